@@ -5,6 +5,7 @@ Walk-forward validation with ROI tracking
 
 import sys
 from pathlib import Path
+from typing import Dict, Optional
 import pandas as pd
 import numpy as np
 
@@ -14,7 +15,7 @@ sys.path.insert(0, str(project_root))
 from training.config import TRAINING_DATA_PATHS, BACKTEST_CONFIG, BACKTESTING_RESULTS_DIR
 from backtesting.utils import (
     walk_forward_split, calculate_roi, calculate_sharpe_ratio,
-    calculate_max_drawdown, print_backtest_summary
+    calculate_max_drawdown, point_in_time_features, print_backtest_summary
 )
 
 
@@ -22,7 +23,8 @@ def walk_forward_backtest_goals(
     data_path: str,
     initial_train_months: int = 12,
     step_months: int = 1,
-    min_prob_threshold: float = 0.6
+    min_prob_threshold: float = 0.6,
+    feature_version: Optional[str] = None
 ) -> Dict:
     """
     Walk-forward backtest for goals model
@@ -32,6 +34,8 @@ def walk_forward_backtest_goals(
         initial_train_months: Initial training period in months
         step_months: Step size in months
         min_prob_threshold: Minimum probability to place bet
+        feature_version: Read features as of kickoff from this feature
+            store version instead of the table's columns (optional)
         
     Returns:
         Dictionary with backtest results
@@ -44,6 +48,11 @@ def walk_forward_backtest_goals(
     df = pd.read_csv(data_path)
     df = df.dropna(subset=['y', 'odds_over25'])
     
+    feature_cols = None
+    if feature_version:
+        df, feature_cols = point_in_time_features(df, feature_version)
+        print(f"📦 Point-in-time features from feature store {feature_version}: {len(df):,} matches")
+    
     # Create walk-forward splits
     splits = walk_forward_split(df, initial_train_months, step_months)
     print(f"📊 Created {len(splits)} walk-forward periods")
@@ -62,9 +71,10 @@ def walk_forward_backtest_goals(
         # Train simple model (for backtesting purposes)
         from sklearn.linear_model import LogisticRegression
         
-        exclude_cols = ['match_id', 'date', 'league', 'home_team_id', 
-                       'away_team_id', 'y', 'odds_over25']
-        feature_cols = [c for c in train_df.columns if c not in exclude_cols]
+        if feature_cols is None:
+            exclude_cols = ['match_id', 'date', 'league', 'home_team_id', 
+                           'away_team_id', 'y', 'odds_over25']
+            feature_cols = [c for c in train_df.columns if c not in exclude_cols]
         
         X_train = train_df[feature_cols].fillna(0)
         y_train = train_df['y'].astype(int)
@@ -137,7 +147,7 @@ def walk_forward_backtest_goals(
     return results
 
 
-def backtest_goals(data_path: str = None):
+def backtest_goals(data_path: str = None, feature_version: Optional[str] = None):
     """Convenience function for backtesting goals model"""
     if data_path is None:
         data_path = str(TRAINING_DATA_PATHS['goals'])
@@ -145,10 +155,17 @@ def backtest_goals(data_path: str = None):
     return walk_forward_backtest_goals(
         data_path,
         initial_train_months=BACKTEST_CONFIG['initial_train_months'],
-        step_months=BACKTEST_CONFIG['step_months']
+        step_months=BACKTEST_CONFIG['step_months'],
+        feature_version=feature_version
     )
 
 
 if __name__ == "__main__":
-    from typing import Dict
-    backtest_goals()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Walk-forward backtest of the goals model')
+    parser.add_argument('--data-path', help='Training table (default: goals table)')
+    parser.add_argument('--feature-version', help='Read features as of kickoff from this feature store version')
+    args = parser.parse_args()
+    
+    backtest_goals(args.data_path, args.feature_version)
@@ -5,6 +5,7 @@ Tests value betting approach with Kelly criterion staking
 
 import sys
 from pathlib import Path
+from typing import Dict
 import pandas as pd
 import numpy as np
 
@@ -120,6 +121,5 @@ def backtest_value_bets(
 
 
 if __name__ == "__main__":
-    from typing import Dict
     from training.config import TRAINING_DATA_PATHS
     backtest_value_bets(str(TRAINING_DATA_PATHS['goals']))
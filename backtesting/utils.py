@@ -5,7 +5,7 @@ Helper functions for backtesting and performance evaluation
 
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 
 
 def calculate_roi(
@@ -176,6 +176,39 @@ def walk_forward_split(
     return splits
 
 
+def point_in_time_features(
+    df: pd.DataFrame,
+    feature_version: str,
+    root_dir: Optional[str] = None,
+    id_column: str = 'match_id'
+) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Replace a table's features with those stored as of kickoff
+    
+    Reads the feature store's point-in-time rows for the table's matches,
+    so backtests score the features training and serving read instead of
+    recomputing them. Matches without stored features are dropped.
+    
+    Args:
+        df: Table with match IDs, labels and odds
+        feature_version: Feature store version to read
+        root_dir: Feature store root directory (default: the store's)
+        id_column: Column holding the match ID
+        
+    Returns:
+        Tuple of (table with the stored feature columns, feature names)
+    """
+    from features.feature_store import DEFAULT_STORE_DIR, FeatureStore
+    
+    store = FeatureStore(feature_version, root_dir=root_dir or DEFAULT_STORE_DIR)
+    ids = df[id_column].astype(str)
+    stored = store.get_point_in_time(ids.unique()).drop(columns='kickoff')
+    
+    table = df.drop(columns=[c for c in store.feature_names if c in df.columns])
+    table = table.assign(**{id_column: ids}).join(stored, on=id_column, how='inner')
+    return table, store.feature_names
+
+
 def print_backtest_summary(results: Dict):
     """
     Print formatted backtest summary
@@ -14,6 +14,7 @@ from .schemas import (
 )
 from .database import get_db, get_db_session, init_db, drop_db
 from .ingestion import DataIngestionService
+from .aggregator import TeamStatsAggregator
 
 __all__ = [
     'Team',
@@ -31,5 +32,6 @@ __all__ = [
     'get_db_session',
     'init_db',
     'drop_db',
-    'DataIngestionService'
+    'DataIngestionService',
+    'TeamStatsAggregator'
 ]
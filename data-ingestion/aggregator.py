@@ -0,0 +1,261 @@
+"""
+Team statistics aggregator
+Keeps team_statistics season rows current as match results are ingested
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy.orm import Session
+
+from .models import Match, MatchResult, TeamStatistic
+
+
+FORM_LENGTH = 5
+
+
+class SeasonTotals:
+    """
+    Integer running totals for one team in one season
+
+    Averages and rates on TeamStatistic are derived from these totals, so a
+    new result only needs a handful of additions regardless of how many
+    matches the team has already played.
+    """
+
+    __slots__ = (
+        'matches_played', 'wins', 'draws', 'losses',
+        'goals_scored', 'goals_conceded',
+        'home_matches', 'home_wins', 'home_draws', 'home_losses',
+        'home_goals_scored', 'home_goals_conceded',
+        'away_matches', 'away_wins', 'away_draws', 'away_losses',
+        'away_goals_scored', 'away_goals_conceded',
+        'corners', 'cards', 'btts', 'clean_sheets', 'form'
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+        self.form = ''
+
+    @classmethod
+    def from_row(cls, row: TeamStatistic) -> 'SeasonTotals':
+        """
+        Recover running totals from a stored season row
+
+        Counts are stored directly. Corner, card, BTTS and clean sheet totals
+        are integers stored as 2dp averages, so multiplying back by the match
+        count and rounding recovers them exactly for any realistic season
+        length (< 100 matches).
+        """
+        totals = cls()
+        for name in cls.__slots__[:18]:
+            setattr(totals, name, getattr(row, name) or 0)
+
+        n = totals.matches_played
+        totals.corners = int(round(float(row.corners_avg or 0) * n))
+        totals.cards = int(round(float(row.cards_avg or 0) * n))
+        totals.btts = int(round(float(row.btts_rate or 0) * n))
+        totals.clean_sheets = int(round(float(row.clean_sheet_rate or 0) * n))
+        totals.form = row.current_form or ''
+        return totals
+
+    def add(self, result, is_home: bool):
+        """
+        Fold one match result into the totals
+
+        Args:
+            result: MatchResult row or MatchResultSchema (same attribute names)
+            is_home: Whether this team played at home
+        """
+        if is_home:
+            scored, conceded = result.home_goals, result.away_goals
+            corners, cards = result.home_corners, result.home_cards
+            prefix = 'home_'
+        else:
+            scored, conceded = result.away_goals, result.home_goals
+            corners, cards = result.away_corners, result.away_cards
+            prefix = 'away_'
+
+        if scored > conceded:
+            outcome, letter = 'wins', 'W'
+        elif scored == conceded:
+            outcome, letter = 'draws', 'D'
+        else:
+            outcome, letter = 'losses', 'L'
+
+        self.matches_played += 1
+        self.goals_scored += scored
+        self.goals_conceded += conceded
+        setattr(self, outcome, getattr(self, outcome) + 1)
+
+        self._increment(prefix + 'matches', 1)
+        self._increment(prefix + outcome, 1)
+        self._increment(prefix + 'goals_scored', scored)
+        self._increment(prefix + 'goals_conceded', conceded)
+
+        self.corners += corners or 0
+        self.cards += cards or 0
+        self.btts += 1 if (result.home_goals > 0 and result.away_goals > 0) else 0
+        self.clean_sheets += 1 if conceded == 0 else 0
+
+        # Most recent result last, matching the W/D/L strings on Match
+        self.form = (self.form + letter)[-FORM_LENGTH:]
+
+    def write_to(self, row: TeamStatistic):
+        """Write totals and derived averages back to a season row"""
+        for name in self.__slots__[:18]:
+            setattr(row, name, getattr(self, name))
+
+        n = self.matches_played
+        row.goals_avg = _avg(self.goals_scored, n)
+        row.goals_conceded_avg = _avg(self.goals_conceded, n)
+        row.home_goals_avg = _avg(self.home_goals_scored, self.home_matches)
+        row.away_goals_avg = _avg(self.away_goals_scored, self.away_matches)
+        row.corners_avg = _avg(self.corners, n)
+        row.cards_avg = _avg(self.cards, n)
+        row.btts_rate = _avg(self.btts, n)
+        row.clean_sheet_rate = _avg(self.clean_sheets, n)
+        row.current_form = self.form or None
+        row.updated_at = datetime.utcnow()
+
+    def _increment(self, name: str, amount: int):
+        setattr(self, name, getattr(self, name) + amount)
+
+
+class TeamStatsAggregator:
+    """
+    Maintains TeamStatistic season rows from ingested results
+
+    Usage:
+        aggregator = TeamStatsAggregator(db)
+        aggregator.apply_result(match, result)   # live, O(1) per in-order result
+        aggregator.backfill()                    # historical load, one pass
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._rows: Dict[Tuple[int, str], TeamStatistic] = {}
+
+    def apply_result(self, match: Match, result) -> None:
+        """
+        Fold a newly recorded result into both teams' season rows
+
+        The form string is appended in kickoff order, so a late result for
+        a match older than one already applied rebuilds that team's season
+        instead.
+
+        Args:
+            match: Match the result belongs to (provides teams and season)
+            result: MatchResult row or MatchResultSchema
+        """
+        for team_id, is_home in ((match.home_team_id, True), (match.away_team_id, False)):
+            if self._has_later_result(team_id, match):
+                self.rebuild_team_season(team_id, match.season)
+                continue
+            row = self._get_or_create_row(team_id, match.season)
+            totals = SeasonTotals.from_row(row)
+            totals.add(result, is_home)
+            totals.write_to(row)
+
+    def rebuild_team_season(self, team_id: int, season: str) -> None:
+        """
+        Recompute one team's season row from its completed matches
+
+        Used when a stored result is corrected, since a correction cannot be
+        folded in incrementally without double counting.
+        """
+        self.db.flush()
+        matches = self.db.query(Match, MatchResult).join(
+            MatchResult, Match.match_id == MatchResult.match_id
+        ).filter(
+            Match.season == season,
+            (Match.home_team_id == team_id) | (Match.away_team_id == team_id)
+        ).order_by(Match.match_datetime).all()
+
+        totals = SeasonTotals()
+        for match, result in matches:
+            totals.add(result, is_home=match.home_team_id == team_id)
+
+        totals.write_to(self._get_or_create_row(team_id, season))
+
+    def backfill(self, season: Optional[str] = None) -> int:
+        """
+        Rebuild season rows for all teams from historical results
+
+        Streams completed matches once in kickoff order and accumulates
+        totals in memory, then writes every affected row.
+
+        Args:
+            season: Limit the rebuild to one season (optional)
+
+        Returns:
+            Number of team-season rows written
+        """
+        query = self.db.query(Match, MatchResult).join(
+            MatchResult, Match.match_id == MatchResult.match_id
+        )
+        if season is not None:
+            query = query.filter(Match.season == season)
+
+        totals_by_key: Dict[Tuple[int, str], SeasonTotals] = {}
+        for match, result in query.order_by(Match.match_datetime).yield_per(1000):
+            for team_id, is_home in ((match.home_team_id, True), (match.away_team_id, False)):
+                key = (team_id, match.season)
+                if key not in totals_by_key:
+                    totals_by_key[key] = SeasonTotals()
+                totals_by_key[key].add(result, is_home)
+
+        self._preload_rows(season)
+        for (team_id, row_season), totals in totals_by_key.items():
+            totals.write_to(self._get_or_create_row(team_id, row_season))
+
+        self.db.flush()
+        return len(totals_by_key)
+
+    def _has_later_result(self, team_id: int, match: Match) -> bool:
+        """Whether the team has a recorded result kicking off after ``match`` this season"""
+        later = self.db.query(Match.match_id).join(
+            MatchResult, Match.match_id == MatchResult.match_id
+        ).filter(
+            Match.season == match.season,
+            (Match.home_team_id == team_id) | (Match.away_team_id == team_id),
+            Match.match_datetime > match.match_datetime,
+            Match.match_id != match.match_id
+        ).first()
+        return later is not None
+
+    def _preload_rows(self, season: Optional[str]):
+        """Load existing season rows in one query ahead of a backfill"""
+        query = self.db.query(TeamStatistic)
+        if season is not None:
+            query = query.filter(TeamStatistic.season == season)
+        for row in query.all():
+            self._rows[(row.team_id, row.season)] = row
+
+    def _get_or_create_row(self, team_id: int, season: str) -> TeamStatistic:
+        """Get the season row for a team, creating an empty one if needed"""
+        key = (team_id, season)
+        row = self._rows.get(key)
+        if row is not None:
+            return row
+
+        row = self.db.query(TeamStatistic).filter(
+            TeamStatistic.team_id == team_id,
+            TeamStatistic.season == season
+        ).first()
+
+        if row is None:
+            row = TeamStatistic(team_id=team_id, season=season)
+            SeasonTotals().write_to(row)
+            self.db.add(row)
+            self.db.flush()
+
+        self._rows[key] = row
+        return row
+
+
+def _avg(total: int, count: int) -> Optional[float]:
+    """Average rounded to the 2dp precision of the team_statistics columns"""
+    if not count:
+        return None
+    return round(total / count, 2)
@@ -6,18 +6,29 @@ Processes incoming match data and stores in database
 from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
 from .models import Team, Match, MatchOdds, MatchResult
 from .schemas import MatchSchema, BatchIngestRequest, IngestResponse
+from .aggregator import TeamStatsAggregator
 
 
 class DataIngestionService:
     """Service for ingesting match data into database"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, result_observers: Optional[List] = None):
+        """
+        Args:
+            db: Database session
+            result_observers: In-memory feature stores to notify of new
+                results; each must provide add_result(match, result) and
+                correct_result(match, result) for corrected results
+        """
         self.db = db
         self.errors = []
+        self.stats_aggregator = TeamStatsAggregator(db)
+        self.result_observers = result_observers or []
+        self._pending_results: List[Tuple[Match, object, bool]] = []
     
     def ingest_batch(self, request: BatchIngestRequest) -> IngestResponse:
         """
@@ -47,6 +58,7 @@ class DataIngestionService:
             self.db.commit()
         except Exception as e:
             self.db.rollback()
+            self._pending_results = []
             return IngestResponse(
                 success=False,
                 message=f"Database commit failed: {str(e)}",
@@ -56,6 +68,12 @@ class DataIngestionService:
                 errors=self.errors
             )
         
+        # In-memory stores only see committed results, in kickoff order
+        self._pending_results.sort(key=lambda pending: pending[0].match_datetime)
+        for match, result_data, corrected in self._pending_results:
+            self._notify_observers(match, result_data, corrected)
+        self._pending_results = []
+        
         return IngestResponse(
             success=len(self.errors) == 0,
             message="Batch ingestion completed" if len(self.errors) == 0 else "Batch ingestion completed with errors",
@@ -258,3 +276,27 @@ class DataIngestionService:
         match = self.db.query(Match).filter(Match.match_id == match_id).first()
         if match:
             match.status = 'completed'
+            
+            # Keep season aggregates current
+            if existing:
+                # Corrections are rebuilt from history to avoid double counting
+                self.stats_aggregator.rebuild_team_season(match.home_team_id, match.season)
+                self.stats_aggregator.rebuild_team_season(match.away_team_id, match.season)
+            else:
+                self.stats_aggregator.apply_result(match, result_data)
+            if self.result_observers:
+                self._pending_results.append((match, result_data, existing is not None))
+    
+    def _notify_observers(self, match: Match, result_data, corrected: bool):
+        """Pass a new or corrected result to the in-memory feature stores"""
+        for observer in self.result_observers:
+            try:
+                if corrected:
+                    observer.correct_result(match, result_data)
+                else:
+                    observer.add_result(match, result_data)
+            except Exception as e:
+                # The stored result stands; only the observer is behind
+                self.errors.append(
+                    f"Match {match.match_id}: {type(observer).__name__} not updated: {str(e)}"
+                )
@@ -5,7 +5,7 @@ SQLAlchemy ORM models matching the PostgreSQL schema
 
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, DateTime, Decimal, Boolean, 
+    Column, Integer, String, DateTime, DECIMAL as Decimal, Boolean, 
     ForeignKey, Text, Index
 )
 from sqlalchemy.dialects.postgresql import JSONB
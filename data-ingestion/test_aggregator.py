@@ -0,0 +1,166 @@
+"""
+Team Statistics Aggregator Test Script
+Checks incremental season aggregation against a full backfill
+"""
+import random
+import sys
+import types
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Import the package under its runtime name without running __init__,
+# which opens the PostgreSQL engine
+_package = types.ModuleType('data_ingestion')
+_package.__path__ = [str(Path(__file__).parent)]
+sys.modules.setdefault('data_ingestion', _package)
+
+from data_ingestion.aggregator import SeasonTotals, TeamStatsAggregator
+from data_ingestion.models import Base, Match, MatchResult, Team, TeamStatistic
+
+
+SEASON = '2024/25'
+STAT_COLUMNS = [
+    'matches_played', 'wins', 'draws', 'losses', 'goals_scored', 'goals_conceded',
+    'home_matches', 'away_matches', 'goals_avg', 'corners_avg', 'cards_avg',
+    'btts_rate', 'clean_sheet_rate', 'current_form'
+]
+
+
+def _session():
+    """In-memory database with the tables the aggregator touches"""
+    engine = create_engine('sqlite://')
+    Base.metadata.create_all(engine, tables=[
+        Team.__table__, TeamStatistic.__table__, Match.__table__, MatchResult.__table__
+    ])
+    return sessionmaker(bind=engine, autoflush=False)()
+
+
+def _fixtures(db, n_teams: int = 6, n_matches: int = 40, seed: int = 0):
+    """Teams and scheduled matches in kickoff order, with their results (not stored)"""
+    rng = random.Random(seed)
+    teams = [Team(team_name=f'Team {i}', league='Test League') for i in range(n_teams)]
+    db.add_all(teams)
+    db.flush()
+
+    fixtures = []
+    kickoff = datetime(2024, 8, 10, 15)
+    for i in range(n_matches):
+        home, away = rng.sample(teams, 2)
+        match = Match(
+            match_id=f'M{i:03d}', home_team_id=home.team_id, away_team_id=away.team_id,
+            match_datetime=kickoff + timedelta(days=i), season=SEASON, status='scheduled'
+        )
+        db.add(match)
+        home_goals, away_goals = rng.randint(0, 4), rng.randint(0, 3)
+        result = MatchResult(
+            match_id=match.match_id, home_goals=home_goals, away_goals=away_goals,
+            result='H' if home_goals > away_goals else 'D' if home_goals == away_goals else 'A',
+            total_goals=home_goals + away_goals,
+            home_corners=rng.randint(2, 9), away_corners=rng.randint(1, 8),
+            home_cards=rng.randint(0, 4), away_cards=rng.randint(0, 4)
+        )
+        fixtures.append((match, result))
+    db.flush()
+    return teams, fixtures
+
+
+def _snapshot(db):
+    """Season rows by team, as comparable tuples"""
+    return {
+        row.team_id: tuple(
+            float(value) if value is not None and name.endswith(('_avg', '_rate')) else value
+            for name, value in ((name, getattr(row, name)) for name in STAT_COLUMNS)
+        )
+        for row in db.query(TeamStatistic).filter(TeamStatistic.season == SEASON)
+    }
+
+
+def _ingest(db, aggregator, fixtures):
+    """Store and apply results one at a time, as the ingestion service does"""
+    for match, result in fixtures:
+        db.add(result)
+        match.status = 'completed'
+        aggregator.apply_result(match, result)
+        db.flush()
+
+
+def _backfilled():
+    """Season rows built by backfill over all results"""
+    db = _session()
+    _, fixtures = _fixtures(db)
+    for match, result in fixtures:
+        db.add(result)
+    db.flush()
+    TeamStatsAggregator(db).backfill(SEASON)
+    return _snapshot(db)
+
+
+def test_incremental_matches_backfill():
+    """Results applied one by one give the same rows as one backfill pass"""
+    db = _session()
+    _, fixtures = _fixtures(db)
+    _ingest(db, TeamStatsAggregator(db), fixtures)
+
+    expected = _backfilled()
+    assert _snapshot(db) == expected
+    assert len(expected) == 6
+    print("✅ Incremental aggregation matches backfill")
+
+
+def test_out_of_order_result():
+    """A late result older than applied ones leaves the form string in kickoff order"""
+    db = _session()
+    _, fixtures = _fixtures(db)
+    rng = random.Random(1)
+    late = rng.sample(range(len(fixtures)), 8)
+    on_time = [fixture for i, fixture in enumerate(fixtures) if i not in late]
+    aggregator = TeamStatsAggregator(db)
+    _ingest(db, aggregator, on_time)
+    _ingest(db, aggregator, [fixtures[i] for i in late])
+
+    assert _snapshot(db) == _backfilled()
+    print("✅ Out-of-order results rebuild the season")
+
+
+def test_backfill_is_idempotent():
+    """Re-running backfill rewrites the same rows without duplicating them"""
+    db = _session()
+    _, fixtures = _fixtures(db)
+    for match, result in fixtures:
+        db.add(result)
+    db.flush()
+
+    aggregator = TeamStatsAggregator(db)
+    written = aggregator.backfill(SEASON)
+    first = _snapshot(db)
+    assert aggregator.backfill(SEASON) == written
+    assert _snapshot(db) == first
+    assert db.query(TeamStatistic).count() == written
+    print("✅ Backfill is idempotent")
+
+
+def test_totals_round_trip():
+    """Running totals recovered from a stored row continue exactly"""
+    db = _session()
+    _, fixtures = _fixtures(db, n_matches=30)
+    team_id = fixtures[0][0].home_team_id
+    totals = SeasonTotals()
+    for match, result in fixtures:
+        if team_id in (match.home_team_id, match.away_team_id):
+            row = TeamStatistic(team_id=team_id, season=SEASON)
+            totals.write_to(row)
+            recovered = SeasonTotals.from_row(row)
+            assert all(getattr(recovered, name) == getattr(totals, name) for name in SeasonTotals.__slots__)
+            totals.add(result, is_home=match.home_team_id == team_id)
+    assert len(totals.form) <= 5
+    print("✅ Totals survive the stored 2dp averages")
+
+
+if __name__ == "__main__":
+    test_incremental_matches_backfill()
+    test_out_of_order_result()
+    test_backfill_is_idempotent()
+    test_totals_round_trip()
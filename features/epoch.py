@@ -0,0 +1,32 @@
+"""
+Kickoff Epoch
+Conversion of kickoff times to the integer epoch seconds the feature stores index by
+"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch(value) -> int:
+    """
+    Convert a kickoff to integer epoch seconds
+
+    Args:
+        value: datetime (naive = UTC), pandas Timestamp, ISO string or epoch seconds
+
+    Returns:
+        Seconds since 1970-01-01 UTC
+    """
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if hasattr(value, 'to_pydatetime'):
+        value = value.to_pydatetime()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((value - EPOCH).total_seconds())
@@ -5,7 +5,95 @@ Ensures training and inference use identical feature engineering logic
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
+
+from features.feature_schema import FeatureSchema
+
+
+# Features produced by FeatureBuilder, in build order
+FEATURE_NAMES = (
+    'home_goals_avg_5', 'away_goals_avg_5',
+    'home_goals_conceded_avg_5', 'away_goals_conceded_avg_5',
+    'home_corners_avg_5', 'away_corners_avg_5',
+    'home_cards_avg_5', 'away_cards_avg_5',
+    'home_btts_rate_5', 'away_btts_rate_5',
+    'home_goals_avg_10', 'away_goals_avg_10',
+    'home_goals_conceded_avg_10', 'away_goals_conceded_avg_10',
+    'combined_goals_avg', 'combined_corners_avg',
+    'combined_cards_avg', 'combined_btts_rate',
+    'home_attack_vs_away_defense', 'away_attack_vs_home_defense'
+)
+
+# Match stats read by the builder: (key, fallback key), missing as 0.
+# A stat given as None is rejected (TypeError) at any batch size
+BASE_INPUTS = (
+    ('home_goals_avg_5', 'home_goals_avg'), ('away_goals_avg_5', 'away_goals_avg'),
+    ('home_goals_conceded_avg_5', 'home_goals_conceded_avg'),
+    ('away_goals_conceded_avg_5', 'away_goals_conceded_avg'),
+    ('home_corners_avg_5', 'home_corners_avg'), ('away_corners_avg_5', 'away_corners_avg'),
+    ('home_cards_avg_5', 'home_cards_avg'), ('away_cards_avg_5', 'away_cards_avg'),
+    ('home_btts_rate_5', 'home_btts_rate'), ('away_btts_rate_5', 'away_btts_rate')
+)
+
+# 10-match stats, defaulting to the 5-match value they extend
+LONG_INPUTS = (
+    ('home_goals_avg_10', 'home_goals_avg_5'), ('away_goals_avg_10', 'away_goals_avg_5'),
+    ('home_goals_conceded_avg_10', 'home_goals_conceded_avg_5'),
+    ('away_goals_conceded_avg_10', 'away_goals_conceded_avg_5')
+)
+
+# Below this many matches build_matrix fills rows one by one, which has
+# less per-call overhead than the columnar path
+COLUMNAR_MIN_ROWS = 32
+
+
+def match_columns(matches: Sequence, dtype=np.float64) -> Dict[str, np.ndarray]:
+    """
+    Stat columns of many matches, each converted to ``dtype`` once
+
+    Accepts match dictionaries or objects carrying the stats as attributes
+    (e.g. SQLAlchemy ``Match`` rows, whose snapshot columns are Decimal),
+    so values are converted here rather than on every feature computation.
+
+    Args:
+        matches: Match dictionaries or rows
+        dtype: Column dtype
+
+    Returns:
+        Dictionary mapping each BASE_INPUTS / LONG_INPUTS key to a
+        (len(matches),) array
+
+    Raises:
+        TypeError: If a stat is None, as for a single match
+    """
+    if all(isinstance(match, dict) for match in matches):
+        def values(key, fallback):
+            return [m.get(key, m.get(fallback, 0)) for m in matches]
+
+        def present(key):
+            return [key in m for m in matches]
+    else:
+        def values(key, fallback):
+            return [getattr(m, key, getattr(m, fallback, 0)) for m in matches]
+
+        def present(key):
+            return [hasattr(m, key) for m in matches]
+
+    def column(key, fallback):
+        raw = values(key, fallback)
+        if any(value is None for value in raw):
+            raise TypeError(f"Null {key} for match {[value is None for value in raw].index(True)}")
+        return np.array(raw, dtype=dtype)
+
+    columns = {key: column(key, fallback) for key, fallback in BASE_INPUTS}
+    for key, short in LONG_INPUTS:
+        given = np.array(present(key), dtype=bool)
+        if given.any():
+            # Absent keys read as 0 here and are replaced by the 5-match value
+            columns[key] = np.where(given, column(key, short), columns[short])
+        else:
+            columns[key] = columns[short]
+    return columns
 
 
 class FeatureBuilder:
@@ -27,8 +115,103 @@ class FeatureBuilder:
         Returns:
             Dictionary with engineered features
         """
-        features = {}
+        return dict(zip(FEATURE_NAMES, self._feature_values(match_data)))
+    
+    def build_into(self, match_data: Dict, out: np.ndarray, schema: FeatureSchema) -> np.ndarray:
+        """
+        Build features straight into a preallocated schema row
         
+        Args:
+            match_data: Dictionary with match information and team stats
+            out: Row (or 1 x n matrix) allocated with ``schema.allocate``
+            schema: Compiled feature schema of the target model
+            
+        Returns:
+            The filled row
+        """
+        src, cols = schema.layout(FEATURE_NAMES)
+        values = np.array(self._feature_values(match_data), dtype=np.float64)
+        values[np.isnan(values)] = 0
+        out[..., cols] = values[src]
+        return out
+    
+    def build_matrix(
+        self,
+        matches: List[Dict],
+        schema: FeatureSchema,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Build features for many matches into a schema matrix
+        
+        Args:
+            matches: List of match dictionaries
+            schema: Compiled feature schema of the target model(s)
+            out: Preallocated (len(matches), n_features) matrix (optional)
+            
+        Returns:
+            Feature matrix in schema column order (missing values as 0)
+        """
+        if len(matches) >= COLUMNAR_MIN_ROWS:
+            return self.build_matrix_from_columns(match_columns(matches), schema, out)
+        if out is None:
+            out = schema.allocate(len(matches))
+        if matches:
+            src, cols = schema.layout(FEATURE_NAMES)
+            values = np.array([self._feature_values(m) for m in matches], dtype=np.float64)
+            values[np.isnan(values)] = 0
+            out[:, cols] = values[:, src]
+        return out
+    
+    def build_matrix_from_columns(
+        self,
+        columns: Dict[str, np.ndarray],
+        schema: FeatureSchema,
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        Build features from stat columns, vectorized
+        
+        Derived features are computed at the columns' precision and rounded
+        once into the schema dtype, so a float32 matrix holds exactly the
+        float64 training features as the tree models see them.
+        
+        Args:
+            columns: Stat columns as returned by ``match_columns``
+            schema: Compiled feature schema of the target model(s)
+            out: Preallocated (n_matches, n_features) matrix (optional)
+            
+        Returns:
+            Feature matrix in schema column order (missing values as 0)
+        """
+        n = len(columns['home_goals_avg_5'])
+        if out is None:
+            out = schema.allocate(n)
+        c = columns
+        features = {key: c[key] for key, _ in BASE_INPUTS}
+        features.update({key: c[key] for key, _ in LONG_INPUTS})
+        features.update({
+            'combined_goals_avg': c['home_goals_avg_5'] + c['away_goals_avg_5'],
+            'combined_corners_avg': c['home_corners_avg_5'] + c['away_corners_avg_5'],
+            'combined_cards_avg': c['home_cards_avg_5'] + c['away_cards_avg_5'],
+            'combined_btts_rate': (c['home_btts_rate_5'] + c['away_btts_rate_5']) / 2,
+            'home_attack_vs_away_defense': c['home_goals_avg_5'] - c['away_goals_conceded_avg_5'],
+            'away_attack_vs_home_defense': c['away_goals_avg_5'] - c['home_goals_conceded_avg_5']
+        })
+        for name, values in features.items():
+            column = schema.index.get(name)
+            if column is not None:
+                out[:, column] = values
+        
+        _, cols = schema.layout(FEATURE_NAMES)
+        block = out[:, cols]
+        if np.isnan(block).any():
+            block[np.isnan(block)] = 0
+            out[:, cols] = block
+        return out
+    
+    def _feature_values(self, match_data: Dict) -> List:
+        """Feature values in FEATURE_NAMES order"""
         # Extract base stats
         home_goals_avg = match_data.get('home_goals_avg_5', match_data.get('home_goals_avg', 0))
         away_goals_avg = match_data.get('away_goals_avg_5', match_data.get('away_goals_avg', 0))
@@ -43,37 +226,35 @@ class FeatureBuilder:
         home_btts_rate = match_data.get('home_btts_rate_5', match_data.get('home_btts_rate', 0))
         away_btts_rate = match_data.get('away_btts_rate_5', match_data.get('away_btts_rate', 0))
         
-        # Basic features
-        features['home_goals_avg_5'] = home_goals_avg
-        features['away_goals_avg_5'] = away_goals_avg
-        features['home_goals_conceded_avg_5'] = home_goals_conceded_avg
-        features['away_goals_conceded_avg_5'] = away_goals_conceded_avg
-        features['home_corners_avg_5'] = home_corners_avg
-        features['away_corners_avg_5'] = away_corners_avg
-        features['home_cards_avg_5'] = home_cards_avg
-        features['away_cards_avg_5'] = away_cards_avg
-        features['home_btts_rate_5'] = home_btts_rate
-        features['away_btts_rate_5'] = away_btts_rate
-        
-        # 10-match averages (if available)
-        features['home_goals_avg_10'] = match_data.get('home_goals_avg_10', home_goals_avg)
-        features['away_goals_avg_10'] = match_data.get('away_goals_avg_10', away_goals_avg)
-        features['home_goals_conceded_avg_10'] = match_data.get('home_goals_conceded_avg_10', 
-                                                                home_goals_conceded_avg)
-        features['away_goals_conceded_avg_10'] = match_data.get('away_goals_conceded_avg_10',
-                                                                away_goals_conceded_avg)
-        
-        # Combined features
-        features['combined_goals_avg'] = home_goals_avg + away_goals_avg
-        features['combined_corners_avg'] = home_corners_avg + away_corners_avg
-        features['combined_cards_avg'] = home_cards_avg + away_cards_avg
-        features['combined_btts_rate'] = (home_btts_rate + away_btts_rate) / 2
-        
-        # Attack vs Defense
-        features['home_attack_vs_away_defense'] = home_goals_avg - away_goals_conceded_avg
-        features['away_attack_vs_home_defense'] = away_goals_avg - home_goals_conceded_avg
+        stats = [
+            # Basic features
+            home_goals_avg, away_goals_avg,
+            home_goals_conceded_avg, away_goals_conceded_avg,
+            home_corners_avg, away_corners_avg,
+            home_cards_avg, away_cards_avg,
+            home_btts_rate, away_btts_rate,
+            
+            # 10-match averages (if available)
+            match_data.get('home_goals_avg_10', home_goals_avg),
+            match_data.get('away_goals_avg_10', away_goals_avg),
+            match_data.get('home_goals_conceded_avg_10', home_goals_conceded_avg),
+            match_data.get('away_goals_conceded_avg_10', away_goals_conceded_avg)
+        ]
+        for name, value in zip(FEATURE_NAMES, stats):
+            if value is None:
+                raise TypeError(f"Null {name}")
         
-        return features
+        return stats + [
+            # Combined features
+            home_goals_avg + away_goals_avg,
+            home_corners_avg + away_corners_avg,
+            home_cards_avg + away_cards_avg,
+            (home_btts_rate + away_btts_rate) / 2,
+            
+            # Attack vs Defense
+            home_goals_avg - away_goals_conceded_avg,
+            away_goals_avg - home_goals_conceded_avg
+        ]
     
     def build_features_batch(self, matches: List[Dict]) -> pd.DataFrame:
         """
@@ -90,15 +271,4 @@ class FeatureBuilder:
     
     def get_feature_names(self) -> List[str]:
         """Get list of feature names"""
-        return [
-            'home_goals_avg_5', 'away_goals_avg_5',
-            'home_goals_conceded_avg_5', 'away_goals_conceded_avg_5',
-            'home_corners_avg_5', 'away_corners_avg_5',
-            'home_cards_avg_5', 'away_cards_avg_5',
-            'home_btts_rate_5', 'away_btts_rate_5',
-            'home_goals_avg_10', 'away_goals_avg_10',
-            'home_goals_conceded_avg_10', 'away_goals_conceded_avg_10',
-            'combined_goals_avg', 'combined_corners_avg',
-            'combined_cards_avg', 'combined_btts_rate',
-            'home_attack_vs_away_defense', 'away_attack_vs_home_defense'
-        ]
+        return list(FEATURE_NAMES)
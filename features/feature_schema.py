@@ -0,0 +1,129 @@
+"""
+Compiled Feature Schema
+Fixed column order with index offsets, computed once per model version
+Feature builders write straight into preallocated float32 rows or matrices
+"""
+
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class FeatureSchema:
+    """
+    Column layout of the feature matrix a model expects
+
+    Maps every feature name to its column index once, so builders can
+    scatter their values into a preallocated array instead of going through
+    a dict and a DataFrame on every prediction. Columns no builder produces
+    stay 0, matching the ``fillna(0)`` of the DataFrame path.
+    """
+
+    def __init__(
+        self,
+        feature_names: Sequence[str],
+        version: Optional[str] = None,
+        dtype=np.float32
+    ):
+        """
+        Args:
+            feature_names: Model feature columns, in training order
+            version: Model version the schema was compiled for
+            dtype: Dtype of allocated arrays
+        """
+        self.feature_names = tuple(feature_names)
+        self.version = version
+        self.dtype = np.dtype(dtype)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.feature_names)}
+        self._layouts: Dict[Tuple[str, ...], Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def from_metadata(
+        cls,
+        metadata: Dict,
+        default_names: Sequence[str],
+        dtype=np.float32
+    ) -> 'FeatureSchema':
+        """
+        Compile the schema recorded in model metadata
+
+        Args:
+            metadata: Ensemble or model metadata (``feature_columns``, ``version``)
+            default_names: Feature order to use when metadata has none
+            dtype: Dtype of allocated arrays
+
+        Returns:
+            FeatureSchema
+        """
+        names = metadata.get('feature_columns') or default_names
+        return cls(names, version=metadata.get('version'), dtype=dtype)
+
+    @classmethod
+    def union(cls, schemas: Sequence['FeatureSchema'], dtype=np.float32) -> 'FeatureSchema':
+        """
+        Schema holding every feature of several schemas, in first-seen order
+
+        A matrix built once for the union feeds each model through
+        ``union.columns_of(schema)``.
+
+        Args:
+            schemas: Schemas to merge
+            dtype: Dtype of allocated arrays
+
+        Returns:
+            FeatureSchema
+        """
+        names = dict.fromkeys(name for schema in schemas for name in schema.feature_names)
+        return cls(list(names), dtype=dtype)
+
+    @property
+    def n_features(self) -> int:
+        return len(self.feature_names)
+
+    def __len__(self) -> int:
+        return len(self.feature_names)
+
+    def allocate(self, n_rows: int = 1) -> np.ndarray:
+        """Zero-filled (n_rows, n_features) matrix in the schema dtype"""
+        return np.zeros((n_rows, self.n_features), dtype=self.dtype)
+
+    def layout(self, source_names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Index mapping from a builder's feature order into this schema
+
+        Cached per source order, so it is computed once per builder.
+
+        Args:
+            source_names: Feature names in the order a builder produces them
+
+        Returns:
+            Tuple of (source positions, schema columns) for the names the
+            schema contains; ``out[:, cols] = values[:, src]`` scatters them
+        """
+        key = tuple(source_names)
+        layout = self._layouts.get(key)
+        if layout is None:
+            pairs = [(i, self.index[name]) for i, name in enumerate(key) if name in self.index]
+            src = np.array([i for i, _ in pairs], dtype=np.intp)
+            cols = np.array([c for _, c in pairs], dtype=np.intp)
+            layout = self._layouts[key] = (src, cols)
+        return layout
+
+    def columns_of(self, other: 'FeatureSchema') -> np.ndarray:
+        """
+        Columns of this schema that hold each of another schema's features
+
+        Lets a matrix built once for a wider schema feed a model with a
+        narrower one: ``matrix[:, wide.columns_of(narrow)]``.
+
+        Raises:
+            KeyError: If a feature of ``other`` is not in this schema
+        """
+        missing = [name for name in other.feature_names if name not in self.index]
+        if missing:
+            raise KeyError(f"Features not in schema: {missing}")
+        return np.array([self.index[name] for name in other.feature_names], dtype=np.intp)
+
+    def to_dict(self, row: np.ndarray) -> Dict[str, float]:
+        """Feature name -> value for one row (debugging and logging)"""
+        return {name: float(value) for name, value in zip(self.feature_names, np.ravel(row))}
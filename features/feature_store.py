@@ -0,0 +1,505 @@
+"""
+Offline Feature Store
+Versioned, month-partitioned columnar files of per-match feature vectors
+Point-in-time reads for training and backtesting, latest snapshots for serving
+"""
+
+import json
+import os
+import shutil
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from features.epoch import to_epoch
+from features.feature_builder import FEATURE_NAMES, FeatureBuilder
+from features.feature_schema import FeatureSchema
+
+
+DEFAULT_STORE_DIR = project_root / 'data' / 'feature_store'
+DEFAULT_FEATURE_SET = 'match_features'
+
+# Arrays stored per partition; values are feature-major (n_features, n_rows)
+_COLUMNS = ('match_id', 'kickoff', 'as_of', 'values')
+
+
+class FeatureStore:
+    """
+    Materialized feature vectors per match and feature-set version
+
+    Every row holds one match's features computed from data available at
+    ``as_of``. Backfills write ``as_of == kickoff``; serving jobs write a new
+    snapshot whenever a fixture is recomputed. Rows are partitioned by
+    kickoff month into one directory of ``.npy`` arrays each, read with
+    memory mapping, with feature values stored column by column.
+
+    A version's feature names are fixed by its ``schema.json``; computing
+    a different feature set means writing a new version.
+    """
+
+    def __init__(
+        self,
+        version: str,
+        feature_names: Optional[Sequence[str]] = None,
+        root_dir: Union[str, Path] = DEFAULT_STORE_DIR,
+        feature_set: str = DEFAULT_FEATURE_SET
+    ):
+        """
+        Args:
+            version: Feature-set version (e.g. 'v1')
+            feature_names: Feature columns; required when creating a version,
+                checked against the stored schema otherwise
+            root_dir: Store root directory
+            feature_set: Name of the feature set
+
+        Raises:
+            ValueError: If feature_names differ from the version's schema
+        """
+        self.version = version
+        self.feature_set = feature_set
+        self.path = Path(root_dir) / feature_set / version
+        self._id_index: Optional[Dict[str, Set[str]]] = None
+        self._index_stamps: Dict[str, Tuple[int, int]] = {}
+
+        schema_path = self.path / 'schema.json'
+        if schema_path.exists():
+            with open(schema_path, 'r') as f:
+                self.metadata = json.load(f)
+            stored = self.metadata['feature_names']
+            if feature_names is not None and list(feature_names) != stored:
+                raise ValueError(
+                    f"Feature names differ from {feature_set}/{version}; "
+                    f"write changed features under a new version"
+                )
+        elif feature_names is not None:
+            self.metadata = {
+                'feature_set': feature_set,
+                'version': version,
+                'feature_names': list(feature_names),
+                'created_at': datetime.now().isoformat()
+            }
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(schema_path, 'w') as f:
+                json.dump(self.metadata, f, indent=2)
+        else:
+            raise FileNotFoundError(f"No feature store version at {self.path}")
+
+        self.schema = FeatureSchema(self.metadata['feature_names'], version=version)
+
+    @staticmethod
+    def list_versions(
+        root_dir: Union[str, Path] = DEFAULT_STORE_DIR,
+        feature_set: str = DEFAULT_FEATURE_SET
+    ) -> List[str]:
+        """Versions of a feature set present in the store"""
+        base = Path(root_dir) / feature_set
+        if not base.exists():
+            return []
+        return sorted(p.name for p in base.iterdir() if (p / 'schema.json').exists())
+
+    @property
+    def feature_names(self) -> List[str]:
+        return list(self.schema.feature_names)
+
+    def partitions(self) -> List[str]:
+        """Partition names ('YYYY-MM') in kickoff order"""
+        return sorted(p.name for p in self.path.iterdir() if p.is_dir() and not p.name.startswith('.'))
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def write(
+        self,
+        match_ids: Sequence[str],
+        kickoffs: Sequence,
+        values: np.ndarray,
+        as_of: Optional[Union[Sequence, datetime]] = None
+    ) -> int:
+        """
+        Store feature rows, replacing rows with the same match and as_of
+
+        Args:
+            match_ids: Match IDs
+            kickoffs: Kickoff datetimes (or epoch seconds)
+            values: (n_rows, n_features) matrix in schema column order
+            as_of: Data cutoff per row, or one for all rows
+                (default: the kickoff, as in a backfill)
+
+        Returns:
+            Number of rows written
+        """
+        values = np.asarray(values, dtype=np.float32)
+        if values.ndim != 2 or values.shape[1] != self.schema.n_features:
+            raise ValueError(f"Expected (n, {self.schema.n_features}) feature matrix, got {values.shape}")
+
+        ids = np.asarray([str(m) for m in match_ids])
+        kickoff = np.fromiter((to_epoch(k) for k in kickoffs), np.int64, len(ids))
+        if as_of is None:
+            cutoff = kickoff.copy()
+        elif isinstance(as_of, (str, datetime, int, np.integer)):
+            cutoff = np.full(len(ids), to_epoch(as_of), dtype=np.int64)
+        else:
+            cutoff = np.fromiter((to_epoch(t) for t in as_of), np.int64, len(ids))
+
+        months = np.array([_partition_of(ts) for ts in kickoff.tolist()])
+        for month in np.unique(months):
+            rows = months == month
+            self._merge_partition(month, ids[rows], kickoff[rows], cutoff[rows], values[rows].T)
+
+        return len(ids)
+
+    def materialize(
+        self,
+        matches: List[Dict],
+        as_of: Optional[datetime] = None,
+        builder: Optional[FeatureBuilder] = None,
+        kickoff_key: str = 'match_datetime'
+    ) -> int:
+        """
+        Compute and store features for match dictionaries (serving snapshots)
+
+        Args:
+            matches: Match dictionaries with match_id, kickoff and team stats
+            as_of: Data cutoff of the snapshot (default: now, UTC)
+            builder: Feature builder producing the store's features
+            kickoff_key: Match dictionary key holding the kickoff
+
+        Returns:
+            Number of rows written
+        """
+        if not matches:
+            return 0
+        builder = builder or FeatureBuilder()
+        values = builder.build_matrix(matches, self.schema)
+        return self.write(
+            [m['match_id'] for m in matches],
+            [m[kickoff_key] for m in matches],
+            values,
+            as_of or datetime.now(timezone.utc)
+        )
+
+    def _merge_partition(self, month: str, ids, kickoff, as_of, values):
+        """Merge rows into one partition and rewrite it (sorted by kickoff, match, as_of)"""
+        existing = self._load_partition(month, mmap=False)
+        if existing is not None:
+            old_ids, old_kickoff, old_as_of, old_values = existing
+            keep = ~_pair_in(old_ids, old_as_of, ids, as_of)
+            ids = np.concatenate([old_ids[keep], ids])
+            kickoff = np.concatenate([old_kickoff[keep], kickoff])
+            as_of = np.concatenate([old_as_of[keep], as_of])
+            values = np.concatenate([old_values[:, keep], values], axis=1)
+
+        order = np.lexsort((as_of, ids, kickoff))
+        arrays = {
+            'match_id': ids[order],
+            'kickoff': kickoff[order],
+            'as_of': as_of[order],
+            'values': np.ascontiguousarray(values[:, order])
+        }
+
+        # Write next to the partition and swap directories
+        final = self.path / month
+        tmp = self.path / f'.{month}.tmp-{os.getpid()}'
+        shutil.rmtree(tmp, ignore_errors=True)
+        tmp.mkdir(parents=True)
+        for name, array in arrays.items():
+            np.save(tmp / f'{name}.npy', array)
+        if final.exists():
+            old = self.path / f'.{month}.old-{os.getpid()}'
+            final.rename(old)
+            tmp.rename(final)
+            shutil.rmtree(old, ignore_errors=True)
+        else:
+            tmp.rename(final)
+
+        if self._id_index is not None:
+            for match_id in arrays['match_id'].tolist():
+                self._id_index.setdefault(match_id, set()).add(month)
+            self._index_stamps[month] = _partition_stamp(final)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get_point_in_time(
+        self,
+        match_ids: Optional[Iterable[str]] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        features: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Features as of kickoff, for training and backtesting
+
+        Per match, the latest row computed from data available before
+        kickoff; snapshots written after kickoff are never returned. A
+        match stored under several kickoff months (rescheduled) resolves
+        to its row with the latest as_of.
+
+        Args:
+            match_ids: Matches to read (default: all in range)
+            start, end: Kickoff range, end exclusive (optional)
+            features: Feature columns to return (default: all)
+
+        Returns:
+            DataFrame indexed by match_id with 'kickoff' and feature columns
+        """
+        return self._read(match_ids, start, end, features, point_in_time=True)
+
+    def get_latest(
+        self,
+        match_ids: Iterable[str],
+        features: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Latest snapshot per match, for serving
+
+        Args:
+            match_ids: Matches to read
+            features: Feature columns to return (default: all)
+
+        Returns:
+            DataFrame indexed by match_id with 'kickoff' and feature columns,
+            from each match's row with the latest as_of; matches without a
+            snapshot are absent
+        """
+        return self._read(match_ids, None, None, features, point_in_time=False)
+
+    def latest_matrix(
+        self,
+        match_ids: Sequence[str],
+        schema: FeatureSchema
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Latest snapshots written into a model schema matrix
+
+        Args:
+            match_ids: Matches to read, in row order
+            schema: Target feature schema (columns the store lacks stay 0)
+
+        Returns:
+            Tuple of (feature matrix, mask of matches found in the store)
+        """
+        ids = [str(m) for m in match_ids]
+        out = schema.allocate(len(ids))
+        latest = self.get_latest(ids)
+        if latest.empty:
+            return out, np.zeros(len(ids), dtype=bool)
+
+        src, cols = schema.layout(self.schema.feature_names)
+        positions = latest.index.get_indexer(ids)
+        found = positions >= 0
+        stored = latest[self.feature_names].to_numpy(dtype=np.float32)
+        out[np.ix_(found, cols)] = stored[positions[found]][:, src]
+        return out, found
+
+    def _read(self, match_ids, start, end, features, point_in_time: bool) -> pd.DataFrame:
+        """Select the last qualifying row per match across partitions"""
+        names = list(features) if features is not None else self.feature_names
+        columns = [self.schema.index[name] for name in names]
+
+        wanted = None
+        months = self.partitions()
+        if match_ids is not None:
+            wanted = np.asarray([str(m) for m in match_ids])
+            index = self._partition_index()
+            if any(m not in index for m in wanted.tolist()):
+                # Partitions may have been written by another process; only
+                # those whose files changed are re-read (a plain miss reads none)
+                index = self._partition_index(refresh=True)
+            months = sorted(set().union(*(index[m] for m in wanted.tolist() if m in index)))
+        if start is not None:
+            months = [m for m in months if m >= _partition_of(to_epoch(start))]
+        if end is not None:
+            months = [m for m in months if m <= _partition_of(to_epoch(end))]
+
+        frames, cutoffs = [], []
+        for month in months:
+            ids, kickoff, as_of, values = self._load_partition(month)
+            mask = np.ones(len(ids), dtype=bool)
+            if wanted is not None:
+                mask &= np.isin(ids, wanted)
+            if start is not None:
+                mask &= kickoff >= to_epoch(start)
+            if end is not None:
+                mask &= kickoff < to_epoch(end)
+            if point_in_time:
+                mask &= as_of <= kickoff
+
+            rows = np.flatnonzero(mask)
+            if len(rows) == 0:
+                continue
+            # Rows are sorted by (kickoff, match_id, as_of): keep each match's last
+            selected_ids = ids[rows]
+            last = rows[np.append(selected_ids[1:] != selected_ids[:-1], True)]
+
+            frame = pd.DataFrame(values[np.ix_(columns, last)].T, columns=names)
+            frame.insert(0, 'kickoff', pd.to_datetime(kickoff[last], unit='s'))
+            frame.index = pd.Index(ids[last], name='match_id')
+            frames.append(frame)
+            cutoffs.append(as_of[last])
+
+        if not frames:
+            return pd.DataFrame(columns=['kickoff'] + names, index=pd.Index([], name='match_id'))
+        result = pd.concat(frames)
+        if result.index.has_duplicates:
+            # Rescheduled matches sit in several partitions: keep the latest as_of
+            ids = result.index.to_numpy()
+            order = np.lexsort((np.concatenate(cutoffs), ids))
+            ordered = ids[order]
+            last = order[np.append(ordered[1:] != ordered[:-1], True)]
+            result = result.iloc[np.sort(last)]
+        return result
+
+    def _load_partition(self, month: str, mmap: bool = True):
+        """(match_id, kickoff, as_of, values) arrays of a partition, or None"""
+        part = self.path / month
+        if not part.exists():
+            return None
+        mode = 'r' if mmap else None
+        return tuple(np.load(part / f'{name}.npy', mmap_mode=mode) for name in _COLUMNS)
+
+    def _partition_index(self, refresh: bool = False) -> Dict[str, Set[str]]:
+        """
+        Match ID -> partitions, built on first use and kept current by writes
+
+        Args:
+            refresh: Re-read the partitions rewritten since they were indexed
+                (by another process), going by their file stamps
+        """
+        if self._id_index is not None and not refresh:
+            return self._id_index
+
+        stamps = {}
+        for month in self.partitions():
+            try:
+                stamps[month] = _partition_stamp(self.path / month)
+            except FileNotFoundError:
+                continue  # Mid-swap by a writer; picked up on a later refresh
+        if self._id_index is None or set(self._index_stamps) - set(stamps):
+            self._id_index, self._index_stamps = {}, {}
+
+        for month, stamp in stamps.items():
+            if self._index_stamps.get(month) != stamp:
+                ids = np.load(self.path / month / 'match_id.npy')
+                for match_id in ids.tolist():
+                    self._id_index.setdefault(match_id, set()).add(month)
+                self._index_stamps[month] = stamp
+        return self._id_index
+
+
+def _partition_stamp(part: Path) -> Tuple[int, int]:
+    """(inode, mtime) of a partition's match_id array; every rewrite changes it"""
+    stat = (part / 'match_id.npy').stat()
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _partition_of(epoch: int) -> str:
+    """Kickoff month partition name"""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime('%Y-%m')
+
+
+def _pair_in(ids, as_of, new_ids, new_as_of) -> np.ndarray:
+    """Mask of (id, as_of) pairs that also occur in the new rows"""
+    new_pairs = set(zip(new_ids.tolist(), new_as_of.tolist()))
+    return np.fromiter(
+        ((pair in new_pairs) for pair in zip(ids.tolist(), as_of.tolist())), bool, len(ids)
+    )
+
+
+# ----------------------------------------------------------------------
+# Backfill
+# ----------------------------------------------------------------------
+
+def _backfill_month(task: Tuple[str, str, str]) -> Tuple[str, int]:
+    """Compute and store one month of training features (runs in a worker)"""
+    version, root_dir, month = task
+
+    from data_ingestion.database import get_db
+    from training.build_datasets import DatasetBuilder
+
+    start = datetime.strptime(month, '%Y-%m')
+    end = datetime(start.year + start.month // 12, start.month % 12 + 1, 1)
+
+    store = FeatureStore(version, root_dir=root_dir)
+    with get_db() as session:
+        rows = DatasetBuilder(session).match_features(start, end)
+
+    if rows:
+        store.write(
+            [row['match_id'] for row in rows],
+            [row['date'] for row in rows],
+            np.array([[row[name] for name in store.feature_names] for row in rows], dtype=np.float32)
+        )
+    return month, len(rows)
+
+
+def backfill(
+    version: str,
+    start: str,
+    end: str,
+    workers: int = 4,
+    root_dir: Union[str, Path] = DEFAULT_STORE_DIR
+) -> int:
+    """
+    Materialize training features for every completed match, one month per task
+
+    Args:
+        version: Feature-set version to write
+        start, end: First and last kickoff month ('YYYY-MM', inclusive)
+        workers: Parallel worker processes
+        root_dir: Store root directory
+
+    Returns:
+        Number of rows written
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    FeatureStore(version, FEATURE_NAMES, root_dir=root_dir)
+
+    months = pd.period_range(start, end, freq='M').strftime('%Y-%m').tolist()
+    tasks = [(version, str(root_dir), month) for month in months]
+
+    print(f"🔄 Backfilling {len(months)} months into {version} with {workers} workers...")
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for month, n_rows in pool.map(_backfill_month, tasks):
+            total += n_rows
+            print(f"   {month}: {n_rows:,} matches")
+
+    print(f"✅ Backfilled {total:,} matches")
+    return total
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Offline feature store')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    backfill_parser = subparsers.add_parser('backfill', help='Materialize historical features')
+    backfill_parser.add_argument('--version', required=True)
+    backfill_parser.add_argument('--start', required=True, help='First month (YYYY-MM)')
+    backfill_parser.add_argument('--end', required=True, help='Last month (YYYY-MM)')
+    backfill_parser.add_argument('--workers', type=int, default=4)
+    backfill_parser.add_argument('--root-dir', default=str(DEFAULT_STORE_DIR))
+
+    list_parser = subparsers.add_parser('list', help='List stored versions')
+    list_parser.add_argument('--root-dir', default=str(DEFAULT_STORE_DIR))
+
+    args = parser.parse_args()
+
+    if args.command == 'backfill':
+        backfill(args.version, args.start, args.end, args.workers, args.root_dir)
+    else:
+        for name in FeatureStore.list_versions(args.root_dir):
+            store = FeatureStore(name, root_dir=args.root_dir)
+            print(f"{name}: {len(store.feature_names)} features, {len(store.partitions())} partitions")
@@ -0,0 +1,262 @@
+"""
+Head-to-Head History Index
+Chronological meeting arrays per team pair, attached to fixtures in bulk
+in the h2h_history format expected by HeadToHeadAnalyzer
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from features.epoch import EPOCH, to_epoch
+
+
+MEETING_DTYPE = np.dtype([
+    ('kickoff', 'i8'),          # epoch seconds
+    ('home_is_first', '?'),     # meeting's home team is the pair's first key
+    ('home_goals', 'i2'),
+    ('away_goals', 'i2'),
+    ('total_corners', 'i2'),
+    ('total_cards', 'i2'),
+])
+
+DEFAULT_HISTORY_DEPTH = 10
+
+
+class HeadToHeadIndex:
+    """
+    Index of past meetings keyed by unordered team pair
+
+    Each pair holds a compact structured array of meetings sorted by
+    kickoff, so the last ``history_depth`` meetings before any date are a
+    binary search and a slice away.
+    """
+
+    def __init__(self):
+        self._pairs: Dict[Tuple[Hashable, Hashable], np.ndarray] = {}
+        self._sizes: Dict[Tuple[Hashable, Hashable], int] = {}
+
+    def add_meeting(
+        self,
+        home_id: Hashable,
+        away_id: Hashable,
+        kickoff: datetime,
+        home_goals: int,
+        away_goals: int,
+        total_corners: int = 0,
+        total_cards: int = 0
+    ):
+        """
+        Record one meeting between two teams
+
+        Meetings may arrive in any order; late arrivals are inserted at
+        their chronological position.
+        """
+        key, home_is_first = _pair_key(home_id, away_id)
+        meetings = self._pairs.get(key)
+        size = self._sizes.get(key, 0)
+
+        if meetings is None:
+            meetings = np.zeros(4, dtype=MEETING_DTYPE)
+        elif size == len(meetings):
+            grown = np.zeros(len(meetings) * 2, dtype=MEETING_DTYPE)
+            grown[:size] = meetings
+            meetings = grown
+
+        ts = to_epoch(kickoff)
+        pos = int(np.searchsorted(meetings['kickoff'][:size], ts, side='right'))
+        meetings[pos + 1:size + 1] = meetings[pos:size]
+        meetings[pos] = (ts, home_is_first, home_goals, away_goals,
+                         total_corners or 0, total_cards or 0)
+
+        self._pairs[key] = meetings
+        self._sizes[key] = size + 1
+
+    def add_result(self, match, result):
+        """
+        Record a completed match (DataIngestionService result observer)
+
+        Args:
+            match: Match row (team IDs and kickoff)
+            result: MatchResult row or MatchResultSchema
+        """
+        self.add_meeting(
+            match.home_team_id, match.away_team_id, match.match_datetime,
+            result.home_goals, result.away_goals, *_totals(result)
+        )
+
+    def correct_result(self, match, result):
+        """
+        Replace a recorded meeting with a corrected result (result observer)
+
+        The meeting is matched on team pair, venue and kickoff; a meeting
+        that was never recorded is added.
+        """
+        key, home_is_first = _pair_key(match.home_team_id, match.away_team_id)
+        meetings = self._pairs.get(key)
+        if meetings is not None:
+            size = self._sizes[key]
+            ts = to_epoch(match.match_datetime)
+            lo = int(np.searchsorted(meetings['kickoff'][:size], ts, side='left'))
+            hi = int(np.searchsorted(meetings['kickoff'][:size], ts, side='right'))
+            for pos in range(lo, hi):
+                if meetings['home_is_first'][pos] == home_is_first:
+                    meetings[pos] = (ts, home_is_first, result.home_goals, result.away_goals,
+                                     *_totals(result))
+                    return
+        self.add_result(match, result)
+
+    def meetings(
+        self,
+        team_a: Hashable,
+        team_b: Hashable,
+        as_of: Optional[datetime] = None,
+        history_depth: int = DEFAULT_HISTORY_DEPTH
+    ) -> np.ndarray:
+        """
+        Most recent meetings between two teams, newest first
+
+        Args:
+            team_a, team_b: Team identifiers (order does not matter)
+            as_of: Only meetings strictly before this kickoff (optional)
+            history_depth: Maximum number of meetings returned
+
+        Returns:
+            Structured array with MEETING_DTYPE
+        """
+        key, _ = _pair_key(team_a, team_b)
+        meetings = self._pairs.get(key)
+        if meetings is None:
+            return np.zeros(0, dtype=MEETING_DTYPE)
+
+        end = self._sizes[key]
+        if as_of is not None:
+            end = int(np.searchsorted(meetings['kickoff'][:end], to_epoch(as_of), side='left'))
+        return meetings[max(end - history_depth, 0):end][::-1]
+
+    def attach_histories(
+        self,
+        fixtures: List[Dict[str, Any]],
+        history_depth: int = DEFAULT_HISTORY_DEPTH,
+        home_key: str = 'home_team_id',
+        away_key: str = 'away_team_id',
+        as_of_key: Optional[str] = 'match_datetime'
+    ) -> List[Dict[str, Any]]:
+        """
+        Attach bounded head-to-head histories to a batch of fixtures
+
+        Sets ``fixture['h2h_history']`` on every fixture to a newest-first
+        list of meeting dicts. Team labels in the history use the fixture's
+        own ``home_team``/``away_team`` values, so HeadToHeadAnalyzer's
+        winner and venue comparisons line up with the fixture.
+
+        Args:
+            fixtures: Fixture dicts (modified in place)
+            history_depth: Maximum meetings attached per fixture
+            home_key, away_key: Fixture keys holding the indexed team IDs
+            as_of_key: Fixture key with the kickoff used as cut-off
+                (None to use all recorded meetings)
+
+        Returns:
+            The same fixture list
+        """
+        for fixture in fixtures:
+            home_id = fixture[home_key]
+            away_id = fixture[away_key]
+            as_of = fixture.get(as_of_key) if as_of_key else None
+            if isinstance(as_of, str):
+                as_of = datetime.fromisoformat(as_of.replace('Z', '+00:00'))
+
+            meetings = self.meetings(home_id, away_id, as_of, history_depth)
+            if len(meetings) == 0:
+                fixture['h2h_history'] = []
+                continue
+
+            _, fixture_home_is_first = _pair_key(home_id, away_id)
+            home_label = fixture.get('home_team', home_id)
+            away_label = fixture.get('away_team', away_id)
+
+            same_venue = (meetings['home_is_first'] == fixture_home_is_first).tolist()
+            home_goals = meetings['home_goals'].tolist()
+            away_goals = meetings['away_goals'].tolist()
+            corners = meetings['total_corners'].tolist()
+            cards = meetings['total_cards'].tolist()
+            kickoffs = meetings['kickoff'].tolist()
+
+            history = []
+            for same, hg, ag, tc, tk, ts in zip(same_venue, home_goals, away_goals,
+                                                corners, cards, kickoffs):
+                meeting_home, meeting_away = (
+                    (home_label, away_label) if same else (away_label, home_label)
+                )
+                if hg > ag:
+                    result, winner = 'H', meeting_home
+                elif hg < ag:
+                    result, winner = 'A', meeting_away
+                else:
+                    result, winner = 'D', None
+
+                history.append({
+                    'date': EPOCH + timedelta(seconds=ts),
+                    'home_team': meeting_home,
+                    'away_team': meeting_away,
+                    'home_goals': hg,
+                    'away_goals': ag,
+                    'total_goals': hg + ag,
+                    'total_corners': tc,
+                    'total_cards': tk,
+                    'result': result,
+                    'winner': winner
+                })
+
+            fixture['h2h_history'] = history
+
+        return fixtures
+
+    @classmethod
+    def from_session(cls, session) -> 'HeadToHeadIndex':
+        """Build the index from all completed matches in the database"""
+        from data_ingestion.models import Match, MatchResult
+
+        index = cls()
+        rows = session.query(Match, MatchResult).join(
+            MatchResult, Match.match_id == MatchResult.match_id
+        ).filter(
+            Match.status == 'completed'
+        ).order_by(Match.match_datetime).yield_per(1000)
+
+        for match, result in rows:
+            index.add_result(match, result)
+
+        return index
+
+    @property
+    def n_pairs(self) -> int:
+        return len(self._pairs)
+
+    @property
+    def n_meetings(self) -> int:
+        return sum(self._sizes.values())
+
+    @property
+    def nbytes(self) -> int:
+        return sum(meetings.nbytes for meetings in self._pairs.values())
+
+
+def _pair_key(team_a: Hashable, team_b: Hashable) -> Tuple[Tuple[Hashable, Hashable], bool]:
+    """Unordered pair key plus whether team_a is the key's first element"""
+    if team_a <= team_b:
+        return (team_a, team_b), True
+    return (team_b, team_a), False
+
+
+def _totals(result) -> Tuple[int, int]:
+    """Total corners and cards of a result, summed from the sides if missing"""
+    total_corners = result.total_corners
+    if total_corners is None:
+        total_corners = (result.home_corners or 0) + (result.away_corners or 0)
+    total_cards = result.total_cards
+    if total_cards is None:
+        total_cards = (result.home_cards or 0) + (result.away_cards or 0)
+    return total_corners or 0, total_cards or 0
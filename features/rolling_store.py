@@ -0,0 +1,440 @@
+"""
+Rolling-Window State Store
+Per-team ring buffers answering "last N home/away results before date D"
+Shared by dataset building (training) and live feature lookup (serving)
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from features.epoch import to_epoch
+
+
+# Stored per result, in this order, for each team and venue side
+METRICS = ('goals', 'conceded', 'corners', 'cards', 'btts')
+
+HOME = 0
+AWAY = 1
+
+# Longest lookback window used by training (LOOKBACK_WINDOWS['long'])
+DEFAULT_CAPACITY = 20
+
+# Same threshold as training.config.MIN_MATCHES_FOR_STATS
+DEFAULT_MIN_MATCHES = 5
+
+# Rolling stats used as FeatureBuilder inputs, per window (see _get_match_features)
+_SHORT_STATS = ('goals_avg', 'goals_conceded_avg', 'corners_avg', 'cards_avg', 'btts_rate')
+_LONG_STATS = ('goals_avg', 'goals_conceded_avg')
+
+
+class RollingWindowStore:
+    """
+    Array-backed rolling-window store of recent results per team and venue
+
+    For every (team, side) the store keeps the kickoff times of the last
+    ``capacity`` results and a ring of cumulative sums for each metric.
+    The sum over the last ``n`` results before any date is then the
+    difference of two cumulative sums, so window averages of any size up
+    to ``capacity`` are answered in constant time.
+
+    Results must be pushed in kickoff order per team and side. Training
+    replays history in order and queries each fixture before pushing its
+    result; serving builds the store once and keeps it current from
+    result ingestion.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, initial_teams: int = 64):
+        """
+        Args:
+            capacity: Number of results retained per team and side
+            initial_teams: Preallocated team rows (grows by doubling)
+        """
+        self.capacity = capacity
+        self._team_index: Dict[int, int] = {}
+        self._team_ids: List[int] = []
+
+        self._counts = np.zeros((initial_teams, 2), dtype=np.int64)
+        self._kickoffs = np.zeros((initial_teams, 2, capacity), dtype=np.int64)
+        self._cumsums = np.zeros(
+            (initial_teams, 2, capacity + 1, len(METRICS)), dtype=np.int32
+        )
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def push(
+        self,
+        team_id: int,
+        is_home: bool,
+        kickoff: Union[datetime, int],
+        goals: int,
+        conceded: int,
+        corners: int = 0,
+        cards: int = 0,
+        btts: bool = False
+    ):
+        """
+        Append one result for a team on one venue side
+
+        Args:
+            team_id: Team ID
+            is_home: Whether the team played at home
+            kickoff: Match datetime (or epoch seconds)
+            goals, conceded, corners, cards, btts: Result values for the team
+
+        Raises:
+            ValueError: If the result is older than the last stored result
+        """
+        row = self._row_for(team_id, create=True)
+        side = HOME if is_home else AWAY
+        n = self._counts[row, side]
+        ts = to_epoch(kickoff)
+
+        if n > 0 and ts < self._kickoffs[row, side, (n - 1) % self.capacity]:
+            raise ValueError(
+                f"Out-of-order result for team {team_id}: results must be pushed "
+                f"in kickoff order (rebuild the store to insert history)"
+            )
+
+        ring = self.capacity + 1
+        self._kickoffs[row, side, n % self.capacity] = ts
+        self._cumsums[row, side, (n + 1) % ring] = self._cumsums[row, side, n % ring] + (
+            goals, conceded, corners or 0, cards or 0, 1 if btts else 0
+        )
+        self._counts[row, side] = n + 1
+
+    def add_result(self, match, result):
+        """
+        Push a match result for both teams
+
+        Accepts Match/MatchResult rows (or any objects with the same
+        attributes), so the store can be registered as a result observer on
+        DataIngestionService.
+        """
+        btts = result.btts
+        if btts is None:
+            btts = result.home_goals > 0 and result.away_goals > 0
+
+        self.push(
+            match.home_team_id, True, match.match_datetime,
+            result.home_goals, result.away_goals,
+            result.home_corners, result.home_cards, btts
+        )
+        self.push(
+            match.away_team_id, False, match.match_datetime,
+            result.away_goals, result.home_goals,
+            result.away_corners, result.away_cards, btts
+        )
+
+    def correct_result(self, match, result):
+        """
+        Replace the values of an already pushed result for both teams
+
+        Called by DataIngestionService when a stored result is corrected.
+        The cumulative sums from the result onwards are shifted by the
+        difference; results no longer retained are ignored.
+        """
+        btts = result.btts
+        if btts is None:
+            btts = result.home_goals > 0 and result.away_goals > 0
+
+        home = (result.home_goals, result.away_goals,
+                result.home_corners or 0, result.home_cards or 0, 1 if btts else 0)
+        away = (result.away_goals, result.home_goals,
+                result.away_corners or 0, result.away_cards or 0, 1 if btts else 0)
+        self._replace(match.home_team_id, HOME, match.match_datetime, home)
+        self._replace(match.away_team_id, AWAY, match.match_datetime, away)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def rolling_stats(
+        self,
+        team_id: int,
+        as_of: Union[datetime, int],
+        is_home: bool,
+        window: int = 5,
+        min_matches: int = DEFAULT_MIN_MATCHES
+    ) -> Dict:
+        """
+        Rolling statistics for a team's last ``window`` results before a date
+
+        Mirrors DatasetBuilder._calculate_rolling_stats: returns an empty
+        dict when fewer than ``min_matches`` results are available. Also
+        returns an empty dict when the window reaches back past the
+        retained results (``as_of`` older than the last ``capacity``
+        results allow), rather than averaging a shorter window.
+
+        Args:
+            team_id: Team ID
+            as_of: Only results strictly before this kickoff are used
+            is_home: Home or away results
+            window: Number of recent results (at most ``capacity``)
+            min_matches: Minimum results required
+
+        Returns:
+            Dictionary with rolling statistics
+        """
+        self._check_window(window)
+        row = self._team_index.get(team_id)
+        if row is None:
+            return {}
+
+        side = HOME if is_home else AWAY
+        n = int(self._counts[row, side])
+        valid = min(n, self.capacity)
+        after = int(np.count_nonzero(self._kickoffs[row, side, :valid] >= to_epoch(as_of)))
+
+        end = n - after
+        retained = end - (n - valid)
+        if retained < window and n > valid:
+            return {}
+        k = min(window, retained)
+        if k < max(min_matches, 1):
+            return {}
+
+        ring = self.capacity + 1
+        sums = self._cumsums[row, side, end % ring] - self._cumsums[row, side, (end - k) % ring]
+        return _stats_dict(sums.astype(np.float64) / k, k)
+
+    def rolling_stats_batch(
+        self,
+        team_ids: Sequence[int],
+        as_of: Union[datetime, int, Sequence],
+        is_home: bool,
+        window: int = 5,
+        min_matches: int = DEFAULT_MIN_MATCHES
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized rolling statistics for many teams at once
+
+        Args:
+            team_ids: Team IDs
+            as_of: One kickoff for all teams, or one per team
+            is_home: Home or away results
+            window: Number of recent results (at most ``capacity``)
+            min_matches: Minimum results required
+
+        Returns:
+            Dictionary of arrays keyed like ``rolling_stats``; rows with
+            insufficient or evicted history are NaN with matches_count 0
+        """
+        self._check_window(window)
+        m = len(team_ids)
+        rows = np.array([self._team_index.get(t, -1) for t in team_ids], dtype=np.int64)
+        if isinstance(as_of, (datetime, int, np.integer)):
+            ts = np.full(m, to_epoch(as_of), dtype=np.int64)
+        else:
+            ts = np.array([to_epoch(a) for a in as_of], dtype=np.int64)
+
+        known = rows >= 0
+        safe_rows = np.where(known, rows, 0)
+        side = HOME if is_home else AWAY
+
+        n = np.where(known, self._counts[safe_rows, side], 0)
+        valid = np.minimum(n, self.capacity)
+        slot_valid = np.arange(self.capacity)[None, :] < valid[:, None]
+        after = np.count_nonzero(
+            (self._kickoffs[safe_rows, side] >= ts[:, None]) & slot_valid, axis=1
+        )
+
+        end = n - after
+        retained = end - (n - valid)
+        k = np.minimum(window, retained)
+        ok = known & (k >= max(min_matches, 1)) & ~((retained < window) & (n > valid))
+
+        ring = self.capacity + 1
+        hi = self._cumsums[safe_rows, side, end % ring]
+        lo = self._cumsums[safe_rows, side, (end - k) % ring]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = (hi - lo).astype(np.float64) / k[:, None]
+        means[~ok] = np.nan
+
+        stats = _stats_dict(means.T, np.where(ok, k, 0))
+        return stats
+
+    def attach_stats(
+        self,
+        fixtures: List[Dict],
+        home_key: str = 'home_team_id',
+        away_key: str = 'away_team_id',
+        as_of_key: str = 'match_datetime',
+        min_matches: int = DEFAULT_MIN_MATCHES
+    ) -> List[Dict]:
+        """
+        Fill the FeatureBuilder team stats of a batch of fixtures
+
+        Sets the ``{home,away}_*_5`` and ``*_10`` keys training derives
+        from rolling windows, for fixtures that carry team IDs and a
+        kickoff. Stats already present on a fixture are kept, as are
+        fixtures without enough stored history.
+
+        Args:
+            fixtures: Fixture dicts (modified in place)
+            home_key, away_key: Fixture keys holding the team IDs
+            as_of_key: Fixture key with the kickoff used as cut-off
+            min_matches: Minimum results required
+
+        Returns:
+            The same fixture list
+        """
+        todo = [
+            f for f in fixtures
+            if f.get(home_key) is not None and f.get(away_key) is not None and f.get(as_of_key) is not None
+        ]
+        if not todo:
+            return fixtures
+
+        kickoffs = [
+            datetime.fromisoformat(f[as_of_key].replace('Z', '+00:00'))
+            if isinstance(f[as_of_key], str) else f[as_of_key]
+            for f in todo
+        ]
+        for prefix, key, is_home in (('home', home_key, True), ('away', away_key, False)):
+            team_ids = [f[key] for f in todo]
+            for window, names in ((5, _SHORT_STATS), (10, _LONG_STATS)):
+                stats = self.rolling_stats_batch(team_ids, kickoffs, is_home, window, min_matches)
+                counts = stats['matches_count']
+                for name in names:
+                    values = stats[name].tolist()
+                    feature = f"{prefix}_{name}_{window}"
+                    for fixture, value, count in zip(todo, values, counts):
+                        if count and feature not in fixture:
+                            fixture[feature] = value
+
+        return fixtures
+
+    # ------------------------------------------------------------------
+    # Construction and persistence
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_session(cls, session, capacity: int = DEFAULT_CAPACITY) -> 'RollingWindowStore':
+        """
+        Build a store from all completed matches in the database
+
+        Args:
+            session: SQLAlchemy session
+            capacity: Number of results retained per team and side
+
+        Returns:
+            Populated store
+        """
+        from data_ingestion.models import Match, MatchResult
+
+        store = cls(capacity=capacity)
+        rows = session.query(Match, MatchResult).join(
+            MatchResult, Match.match_id == MatchResult.match_id
+        ).filter(
+            Match.status == 'completed'
+        ).order_by(Match.match_datetime).yield_per(1000)
+
+        for match, result in rows:
+            store.add_result(match, result)
+
+        return store
+
+    def save(self, path: Union[str, Path]):
+        """Persist the store to a .npz file"""
+        t = len(self._team_ids)
+        np.savez(
+            path,
+            capacity=np.int64(self.capacity),
+            team_ids=np.array(self._team_ids, dtype=np.int64),
+            counts=self._counts[:t],
+            kickoffs=self._kickoffs[:t],
+            cumsums=self._cumsums[:t]
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'RollingWindowStore':
+        """Load a store saved with ``save``"""
+        with np.load(path) as data:
+            team_ids = data['team_ids'].tolist()
+            store = cls(capacity=int(data['capacity']), initial_teams=max(len(team_ids), 1))
+            t = len(team_ids)
+            store._counts[:t] = data['counts']
+            store._kickoffs[:t] = data['kickoffs']
+            store._cumsums[:t] = data['cumsums']
+
+        store._team_ids = team_ids
+        store._team_index = {team_id: i for i, team_id in enumerate(team_ids)}
+        return store
+
+    @property
+    def n_teams(self) -> int:
+        return len(self._team_ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the state arrays for the teams currently stored"""
+        t = len(self._team_ids)
+        return (
+            self._counts[:t].nbytes
+            + self._kickoffs[:t].nbytes
+            + self._cumsums[:t].nbytes
+        )
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _row_for(self, team_id: int, create: bool = False) -> Optional[int]:
+        row = self._team_index.get(team_id)
+        if row is None and create:
+            row = len(self._team_ids)
+            if row == self._counts.shape[0]:
+                self._grow()
+            self._team_index[team_id] = row
+            self._team_ids.append(team_id)
+        return row
+
+    def _replace(self, team_id: int, side: int, kickoff, values) -> bool:
+        """Overwrite a retained result's values; False if it is not retained"""
+        row = self._team_index.get(team_id)
+        if row is None:
+            return False
+
+        n = int(self._counts[row, side])
+        ts = to_epoch(kickoff)
+        ring = self.capacity + 1
+        for i in range(n - 1, n - min(n, self.capacity) - 1, -1):
+            if self._kickoffs[row, side, i % self.capacity] == ts:
+                cumsums = self._cumsums[row, side]
+                delta = np.asarray(values, dtype=cumsums.dtype) - (cumsums[(i + 1) % ring] - cumsums[i % ring])
+                for j in range(i + 1, n + 1):
+                    cumsums[j % ring] += delta
+                return True
+        return False
+
+    def _grow(self):
+        """Double the number of team rows"""
+        def grow(arr):
+            out = np.zeros((arr.shape[0] * 2,) + arr.shape[1:], dtype=arr.dtype)
+            out[:arr.shape[0]] = arr
+            return out
+
+        self._counts = grow(self._counts)
+        self._kickoffs = grow(self._kickoffs)
+        self._cumsums = grow(self._cumsums)
+
+    def _check_window(self, window: int):
+        if window > self.capacity:
+            raise ValueError(f"Window {window} exceeds store capacity {self.capacity}")
+
+
+def _stats_dict(means, count) -> Dict:
+    """Map per-metric means onto the rolling stats keys used by training"""
+    return {
+        'goals_avg': means[0],
+        'goals_conceded_avg': means[1],
+        'corners_avg': means[2],
+        'cards_avg': means[3],
+        'btts_rate': means[4],
+        'matches_count': count
+    }
@@ -0,0 +1,60 @@
+"""
+Feature Builder Test Script
+Checks that the row-by-row and columnar build paths give the same matrix
+and treat null stats the same way
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from features.feature_builder import BASE_INPUTS, COLUMNAR_MIN_ROWS, FEATURE_NAMES, FeatureBuilder
+from features.feature_schema import FeatureSchema
+
+
+def _matches(n: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    matches = [{key: round(float(rng.gamma(3.0, 0.5)), 2) for key, _ in BASE_INPUTS} for _ in range(n)]
+    for match in matches[::3]:
+        match['home_goals_avg_10'] = round(float(rng.gamma(3.0, 0.5)), 2)
+    for match in matches[1::4]:
+        match['away_cards_avg_5'] = float('nan')
+    return matches
+
+
+def test_paths_agree():
+    """A batch built column-wise matches the same matches built one by one"""
+    builder = FeatureBuilder()
+    schema = FeatureSchema(list(FEATURE_NAMES))
+    matches = _matches(COLUMNAR_MIN_ROWS + 8)
+
+    batch = builder.build_matrix(matches, schema)
+    rows = np.vstack([builder.build_matrix([match], schema) for match in matches])
+    assert np.allclose(batch, rows, rtol=0, atol=1e-12)
+    assert not np.isnan(batch).any()
+    print("✅ Columnar and row-by-row builds agree")
+
+
+def test_null_stat_rejected_at_any_size():
+    """A None stat raises TypeError for 1 match and for a columnar batch of 40"""
+    builder = FeatureBuilder()
+    schema = FeatureSchema(list(FEATURE_NAMES))
+
+    for key in ('home_goals_avg_5', 'away_goals_avg_10'):
+        for n in (1, 40):
+            matches = _matches(n)
+            matches[-1][key] = None
+            try:
+                builder.build_matrix(matches, schema)
+            except TypeError as e:
+                assert key in str(e)
+            else:
+                raise AssertionError(f"{n} matches with a null {key} were built")
+    print("✅ Null stats rejected for 1 and 40 matches")
+
+
+if __name__ == "__main__":
+    test_paths_agree()
+    test_null_stat_rejected_at_any_size()
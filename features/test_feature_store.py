@@ -0,0 +1,60 @@
+"""
+Feature Store Test Script
+Checks serving reads of fixtures without a snapshot and writes made by
+another store instance
+"""
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from features.feature_store import FeatureStore
+
+
+NAMES = ['home_goals_avg_5', 'away_goals_avg_5']
+
+
+def _write(store: FeatureStore, first: int, n: int):
+    kickoffs = [datetime(2024, 1, 1) + timedelta(days=3 * i) for i in range(first, first + n)]
+    values = np.arange(first * 2, (first + n) * 2, dtype=np.float32).reshape(n, 2)
+    store.write([f'M{i}' for i in range(first, first + n)], kickoffs, values)
+
+
+def test_miss_does_not_rescan():
+    """Unknown match IDs leave unchanged partitions unread"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = FeatureStore('v1', NAMES, root_dir=tmp)
+        _write(store, 0, 60)
+        assert len(store.get_latest(['M1', 'M59'])) == 2
+
+        with mock.patch('features.feature_store.np.load', wraps=np.load) as load:
+            assert store.get_latest(['upcoming']).empty
+            latest = store.get_latest(['M5', 'upcoming'])
+        assert list(latest.index) == ['M5']
+        assert load.call_count == 4  # M5's partition arrays; no index rebuild
+    print("✅ Misses do not rebuild the match index")
+
+
+def test_sees_other_writers():
+    """Rows written by another instance are found after a miss"""
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = FeatureStore('v1', NAMES, root_dir=tmp)
+        writer = FeatureStore('v1', root_dir=tmp)
+        _write(writer, 0, 20)
+        assert len(reader.get_latest(['M0'])) == 1
+
+        _write(writer, 20, 20)
+        latest = reader.get_latest(['M0', 'M30', 'M39'])
+        assert list(latest.index) == ['M0', 'M30', 'M39']
+        assert latest.loc['M30', 'home_goals_avg_5'] == 60.0
+    print("✅ Partitions written elsewhere are picked up")
+
+
+if __name__ == "__main__":
+    test_miss_does_not_rescan()
+    test_sees_other_writers()
@@ -10,7 +10,7 @@ from typing import List, Dict, Optional
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from predictor.integrated_predictor import IntegratedPredictor
+from predictor.integrated_predictor import IntegratedPredictor, MARKETS
 
 
 class GoldenBetsSelector:
@@ -49,16 +49,19 @@ class GoldenBetsSelector:
         """
         golden_bets = []
         
-        for pred in predictions:
-            match_data = pred.get('match_data', {})
+        # Score every market for the whole slate, building features once per match
+        matches = [pred.get('match_data', {}) for pred in predictions]
+        market_probs = self.predictor.predict_batch(matches, MARKETS, default=0.5)
+        
+        for i, pred in enumerate(predictions):
+            match_data = matches[i]
             league = pred.get('league', '')
             
-            # Get predictions for all markets
-            market_probs = self.predictor.predict_all_markets(match_data)
-            
             # Find best market
-            best_market = max(market_probs.items(), key=lambda x: x[1])
-            market_name, probability = best_market
+            market_name, probability = max(
+                ((market, float(probs[i])) for market, probs in market_probs.items()),
+                key=lambda x: x[1]
+            )
             
             # Check if meets Golden Bet criteria
             if probability >= self.min_prob:
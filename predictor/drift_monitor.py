@@ -0,0 +1,184 @@
+"""
+Feature Drift Monitor
+Fixed-bin streaming histograms of served features, compared with the
+training-time reference profiles stored by save_model_with_metadata
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+
+# PSI above which a feature is reported as moderately / significantly drifted
+PSI_THRESHOLDS = (0.1, 0.25)
+
+# Floor for bin shares in the PSI log ratio (empty bins)
+_MIN_SHARE = 1e-4
+
+
+class DriftMonitor:
+    """
+    Constant-memory drift monitor for model input columns
+
+    Every feature keeps a histogram over the bins of its reference profile
+    (training quantiles). Served rows are copied into a small buffer and
+    binned a buffer at a time, so a request only pays for one row copy;
+    memory is the buffer plus one count per feature bin, however much
+    traffic is seen.
+    """
+
+    def __init__(
+        self,
+        references: Dict[str, Dict],
+        feature_names: Sequence[str],
+        buffer_rows: int = 1024,
+        dtype=np.float64
+    ):
+        """
+        Args:
+            references: Feature name -> {'edges', 'proportions'} reference bins
+            feature_names: Columns of the matrices passed to ``observe``
+            buffer_rows: Rows buffered before they are binned
+            dtype: Dtype of the observed matrices
+        """
+        self.feature_names = list(feature_names)
+        self.monitored = [name for name in self.feature_names if name in references]
+        k = len(self.feature_names)
+        n_bins = max((len(references[name]['proportions']) for name in self.monitored), default=1)
+
+        # Cut points padded with +inf to a common bin count; unmonitored
+        # columns fall into bin 0 and are left out of the report. Cut points
+        # are rounded to the observed dtype, so a float32 value equal to a
+        # (float64) training quantile still falls in the bin above it
+        self.edges = np.full((k, n_bins - 1), np.inf, dtype=dtype)
+        self.reference = np.zeros((k, n_bins))
+        for j, name in enumerate(self.feature_names):
+            if name in references:
+                edges = references[name]['edges']
+                self.edges[j, :len(edges)] = edges
+                self.reference[j, :len(edges) + 1] = references[name]['proportions']
+
+        self.n_bins = n_bins
+        self.counts = np.zeros((k, n_bins), dtype=np.int64)
+        self.n_observed = 0
+        self._offsets = np.arange(k) * n_bins
+        self._buffer = np.empty((buffer_rows, k), dtype=dtype)
+        self._pending = 0
+
+    @classmethod
+    def from_profiles(
+        cls,
+        profiles: Sequence[Dict],
+        feature_names: Sequence[str],
+        buffer_rows: int = 1024,
+        dtype=np.float64
+    ) -> Optional['DriftMonitor']:
+        """
+        Build a monitor from reference profiles (model metadata ``feature_reference``)
+
+        Args:
+            profiles: Reference profiles; the first profile of a feature wins
+            feature_names: Columns of the matrices passed to ``observe``
+            buffer_rows: Rows buffered before they are binned
+            dtype: Dtype of the observed matrices
+
+        Returns:
+            DriftMonitor, or None when no profile covers a feature
+        """
+        references = {}
+        for profile in profiles:
+            for name, bins in profile.get('features', {}).items():
+                references.setdefault(name, bins)
+        if not references:
+            return None
+        return cls(references, feature_names, buffer_rows, dtype)
+
+    def observe(self, X: np.ndarray):
+        """
+        Record served feature rows
+
+        Args:
+            X: (n_rows, n_features) matrix in ``feature_names`` order
+        """
+        n = len(X)
+        if self._pending + n > len(self._buffer):
+            self.flush()
+            if n > len(self._buffer):
+                self._bin(X)
+                return
+        self._buffer[self._pending:self._pending + n] = X
+        self._pending += n
+
+    def flush(self):
+        """Bin the buffered rows"""
+        if self._pending:
+            self._bin(self._buffer[:self._pending])
+            self._pending = 0
+
+    def _bin(self, X: np.ndarray):
+        """Add rows to the histograms (a value equal to a cut point goes up)"""
+        bins = (X[:, :, None] >= self.edges).sum(axis=2) + self._offsets
+        self.counts += np.bincount(bins.ravel(), minlength=self.counts.size).reshape(self.counts.shape)
+        self.n_observed += len(X)
+
+    def scores(self) -> Dict[str, Dict[str, float]]:
+        """
+        PSI and binned KS distance of live traffic per monitored feature
+
+        Returns:
+            Feature name -> {'psi', 'ks', 'status'}
+        """
+        self.flush()
+        if self.n_observed == 0:
+            return {}
+
+        live = self.counts / self.n_observed
+        expected = np.maximum(self.reference, _MIN_SHARE)
+        actual = np.maximum(live, _MIN_SHARE)
+        psi = ((actual - expected) * np.log(actual / expected)).sum(axis=1)
+        ks = np.abs(np.cumsum(live, axis=1) - np.cumsum(self.reference, axis=1)).max(axis=1)
+
+        index = {name: j for j, name in enumerate(self.feature_names)}
+        return {
+            name: {
+                'psi': float(psi[index[name]]),
+                'ks': float(ks[index[name]]),
+                'status': _status(psi[index[name]])
+            }
+            for name in self.monitored
+        }
+
+    def report(self, top: Optional[int] = None) -> Dict:
+        """
+        Drift summary, features ordered by PSI
+
+        Args:
+            top: Only include the ``top`` most drifted features
+
+        Returns:
+            Dictionary with observed row count, drifted feature names and
+            per-feature scores
+        """
+        scores = self.scores()
+        ranked = sorted(scores.items(), key=lambda item: item[1]['psi'], reverse=True)
+        return {
+            'n_observed': self.n_observed,
+            'n_features': len(self.monitored),
+            'drifted': [name for name, score in ranked if score['status'] == 'drift'],
+            'features': dict(ranked[:top] if top else ranked)
+        }
+
+    def reset(self):
+        """Start a new observation window"""
+        self._pending = 0
+        self.counts[:] = 0
+        self.n_observed = 0
+
+
+def _status(psi: float) -> str:
+    """Stability label for a PSI value"""
+    if psi >= PSI_THRESHOLDS[1]:
+        return 'drift'
+    if psi >= PSI_THRESHOLDS[0]:
+        return 'moderate'
+    return 'stable'
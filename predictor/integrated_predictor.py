@@ -5,7 +5,6 @@ Loads trained ensemble models with calibration for all markets
 
 import sys
 from pathlib import Path
-import pickle
 import json
 import pandas as pd
 import numpy as np
@@ -15,25 +14,42 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from features.feature_builder import FeatureBuilder
+from features.feature_schema import FeatureSchema
+from predictor.drift_monitor import DriftMonitor
+from predictor.model_io import has_model, load_model, load_calibration
+from predictor.simulation import MatchSimulator
 from training.config import MODELS_DIR, ENSEMBLE_WEIGHTS
+from training.count_models import CountDistributionModel
+from training.distill import teacher_fingerprint
 from training.utils import ensemble_predictions, apply_calibration
 
 
+MARKETS = ['goals', 'btts', 'cards', 'corners']
+
 class IntegratedPredictor:
     """
     Integrated predictor using trained ensemble models with calibration
     Replaces placeholder logic with real ML predictions
     """
     
-    def __init__(self, models_dir: str = None):
+    def __init__(self, models_dir: str = None, feature_store=None, dtype=np.float32, rolling_store=None):
         """
         Initialize predictor with trained models
         
         Args:
             models_dir: Path to models directory (optional)
+            feature_store: FeatureStore whose latest snapshots are used for
+                matches it holds, instead of rebuilding features (optional)
+            dtype: Dtype of feature matrices and probabilities; float32
+                end to end unless float64 is requested
+            rolling_store: RollingWindowStore filling the team stats of
+                matches that carry only team IDs and kickoff (optional)
         """
         self.models_dir = Path(models_dir) if models_dir else MODELS_DIR
+        self.dtype = np.dtype(dtype)
         self.feature_builder = FeatureBuilder()
+        self.feature_store = feature_store
+        self.rolling_store = rolling_store
         
         # Storage for loaded models
         self.models = {
@@ -44,20 +60,47 @@ class IntegratedPredictor:
         }
         self.calibration_models = {}
         self.metadata = {}
+        self.students = {}
+        self.student_metadata: Dict[str, Dict] = {}
+        self.schemas: Dict[str, FeatureSchema] = {}
+        self.feature_schema: Optional[FeatureSchema] = None
+        self.market_columns: Dict[str, np.ndarray] = {}
+        self.feature_references: Dict[str, Dict] = {}
+        self.drift_monitor: Optional[DriftMonitor] = None
+        self.count_model: Optional[CountDistributionModel] = None
         
         # Load all models
         self._load_all_models()
     
     def _load_all_models(self):
         """Load all trained models and calibration"""
-        markets = ['goals', 'btts', 'cards', 'corners']
-        
-        for market in markets:
+        for market in MARKETS:
             try:
                 self._load_market_models(market)
                 print(f"✅ Loaded {market} models")
             except Exception as e:
                 print(f"⚠️  Warning: Could not load {market} models: {e}")
+        
+        # Count distribution model pricing every line in the odds table
+        count_dir = self.models_dir / 'counts'
+        if (count_dir / 'count_model.json').exists():
+            self.count_model = CountDistributionModel.load(count_dir)
+            self.schemas['counts'] = FeatureSchema(self.count_model.feature_columns, dtype=self.dtype)
+            print("✅ Loaded count distribution model")
+        
+        # Shared feature layout: built once per match, gathered per market
+        self.feature_schema = FeatureSchema.union(list(self.schemas.values()), dtype=self.dtype)
+        self.market_columns = {
+            market: self.feature_schema.columns_of(schema)
+            for market, schema in self.schemas.items()
+        }
+        
+        # Served features are compared with the training distributions
+        self.drift_monitor = DriftMonitor.from_profiles(
+            list(self.feature_references.values()),
+            self.feature_schema.feature_names,
+            dtype=self.dtype
+        )
     
     def _load_market_models(self, market: str):
         """Load models for a specific market"""
@@ -76,44 +119,184 @@ class IntegratedPredictor:
         base_models = self.metadata.get(market, {}).get('base_models', ['xgboost', 'lightgbm', 'logistic'])
         
         for model_type in base_models:
-            model_path = market_dir / f"{model_type}_model.pkl"
-            if model_path.exists():
-                with open(model_path, 'rb') as f:
-                    self.models[market][model_type] = pickle.load(f)
-        
-        # Load calibration model
-        calib_path = market_dir / 'ensemble_calibration.pkl'
-        if calib_path.exists():
-            with open(calib_path, 'rb') as f:
-                self.calibration_models[market] = pickle.load(f)
+            # Memory-mapped native artifacts; tree models score small
+            # batches with flat node arrays (legacy pickles still load)
+            if has_model(market_dir, model_type):
+                self.models[market][model_type] = load_model(market_dir, model_type)
+            
+            # Training feature distributions recorded with the base model
+            meta_path = market_dir / f"{model_type}_metadata.json"
+            if market not in self.feature_references and meta_path.exists():
+                with open(meta_path, 'r') as f:
+                    reference = json.load(f).get('feature_reference')
+                if reference:
+                    self.feature_references[market] = reference
+        
+        # Load calibration lookup table (legacy pickles are converted)
+        calibration_method = self.metadata.get(market, {}).get('calibration_method', 'isotonic')
+        calibrator = load_calibration(market_dir, 'ensemble', calibration_method)
+        if calibrator is not None:
+            self.calibration_models[market] = calibrator
+        
+        # Distilled student, only if it was fitted to this ensemble
+        student_meta_path = market_dir / 'student_metadata.json'
+        if has_model(market_dir, 'student') and student_meta_path.exists():
+            with open(student_meta_path, 'r') as f:
+                student_metadata = json.load(f)
+            if student_metadata.get('teacher_fingerprint') == teacher_fingerprint(self.metadata.get(market, {})):
+                self.students[market] = load_model(market_dir, 'student')
+                self.student_metadata[market] = student_metadata
+            else:
+                print(f"⚠️  Warning: {market} student is stale (distilled from another ensemble), not served")
+        
+        # Compile the feature layout once per loaded model version
+        self.schemas[market] = FeatureSchema.from_metadata(
+            self.metadata.get(market, {}),
+            self.feature_builder.get_feature_names(),
+            dtype=self.dtype
+        )
     
-    def predict_for_match(self, market: str, match_data: Dict) -> float:
+    def predict_batch(
+        self,
+        matches: List[Dict],
+        markets: Optional[List[str]] = None,
+        default: Optional[float] = None,
+        use_student: bool = False
+    ) -> Dict[str, np.ndarray]:
         """
-        Predict probability for a specific market and match
+        Predict probabilities for several markets over a batch of matches
+        
+        Features are built once per match into a matrix shared by every
+        market; each market's ensemble and calibrator read their columns
+        from it. With ``use_student``, markets with a distilled student
+        are scored by it, and only Golden Bet candidates near the
+        threshold by the ensemble.
         
         Args:
-            market: Market name ('goals', 'btts', 'cards', 'corners')
-            match_data: Dictionary with match information and team stats
+            matches: List of match dictionaries with team stats
+            markets: Markets to score (default: all loaded markets)
+            default: Probability for markets, or matches whose features
+                cannot be built, that cannot be scored (None raises instead)
+            use_student: Serve distilled students where available (for
+                callers that only report probabilities; edges and bet
+                selection use the ensemble)
             
         Returns:
-            Calibrated probability
+            Dictionary mapping market names to arrays of calibrated
+            probabilities, one per match
+        """
+        if markets is None:
+            markets = [market for market in MARKETS if self.models.get(market)]
+        if not matches:
+            return {market: np.empty(0, dtype=self.dtype) for market in markets}
+        
+        built = None
+        try:
+            X = self._feature_matrix(matches)
+        except Exception:
+            if default is None:
+                raise
+            # Find the matches that fail; only they get the default
+            X, built = self._feature_matrix_per_match(matches)
+        if self.drift_monitor is not None:
+            self.drift_monitor.observe(X)
+        
+        results = {}
+        for market in markets:
+            try:
+                if len(X) == 0:
+                    raise ValueError("no match features could be built")
+                if use_student and market in self.students:
+                    proba = self._score_student(market, X)
+                else:
+                    proba = self._score_market(market, X)
+            except Exception as e:
+                if default is None:
+                    raise
+                print(f"⚠️  Warning: Could not predict {market}: {e}")
+                proba = np.full(len(X), default, dtype=self.dtype)
+            if built is not None:
+                results[market] = np.full(len(matches), default, dtype=self.dtype)
+                results[market][built] = proba
+            else:
+                results[market] = proba
+        
+        return results
+    
+    def _feature_matrix_per_match(self, matches: List[Dict]) -> tuple:
+        """
+        Feature rows of the matches whose features can be built
+
+        Returns:
+            Tuple of (feature matrix of the built matches, boolean mask of
+            those matches)
+        """
+        rows, built = [], np.zeros(len(matches), dtype=bool)
+        for i, match in enumerate(matches):
+            try:
+                rows.append(self._feature_matrix([match]))
+            except Exception as e:
+                print(f"⚠️  Warning: Could not build features for match {match.get('match_id', i)}: {e}")
+            else:
+                built[i] = True
+        if not rows:
+            return self.feature_schema.allocate(0), built
+        return np.vstack(rows), built
+    
+    def _feature_matrix(self, matches: List[Dict]) -> np.ndarray:
+        """
+        Shared feature matrix for a batch of matches
+        
+        Matches with a snapshot in the feature store are read from it; the
+        rest are built from their match data, with team stats they lack
+        taken from the rolling-window store.
+        """
+        if self.feature_store is None:
+            return self.feature_builder.build_matrix(self._with_team_stats(matches), self.feature_schema)
+        
+        ids = [str(match.get('match_id')) for match in matches]
+        X, found = self.feature_store.latest_matrix(ids, self.feature_schema)
+        missing = np.flatnonzero(~found)
+        if len(missing):
+            X[missing] = self.feature_builder.build_matrix(
+                self._with_team_stats([matches[i] for i in missing]), self.feature_schema
+            )
+        return X
+    
+    def _with_team_stats(self, matches: List[Dict]) -> List[Dict]:
+        """Copies of the matches with rolling-window stats filled in"""
+        if self.rolling_store is None:
+            return matches
+        return self.rolling_store.attach_stats([dict(match) for match in matches])
+    
+    def _score_market(self, market: str, X: np.ndarray) -> np.ndarray:
+        """
+        Ensemble and calibrate one market over a shared feature matrix
+        
+        Args:
+            market: Market name
+            X: Feature matrix in ``self.feature_schema`` column order
+            
+        Returns:
+            Calibrated probabilities
         """
         if market not in self.models or not self.models[market]:
             raise ValueError(f"No models loaded for market: {market}")
         
-        # Build features
-        features = self.feature_builder.build_features(match_data)
-        feature_names = self.feature_builder.get_feature_names()
-        
-        # Create DataFrame with correct feature order
-        X = pd.DataFrame([features])[feature_names].fillna(0)
+        X_market = X[:, self.market_columns[market]]
+        X_named = None
         
         # Get predictions from all base models
         predictions = {}
         for model_type, model in self.models[market].items():
             try:
-                proba = model.predict_proba(X)[0, 1]
-                predictions[model_type] = proba
+                if hasattr(model, 'feature_names_in_'):
+                    # Pickled estimator fitted on a DataFrame: one named frame for all of them
+                    if X_named is None:
+                        X_named = self._named_frame(market, X_market)
+                    predictions[model_type] = model.predict_proba(X_named)[:, 1]
+                else:
+                    predictions[model_type] = model.predict_proba(X_market)[:, 1]
             except Exception as e:
                 print(f"⚠️  Warning: Error predicting with {model_type}: {e}")
                 continue
@@ -123,22 +306,127 @@ class IntegratedPredictor:
         
         # Ensemble predictions
         weights = self.metadata.get(market, {}).get('weights', ENSEMBLE_WEIGHTS)
-        ensemble_proba = ensemble_predictions(
-            {k: np.array([v]) for k, v in predictions.items()},
-            weights
-        )[0]
+        ensemble_proba = ensemble_predictions(predictions, weights)
         
         # Apply calibration if available
         if market in self.calibration_models:
             calibration_method = self.metadata.get(market, {}).get('calibration_method', 'isotonic')
-            calibrated_proba = apply_calibration(
+            ensemble_proba = apply_calibration(
                 self.calibration_models[market],
-                np.array([ensemble_proba]),
+                ensemble_proba,
                 calibration_method
-            )[0]
-            return float(calibrated_proba)
+            )
         
-        return float(ensemble_proba)
+        return np.asarray(ensemble_proba, dtype=self.dtype)
+    
+    def _score_student(self, market: str, X: np.ndarray) -> np.ndarray:
+        """
+        Score one market with its distilled student
+        
+        Matches where max(p, 1 - p) comes within the student's fallback
+        margin of the Golden Bets threshold are re-scored by the ensemble,
+        so Golden Bet selection never relies on the student.
+        
+        Args:
+            market: Market name
+            X: Feature matrix in ``self.feature_schema`` column order
+            
+        Returns:
+            Probabilities
+        """
+        metadata = self.student_metadata[market]
+        student = self.students[market]
+        X_market = X[:, self.market_columns[market]]
+        if hasattr(student, 'feature_names_in_'):
+            X_market = self._named_frame(market, X_market)
+        proba = np.ascontiguousarray(student.predict_proba(X_market)[:, 1], dtype=self.dtype)
+        
+        near_golden = np.maximum(proba, 1 - proba) >= metadata['golden_threshold'] - metadata['fallback_margin']
+        if near_golden.any():
+            proba[near_golden] = self._score_market(market, X[near_golden])
+        return proba
+    
+    def _named_frame(self, market: str, X_market: np.ndarray) -> pd.DataFrame:
+        """
+        Market columns as a DataFrame, for pickled sklearn / LightGBM
+        estimators that were fitted on DataFrames and check feature names
+        (the model_io wrappers take the bare matrix)
+        """
+        return pd.DataFrame(X_market, columns=list(self.schemas[market].feature_names), copy=False)
+    
+    def predict_lines(self, matches: List[Dict]) -> Dict[str, np.ndarray]:
+        """
+        Probabilities for every over/under line, BTTS, 1X2 and double
+        chance from the count distribution model
+        
+        Args:
+            matches: List of match dictionaries with team stats
+            
+        Returns:
+            Dictionary mapping market keys (MatchOdds column names without
+            ``_odds``, e.g. 'over_3_5', 'corners_under_8_5') to arrays of
+            probabilities, one per match
+        """
+        if self.count_model is None:
+            raise ValueError("No count distribution model loaded")
+        X = self._feature_matrix(matches)
+        return self.count_model.predict_markets(X[:, self.market_columns['counts']])
+    
+    def simulate_markets(
+        self,
+        matches: List[Dict],
+        expressions: List[str],
+        n_sims: int = 100_000,
+        seed: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Joint probabilities of market combinations by Monte Carlo
+        simulation from the count distribution model
+        
+        Args:
+            matches: List of match dictionaries with team stats
+            expressions: Market expressions, e.g. 'over_2_5 & btts_yes'
+                (see MatchSamples.evaluate)
+            n_sims: Simulations per match
+            seed: RNG seed (optional)
+            
+        Returns:
+            Dictionary mapping each expression to probabilities, one per match
+        """
+        if self.count_model is None:
+            raise ValueError("No count distribution model loaded")
+        X = self._feature_matrix(matches)
+        means = self.count_model.predict_means(X[:, self.market_columns['counts']])
+        simulator = MatchSimulator.from_count_model(self.count_model, seed)
+        return simulator.probabilities(means, expressions, n_sims, chunk_size=20_000)
+    
+    def get_drift_report(self, top: Optional[int] = None) -> Dict:
+        """
+        Drift of served features against the training distributions
+        
+        Args:
+            top: Only include the ``top`` most drifted features
+            
+        Returns:
+            Drift report (see DriftMonitor.report), or an empty report when
+            the loaded models carry no reference profiles
+        """
+        if self.drift_monitor is None:
+            return {'n_observed': 0, 'n_features': 0, 'drifted': [], 'features': {}}
+        return self.drift_monitor.report(top)
+    
+    def predict_for_match(self, market: str, match_data: Dict) -> float:
+        """
+        Predict probability for a specific market and match
+        
+        Args:
+            market: Market name ('goals', 'btts', 'cards', 'corners')
+            match_data: Dictionary with match information and team stats
+            
+        Returns:
+            Calibrated probability
+        """
+        return float(self.predict_batch([match_data], [market])[market][0])
     
     def predict_all_markets(self, match_data: Dict) -> Dict[str, float]:
         """
@@ -150,17 +438,8 @@ class IntegratedPredictor:
         Returns:
             Dictionary mapping market names to probabilities
         """
-        results = {}
-        
-        for market in ['goals', 'btts', 'cards', 'corners']:
-            try:
-                prob = self.predict_for_match(market, match_data)
-                results[market] = prob
-            except Exception as e:
-                print(f"⚠️  Warning: Could not predict {market}: {e}")
-                results[market] = 0.5  # Default probability
-        
-        return results
+        probabilities = self.predict_batch([match_data], MARKETS, default=0.5)
+        return {market: float(probs[0]) for market, probs in probabilities.items()}
     
     def get_smart_bet(self, match_data: Dict) -> Dict:
         """
@@ -249,6 +528,11 @@ class IntegratedPredictor:
                 market: market in self.calibration_models
                 for market in self.models.keys()
             },
+            'has_student': {
+                market: market in self.students
+                for market in self.models.keys()
+            },
+            'has_count_model': self.count_model is not None,
             'metadata': self.metadata
         }
         return info
@@ -0,0 +1,368 @@
+"""
+Model Artifacts
+Native model files written at training time (XGBoost UBJSON, LightGBM text,
+logistic coefficients as .npy, calibrators as lookup tables) and the
+memory-mapped loaders used when serving
+"""
+
+import json
+import pickle
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from predictor.tree_ensemble import FlatTreeEnsemble, proba_dtype
+
+
+# Largest batch scored with the flat NumPy trees; bigger batches go to the
+# native (multi-threaded) XGBoost / LightGBM predict
+FLAT_TREE_MAX_ROWS = 64
+
+ARTIFACT_FORMAT_VERSION = 1
+
+
+class LinearModel:
+    """Binary logistic regression from a [intercept, *coefficients] array"""
+
+    def __init__(self, weights: np.ndarray):
+        self.weights = weights
+        self.intercept = float(weights[0])
+        self.coef = weights[1:]
+        self._coef32 = np.asarray(self.coef, dtype=np.float32)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        (n_rows, 2) array of [P(0), P(1)], as sklearn's LogisticRegression
+
+        float32 rows are scored in float32; anything else in float64.
+        """
+        dtype = proba_dtype(X)
+        X = np.asarray(X, dtype=dtype)
+        if X.ndim == 1:
+            X = X[None, :]
+        coef = self._coef32 if dtype == np.float32 else self.coef
+        p = 1.0 / (1.0 + np.exp(-(X @ coef + dtype.type(self.intercept))))
+        return np.column_stack([1.0 - p, p])
+
+
+class TreeModel:
+    """
+    Gradient-boosted trees served from flat node arrays
+
+    Small batches are scored by the (memory-mapped) FlatTreeEnsemble;
+    batches above FLAT_TREE_MAX_ROWS use the native library model, which
+    is only loaded the first time one arrives.
+    """
+
+    def __init__(self, flat: FlatTreeEnsemble, native: Any = None, native_path: Optional[Path] = None):
+        """
+        Args:
+            flat: Flattened ensemble
+            native: Fitted XGBoost / LightGBM model (optional)
+            native_path: Native model file loaded on demand when ``native`` is None
+        """
+        self.flat = flat
+        self._native = native
+        self.native_path = native_path
+
+    @property
+    def native(self) -> Any:
+        """Native model with ``predict_proba``, or None if unavailable"""
+        if self._native is None and self.native_path is not None:
+            self._native = _load_native(self.flat.source, self.native_path)
+        return self._native
+
+    def predict_proba(self, X) -> np.ndarray:
+        """(n_rows, 2) array of [P(0), P(1)]"""
+        if len(X) > FLAT_TREE_MAX_ROWS and self.native is not None:
+            native_X = np.asarray(X, dtype=np.float32)
+            names = getattr(self.native, 'feature_names_in_', None)
+            if names is not None:
+                # Legacy pickle fitted on a DataFrame checks feature names
+                import pandas as pd
+                native_X = pd.DataFrame(native_X, columns=list(names), copy=False)
+            proba = self.native.predict_proba(native_X)
+            return proba.astype(proba_dtype(X), copy=False)
+        return self.flat.predict_proba(X)
+
+
+class CalibrationTable:
+    """
+    Probability calibrator as plain arrays
+
+    Isotonic regression is stored as its breakpoints and applied with
+    ``np.interp`` (clipped at the ends, as ``out_of_bounds='clip'``);
+    Platt scaling is stored as its slope and intercept and applied as a
+    closed-form sigmoid.
+    """
+
+    METHODS = ('isotonic', 'sigmoid')
+
+    def __init__(self, method: str, x: Optional[np.ndarray] = None, y: Optional[np.ndarray] = None,
+                 coef: float = 1.0, intercept: float = 0.0):
+        """
+        Args:
+            method: 'isotonic' or 'sigmoid'
+            x: Isotonic breakpoints (increasing raw probabilities)
+            y: Calibrated probability at each breakpoint
+            coef: Platt slope
+            intercept: Platt intercept
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown calibration method: {method}")
+        self.method = method
+        self.x = None if x is None else np.asarray(x, dtype=np.float64)
+        self.y = None if y is None else np.asarray(y, dtype=np.float64)
+        self.coef = float(coef)
+        self.intercept = float(intercept)
+
+    @classmethod
+    def from_model(cls, calibrator: Any, method: str) -> 'CalibrationTable':
+        """
+        Export a fitted IsotonicRegression (isotonic) or one-feature
+        LogisticRegression (sigmoid)
+
+        Raises:
+            ValueError: If the calibrator cannot be expressed as a table
+        """
+        if method == 'isotonic':
+            if getattr(calibrator, 'out_of_bounds', 'clip') != 'clip':
+                raise ValueError("Only out_of_bounds='clip' isotonic calibrators can be exported")
+            return cls('isotonic', x=calibrator.X_thresholds_, y=calibrator.y_thresholds_)
+        if method == 'sigmoid':
+            coef = np.ravel(calibrator.coef_)
+            if len(coef) != 1:
+                raise ValueError(f"Platt calibrator must have one coefficient, got {len(coef)}")
+            return cls('sigmoid', coef=coef[0], intercept=np.ravel(calibrator.intercept_)[0])
+        raise ValueError(f"Unknown calibration method: {method}")
+
+    def predict(self, raw_probs) -> np.ndarray:
+        """
+        Calibrated probabilities for an array (or scalar) of raw
+        probabilities, float32 for float32 input
+        """
+        dtype = proba_dtype(raw_probs)
+        raw_probs = np.asarray(raw_probs, dtype=dtype)
+        if self.method == 'isotonic':
+            return np.interp(raw_probs, self.x, self.y).astype(dtype, copy=False)
+        return 1.0 / (1.0 + np.exp(-(dtype.type(self.coef) * raw_probs + dtype.type(self.intercept))))
+
+    def to_dict(self) -> Dict:
+        if self.method == 'isotonic':
+            return {'method': self.method, 'x': self.x.tolist(), 'y': self.y.tolist()}
+        return {'method': self.method, 'coef': self.coef, 'intercept': self.intercept}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CalibrationTable':
+        return cls(data['method'], x=data.get('x'), y=data.get('y'),
+                   coef=data.get('coef', 1.0), intercept=data.get('intercept', 0.0))
+
+
+class _LightGBMBooster:
+    """predict_proba over a lightgbm.Booster loaded from model text"""
+
+    def __init__(self, booster):
+        self.booster = booster
+
+    def predict_proba(self, X) -> np.ndarray:
+        p = self.booster.predict(X)
+        return np.column_stack([1.0 - p, p])
+
+
+def save_model_artifacts(model: Any, model_dir: Union[str, Path], name: str) -> Path:
+    """
+    Save a fitted model in a native, version-stable format
+
+    Writes ``{name}_model.json`` (manifest) plus:
+    - XGBoost: ``{name}_model.ubj`` booster and ``{name}_flat/`` node arrays
+      (multi-target models are kept native only)
+    - LightGBM: ``{name}_model.txt`` booster and ``{name}_flat/`` node arrays
+    Boosters are saved up to their early-stopping ``best_iteration``.
+    - Binary logistic regression: ``{name}_coef.npy``
+    - Anything else: ``{name}_model.pkl`` (pickle fallback)
+
+    Args:
+        model: Fitted model
+        model_dir: Output directory
+        name: Artifact name prefix (model type or market)
+
+    Returns:
+        Path to the manifest
+    """
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {'format_version': ARTIFACT_FORMAT_VERSION, 'model_class': type(model).__name__}
+
+    flat = None
+    if hasattr(model, 'get_booster') or hasattr(model, 'booster_'):
+        try:
+            flat = FlatTreeEnsemble.from_model(model)
+        except (TypeError, ValueError) as e:
+            print(f"⚠️  Warning: {name} cannot be flattened, saving the native model only: {e}")
+
+    if hasattr(model, 'get_booster'):
+        import xgboost
+        native_path = model_dir / f"{name}_model.ubj"
+        booster = model.get_booster()
+        # Trees past the early-stopping optimum are dropped, as for LightGBM,
+        # so a warm start continues from the model that is served
+        best_iteration = getattr(model, 'best_iteration', None)
+        if best_iteration is not None and best_iteration + 1 < booster.num_boosted_rounds():
+            booster = booster[:best_iteration + 1]
+        booster.save_model(str(native_path))
+        manifest.update({'format': 'xgboost', 'native': native_path.name, 'library_version': xgboost.__version__})
+    elif flat is not None and flat.source == 'lightgbm':
+        import lightgbm
+        native_path = model_dir / f"{name}_model.txt"
+        booster = model.booster_
+        booster.save_model(str(native_path), num_iteration=booster.best_iteration or -1)
+        manifest.update({'format': 'lightgbm', 'native': native_path.name, 'library_version': lightgbm.__version__})
+    elif _is_binary_linear(model):
+        coef_path = model_dir / f"{name}_coef.npy"
+        np.save(coef_path, np.concatenate([model.intercept_, model.coef_[0]]).astype(np.float64))
+        manifest.update({'format': 'linear', 'weights': coef_path.name})
+    else:
+        pickle_path = model_dir / f"{name}_model.pkl"
+        with open(pickle_path, 'wb') as f:
+            pickle.dump(model, f)
+        manifest.update({'format': 'pickle', 'pickle': pickle_path.name})
+
+    if flat is not None:
+        flat.save(model_dir / f"{name}_flat")
+        manifest['flat'] = f"{name}_flat"
+
+    manifest_path = model_dir / f"{name}_model.json"
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest_path
+
+
+def has_model(model_dir: Union[str, Path], name: str) -> bool:
+    """Whether native artifacts or a legacy pickle exist for ``name``"""
+    model_dir = Path(model_dir)
+    return (model_dir / f"{name}_model.json").exists() or (model_dir / f"{name}_model.pkl").exists()
+
+
+def load_model(model_dir: Union[str, Path], name: str, mmap: bool = True) -> Any:
+    """
+    Load a model for serving
+
+    Native artifacts are preferred; a legacy ``{name}_model.pkl`` is
+    unpickled, with XGBoost / LightGBM models wrapped in a TreeModel so
+    they get the same small-batch fast path.
+
+    Args:
+        model_dir: Directory holding the artifacts
+        name: Artifact name prefix
+        mmap: Memory-map array files so worker processes share their pages
+
+    Returns:
+        Model exposing ``predict_proba``
+
+    Raises:
+        FileNotFoundError: If neither artifacts nor a pickle exist
+    """
+    model_dir = Path(model_dir)
+    manifest_path = model_dir / f"{name}_model.json"
+    mmap_mode = 'r' if mmap else None
+
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        fmt = manifest['format']
+        if fmt in ('xgboost', 'lightgbm'):
+            if 'flat' not in manifest:
+                return _load_native(fmt, model_dir / manifest['native'])
+            flat = FlatTreeEnsemble.load(model_dir / manifest['flat'], mmap=mmap)
+            return TreeModel(flat, native_path=model_dir / manifest['native'])
+        if fmt == 'linear':
+            return LinearModel(np.load(model_dir / manifest['weights'], mmap_mode=mmap_mode))
+        with open(model_dir / manifest['pickle'], 'rb') as f:
+            model = pickle.load(f)
+        return model
+
+    pickle_path = model_dir / f"{name}_model.pkl"
+    if not pickle_path.exists():
+        raise FileNotFoundError(f"Model not found: {manifest_path} or {pickle_path}")
+    with open(pickle_path, 'rb') as f:
+        model = pickle.load(f)
+
+    if hasattr(model, 'get_booster') or hasattr(model, 'booster_'):
+        try:
+            return TreeModel(FlatTreeEnsemble.from_model(model), native=model)
+        except (TypeError, ValueError):
+            pass
+    return model
+
+
+def save_calibration(calibrator: CalibrationTable, model_dir: Union[str, Path], name: str) -> Path:
+    """
+    Save a calibration table as ``{name}_calibration.json``
+
+    Args:
+        calibrator: Calibration table
+        model_dir: Output directory
+        name: Artifact name prefix (e.g. 'ensemble')
+
+    Returns:
+        Path to the saved table
+    """
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+    path = model_dir / f"{name}_calibration.json"
+    with open(path, 'w') as f:
+        json.dump(calibrator.to_dict(), f)
+    return path
+
+
+def load_calibration(model_dir: Union[str, Path], name: str, method: str = 'isotonic') -> Optional[Any]:
+    """
+    Load a calibrator saved by ``save_calibration``
+
+    A legacy ``{name}_calibration.pkl`` is unpickled and exported to a
+    table when possible, so old model directories get the fast path too.
+
+    Args:
+        model_dir: Directory holding the calibrator
+        name: Artifact name prefix
+        method: Calibration method of a legacy pickle
+
+    Returns:
+        Calibrator, or None if there is none
+    """
+    model_dir = Path(model_dir)
+    path = model_dir / f"{name}_calibration.json"
+    if path.exists():
+        with open(path, 'r') as f:
+            return CalibrationTable.from_dict(json.load(f))
+
+    pickle_path = model_dir / f"{name}_calibration.pkl"
+    if not pickle_path.exists():
+        return None
+    with open(pickle_path, 'rb') as f:
+        calibrator = pickle.load(f)
+    try:
+        return CalibrationTable.from_model(calibrator, method)
+    except (AttributeError, ValueError):
+        return calibrator
+
+
+def _is_binary_linear(model: Any) -> bool:
+    """Fitted binary LogisticRegression-like model"""
+    return (
+        type(model).__name__ == 'LogisticRegression'
+        and getattr(model, 'coef_', None) is not None
+        and model.coef_.shape[0] == 1
+    )
+
+
+def _load_native(source: str, path: Path) -> Any:
+    """Load a native booster saved by ``save_model_artifacts``"""
+    if source == 'xgboost':
+        from xgboost import XGBClassifier
+        model = XGBClassifier()
+        model.load_model(str(path))
+        return model
+    import lightgbm
+    return _LightGBMBooster(lightgbm.Booster(model_file=str(path)))
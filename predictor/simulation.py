@@ -0,0 +1,288 @@
+"""
+Match Simulation
+Vectorized Monte Carlo draws of correlated goals, corners and cards per
+fixture, for joint probabilities of arbitrary market combinations
+"""
+
+import ast
+import re
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from training.count_models import COUNT_TARGETS, CountDistributionModel, count_pmf
+
+
+# 'over_2_5', 'under_0_5', 'corners_over_9_5', 'cards_under_4_5'
+_LINE_EVENT = re.compile(r'^(?:(corners|cards)_)?(over|under)_(\d+)_(\d+)$')
+
+# Count where the corners / cards tables are cut; the remaining tail
+# mass is assigned to the last count
+_TAIL_SIGMAS = 10
+
+
+class MatchSamples:
+    """
+    Simulated outcomes, batch-major: each array is (n_fixtures, n_sims)
+
+    Goal markets share one score sample per simulated match, so joint
+    events such as Over 2.5 and BTTS keep their correlation.
+    """
+
+    def __init__(
+        self,
+        home_goals: np.ndarray,
+        away_goals: np.ndarray,
+        corners: Optional[np.ndarray] = None,
+        cards: Optional[np.ndarray] = None
+    ):
+        self.home_goals = home_goals
+        self.away_goals = away_goals
+        self.corners = corners
+        self.cards = cards
+
+    @property
+    def n_fixtures(self) -> int:
+        return self.home_goals.shape[0]
+
+    @property
+    def n_sims(self) -> int:
+        return self.home_goals.shape[1]
+
+    def event(self, key: str) -> np.ndarray:
+        """
+        Boolean (n_fixtures, n_sims) array for one market selection
+
+        Args:
+            key: Market key as in CountDistributionModel.predict_markets
+                ('over_2_5', 'btts_yes', 'home_or_draw', 'corners_over_9_5', ...)
+
+        Raises:
+            ValueError: For unknown keys or stats that were not simulated
+        """
+        h, a = self.home_goals, self.away_goals
+        if key == 'btts_yes':
+            return (h > 0) & (a > 0)
+        if key == 'btts_no':
+            return (h == 0) | (a == 0)
+        if key == 'home_win':
+            return h > a
+        if key == 'draw':
+            return h == a
+        if key == 'away_win':
+            return h < a
+        if key == 'home_or_draw':
+            return h >= a
+        if key == 'away_or_draw':
+            return h <= a
+        if key == 'home_or_away':
+            return h != a
+
+        match = _LINE_EVENT.match(key)
+        if match is None:
+            raise ValueError(f"Unknown market: {key}")
+        stat, side, whole, fraction = match.groups()
+        counts = h + a if stat is None else getattr(self, stat)
+        if counts is None:
+            raise ValueError(f"{stat} were not simulated")
+        line = float(f"{whole}.{fraction}")
+        return counts > line if side == 'over' else counts < line
+
+    def evaluate(self, expression: str) -> np.ndarray:
+        """
+        Boolean array for a combination of markets
+
+        Market keys combine with ``&`` / ``and``, ``|`` / ``or``, ``~`` /
+        ``not`` and parentheses, e.g. ``"over_2_5 & btts_yes"`` or
+        ``"(home_win | draw) and not cards_over_4_5"``.
+
+        Raises:
+            ValueError: For unknown markets or unsupported syntax
+        """
+        try:
+            tree = ast.parse(expression, mode='eval')
+        except SyntaxError as e:
+            raise ValueError(f"Invalid market expression: {expression}") from e
+        return self._evaluate_node(tree.body)
+
+    def probability(self, expression: str) -> np.ndarray:
+        """Share of simulations where ``expression`` holds, one per fixture"""
+        return self.evaluate(expression).mean(axis=1)
+
+    def _evaluate_node(self, node: ast.AST) -> np.ndarray:
+        if isinstance(node, ast.Name):
+            return self.event(node.id)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.Invert, ast.Not)):
+            return ~self._evaluate_node(node.operand)
+        if isinstance(node, ast.BinOp) and isinstance(node.op, (ast.BitAnd, ast.BitOr)):
+            left, right = self._evaluate_node(node.left), self._evaluate_node(node.right)
+            return left & right if isinstance(node.op, ast.BitAnd) else left | right
+        if isinstance(node, ast.BoolOp):
+            values = [self._evaluate_node(value) for value in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            return combine.reduce(values)
+        raise ValueError(f"Unsupported market expression: {ast.dump(node)}")
+
+
+class MatchSimulator:
+    """
+    Draws match outcomes from the count distribution model's parameters
+
+    Scores are sampled from the Dixon-Coles score matrix, and total
+    corners and cards from their negative binomial (or Poisson)
+    distributions. All three use inverse-CDF lookups into per-fixture
+    tables. Corners and cards are independent of the score given their
+    means.
+    """
+
+    def __init__(
+        self,
+        rho: float = 0.0,
+        dispersion: Optional[Dict[str, Optional[float]]] = None,
+        max_goals: int = 10,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            rho: Dixon-Coles low-score correlation
+            dispersion: Negative binomial size per stat ('corners', 'cards');
+                missing or None entries are Poisson
+            max_goals: Per-team goals in the score matrix
+            seed: RNG seed (None for fresh entropy)
+        """
+        self.dispersion = dispersion or {}
+        self.rng = np.random.default_rng(seed)
+        self._scores = CountDistributionModel([], {}, rho=rho, max_goals=max_goals)
+
+    @classmethod
+    def from_count_model(cls, model: CountDistributionModel, seed: Optional[int] = None) -> 'MatchSimulator':
+        """Simulator with a fitted model's rho, dispersions and score range"""
+        return cls(model.rho, dict(model.dispersion), model.max_goals, seed)
+
+    def distributions(self, means: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Per-fixture CDF tables to sample from
+
+        Args:
+            means: Expected counts per count column (as returned by
+                CountDistributionModel.predict_means); corners and cards
+                are optional
+
+        Returns:
+            Dictionary with 'scores' (n, (max_goals + 1)^2) and, when their
+            means are given, 'corners' and 'cards' (n, max_count + 1)
+        """
+        home_mu = np.asarray(means['home_goals'], dtype=np.float64)
+        away_mu = np.asarray(means['away_goals'], dtype=np.float64)
+        tables = {'scores': self._scores.score_matrix(home_mu, away_mu).reshape(len(home_mu), -1)}
+
+        for stat in ('corners', 'cards'):
+            home, away = COUNT_TARGETS[stat]
+            if home not in means or away not in means:
+                continue
+            mu = np.asarray(means[home], dtype=np.float64) + np.asarray(means[away], dtype=np.float64)
+            size = self.dispersion.get(stat)
+            variance = mu.max() + (mu.max() ** 2 / size if size else 0.0)
+            max_count = int(mu.max() + _TAIL_SIGMAS * np.sqrt(variance)) + 1
+            tables[stat] = count_pmf(mu, max_count, size)
+
+        for name, pmf in tables.items():
+            cdf = np.cumsum(pmf, axis=1)
+            cdf[:, -1] = 1.0
+            tables[name] = cdf
+        return tables
+
+    def simulate(
+        self,
+        means: Dict[str, np.ndarray],
+        n_sims: int = 10_000,
+        tables: Optional[Dict[str, np.ndarray]] = None
+    ) -> MatchSamples:
+        """
+        Draw ``n_sims`` matches per fixture
+
+        Args:
+            means: Expected counts per count column
+            n_sims: Simulations per fixture
+            tables: Precomputed ``distributions(means)`` (optional)
+
+        Returns:
+            MatchSamples with (n_fixtures, n_sims) arrays
+        """
+        tables = tables or self.distributions(means)
+        width = self._scores.max_goals + 1
+        scores = self._draw(tables['scores'], n_sims)
+        home_goals, away_goals = np.divmod(scores.astype(np.int16), width)
+        return MatchSamples(
+            home_goals.astype(np.int8),
+            away_goals.astype(np.int8),
+            self._draw(tables['corners'], n_sims).astype(np.int16) if 'corners' in tables else None,
+            self._draw(tables['cards'], n_sims).astype(np.int16) if 'cards' in tables else None
+        )
+
+    def probabilities(
+        self,
+        means: Dict[str, np.ndarray],
+        expressions: Sequence[str],
+        n_sims: int = 100_000,
+        chunk_size: Optional[int] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Probabilities of market combinations, simulating in chunks
+
+        Only event counts are kept between chunks, so memory is bounded by
+        ``chunk_size`` rather than ``n_sims``.
+
+        Args:
+            means: Expected counts per count column
+            expressions: Market expressions (see MatchSamples.evaluate)
+            n_sims: Simulations per fixture
+            chunk_size: Simulations per fixture per chunk (default: all)
+
+        Returns:
+            Dictionary mapping each expression to per-fixture probabilities
+        """
+        tables = self.distributions(means)
+        n_fixtures = len(tables['scores'])
+        chunk_size = chunk_size or n_sims
+        hits = {expression: np.zeros(n_fixtures, dtype=np.int64) for expression in expressions}
+
+        done = 0
+        while done < n_sims:
+            size = min(chunk_size, n_sims - done)
+            samples = self.simulate(means, size, tables)
+            for expression in expressions:
+                hits[expression] += samples.evaluate(expression).sum(axis=1)
+            done += size
+
+        return {expression: count / n_sims for expression, count in hits.items()}
+
+    def _draw(self, cdf: np.ndarray, n_sims: int) -> np.ndarray:
+        """
+        Inverse-CDF draws, (n_fixtures, n_sims) category indices
+
+        A guide table gives, per fixture and per 1/n_categories bucket of
+        the uniform, a category at or below the answer; a short vectorized
+        walk then steps every draw forward until its CDF exceeds the uniform.
+        """
+        n_fixtures, n_categories = cdf.shape
+        rows = np.arange(n_fixtures, dtype=np.int64)[:, None]
+
+        # guide[i, j]: categories whose CDF is safely below j / n_categories
+        first_bucket = np.ceil(cdf * n_categories + 0.5).astype(np.int64)
+        np.clip(first_bucket, 0, n_categories, out=first_bucket)
+        guide = np.bincount(
+            (rows * (n_categories + 1) + first_bucket).ravel(),
+            minlength=n_fixtures * (n_categories + 1)
+        ).reshape(n_fixtures, n_categories + 1).cumsum(axis=1)[:, :n_categories]
+
+        uniforms = self.rng.random((n_fixtures, n_sims))
+        buckets = (uniforms * n_categories).astype(np.int64)
+        flat_cdf, flat_uniforms = cdf.ravel(), uniforms.ravel()
+        draws = (np.take_along_axis(guide, buckets, axis=1) + rows * n_categories).ravel()
+
+        active = np.flatnonzero(flat_cdf[draws] <= flat_uniforms)
+        while active.size:
+            draws[active] += 1
+            active = active[flat_cdf[draws[active]] <= flat_uniforms[active]]
+        return draws.reshape(n_fixtures, n_sims) - rows * n_categories
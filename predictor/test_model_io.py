@@ -0,0 +1,149 @@
+"""
+Model Artifacts Test Script
+Round-trips models and calibrators through the native formats and the
+legacy pickle path
+"""
+import pickle
+import sys
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from predictor.model_io import (
+    CalibrationTable, LinearModel, TreeModel, has_model, load_calibration, load_model,
+    save_calibration, save_model_artifacts
+)
+
+
+def _data(n: int = 2000, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, 12))
+    y = (X[:, 0] - X[:, 1] + rng.normal(size=n) > 0).astype(int)
+    return pd.DataFrame(X, columns=[f'f{i}' for i in range(12)]), y
+
+
+def _models():
+    from lightgbm import LGBMClassifier
+    from sklearn.linear_model import LogisticRegression
+    from xgboost import XGBClassifier
+
+    X, y = _data()
+    return X, {
+        'xgboost': XGBClassifier(n_estimators=50, max_depth=4, eval_metric='logloss').fit(X, y),
+        'lightgbm': LGBMClassifier(n_estimators=50, verbose=-1).fit(X, y),
+        'logistic': LogisticRegression(max_iter=1000).fit(X, y)
+    }
+
+
+def test_native_round_trip():
+    """Native artifacts predict like the fitted models, one row and 1000 rows"""
+    X, models = _models()
+    X = X.to_numpy()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, model in models.items():
+            save_model_artifacts(model, tmp, name)
+            assert not (Path(tmp) / f"{name}_model.pkl").exists()
+            loaded = load_model(tmp, name)
+            assert isinstance(loaded, LinearModel if name == 'logistic' else TreeModel)
+
+            for rows in (X[:1], X[:1000]):
+                error = np.abs(loaded.predict_proba(rows) - model.predict_proba(rows)).max()
+                assert error < 1e-6, f"{name}: max difference {error:.2e}"
+            del loaded
+    print("✅ Native artifacts match the fitted models")
+
+
+def test_early_stopped_booster():
+    """XGBoost is saved up to best_iteration, so warm starts continue from it"""
+    import xgboost
+    from xgboost import XGBClassifier
+
+    X, y = _data(3000)
+    model = XGBClassifier(
+        n_estimators=300, learning_rate=0.3, early_stopping_rounds=10, eval_metric='logloss'
+    ).fit(X[:2000], y[:2000], eval_set=[(X[2000:], y[2000:])], verbose=False)
+    assert model.best_iteration + 1 < model.get_booster().num_boosted_rounds()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        save_model_artifacts(model, tmp, 'xgboost')
+        booster = xgboost.Booster(model_file=str(Path(tmp) / 'xgboost_model.ubj'))
+        assert booster.num_boosted_rounds() == model.best_iteration + 1
+
+        rows = X.to_numpy()[:1000]
+        error = np.abs(load_model(tmp, 'xgboost').predict_proba(rows) - model.predict_proba(X[:1000])).max()
+        assert error < 1e-6, f"max difference {error:.2e}"
+    print("✅ Early-stopped booster saved at its best iteration")
+
+
+def test_legacy_pickle():
+    """Pickled tree models still load, wrapped for the flat fast path"""
+    X, models = _models()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with open(Path(tmp) / 'xgboost_model.pkl', 'wb') as f:
+            pickle.dump(models['xgboost'], f)
+
+        assert has_model(tmp, 'xgboost') and not has_model(tmp, 'lightgbm')
+        loaded = load_model(tmp, 'xgboost')
+        assert isinstance(loaded, TreeModel)
+        assert np.allclose(loaded.predict_proba(X[:5]), models['xgboost'].predict_proba(X[:5]), atol=1e-6)
+
+        # Large batches reach the native model, fitted on a DataFrame, with its feature names
+        with open(Path(tmp) / 'lightgbm_model.pkl', 'wb') as f:
+            pickle.dump(models['lightgbm'], f)
+        loaded = load_model(tmp, 'lightgbm')
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            proba = loaded.predict_proba(X.to_numpy()[:1000])
+        assert np.allclose(proba, models['lightgbm'].predict_proba(X[:1000]), atol=1e-6)
+    print("✅ Legacy pickle loads")
+
+
+def test_calibration_tables():
+    """Lookup tables match sklearn's isotonic and Platt calibrators"""
+    from sklearn.isotonic import IsotonicRegression
+    from sklearn.linear_model import LogisticRegression
+
+    rng = np.random.default_rng(3)
+    raw = rng.beta(2, 3, size=5000)
+    y = (rng.random(5000) < raw ** 1.3).astype(int)
+    test = np.concatenate([rng.random(1000), [0.0, 1.0, raw.min() - 0.01, raw.max() + 0.01]])
+
+    fitted = {
+        'isotonic': IsotonicRegression(out_of_bounds='clip').fit(raw, y),
+        'sigmoid': LogisticRegression().fit(raw.reshape(-1, 1), y)
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        for method, calibrator in fitted.items():
+            if method == 'isotonic':
+                expected = calibrator.predict(test)
+            else:
+                expected = calibrator.predict_proba(test.reshape(-1, 1))[:, 1]
+
+            save_calibration(CalibrationTable.from_model(calibrator, method), tmp, method)
+            table = load_calibration(tmp, method)
+            assert np.abs(table.predict(test) - expected).max() < 1e-12, method
+            assert np.isclose(table.predict(test[0]), expected[0])  # single value
+
+            # Legacy pickles are converted on load
+            with open(Path(tmp) / f"legacy_{method}_calibration.pkl", 'wb') as f:
+                pickle.dump(calibrator, f)
+            legacy = load_calibration(tmp, f"legacy_{method}", method)
+            assert isinstance(legacy, CalibrationTable)
+            assert np.abs(legacy.predict(test) - expected).max() < 1e-12, method
+
+        assert load_calibration(tmp, 'missing') is None
+    print("✅ Calibration tables match sklearn")
+
+
+if __name__ == "__main__":
+    test_native_round_trip()
+    test_early_stopped_booster()
+    test_legacy_pickle()
+    test_calibration_tables()
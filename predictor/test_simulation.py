@@ -0,0 +1,74 @@
+"""
+Match Simulation Test Script
+Checks simulated market probabilities against the count model's closed forms
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from predictor.simulation import MatchSimulator
+from training.count_models import CountDistributionModel
+
+
+def _model_and_means(n: int = 5):
+    rng = np.random.default_rng(0)
+    model = CountDistributionModel([], {}, rho=-0.08, dispersion={'corners': 12.0, 'cards': None})
+    means = {
+        'home_goals': rng.uniform(0.8, 2.2, n), 'away_goals': rng.uniform(0.6, 1.6, n),
+        'home_corners': rng.uniform(4, 6, n), 'away_corners': rng.uniform(3.5, 5.5, n),
+        'home_cards': rng.uniform(1.5, 2.5, n), 'away_cards': rng.uniform(1.5, 2.5, n)
+    }
+    return model, means
+
+
+def test_matches_closed_form():
+    """Marginal markets agree with predict_markets within Monte Carlo error"""
+    model, means = _model_and_means()
+    samples = MatchSimulator.from_count_model(model, seed=1).simulate(means, 200_000)
+
+    # Closed forms over the same means
+    model.predict_means = lambda X: means
+    expected = model.predict_markets(np.zeros((5, 1)))
+
+    for market in ('over_2_5', 'under_1_5', 'btts_yes', 'draw', 'home_or_away',
+                   'corners_over_9_5', 'cards_under_4_5'):
+        error = np.abs(samples.probability(market) - expected[market]).max()
+        assert error < 0.006, f"{market}: {error:.4f}"
+    print("✅ Simulated markets match the closed forms")
+
+
+def test_joint_expressions():
+    """Boolean combinations and reproducibility"""
+    model, means = _model_and_means()
+    simulator = MatchSimulator.from_count_model(model, seed=7)
+    samples = simulator.simulate(means, 50_000)
+
+    both = samples.probability('over_2_5 & btts_yes')
+    assert np.allclose(both, samples.probability('over_2_5 and btts_yes'))
+    assert np.all(both <= np.minimum(samples.probability('over_2_5'), samples.probability('btts_yes')))
+    assert np.allclose(samples.probability('home_win | draw'), samples.probability('home_or_draw'))
+    assert np.allclose(samples.probability('~btts_yes'), samples.probability('btts_no'))
+
+    again = MatchSimulator.from_count_model(model, seed=7).simulate(means, 50_000)
+    assert np.array_equal(again.home_goals, samples.home_goals)
+
+    chunked = MatchSimulator.from_count_model(model, seed=7).probabilities(
+        means, ['over_2_5 & btts_yes'], n_sims=50_000, chunk_size=8_000
+    )
+    assert np.abs(chunked['over_2_5 & btts_yes'] - both).max() < 0.02
+
+    for bad in ('over_2_5 + btts_yes', 'not_a_market', 'over_2_5 &'):
+        try:
+            samples.probability(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"{bad!r} should be rejected")
+    print("✅ Joint market expressions")
+
+
+if __name__ == "__main__":
+    test_matches_closed_form()
+    test_joint_expressions()
@@ -0,0 +1,113 @@
+"""
+Flat Tree Ensemble Test Script
+Checks the NumPy tree evaluator against XGBoost and LightGBM predict_proba
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from tree_ensemble import FlatTreeEnsemble
+
+
+def _data(rng: np.random.Generator, n: int, missing: float = 0.0):
+    """Features with a discrete column, optional NaNs and a noisy target"""
+    X = rng.normal(size=(n, 20))
+    X[:, 3] = np.round(X[:, 3])
+    y = (X[:, 0] + 0.5 * X[:, 3] + rng.normal(size=n) > 0).astype(int)
+    if missing:
+        X[rng.random(X.shape) < missing] = np.nan
+    return pd.DataFrame(X, columns=[f'f{i}' for i in range(20)]), y
+
+
+def _check(model, X: np.ndarray, tol: float = 1e-6) -> float:
+    flat = FlatTreeEnsemble.from_model(model)
+    error = np.abs(flat.predict_proba(X) - model.predict_proba(X)).max()
+    assert error < tol, f"{flat.source}: max difference {error:.2e}"
+    # Single rows take the same path as batches
+    assert np.allclose(flat.predict_proba(X[:1]), flat.predict_proba(X)[:1])
+    return error
+
+
+def test_xgboost_parity():
+    """Early-stopped XGBoost classifier, test rows with NaNs"""
+    from xgboost import XGBClassifier
+
+    rng = np.random.default_rng(0)
+    X, y = _data(rng, 3000)
+    model = XGBClassifier(
+        n_estimators=200, max_depth=6, learning_rate=0.05, subsample=0.8,
+        colsample_bytree=0.8, eval_metric='logloss', early_stopping_rounds=20
+    )
+    model.fit(X[:2000], y[:2000], eval_set=[(X[2000:], y[2000:])], verbose=False)
+
+    X_test, _ = _data(rng, 2000, missing=0.05)
+    error = _check(model, X_test.to_numpy())
+    print(f"✅ XGBoost parity: max difference {error:.1e}")
+
+
+def test_lightgbm_parity():
+    """LightGBM with each missing value mode"""
+    from lightgbm import LGBMClassifier
+
+    rng = np.random.default_rng(1)
+    X_test, _ = _data(rng, 2000, missing=0.05)
+    X_test.iloc[:5] = 0.0
+
+    for missing, params in ((0.0, {}), (0.1, {}), (0.0, {'zero_as_missing': True})):
+        X, y = _data(rng, 3000, missing)
+        model = LGBMClassifier(n_estimators=100, max_depth=6, learning_rate=0.05, verbose=-1, **params)
+        model.fit(X, y)
+        error = _check(model, X_test)
+    print(f"✅ LightGBM parity: max difference {error:.1e}")
+
+
+def test_float32_rows():
+    """float32 rows split as their float64 values do, without widening"""
+    from lightgbm import LGBMClassifier
+
+    rng = np.random.default_rng(3)
+    X, y = _data(rng, 3000)
+    flat = FlatTreeEnsemble.from_model(LGBMClassifier(n_estimators=50, verbose=-1).fit(X, y))
+
+    # float32 values on and either side of every float64 threshold
+    internal = flat.children[:, 0] != np.arange(flat.n_nodes)
+    nearest = flat.threshold[internal].astype(np.float32)
+    values = np.stack([np.nextafter(nearest, np.float32(-np.inf)), nearest, np.nextafter(nearest, np.float32(np.inf))])
+    t32 = flat._float32_thresholds()[internal]
+    assert np.array_equal(values <= t32, values.astype(np.float64) <= flat.threshold[internal])
+
+    X32 = X.to_numpy(dtype=np.float32)
+    proba = flat.predict_proba(X32)
+    assert proba.dtype == np.float32
+    assert np.abs(proba - flat.predict_proba(X32.astype(np.float64))).max() < 1e-6
+    print("✅ float32 rows match float64 routing")
+
+
+def test_save_load():
+    """Saved arrays reload to the same predictions"""
+    from lightgbm import LGBMClassifier
+
+    rng = np.random.default_rng(2)
+    X, y = _data(rng, 1000)
+    flat = FlatTreeEnsemble.from_model(LGBMClassifier(n_estimators=20, verbose=-1).fit(X, y))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'lightgbm_flat'
+        flat.save(path)
+        loaded = FlatTreeEnsemble.load(path)
+        assert not loaded.feature.flags.writeable  # read-only mapping, not a copy
+        assert np.array_equal(loaded.predict_proba(X), flat.predict_proba(X))
+        del loaded
+    print("✅ Flat ensemble save/load round trip (memory-mapped)")
+
+
+if __name__ == "__main__":
+    test_xgboost_parity()
+    test_lightgbm_parity()
+    test_float32_rows()
+    test_save_load()
@@ -0,0 +1,377 @@
+"""
+Flat Tree Ensembles
+Exports trained XGBoost / LightGBM classifiers to flat node arrays and
+evaluates them with NumPy, without the libraries' per-call input setup
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+
+
+# How a node routes missing values (LightGBM missing_type; XGBoost is NAN)
+MISSING_NONE = 0   # NaN is treated as 0.0 and compared
+MISSING_ZERO = 1   # 0.0 and NaN take the default branch
+MISSING_NAN = 2    # NaN takes the default branch
+
+# LightGBM's zero tolerance for MISSING_ZERO nodes
+_ZERO_THRESHOLD = 1e-35
+
+_ARRAYS = ('feature', 'threshold', 'children', 'default_left', 'missing', 'value', 'roots')
+
+
+def proba_dtype(X) -> np.dtype:
+    """Dtype of probabilities returned for ``X``: float32 inputs stay float32"""
+    return np.dtype(np.float32) if getattr(X, 'dtype', None) == np.float32 else np.dtype(np.float64)
+
+
+class FlatTreeEnsemble:
+    """
+    Binary gradient-boosted trees as flat node arrays
+
+    All trees share one set of node arrays (split feature, threshold,
+    left/right child, default direction, leaf value) with one root index
+    per tree. Leaves point at themselves, so every row descends all trees
+    together for ``max_depth`` steps of array indexing. Exposes
+    ``predict_proba`` like the sklearn wrappers it replaces.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        children: np.ndarray,
+        default_left: np.ndarray,
+        missing: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        base_margin: float = 0.0,
+        sigmoid: float = 1.0,
+        strict: bool = True,
+        source: str = 'xgboost'
+    ):
+        """
+        Args:
+            feature: Split feature per node (0 for leaves)
+            threshold: Split threshold per node, in the comparison dtype
+            children: (n_nodes, 2) child indices, column 0 right / 1 left
+            default_left: Whether missing values go left, per node
+            missing: Missing value handling per node (MISSING_* codes)
+            value: Leaf value per node (0 for internal nodes)
+            roots: Root node index of each tree
+            max_depth: Depth of the deepest tree
+            base_margin: Margin added to the sum of leaves
+            sigmoid: Slope of the logistic link
+            strict: Go left on ``x < threshold`` (XGBoost) instead of
+                ``x <= threshold`` (LightGBM)
+            source: Library the trees were exported from
+        """
+        self.feature = np.asarray(feature, dtype=np.int32)
+        self.threshold = np.asarray(threshold)
+        self.children = np.asarray(children, dtype=np.int32)
+        self.default_left = np.asarray(default_left, dtype=bool)
+        self.missing = np.asarray(missing, dtype=np.int8)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.base_margin = float(base_margin)
+        self.sigmoid = float(sigmoid)
+        self.strict = bool(strict)
+        self.source = source
+        self.dtype = self.threshold.dtype
+        self._threshold32 = None
+        self._zero_nodes = bool((self.missing == MISSING_ZERO).any())
+        self._children_flat = self.children.ravel()
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    @classmethod
+    def from_model(cls, model) -> 'FlatTreeEnsemble':
+        """
+        Export a fitted XGBClassifier / LGBMClassifier (or their boosters)
+
+        Raises:
+            TypeError: For other model types
+        """
+        if hasattr(model, 'get_booster') or type(model).__name__ == 'Booster' and hasattr(model, 'save_raw'):
+            return cls.from_xgboost(model)
+        if hasattr(model, 'booster_') or hasattr(model, 'dump_model'):
+            return cls.from_lightgbm(model)
+        raise TypeError(f"Cannot flatten {type(model).__name__}; expected an XGBoost or LightGBM model")
+
+    @classmethod
+    def from_xgboost(cls, model) -> 'FlatTreeEnsemble':
+        """
+        Export a binary:logistic XGBoost model
+
+        Uses the trees up to ``best_iteration`` when the classifier was
+        fitted with early stopping, as its ``predict_proba`` does.
+        """
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        learner = json.loads(booster.save_raw(raw_format='json'))['learner']
+
+        objective = learner['objective']['name']
+        if objective not in ('binary:logistic', 'reg:logistic'):
+            raise ValueError(f"Unsupported XGBoost objective: {objective}")
+        if learner['gradient_booster']['name'] != 'gbtree':
+            raise ValueError("Only gbtree boosters can be flattened")
+        if int(learner['learner_model_param'].get('num_target', 1)) > 1:
+            raise ValueError("Multi-target XGBoost models are not supported")
+
+        trees_model = learner['gradient_booster']['model']
+        trees = trees_model['trees']
+        best_iteration = getattr(model, 'best_iteration', None) if hasattr(model, 'get_booster') else None
+        if best_iteration is not None:
+            trees = trees[:trees_model['iteration_indptr'][best_iteration + 1]]
+
+        nodes = []
+        for tree in trees:
+            if any(tree['split_type']):
+                raise ValueError("Categorical XGBoost splits are not supported")
+            left = np.asarray(tree['left_children'])
+            leaf = left == -1
+            nodes.append({
+                'feature': np.where(leaf, 0, tree['split_indices']),
+                'threshold': np.where(leaf, 0, tree['split_conditions']),
+                'left': left,
+                'right': np.asarray(tree['right_children']),
+                'default_left': np.asarray(tree['default_left'], dtype=bool),
+                'missing': np.full(len(left), MISSING_NAN),
+                'value': np.where(leaf, tree['split_conditions'], 0.0)
+            })
+
+        base_score = float(str(learner['learner_model_param']['base_score']).strip('[]'))
+        return cls._from_trees(
+            nodes,
+            threshold_dtype=np.float32,
+            base_margin=float(np.log(base_score / (1 - base_score))),
+            strict=True,
+            source='xgboost'
+        )
+
+    @classmethod
+    def from_lightgbm(cls, model) -> 'FlatTreeEnsemble':
+        """
+        Export a binary LightGBM model (numerical splits)
+
+        Uses the trees up to ``best_iteration`` when set, as
+        ``predict_proba`` does.
+        """
+        booster = model.booster_ if hasattr(model, 'booster_') else model
+        dump = booster.dump_model()
+
+        objective = dump['objective'].split()
+        if objective[0] != 'binary' or dump['num_tree_per_iteration'] != 1:
+            raise ValueError(f"Unsupported LightGBM objective: {dump['objective']}")
+        sigmoid = 1.0
+        for param in objective[1:]:
+            if param.startswith('sigmoid:'):
+                sigmoid = float(param.split(':', 1)[1])
+
+        missing_codes = {'None': MISSING_NONE, 'Zero': MISSING_ZERO, 'NaN': MISSING_NAN}
+        nodes = []
+        for info in dump['tree_info']:
+            tree = {key: [] for key in ('feature', 'threshold', 'left', 'right', 'default_left', 'missing', 'value')}
+
+            def add(node) -> int:
+                index = len(tree['feature'])
+                for key in tree:
+                    tree[key].append(0)
+                if 'leaf_value' in node or 'split_feature' not in node:
+                    tree['left'][index] = tree['right'][index] = -1
+                    tree['value'][index] = node.get('leaf_value', 0.0)
+                    return index
+                if node['decision_type'] != '<=':
+                    raise ValueError("Categorical LightGBM splits are not supported")
+                tree['feature'][index] = node['split_feature']
+                tree['threshold'][index] = node['threshold']
+                tree['default_left'][index] = node['default_left']
+                tree['missing'][index] = missing_codes[node['missing_type']]
+                tree['left'][index] = add(node['left_child'])
+                tree['right'][index] = add(node['right_child'])
+                return index
+
+            add(info['tree_structure'])
+            nodes.append({key: np.asarray(values) for key, values in tree.items()})
+
+        return cls._from_trees(
+            nodes,
+            threshold_dtype=np.float64,
+            sigmoid=sigmoid,
+            strict=False,
+            source='lightgbm'
+        )
+
+    @classmethod
+    def _from_trees(cls, trees: List[Dict[str, np.ndarray]], threshold_dtype, **kwargs) -> 'FlatTreeEnsemble':
+        """Concatenate per-tree node arrays (children local to each tree)"""
+        offsets = np.cumsum([0] + [len(tree['left']) for tree in trees])
+        children, depths = [], []
+        for tree, offset in zip(trees, offsets):
+            n = len(tree['left'])
+            own = np.arange(n)
+            leaf = tree['left'] == -1
+            # Leaves loop back to themselves; column 0 is right, 1 is left
+            children.append(np.stack([
+                np.where(leaf, own, tree['right']),
+                np.where(leaf, own, tree['left'])
+            ], axis=1) + offset)
+            depths.append(_tree_depth(tree['left'], tree['right']))
+
+        def join(key, dtype):
+            return np.concatenate([tree[key] for tree in trees]).astype(dtype) if trees else np.empty(0, dtype)
+
+        return cls(
+            feature=join('feature', np.int32),
+            threshold=join('threshold', threshold_dtype),
+            children=np.concatenate(children) if trees else np.empty((0, 2), np.int32),
+            default_left=join('default_left', bool),
+            missing=join('missing', np.int8),
+            value=join('value', np.float64),
+            roots=offsets[:-1],
+            max_depth=max(depths, default=0),
+            **kwargs
+        )
+
+    def predict_margin(self, X) -> np.ndarray:
+        """
+        Raw scores (sum of leaf values plus base margin)
+
+        Args:
+            X: (n_rows, n_features) array in training column order
+        """
+        # float32 rows are compared in float32 (no widened copy of X)
+        if getattr(X, 'dtype', None) == np.float32:
+            X, thresholds = np.asarray(X), self._float32_thresholds()
+        else:
+            X, thresholds = np.asarray(X, dtype=self.dtype), self.threshold
+        if X.ndim == 1:
+            X = X[None, :]
+        n = len(X)
+        if self.n_trees == 0:
+            return np.full(n, self.base_margin)
+
+        # Flat offsets: X.take(row_offset + feature) reads each row's split value
+        node = np.tile(self.roots, (n, 1))
+        row_offset = np.arange(0, n * X.shape[1], X.shape[1])[:, None]
+        X_flat = X.ravel()
+        children = self._children_flat
+        check_missing = self._zero_nodes or np.isnan(X).any()
+
+        for _ in range(self.max_depth):
+            x = X_flat.take(self.feature.take(node) + row_offset)
+            threshold = thresholds.take(node)
+            go_left = np.less(x, threshold) if self.strict else np.less_equal(x, threshold)
+            if check_missing:
+                go_left = self._route_missing(node, x, go_left)
+            node = children.take(node * 2 + go_left)
+
+        return self.value[node].sum(axis=1) + self.base_margin
+
+    def _float32_thresholds(self) -> np.ndarray:
+        """
+        Thresholds for comparing float32 rows without widening them
+
+        float64 (LightGBM) thresholds are rounded down to the nearest
+        float32, so for any float32 ``x``, ``x <= t32`` iff ``x <= t`` and
+        ``x < t32`` iff ``x < t`` for thresholds that are float32 already.
+        """
+        if self.dtype == np.float32:
+            return self.threshold
+        if self._threshold32 is None:
+            threshold = np.asarray(self.threshold, dtype=np.float64)
+            with np.errstate(over='ignore'):
+                t32 = threshold.astype(np.float32)
+            above = t32.astype(np.float64) > threshold
+            t32[above] = np.nextafter(t32[above], np.float32(-np.inf))
+            if self.strict:
+                # x < t needs the smallest float32 >= t instead
+                below = t32.astype(np.float64) < threshold
+                t32[below] = np.nextafter(t32[below], np.float32(np.inf))
+            self._threshold32 = t32
+        return self._threshold32
+
+    def _route_missing(self, node: np.ndarray, x: np.ndarray, go_left: np.ndarray) -> np.ndarray:
+        """Apply each node's missing value rule to the split decisions"""
+        kind = self.missing[node]
+        nan = np.isnan(x)
+        # MISSING_NONE / MISSING_ZERO compare NaN as 0.0
+        as_zero = nan & (kind != MISSING_NAN)
+        if as_zero.any():
+            zero = np.zeros((), dtype=self.dtype)
+            threshold = self.threshold[node]
+            go_left = np.where(as_zero, zero < threshold if self.strict else zero <= threshold, go_left)
+        missing = (nan & (kind == MISSING_NAN)) | (
+            (kind == MISSING_ZERO) & (nan | (np.abs(x) <= _ZERO_THRESHOLD))
+        )
+        return np.where(missing, self.default_left[node], go_left)
+
+    def predict_proba(self, X) -> np.ndarray:
+        """
+        Class probabilities, shaped like sklearn's ``predict_proba``
+
+        Returns:
+            (n_rows, 2) array of [P(0), P(1)], float32 for float32 ``X``
+        """
+        p = 1.0 / (1.0 + np.exp(-self.sigmoid * self.predict_margin(X)))
+        p = p.astype(proba_dtype(X), copy=False)
+        return np.column_stack([1.0 - p, p])
+
+    def scalars(self) -> Dict[str, Union[float, int, bool, str]]:
+        """Non-array parameters (stored next to the node arrays)"""
+        return {
+            'max_depth': self.max_depth, 'base_margin': self.base_margin,
+            'sigmoid': self.sigmoid, 'strict': self.strict, 'source': self.source
+        }
+
+    def save(self, directory: Union[str, Path]):
+        """
+        Save the node arrays as .npy files plus a scalars.json
+
+        Uncompressed .npy files can be memory-mapped by ``load``, so
+        several worker processes share one copy of the arrays.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for key in _ARRAYS:
+            np.save(directory / f"{key}.npy", np.ascontiguousarray(getattr(self, key)))
+        with open(directory / 'scalars.json', 'w') as f:
+            json.dump(self.scalars(), f, indent=2)
+
+    @classmethod
+    def load(cls, directory: Union[str, Path], mmap: bool = True) -> 'FlatTreeEnsemble':
+        """
+        Load an ensemble saved with ``save``
+
+        Args:
+            directory: Directory written by ``save``
+            mmap: Memory-map the node arrays (read-only) instead of reading them
+        """
+        directory = Path(directory)
+        with open(directory / 'scalars.json', 'r') as f:
+            scalars = json.load(f)
+        arrays = {
+            key: np.load(directory / f"{key}.npy", mmap_mode='r' if mmap else None)
+            for key in _ARRAYS
+        }
+        return cls(**arrays, **scalars)
+
+
+def _tree_depth(left: np.ndarray, right: np.ndarray) -> int:
+    """Number of splits on the longest root-to-leaf path"""
+    depth = np.zeros(len(left), dtype=np.int64)
+    deepest = 0
+    for i in range(len(left)):
+        if left[i] != -1:
+            depth[left[i]] = depth[right[i]] = depth[i] + 1
+            deepest = max(deepest, depth[i] + 1)
+    return deepest
@@ -0,0 +1,164 @@
+"""
+Benchmark Float32 Inference
+Memory and latency of scoring 100k fixtures float32 end to end vs float64,
+with the largest probability difference between the two
+"""
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from features.feature_builder import FEATURE_NAMES, FeatureBuilder, match_columns
+from features.feature_schema import FeatureSchema
+from predictor.integrated_predictor import IntegratedPredictor, MARKETS
+from predictor.model_io import CalibrationTable, save_calibration, save_model_artifacts
+
+
+def _random_stats(rng: np.random.Generator, n: int) -> pd.DataFrame:
+    """5-match team stats, rounded to the Match table's Decimal precision"""
+    stats = pd.DataFrame({
+        'home_goals_avg_5': rng.uniform(0.5, 3.0, n), 'away_goals_avg_5': rng.uniform(0.5, 3.0, n),
+        'home_goals_conceded_avg_5': rng.uniform(0.5, 2.5, n), 'away_goals_conceded_avg_5': rng.uniform(0.5, 2.5, n),
+        'home_corners_avg_5': rng.uniform(3.0, 8.0, n), 'away_corners_avg_5': rng.uniform(3.0, 8.0, n),
+        'home_cards_avg_5': rng.uniform(1.0, 3.5, n), 'away_cards_avg_5': rng.uniform(1.0, 3.5, n),
+        'home_btts_rate_5': rng.uniform(0.2, 0.8, n), 'away_btts_rate_5': rng.uniform(0.2, 0.8, n)
+    })
+    return stats.round(2)
+
+
+def _train_models(models_dir: Path, rng: np.random.Generator, n: int = 20_000):
+    """Ensemble (XGBoost, LightGBM, logistic) plus isotonic calibration per market"""
+    from lightgbm import LGBMClassifier
+    from sklearn.isotonic import IsotonicRegression
+    from sklearn.linear_model import LogisticRegression
+    from xgboost import XGBClassifier
+
+    builder = FeatureBuilder()
+    schema = FeatureSchema(FEATURE_NAMES, dtype=np.float64)
+    stats = _random_stats(rng, n)
+    X = builder.build_matrix(stats.to_dict('records'), schema)
+    signals = {
+        'goals': X[:, FEATURE_NAMES.index('combined_goals_avg')] - 3.0,
+        'btts': X[:, FEATURE_NAMES.index('combined_btts_rate')] * 4 - 2.0,
+        'cards': X[:, FEATURE_NAMES.index('combined_cards_avg')] - 4.0,
+        'corners': (X[:, FEATURE_NAMES.index('combined_corners_avg')] - 10.0) / 2
+    }
+    weights = {'xgboost': 0.5, 'lightgbm': 0.3, 'logistic': 0.2}
+
+    for market in MARKETS:
+        market_dir = models_dir / market
+        y = (rng.random(n) < 1 / (1 + np.exp(-signals[market]))).astype(int)
+        fit, val = slice(0, n * 3 // 4), slice(n * 3 // 4, n)
+        models = {
+            'xgboost': XGBClassifier(n_estimators=200, max_depth=6, learning_rate=0.05, eval_metric='logloss'),
+            'lightgbm': LGBMClassifier(n_estimators=200, max_depth=6, learning_rate=0.05, verbose=-1),
+            'logistic': LogisticRegression(max_iter=1000)
+        }
+        raw = np.zeros(n - fit.stop)
+        for model_type, model in models.items():
+            model.fit(X[fit], y[fit])
+            save_model_artifacts(model, market_dir, model_type)
+            raw += weights[model_type] * model.predict_proba(X[val])[:, 1]
+        isotonic = IsotonicRegression(out_of_bounds='clip').fit(raw, y[val])
+        save_calibration(CalibrationTable.from_model(isotonic, 'isotonic'), market_dir, 'ensemble')
+        with open(market_dir / 'ensemble_metadata.json', 'w') as f:
+            json.dump({
+                'market': market, 'version': 'v1.0.0', 'base_models': list(models),
+                'weights': weights, 'calibration_method': 'isotonic', 'feature_columns': list(FEATURE_NAMES)
+            }, f)
+
+
+def _run(predictor: IntegratedPredictor, matches, batch_size: int):
+    """Score every match in batches; returns (probabilities, seconds, peak bytes)"""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    parts = [predictor.predict_batch(matches[i:i + batch_size]) for i in range(0, len(matches), batch_size)]
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    probabilities = {market: np.concatenate([part[market] for part in parts]) for market in parts[0]}
+    return probabilities, elapsed, peak
+
+
+def benchmark_float32_inference(n_fixtures: int = 100_000, batch_size: int = 10_000):
+    """
+    Score fixtures read as Match rows (Decimal stats) with float64 and
+    float32 predictors
+
+    Args:
+        n_fixtures: Fixtures to score
+        batch_size: Fixtures per predict_batch call
+    """
+    print("\n" + "=" * 60)
+    print("FLOAT32 INFERENCE BENCHMARK")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        models_dir = Path(tmp)
+        print("🔄 Training synthetic market ensembles...")
+        _train_models(models_dir, rng)
+
+        stats = _random_stats(rng, n_fixtures)
+        matches = [
+            {key: Decimal(f"{value:.2f}") for key, value in row.items()}
+            for row in stats.to_dict('records')
+        ]
+
+        # Feature construction alone: per-match Decimal arithmetic vs
+        # converting each column once into a float32 matrix
+        builder = FeatureBuilder()
+        schema64 = FeatureSchema(FEATURE_NAMES, dtype=np.float64)
+        schema32 = FeatureSchema(FEATURE_NAMES, dtype=np.float32)
+        t0 = time.perf_counter()
+        X_rows = schema64.allocate(n_fixtures)
+        for i, match in enumerate(matches):
+            builder.build_into(match, X_rows[i], schema64)
+        rows_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        X_cols = builder.build_matrix_from_columns(match_columns(matches), schema32)
+        cols_time = time.perf_counter() - t0
+        feature_error = np.abs(X_cols - X_rows).max()
+
+        results = {}
+        for dtype in (np.float64, np.float32):
+            predictor = IntegratedPredictor(str(models_dir), dtype=dtype)
+            results[np.dtype(dtype).name] = _run(predictor, matches, batch_size)
+
+    print(f"\nFixtures: {n_fixtures:,}  Batch: {batch_size:,}  Features: {len(FEATURE_NAMES)}  Markets: {len(MARKETS)}")
+    print(f"\n⏱️  Features, per-row float64:   {rows_time:6.2f} s  ({X_rows.nbytes / 2 ** 20:.1f} MiB)")
+    print(f"⏱️  Features, columnar float32:  {cols_time:6.2f} s  ({X_cols.nbytes / 2 ** 20:.1f} MiB)")
+    print(f"   Max |difference|:            {feature_error:.1e}")
+
+    print(f"\n{'Scoring':<12}{'Time (s)':>10}{'µs/fixture':>12}{'Peak MiB':>10}")
+    for name, (_, elapsed, peak) in results.items():
+        print(f"{name:<12}{elapsed:>10.2f}{elapsed / n_fixtures * 1e6:>12.2f}{peak / 2 ** 20:>10.1f}")
+    (p64, t64, m64), (p32, t32, m32) = results['float64'], results['float32']
+    print(f"🚀 Speedup: {t64 / t32:.2f}x   Peak memory: {m32 / m64:.0%} of float64")
+
+    print("\n📊 Max |float32 - float64| probability per market:")
+    for market in p64:
+        assert p32[market].dtype == np.float32
+        print(f"   {market:<8} {np.abs(p32[market].astype(np.float64) - p64[market]).max():.1e}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark float32 vs float64 inference')
+    parser.add_argument('--fixtures', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    args = parser.parse_args()
+
+    benchmark_float32_inference(args.fixtures, args.batch_size)
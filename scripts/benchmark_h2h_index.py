@@ -0,0 +1,107 @@
+"""
+Benchmark Head-to-Head Index
+Index size, update throughput and batch history attach latency
+"""
+
+import sys
+import time
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from features.h2h_index import HeadToHeadIndex
+
+
+def benchmark_h2h_index(
+    n_leagues: int = 200,
+    teams_per_league: int = 20,
+    seasons: int = 10,
+    batch_sizes=(10, 100, 1_000, 10_000),
+    history_depth: int = 10
+):
+    """
+    Populate an index with double round-robin seasons and time batch attaches
+
+    Args:
+        n_leagues: Number of leagues
+        teams_per_league: Teams per league
+        seasons: Seasons of history per league
+        batch_sizes: Fixture batch sizes to time
+        history_depth: Meetings attached per fixture
+    """
+    print("\n" + "=" * 60)
+    print("HEAD-TO-HEAD INDEX BENCHMARK")
+    print("=" * 60)
+
+    rng = np.random.default_rng(42)
+    index = HeadToHeadIndex()
+    start_date = datetime(2015, 8, 1)
+
+    pairings = [
+        (home, away)
+        for home in range(teams_per_league)
+        for away in range(teams_per_league)
+        if home != away
+    ]
+    n_meetings = n_leagues * seasons * len(pairings)
+    goals = rng.poisson(1.3, (n_meetings, 2))
+    corners = rng.poisson(10.0, n_meetings)
+    cards = rng.poisson(4.0, n_meetings)
+
+    t0 = time.perf_counter()
+    i = 0
+    for season in range(seasons):
+        for j, (home, away) in enumerate(pairings):
+            kickoff = start_date + timedelta(days=365 * season + j // 10)
+            for league in range(n_leagues):
+                offset = league * teams_per_league
+                index.add_meeting(offset + home, offset + away, kickoff,
+                                  goals[i, 0], goals[i, 1], corners[i], cards[i])
+                i += 1
+    build_time = time.perf_counter() - t0
+
+    print(f"Teams: {n_leagues * teams_per_league:,}  Pairs: {index.n_pairs:,}  "
+          f"Meetings: {index.n_meetings:,}")
+    print(f"\n💾 Index size: {index.nbytes / 1024 ** 2:.2f} MB")
+    print(f"⏱️  Insert: {build_time / n_meetings * 1e6:.2f} µs/meeting")
+
+    as_of = start_date + timedelta(days=365 * seasons)
+    for batch_size in batch_sizes:
+        leagues = rng.integers(0, n_leagues, batch_size) * teams_per_league
+        pairs = rng.integers(0, len(pairings), batch_size)
+        fixtures = [
+            {
+                'home_team_id': int(league + pairings[p][0]),
+                'away_team_id': int(league + pairings[p][1]),
+                'home_team': f"Team {league + pairings[p][0]}",
+                'away_team': f"Team {league + pairings[p][1]}",
+                'match_datetime': as_of
+            }
+            for league, p in zip(leagues, pairs)
+        ]
+
+        t0 = time.perf_counter()
+        index.attach_histories(fixtures, history_depth=history_depth)
+        elapsed = time.perf_counter() - t0
+        print(f"⏱️  Attach {batch_size:>6,} fixtures: {elapsed * 1e3:8.2f} ms "
+              f"({elapsed / batch_size * 1e6:.1f} µs/fixture)")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the head-to-head index')
+    parser.add_argument('--leagues', type=int, default=200)
+    parser.add_argument('--teams-per-league', type=int, default=20)
+    parser.add_argument('--seasons', type=int, default=10)
+    parser.add_argument('--history-depth', type=int, default=10)
+    args = parser.parse_args()
+
+    benchmark_h2h_index(args.leagues, args.teams_per_league, args.seasons,
+                        history_depth=args.history_depth)
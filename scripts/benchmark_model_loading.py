@@ -0,0 +1,144 @@
+"""
+Benchmark Model Loading
+Worker startup time and memory for pickled models vs native, memory-mapped
+artifacts (all four markets, XGBoost + LightGBM + logistic per market)
+"""
+
+import multiprocessing as mp
+import pickle
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from predictor.model_io import load_model, save_model_artifacts
+from training.config import MODEL_CONFIGS
+
+MARKETS = ['goals', 'btts', 'cards', 'corners']
+MODEL_TYPES = ['xgboost', 'lightgbm', 'logistic']
+
+
+def _memory_kib() -> dict:
+    """Resident (RSS) and proportional (PSS) set size of this process"""
+    memory = {}
+    for path, key in (('/proc/self/status', 'VmRSS:'), ('/proc/self/smaps_rollup', 'Pss:')):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if line.startswith(key):
+                        memory[key.rstrip(':')] = int(line.split()[1])
+                        break
+        except OSError:
+            pass
+    return memory
+
+
+def _worker(args):
+    """Load every model, score one row, report timings and memory"""
+    fmt, models_dir, n_features, start_memory = args
+    warnings.filterwarnings('ignore')
+    row = np.zeros((1, n_features))
+
+    t0 = time.perf_counter()
+    models = {}
+    for market in MARKETS:
+        market_dir = Path(models_dir) / market
+        for model_type in MODEL_TYPES:
+            if fmt == 'pickle':
+                with open(market_dir / f"{model_type}_model.pkl", 'rb') as f:
+                    models[market, model_type] = pickle.load(f)
+            else:
+                models[market, model_type] = load_model(market_dir, model_type)
+    load_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for model in models.values():
+        model.predict_proba(row)
+    first_predict = time.perf_counter() - t0
+
+    memory = _memory_kib()
+    return {
+        'load': load_time,
+        'first_predict': first_predict,
+        'rss': memory.get('VmRSS', 0) - start_memory.get('VmRSS', 0),
+        'pss': memory.get('Pss', 0) - start_memory.get('Pss', 0)
+    }
+
+
+def _baseline(_):
+    """Memory of an idle worker, subtracted from the loaded figures"""
+    return _memory_kib()
+
+
+def benchmark_model_loading(n_workers: int = 4, n_features: int = 40):
+    """
+    Load the same models as pickle and as native artifacts in worker processes
+
+    Args:
+        n_workers: Worker processes, each loading every market's models
+        n_features: Feature columns of the synthetic training data
+    """
+    from lightgbm import LGBMClassifier
+    from sklearn.linear_model import LogisticRegression
+    from xgboost import XGBClassifier
+
+    print("\n" + "=" * 60)
+    print("MODEL LOADING BENCHMARK")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.gamma(2.0, 0.7, size=(6000, n_features)),
+                     columns=[f'feature_{i}' for i in range(n_features)])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pickle_dir, native_dir = Path(tmp) / 'pickle', Path(tmp) / 'native'
+        for market in MARKETS:
+            y = (X.iloc[:, 0] - X.iloc[:, MARKETS.index(market) + 1] + rng.normal(size=len(X)) > 0).astype(int)
+            models = {
+                'xgboost': XGBClassifier(**dict(MODEL_CONFIGS['xgboost']['params'], early_stopping_rounds=None)),
+                'lightgbm': LGBMClassifier(**MODEL_CONFIGS['lightgbm']['params']),
+                'logistic': LogisticRegression(max_iter=1000)
+            }
+            (pickle_dir / market).mkdir(parents=True)
+            for model_type, model in models.items():
+                model.fit(X, y)
+                with open(pickle_dir / market / f"{model_type}_model.pkl", 'wb') as f:
+                    pickle.dump(model, f)
+                save_model_artifacts(model, native_dir / market, model_type)
+
+        for name, directory in (('pickle', pickle_dir), ('native', native_dir)):
+            size = sum(p.stat().st_size for p in directory.rglob('*') if p.is_file())
+            print(f"\n📦 {name}: {size / 1024:,.0f} KiB on disk")
+
+            context = mp.get_context('spawn')
+            with context.Pool(n_workers) as pool:
+                start_memory = pool.map(_baseline, range(n_workers))
+                results = pool.map(
+                    _worker, [(name, str(directory), n_features, m) for m in start_memory]
+                )
+
+            load = np.mean([r['load'] for r in results])
+            first = np.mean([r['first_predict'] for r in results])
+            rss = np.mean([r['rss'] for r in results])
+            pss = np.mean([r['pss'] for r in results])
+            print(f"   ⏱️  load {load * 1e3:7.1f} ms  first predict {first * 1e3:6.1f} ms")
+            print(f"   🧠 per worker: RSS +{rss / 1024:6.1f} MiB  PSS +{pss / 1024:6.1f} MiB  ({n_workers} workers)")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark pickle vs native model loading')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    benchmark_model_loading(args.workers)
@@ -0,0 +1,102 @@
+"""
+Benchmark Rolling-Window Store
+Memory footprint, update throughput and as-of query latency at league scale
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from features.rolling_store import RollingWindowStore
+
+
+def benchmark_rolling_store(n_teams: int = 10_000, results_per_side: int = 40, capacity: int = 20):
+    """
+    Populate a store and time pushes and queries
+
+    Args:
+        n_teams: Number of teams
+        results_per_side: Results pushed per team per venue side
+        capacity: Ring buffer capacity
+    """
+    print("\n" + "=" * 60)
+    print("ROLLING-WINDOW STORE BENCHMARK")
+    print("=" * 60)
+    print(f"Teams: {n_teams:,}  Results/side: {results_per_side}  Capacity: {capacity}")
+
+    rng = np.random.default_rng(42)
+    store = RollingWindowStore(capacity=capacity)
+    start_date = datetime(2020, 8, 1)
+
+    n_pushes = n_teams * results_per_side * 2
+    goals = rng.poisson(1.4, n_pushes)
+    conceded = rng.poisson(1.2, n_pushes)
+    corners = rng.poisson(5.0, n_pushes)
+    cards = rng.poisson(2.0, n_pushes)
+
+    t0 = time.perf_counter()
+    i = 0
+    for week in range(results_per_side):
+        kickoff = start_date + timedelta(days=7 * week)
+        for team_id in range(n_teams):
+            for is_home in (True, False):
+                store.push(team_id, is_home, kickoff, goals[i], conceded[i],
+                           corners[i], cards[i], goals[i] > 0 and conceded[i] > 0)
+                i += 1
+    push_time = time.perf_counter() - t0
+
+    print(f"\n💾 Memory footprint: {store.nbytes / 1024 ** 2:.2f} MB "
+          f"({store.nbytes / n_teams:.0f} bytes/team)")
+    print(f"⏱️  Push: {push_time / n_pushes * 1e6:.2f} µs/result "
+          f"({n_pushes / push_time:,.0f} results/s)")
+
+    as_of = start_date + timedelta(days=7 * (results_per_side - 3))
+    query_teams = rng.integers(0, n_teams, 10_000)
+
+    for window in (5, 10, 20):
+        t0 = time.perf_counter()
+        for team_id in query_teams:
+            store.rolling_stats(int(team_id), as_of, True, window)
+        elapsed = time.perf_counter() - t0
+        print(f"⏱️  Single query (window={window:2d}): "
+              f"{elapsed / len(query_teams) * 1e6:.2f} µs")
+
+    team_list = query_teams.tolist()
+    t0 = time.perf_counter()
+    store.rolling_stats_batch(team_list, as_of, True, 10)
+    elapsed = time.perf_counter() - t0
+    print(f"⏱️  Batch query ({len(team_list):,} teams): {elapsed * 1e3:.2f} ms "
+          f"({elapsed / len(team_list) * 1e6:.3f} µs/team)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "rolling_store.npz"
+        t0 = time.perf_counter()
+        store.save(path)
+        save_time = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        RollingWindowStore.load(path)
+        load_time = time.perf_counter() - t0
+        size_mb = path.stat().st_size / 1024 ** 2
+
+    print(f"💾 Saved file: {size_mb:.2f} MB (save {save_time * 1e3:.0f} ms, "
+          f"load {load_time * 1e3:.0f} ms)")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the rolling-window store')
+    parser.add_argument('--teams', type=int, default=10_000)
+    parser.add_argument('--results-per-side', type=int, default=40)
+    parser.add_argument('--capacity', type=int, default=20)
+    args = parser.parse_args()
+
+    benchmark_rolling_store(args.teams, args.results_per_side, args.capacity)
@@ -0,0 +1,75 @@
+"""
+Benchmark Match Simulation
+Simulated matches per second (one core) for the Monte Carlo engine, with
+and without chunking
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from predictor.simulation import MatchSimulator
+
+
+def benchmark_simulation(n_fixtures: int = 50, n_sims: int = 200_000, chunk_size: int = 20_000):
+    """
+    Time simulate() and chunked probabilities() for a day of fixtures
+
+    Args:
+        n_fixtures: Fixtures simulated together
+        n_sims: Simulations per fixture
+        chunk_size: Simulations per fixture per chunk
+    """
+    print("\n" + "=" * 60)
+    print("MATCH SIMULATION BENCHMARK")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    means = {
+        'home_goals': rng.uniform(0.8, 2.2, n_fixtures), 'away_goals': rng.uniform(0.6, 1.6, n_fixtures),
+        'home_corners': rng.uniform(4, 6, n_fixtures), 'away_corners': rng.uniform(3.5, 5.5, n_fixtures),
+        'home_cards': rng.uniform(1.5, 2.5, n_fixtures), 'away_cards': rng.uniform(1.5, 2.5, n_fixtures)
+    }
+    simulator = MatchSimulator(rho=-0.08, dispersion={'corners': 12.0}, seed=0)
+    total = n_fixtures * n_sims
+
+    t0 = time.perf_counter()
+    samples = simulator.simulate(means, n_sims)
+    elapsed = time.perf_counter() - t0
+    memory = sum(a.nbytes for a in (samples.home_goals, samples.away_goals, samples.corners, samples.cards))
+    print(f"Fixtures: {n_fixtures}  Simulations/fixture: {n_sims:,}")
+    print(f"\n⏱️  simulate():      {total / elapsed / 1e6:6.2f} M matches/s  ({memory / 2 ** 20:.0f} MiB of samples)")
+
+    expressions = ['over_2_5 & btts_yes', '(home_win | draw) & corners_over_9_5', 'under_2_5 & cards_over_3_5']
+    t0 = time.perf_counter()
+    for expression in expressions:
+        samples.probability(expression)
+    print(f"⏱️  3 expressions:   {(time.perf_counter() - t0) * 1e3:6.1f} ms")
+
+    t0 = time.perf_counter()
+    simulator.probabilities(means, expressions, n_sims, chunk_size)
+    elapsed = time.perf_counter() - t0
+    print(f"⏱️  probabilities(): {total / elapsed / 1e6:6.2f} M matches/s incl. evaluation "
+          f"(chunks of {chunk_size:,})")
+
+    p = samples.probability('over_2_5 & btts_yes')
+    independent = samples.probability('over_2_5') * samples.probability('btts_yes')
+    print(f"\n📊 P(Over 2.5 & BTTS) {p.mean():.3f} vs independence {independent.mean():.3f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark the match simulation engine')
+    parser.add_argument('--fixtures', type=int, default=50)
+    parser.add_argument('--sims', type=int, default=200_000)
+    parser.add_argument('--chunk-size', type=int, default=20_000)
+    args = parser.parse_args()
+
+    benchmark_simulation(args.fixtures, args.sims, args.chunk_size)
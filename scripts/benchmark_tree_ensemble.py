@@ -0,0 +1,84 @@
+"""
+Benchmark Flat Tree Ensembles
+Latency of the NumPy tree evaluator vs XGBoost / LightGBM predict_proba
+at batch sizes 1, 10 and 1000
+"""
+
+import sys
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from predictor.tree_ensemble import FlatTreeEnsemble
+from training.config import MODEL_CONFIGS
+
+
+def _time_per_call(fn, X, min_time: float = 0.5) -> float:
+    """Mean seconds per call, repeating for at least ``min_time``"""
+    fn(X)
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
+def benchmark_tree_ensemble(batch_sizes=(1, 10, 1000), n_features: int = 20):
+    """
+    Time both paths for the training configs' XGBoost and LightGBM models
+
+    Args:
+        batch_sizes: Rows per predict call
+        n_features: Feature columns
+    """
+    from xgboost import XGBClassifier
+    from lightgbm import LGBMClassifier
+
+    warnings.filterwarnings('ignore', message='X does not have valid feature names')
+
+    print("\n" + "=" * 60)
+    print("FLAT TREE ENSEMBLE BENCHMARK")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.gamma(2.0, 0.7, size=(6000, n_features)),
+                     columns=[f'feature_{i}' for i in range(n_features)])
+    y = (X.iloc[:, 0] - X.iloc[:, 1] + rng.normal(size=len(X)) > 0).astype(int)
+
+    xgb_params = dict(MODEL_CONFIGS['xgboost']['params'], early_stopping_rounds=None)
+    models = {
+        'xgboost': XGBClassifier(**xgb_params).fit(X, y, verbose=False),
+        'lightgbm': LGBMClassifier(**MODEL_CONFIGS['lightgbm']['params']).fit(X, y)
+    }
+
+    for name, model in models.items():
+        flat = FlatTreeEnsemble.from_model(model)
+        print(f"\n📊 {name}: {flat.n_trees} trees, {flat.n_nodes:,} nodes, depth {flat.max_depth}")
+
+        for size in batch_sizes:
+            batch = X.to_numpy()[:size]
+            error = np.abs(flat.predict_proba(batch) - model.predict_proba(batch)).max()
+            native = _time_per_call(model.predict_proba, batch)
+            numpy_time = _time_per_call(flat.predict_proba, batch)
+            print(f"   batch {size:>5}: native {native * 1e6:9.1f} µs  flat {numpy_time * 1e6:9.1f} µs  "
+                  f"({native / numpy_time:5.1f}x)  max diff {error:.1e}")
+
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark flat tree ensembles')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 10, 1000])
+    args = parser.parse_args()
+
+    benchmark_tree_ensemble(args.batch_sizes)
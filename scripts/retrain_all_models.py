@@ -6,19 +6,18 @@ Automated retraining workflow for all markets
 import sys
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Optional
 import json
 
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from training.build_datasets import build_all_training_datasets
-from training.train_goals import train_goals_model
-from training.train_btts import train_btts_model
-from training.train_cards import train_cards_model
-from training.train_corners import train_corners_model
-from training.config import (
-    RETRAIN_CONFIG, MODELS_DIR, TRAINING_DATA_PATHS
-)
+from training.market_trainer import MarketTrainer
+from training.distill import distill_market
+from training.parallel_training import train_markets_parallel
+from training.incremental import data_end_date, train_market_incremental
+from training.config import RETRAIN_CONFIG, MODELS_DIR
 from training.utils import increment_version
 
 
@@ -94,12 +93,21 @@ def promote_model(market: str, new_version: str):
     print(f"✅ Promoted {market} model to version {new_version}")
 
 
-def retrain_all_models(force: bool = False):
+def retrain_all_models(
+    force: bool = False,
+    parallel: bool = True,
+    workers: Optional[int] = None,
+    incremental: bool = False
+):
     """
     Main retraining workflow
     
     Args:
         force: Force retraining even if not needed
+        parallel: Train all markets' base models concurrently
+        workers: Worker processes for parallel training (default: one per core)
+        incremental: Warm-start from the active models where possible; markets
+            whose update is not possible or fails its gate are trained from scratch
     """
     print("\n" + "=" * 60)
     print("AUTOMATED MODEL RETRAINING WORKFLOW")
@@ -121,20 +129,41 @@ def retrain_all_models(force: bool = False):
     
     # Step 2: Train models for each market
     markets = ['goals', 'btts', 'cards', 'corners']
-    training_functions = {
-        'goals': train_goals_model,
-        'btts': train_btts_model,
-        'cards': train_cards_model,
-        'corners': train_corners_model
-    }
+    # Incremental updates, serial training and distillation share one load
+    # of the training table, made by the first step that needs it
+    trainer = MarketTrainer()
     
     results = {}
+    trained = {}
+    
+    if incremental:
+        print("\n📊 Step 2: Updating market models incrementally...")
+        for market in markets:
+            try:
+                # Distilled below, once the promoted version is stamped
+                result = train_market_incremental(market, redistill=False, trainer=trainer)
+            except Exception as e:
+                print(f"❌ Error updating {market} model incrementally: {e}")
+                continue
+            if result and result['gate']['passed']:
+                trained[market] = result
+    
+    scratch_markets = [market for market in markets if market not in trained]
+    if parallel and scratch_markets:
+        print("\n📊 Step 2: Training market models in parallel...")
+        try:
+            parallel_results = train_markets_parallel(scratch_markets, max_workers=workers)
+            parallel_results.pop('timing', None)
+            # Markets whose jobs all failed fall back to serial training below
+            trained.update({market: result for market, result in parallel_results.items() if result})
+        except Exception as e:
+            print(f"❌ Parallel training failed, training markets serially: {e}")
     
     for market in markets:
-        print(f"\n📊 Step 2.{markets.index(market)+1}: Training {market} model...")
+        print(f"\n📊 Step 2.{markets.index(market)+1}: {'Promoting' if market in trained else 'Training'} {market} model...")
         
         try:
-            result = training_functions[market]()
+            result = trained[market] if market in trained else trainer.train_market(market)
             results[market] = result
             
             # Validate performance
@@ -162,11 +191,19 @@ def retrain_all_models(force: bool = False):
                         metadata = json.load(f)
                     metadata['version'] = new_version
                     metadata['retrained_at'] = datetime.now().isoformat()
+                    # Incremental updates continue from matches after this date
+                    metadata['data_end_date'] = data_end_date(trainer.data_path)
                     with open(ensemble_meta_path, 'w') as f:
                         json.dump(metadata, f, indent=2)
                 
                 # Promote model
                 promote_model(market, new_version)
+                
+                # Distill the promoted ensemble into the served student
+                try:
+                    distill_market(market, trainer=trainer)
+                except Exception as e:
+                    print(f"⚠️  Could not distill {market} model: {e}")
             else:
                 print(f"⚠️  {market} model did not meet performance thresholds - not promoted")
         
@@ -176,6 +213,9 @@ def retrain_all_models(force: bool = False):
             traceback.print_exc()
             continue
     
+    if trainer.timings:
+        trainer.print_timings()
+    
     # Step 3: Summary
     print("\n" + "=" * 60)
     print("RETRAINING SUMMARY")
@@ -201,7 +241,16 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Retrain all betting models')
     parser.add_argument('--force', action='store_true', 
                        help='Force retraining even if not needed')
+    parser.add_argument('--serial', action='store_true',
+                       help='Train markets one after another')
+    parser.add_argument('--workers', type=int,
+                       help='Worker processes for parallel training')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Continue boosting the active models on new matches')
     
     args = parser.parse_args()
     
-    retrain_all_models(force=args.force)
+    retrain_all_models(
+        force=args.force, parallel=not args.serial,
+        workers=args.workers, incremental=args.incremental
+    )
@@ -7,6 +7,12 @@ import pandas as pd
 import numpy as np
 from typing import Dict, List, Optional
 
+# Try importing from smart_bets_ai package first, fallback to direct import
+try:
+    from smart_bets_ai.features.form_encoding import encode_forms, total_points
+except ImportError:
+    from features.form_encoding import encode_forms, total_points
+
 
 class FeatureEngineer:
     """
@@ -142,20 +148,12 @@ class FeatureEngineer:
     
     def _add_form_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add form-based features"""
-        # Convert form strings to numeric scores
-        def form_to_score(form_str):
-            if pd.isna(form_str) or not isinstance(form_str, str):
-                return 0
-            score = 0
-            for char in form_str:
-                if char == 'W':
-                    score += 3
-                elif char == 'D':
-                    score += 1
-            return score
-        
-        df['home_form_score'] = df['home_form'].apply(form_to_score)
-        df['away_form_score'] = df['away_form'].apply(form_to_score)
+        # Encode form strings once and score them (W=3, D=1); missing forms score 0
+        home_codes, _ = encode_forms(df['home_form'], sequences=False)
+        away_codes, _ = encode_forms(df['away_form'], sequences=False)
+        
+        df['home_form_score'] = total_points(home_codes)
+        df['away_form_score'] = total_points(away_codes)
         df['form_differential'] = df['home_form_score'] - df['away_form_score']
         df['combined_form_score'] = df['home_form_score'] + df['away_form_score']
         
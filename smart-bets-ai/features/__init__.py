@@ -5,12 +5,23 @@ Transforms raw match data into 100+ intelligent features for ML models
 
 from .core_stats import CoreStatisticsEngine
 from .head_to_head import HeadToHeadAnalyzer
-from .player_intelligence import PlayerIntelligenceEngine
-from .environmental import EnvironmentalAnalyzer
 from .momentum import MomentumAnalyzer
 from .market_specific import MarketSpecificFeatures
+from .columnar import ColumnarFeatureEngine
+from .team_snapshot import TeamSnapshotCache
 from .feature_pipeline import FeaturePipeline
 
+# Player and environmental modules are optional until they ship
+try:
+    from .player_intelligence import PlayerIntelligenceEngine
+except ImportError:
+    PlayerIntelligenceEngine = None
+
+try:
+    from .environmental import EnvironmentalAnalyzer
+except ImportError:
+    EnvironmentalAnalyzer = None
+
 __all__ = [
     'CoreStatisticsEngine',
     'HeadToHeadAnalyzer',
@@ -18,6 +29,8 @@ __all__ = [
     'EnvironmentalAnalyzer',
     'MomentumAnalyzer',
     'MarketSpecificFeatures',
+    'ColumnarFeatureEngine',
+    'TeamSnapshotCache',
     'FeaturePipeline'
 ]
 
@@ -0,0 +1,635 @@
+"""
+Columnar Feature Engine
+Vectorized batch implementation of the FeaturePipeline feature groups
+Produces the same columns and values as the per-match dict path
+"""
+
+import operator
+from itertools import chain, repeat
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .team_snapshot import TeamSnapshotCache
+from .kernels import mean_difference, pad_histories, tail_variance, trailing_run
+from .form_encoding import (
+    DRAW, FORM_WEIGHTS, WIN,
+    count_code, encode_forms, mean_points, trailing_streak, weighted_points
+)
+
+
+# Per-side defaults used by MarketSpecificFeatures when a key is missing
+MARKET_DEFAULTS = {
+    'home': {
+        'goals_avg': 1.2, 'shots_per_game': 12.0, 'shots_on_target_pct': 0.35,
+        'big_chances': 2.5, 'corners_avg': 5.0, 'corners_against_avg': 4.5,
+        'yellows_avg': 1.8, 'reds_season': 2, 'fouls_avg': 11.0,
+        'clean_sheets_rate': 0.3, 'blanks_rate': 0.2,
+        'scored_last_5_count': 4, 'conceded_last_5_count': 3,
+    },
+    'away': {
+        'goals_avg': 1.0, 'shots_per_game': 10.0, 'shots_on_target_pct': 0.33,
+        'big_chances': 2.0, 'corners_avg': 4.5, 'corners_against_avg': 5.0,
+        'yellows_avg': 1.7, 'reds_season': 1, 'fouls_avg': 10.5,
+        'clean_sheets_rate': 0.25, 'blanks_rate': 0.25,
+        'scored_last_5_count': 3, 'conceded_last_5_count': 4,
+    },
+}
+
+# Column that HeadToHeadAnalyzer omits when a pair has 1-2 meetings
+_PARTIAL_H2H_COLUMN = 'h2h_corners_trend'
+
+_MISSING = object()
+
+
+class MatchColumns:
+    """
+    Column accessor over a list of match data dicts
+
+    Gathers one input key at a time into a NumPy array, applying the same
+    defaults as ``dict.get`` in the per-match feature modules.
+    """
+
+    def __init__(self, matches_data: List[Dict[str, Any]]):
+        self.matches = matches_data
+        self.n = len(matches_data)
+
+    def scalar(self, key: str, default: Any = 0) -> np.ndarray:
+        """
+        Float column for ``key``
+
+        Args:
+            key: Input key
+            default: Scalar default or per-row array of defaults
+
+        Raises:
+            ValueError: If a value is missing-like (None/NaN) or non-numeric
+        """
+        if np.ndim(default) == 0:
+            raw = [m.get(key, default) for m in self.matches]
+        else:
+            raw = [m.get(key, _MISSING) for m in self.matches]
+            for i, value in enumerate(raw):
+                if value is _MISSING:
+                    raw[i] = default[i]
+
+        values = np.array(raw, dtype=np.float64)
+        if np.isnan(values).any():
+            raise ValueError(f"Missing or non-numeric values for '{key}'")
+        return values
+
+    def history(self, key: str, width: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Right-aligned padded matrix of the last ``width`` values of a list
+
+        Args:
+            key: Input key holding a list of numbers per match
+            width: Columns kept (defaults to the longest list)
+
+        Returns:
+            Tuple of (values matrix, full list lengths)
+        """
+        lists = [m.get(key, ()) for m in self.matches]
+        return pad_histories(lists, width, self.n)
+
+    def results(self, key: str, width: int = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Right-aligned result code matrix for a list of W/D/L results
+
+        Returns:
+            Tuple of (codes matrix, full list lengths)
+        """
+        return encode_forms([m.get(key, ()) for m in self.matches], width)
+
+    def form_points(self, key: str) -> np.ndarray:
+        """
+        Average points per character of a form string (1.5 when empty)
+
+        Mirrors CoreStatisticsEngine._form_to_points.
+        """
+        codes, lengths = encode_forms([m.get(key, '') for m in self.matches])
+        return mean_points(codes, lengths)
+
+    def lengths(self, key: str) -> np.ndarray:
+        """Length of the list held under ``key`` for each match (0 if missing)"""
+        return np.fromiter((len(m.get(key, ())) for m in self.matches), np.int64, self.n)
+
+    def raw(self, key: str, default: Any = None) -> List[Any]:
+        """Raw values for ``key`` (for comparisons on non-numeric fields)"""
+        return [m.get(key, default) for m in self.matches]
+
+
+class ColumnarFeatureEngine:
+    """
+    Computes every FeaturePipeline feature group over whole columns
+
+    Each group is evaluated with array operations over the batch instead of
+    per-match dict updates. Features that depend on one team only are built
+    as per-side blocks and combined with the cross terms (differentials,
+    combined and expected values, head-to-head).
+
+    Inputs the dict path would reject (None values, malformed histories,
+    divisions by zero) raise here, so callers can fall back to the
+    per-match path, which skips the offending matches.
+    """
+
+    def __init__(
+        self,
+        feature_names: List[str],
+        groups: Optional[Iterable[str]] = None,
+        snapshot_cache: Optional[TeamSnapshotCache] = None
+    ):
+        """
+        Args:
+            feature_names: Column order of the dict path
+                (FeaturePipeline.get_feature_names(), or the pruned output)
+            groups: Feature groups to compute (FeaturePipeline.get_feature_groups()
+                keys); None computes all of them
+            snapshot_cache: Cache of per-team side blocks (optional); cleared
+                here since cached rows follow this engine's block layout
+        """
+        self.feature_names = list(feature_names)
+        self.groups = None if groups is None else frozenset(groups)
+        self.snapshot_cache = snapshot_cache
+        self._side_names: Dict[str, List[str]] = {}
+        if snapshot_cache is not None:
+            snapshot_cache.clear()
+
+    def _wants(self, group: str) -> bool:
+        """Whether a feature group is computed"""
+        return self.groups is None or group in self.groups
+
+    def transform(self, matches_data: List[Dict[str, Any]]) -> pd.DataFrame:
+        """
+        Transform a batch of matches into a feature DataFrame
+
+        Args:
+            matches_data: List of match data dictionaries
+
+        Returns:
+            DataFrame indexed by match_id with the dict path's columns
+        """
+        if not matches_data:
+            raise ValueError("No features generated from input data")
+
+        columns = self.compute(matches_data)
+        match_ids = [m.get('match_id', f'match_{i}') for i, m in enumerate(matches_data)]
+
+        return pd.DataFrame(columns, index=pd.Index(match_ids, name='match_id'))
+
+    def compute(self, matches_data: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Compute all feature columns in the dict path's column order
+
+        Args:
+            matches_data: List of match data dictionaries
+
+        Returns:
+            Ordered dictionary of feature name -> column array
+        """
+        cols = MatchColumns(matches_data)
+        home = self._cached_side_block(matches_data, cols, 'home')
+        away = self._cached_side_block(matches_data, cols, 'away')
+        features = {**home, **away}
+        features.update(self.cross_terms(cols, home, away))
+        if self._wants('h2h'):
+            features.update(self.h2h_block(cols))
+
+        for name, values in features.items():
+            if np.isinf(values).any():
+                raise ValueError(f"Non-finite values generated for '{name}'")
+
+        h2h_counts = cols.lengths('h2h_history')
+        return {name: features[name] for name in self._column_order(h2h_counts)}
+
+    # ------------------------------------------------------------------
+    # Per-side blocks
+    # ------------------------------------------------------------------
+
+    def side_block(self, cols: MatchColumns, side: str) -> Dict[str, np.ndarray]:
+        """
+        Features that depend on one team's data only
+
+        Args:
+            cols: Column accessor for the batch
+            side: 'home' or 'away'
+
+        Returns:
+            Dictionary of feature name -> column array
+        """
+        f = {}
+        p = side + '_'
+        market = MARKET_DEFAULTS[side]
+
+        # Legacy averages double as defaults throughout
+        goals_avg = cols.scalar(p + 'goals_avg')
+        conceded_avg = cols.scalar(p + 'goals_conceded_avg')
+        corners_avg = cols.scalar(p + 'corners_avg')
+        cards_avg = cols.scalar(p + 'cards_avg')
+        for name, values in (
+            ('goals_avg', goals_avg), ('goals_conceded_avg', conceded_avg),
+            ('corners_avg', corners_avg), ('cards_avg', cards_avg),
+        ):
+            f[p + name] = values
+        f[p + 'btts_rate'] = cols.scalar(p + 'btts_rate')
+
+        if self._wants('core'):
+            f.update(self._core_side(cols, p, goals_avg, conceded_avg, corners_avg, cards_avg))
+        if self._wants('momentum'):
+            f.update(self._momentum_side(cols, p))
+        f.update(self._market_side(cols, p, market))
+        return f
+
+    def _cached_side_block(
+        self,
+        matches_data: List[Dict[str, Any]],
+        cols: MatchColumns,
+        side: str
+    ) -> Dict[str, np.ndarray]:
+        """
+        ``side_block`` served from the team snapshot cache where possible
+
+        Only sides without a cached (team, side, as-of) block are computed,
+        once per distinct key, and their blocks are cached.
+        """
+        cache = self.snapshot_cache
+        if cache is None:
+            return self.side_block(cols, side)
+
+        keys, rows, cached = cache.lookup(matches_data, side)
+        if rows:
+            sub = cols if len(rows) == cols.n else MatchColumns([matches_data[i] for i in rows])
+            block = self.side_block(sub, side)
+            names = self._side_names[side] = list(block)
+            computed = np.column_stack([block[name] for name in names])
+        else:
+            names = self._side_names[side]
+            computed = np.empty((0, len(names)))
+
+        # Table rows: the computed blocks, then the cached ones
+        source = {}
+        row_of = {}
+        for j, i in enumerate(rows):
+            row_of[i] = j
+            if keys[i] is not None:
+                source[keys[i]] = j
+                cache.put(keys[i], computed[j].copy())
+        for k, key in enumerate(cached, start=len(rows)):
+            source[key] = k
+
+        table = np.vstack([computed, *cached.values()]) if cached else computed
+        index = np.fromiter(
+            (row_of[i] if key is None else source[key] for i, key in enumerate(keys)),
+            np.intp, cols.n
+        )
+        values = table[index]
+        return {name: values[:, c] for c, name in enumerate(names)}
+
+    def _core_side(self, cols, p, goals_avg, conceded_avg, corners_avg, cards_avg):
+        """CoreStatisticsEngine features for one side"""
+        f = {}
+
+        # Rolling averages; the full goals history is kept for the scoring streak
+        goals, n_goals = cols.history(p + 'goals_history')
+        if goals.shape[1] < 10:
+            goals = np.pad(goals, ((0, 0), (10 - goals.shape[1], 0)))
+        last_5 = goals[:, -5:].sum(axis=1) / 5
+        last_10 = goals[:, -10:].sum(axis=1) / 10
+        has_5 = n_goals >= 5
+        f[p + 'goals_last_5'] = np.where(has_5, last_5, goals_avg)
+        f[p + 'goals_last_10'] = np.where(n_goals >= 10, last_10, np.where(has_5, last_5, goals_avg))
+
+        corners, n_corners = cols.history(p + 'corners_history', 5)
+        f[p + 'corners_last_5'] = np.where(n_corners >= 5, corners.sum(axis=1) / 5, corners_avg)
+        cards, n_cards = cols.history(p + 'cards_history', 5)
+        f[p + 'cards_last_5'] = np.where(n_cards >= 5, cards.sum(axis=1) / 5, cards_avg)
+
+        # Weighted form from the last four results, else the form string
+        last_4, n_last_4 = cols.results(p + 'results_last_4')
+        if last_4.shape[1] > 4:
+            raise ValueError(f"'{p}results_last_4' holds more than four results")
+        f[p + 'weighted_form'] = np.where(
+            n_last_4 >= 4, weighted_points(last_4, FORM_WEIGHTS), cols.form_points(p + 'form')
+        )
+
+        # Variance over the last 10 goals
+        variance = tail_variance(goals[:, -10:], np.minimum(n_goals, 10))
+        f[p + 'goals_variance'] = np.where(has_5, variance, 0.5)
+        f[p + 'consistency_score'] = np.where(has_5, 1 / (1 + variance), 0.67)
+
+        # Streaks
+        results, n_results = cols.results(p + 'results_last_10')
+        f[p + 'win_streak'] = trailing_streak(results, (WIN,)).astype(np.float64)
+        f[p + 'unbeaten_streak'] = trailing_streak(results, (WIN, DRAW)).astype(np.float64)
+        f[p + 'scoring_streak'] = trailing_run(goals > 0, n_goals)
+
+        # Venue splits
+        if p == 'home_':
+            venue_goals = cols.scalar('home_home_goals_avg', goals_avg)
+            f['home_home_goals_avg'] = venue_goals
+            f['home_home_conceded_avg'] = cols.scalar('home_home_conceded_avg', conceded_avg)
+            f['home_venue_advantage'] = venue_goals - goals_avg
+        else:
+            venue_goals = cols.scalar('away_away_goals_avg', goals_avg)
+            f['away_away_goals_avg'] = venue_goals
+            f['away_away_conceded_avg'] = cols.scalar('away_away_conceded_avg', conceded_avg)
+            f['away_venue_disadvantage'] = goals_avg - venue_goals
+
+        # Time patterns
+        f[p + 'first_half_goals_avg'] = cols.scalar(p + 'first_half_goals_avg', goals_avg * 0.45)
+        f[p + 'second_half_goals_avg'] = cols.scalar(p + 'second_half_goals_avg', goals_avg * 0.55)
+        f[p + 'late_goals_rate'] = cols.scalar(p + 'goals_after_75min_rate', 0.25)
+
+        return f
+
+    def _momentum_side(self, cols, p):
+        """MomentumAnalyzer features for one side"""
+        f = {}
+
+        last_4, n_last_4 = cols.results(p + 'results_last_4')
+        f[p + 'momentum_score'] = np.where(n_last_4 >= 4, weighted_points(last_4, FORM_WEIGHTS), 1.5)
+
+        goals_last, n_goals_last = cols.history(p + 'goals_last_3')
+        goals_prev, n_goals_prev = cols.history(p + 'goals_prev_3')
+        f[p + 'scoring_momentum'] = mean_difference(goals_last, n_goals_last, goals_prev, n_goals_prev)
+        first_two = np.array([sum(g[:2]) for g in cols.raw(p + 'goals_last_3', [])], dtype=np.float64)
+        f[p + 'hot_streak'] = (first_two >= 3).astype(np.float64)
+
+        conceded_last, n_conceded_last = cols.history(p + 'conceded_last_3')
+        conceded_prev, n_conceded_prev = cols.history(p + 'conceded_prev_3')
+        f[p + 'defensive_momentum'] = mean_difference(
+            conceded_prev, n_conceded_prev, conceded_last, n_conceded_last
+        )
+        padding = np.arange(conceded_last.shape[1]) < (conceded_last.shape[1] - n_conceded_last)[:, None]
+        f[p + 'clean_sheets_last_3'] = ((conceded_last == 0) & ~padding).sum(axis=1).astype(np.float64)
+
+        results, n_results = cols.results(p + 'results_last_5')
+        goal_diff = cols.scalar(p + 'recent_goal_diff')
+        position_change = cols.scalar(p + 'position_change_last_5')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            win_rate = count_code(results, WIN) / n_results
+        f[p + 'confidence_score'] = np.where(
+            n_results > 0,
+            win_rate * 4 + np.minimum(goal_diff / 5, 3) + np.minimum(position_change, 3),
+            5.0
+        )
+
+        f[p + 'under_pressure'] = (cols.scalar(p + 'winless_streak') >= 3).astype(np.float64)
+        f[p + 'bounce_back'] = (cols.scalar(p + 'last_loss_margin') >= 3).astype(np.float64)
+        f[p + 'overperforming'] = np.maximum(0, cols.scalar(p + 'actual_vs_expected_points'))
+
+        matches_7_days = cols.scalar(p + 'matches_last_7_days', 1)
+        days_rest = cols.scalar(p + 'days_since_last_match', 7)
+        f[p + 'matches_last_7_days'] = matches_7_days
+        f[p + 'days_rest'] = days_rest
+        f[p + 'fatigue_risk'] = ((matches_7_days >= 2) & (days_rest < 4)).astype(np.float64)
+
+        return f
+
+    def _market_side(self, cols, p, market):
+        """MarketSpecificFeatures inputs and ratios for one side"""
+        f = {}
+
+        if self._wants('goals'):
+            actual_goals = cols.scalar(p + 'goals_avg', market['goals_avg'])
+            xg = cols.scalar(p + 'xg_last_5', actual_goals)
+            shots = cols.scalar(p + 'shots_per_game', market['shots_per_game'])
+            on_target = cols.scalar(p + 'shots_on_target_pct', market['shots_on_target_pct'])
+            f[p + 'xg_last_5'] = xg
+            f[p + 'xg_diff'] = actual_goals - xg
+            f[p + 'shots_per_game'] = shots
+            f[p + 'shots_on_target_pct'] = on_target
+            with np.errstate(invalid='ignore', divide='ignore'):
+                f[p + 'conversion_rate'] = np.where(shots > 0, actual_goals / shots, 0.1)
+            f[p + 'big_chances_per_game'] = cols.scalar(p + 'big_chances', market['big_chances'])
+            f[p + 'attacking_intensity'] = shots * on_target
+
+        if self._wants('corners'):
+            corners_avg = cols.scalar(p + 'corners_avg', market['corners_avg'])
+            f[p + 'corners_first_half_avg'] = cols.scalar(p + 'corners_1h_avg', corners_avg * 0.45)
+            f[p + 'corners_second_half_avg'] = cols.scalar(p + 'corners_2h_avg', corners_avg * 0.55)
+            possession = cols.scalar(p + 'possession_pct', 50.0)
+            f[p + 'possession_avg'] = possession
+            f[p + 'attacking_style_score'] = possession / 100 * corners_avg
+            f[p + 'corners_conceded_avg'] = cols.scalar(p + 'corners_against_avg', market['corners_against_avg'])
+            f['_' + p + 'market_corners_avg'] = corners_avg
+            if p == 'home_':
+                corners, n_corners = cols.history('home_corners_history', 10)
+                f['home_corners_variance'] = np.where(
+                    n_corners >= 5, tail_variance(corners, np.minimum(n_corners, 10)), 2.0
+                )
+
+        if self._wants('cards'):
+            yellows = cols.scalar(p + 'yellows_avg', market['yellows_avg'])
+            fouls = cols.scalar(p + 'fouls_avg', market['fouls_avg'])
+            f[p + 'yellow_cards_avg'] = yellows
+            f[p + 'red_cards_total'] = cols.scalar(p + 'reds_season', market['reds_season'])
+            f[p + 'fouls_per_game'] = fouls
+            f[p + 'fouls_to_cards_ratio'] = fouls / (yellows + 0.1)
+
+        if self._wants('btts'):
+            f[p + 'clean_sheets_rate'] = cols.scalar(p + 'clean_sheets_rate', market['clean_sheets_rate'])
+            f[p + 'failed_to_score_rate'] = cols.scalar(p + 'blanks_rate', market['blanks_rate'])
+            scored = cols.scalar(p + 'scored_last_5_count', market['scored_last_5_count'])
+            conceded = cols.scalar(p + 'conceded_last_5_count', market['conceded_last_5_count'])
+            f[p + 'scored_in_last_5'] = scored
+            f[p + 'scoring_consistency'] = scored / 5
+            f[p + 'conceded_in_last_5'] = conceded
+            f[p + 'defensive_vulnerability'] = conceded / 5
+
+        return f
+
+    # ------------------------------------------------------------------
+    # Cross terms
+    # ------------------------------------------------------------------
+
+    def cross_terms(
+        self,
+        cols: MatchColumns,
+        home: Dict[str, np.ndarray],
+        away: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Features combining both sides or describing the match itself
+
+        Args:
+            cols: Column accessor for the batch
+            home, away: Per-side blocks from ``side_block``
+
+        Returns:
+            Dictionary of feature name -> column array
+        """
+        f = {}
+
+        if self._wants('momentum'):
+            f['momentum_differential'] = home['home_momentum_score'] - away['away_momentum_score']
+            f['confidence_differential'] = home['home_confidence_score'] - away['away_confidence_score']
+            f['away_travel_distance_km'] = cols.scalar('away_travel_distance')
+
+        if self._wants('goals'):
+            f['combined_xg'] = home['home_xg_last_5'] + away['away_xg_last_5']
+            f['combined_shots_per_game'] = home['home_shots_per_game'] + away['away_shots_per_game']
+
+        if self._wants('corners'):
+            f['expected_home_corners'] = (
+                home['_home_market_corners_avg'] + away['away_corners_conceded_avg']
+            ) / 2
+            f['expected_away_corners'] = (
+                away['_away_market_corners_avg'] + home['home_corners_conceded_avg']
+            ) / 2
+            f['expected_total_corners'] = f['expected_home_corners'] + f['expected_away_corners']
+
+        if self._wants('cards'):
+            f['expected_total_cards'] = (
+                home['home_yellow_cards_avg'] + away['away_yellow_cards_avg'] +
+                (home['home_red_cards_total'] + away['away_red_cards_total']) / 10
+            )
+            f['combined_fouls_avg'] = home['home_fouls_per_game'] + away['away_fouls_per_game']
+            f['match_rivalry_score'] = cols.scalar('rivalry_intensity')
+            f['match_importance_score'] = cols.scalar('match_importance', 5)
+            f['referee_cards_per_game'] = cols.scalar('referee_cards_avg', 3.5)
+            f['referee_strictness'] = cols.scalar('referee_strictness_rating', 5.0)
+            f['combined_aggression_score'] = (
+                (f['combined_fouls_avg'] / 20) * 3 +
+                f['match_rivalry_score'] / 10 * 3 +
+                f['referee_strictness'] / 10 * 4
+            )
+
+        if self._wants('btts'):
+            f['btts_probability_estimate'] = (
+                (1 - home['home_failed_to_score_rate']) *
+                (1 - away['away_failed_to_score_rate'])
+            )
+            f['both_teams_score_capability'] = (
+                home['home_scoring_consistency'] * away['away_scoring_consistency']
+            )
+            f['both_teams_concede_likelihood'] = (
+                home['home_defensive_vulnerability'] * away['away_defensive_vulnerability']
+            )
+            f['btts_composite_score'] = (
+                f['btts_probability_estimate'] * 0.4 +
+                f['both_teams_score_capability'] * 0.3 +
+                f['both_teams_concede_likelihood'] * 0.3
+            )
+
+        if self._wants('legacy'):
+            f['combined_goals_avg'] = home['home_goals_avg'] + away['away_goals_avg']
+            f['combined_corners_avg'] = home['home_corners_avg'] + away['away_corners_avg']
+            f['combined_cards_avg'] = home['home_cards_avg'] + away['away_cards_avg']
+
+        return f
+
+    def h2h_block(self, cols: MatchColumns) -> Dict[str, np.ndarray]:
+        """
+        HeadToHeadAnalyzer features for the batch
+
+        All meetings of all fixtures are flattened into one array per field
+        and reduced per fixture with bincount.
+        """
+        n = cols.n
+        histories = cols.raw('h2h_history', [])
+        counts = cols.lengths('h2h_history')
+        meetings = list(chain.from_iterable(histories))
+        total = len(meetings)
+
+        seg = np.repeat(np.arange(n), counts)
+        starts = np.cumsum(counts) - counts
+        position = np.arange(total) - starts[seg]
+
+        home_teams = cols.raw('home_team')
+        fixture_home = [home_teams[i] for i in seg.tolist()]
+
+        def field(name):
+            return np.fromiter(map(dict.get, meetings, repeat(name), repeat(0)), np.float64, total)
+
+        def flag(name, values):
+            return np.fromiter(
+                map(operator.eq, map(dict.get, meetings, repeat(name)), values), bool, total
+            )
+
+        total_goals = field('total_goals')
+        total_corners = field('total_corners')
+        total_cards = field('total_cards')
+        home_goals = field('home_goals')
+        away_goals = field('away_goals')
+        home_won = flag('winner', fixture_home)
+        drawn = flag('result', ['D'] * total)
+        same_venue = flag('home_team', fixture_home)
+
+        def seg_sum(values):
+            return np.bincount(seg, weights=values, minlength=n)
+
+        f = {}
+        has = counts > 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            home_wins = seg_sum(home_won)
+            draws = seg_sum(drawn)
+            f['h2h_home_wins'] = home_wins
+            f['h2h_away_wins'] = counts - home_wins - draws
+            f['h2h_draws'] = draws
+            f['h2h_home_win_rate'] = np.where(has, home_wins / counts, 0.33)
+            f['h2h_draw_rate'] = np.where(has, draws / counts, 0.33)
+
+            avg_goals = seg_sum(total_goals) / counts
+            avg_corners = seg_sum(total_corners) / counts
+            f['h2h_avg_total_goals'] = np.where(has, avg_goals, 2.5)
+            f['h2h_avg_total_corners'] = np.where(has, avg_corners, 10.0)
+            f['h2h_avg_total_cards'] = np.where(has, seg_sum(total_cards) / counts, 3.5)
+            btts = (home_goals > 0) & (away_goals > 0)
+            f['h2h_btts_rate'] = np.where(has, seg_sum(btts) / counts, 0.5)
+            f['h2h_over_2_5_rate'] = np.where(has, seg_sum(total_goals > 2.5) / counts, 0.5)
+
+            # Meetings are ordered most recent first
+            recent = position < 3
+            recent_goals = seg_sum(np.where(recent, total_goals, 0)) / 3
+            recent_corners = seg_sum(np.where(recent, total_corners, 0)) / 3
+            trended = counts >= 3
+            f['h2h_recent_trend'] = np.where(trended, recent_goals - avg_goals, 0)
+            f['h2h_goals_trend'] = np.where(trended, recent_goals > avg_goals, 0).astype(np.float64)
+            f[_PARTIAL_H2H_COLUMN] = np.where(
+                trended, recent_corners - avg_corners, np.where(has, np.nan, 0)
+            )
+
+            venue_counts = seg_sum(same_venue)
+            venue_goals = seg_sum(np.where(same_venue, total_goals, 0)) / venue_counts
+            at_venue = venue_counts > 0
+            f['h2h_home_venue_goals_avg'] = np.where(has, np.where(at_venue, venue_goals, 0), 2.5)
+            f['h2h_home_venue_advantage'] = np.where(at_venue, venue_goals - avg_goals, 0)
+
+            goal_diff = np.where(same_venue, home_goals - away_goals, away_goals - home_goals)
+            avg_diff = seg_sum(goal_diff) / counts
+            diff_variance = seg_sum((goal_diff - avg_diff[seg]) ** 2) / counts
+            dominance = np.where(goal_diff > 1, 1.0, np.where(goal_diff > 0, 0.5, 0.0))
+            f['h2h_avg_goal_difference'] = np.where(has, avg_diff, 0)
+            f['h2h_goal_diff_variance'] = np.where(has, diff_variance, 1.0)
+            f['h2h_dominance_score'] = np.where(has, seg_sum(dominance) / counts, 0.5)
+
+        return f
+
+    # ------------------------------------------------------------------
+    # Column order
+    # ------------------------------------------------------------------
+
+    def _column_order(self, h2h_counts: np.ndarray) -> List[str]:
+        """
+        Column order of ``pd.DataFrame`` built from the per-match dicts
+
+        The dict path adds keys module by module, so columns follow
+        ``feature_names``. The only key missing from some rows is
+        ``h2h_corners_trend`` (pairs with 1-2 meetings); pandas appends it
+        after the other columns when the first match lacks it and drops it
+        when every match does.
+        """
+        order = list(self.feature_names)
+        if _PARTIAL_H2H_COLUMN not in order:
+            return order
+
+        partial = (h2h_counts > 0) & (h2h_counts < 3)
+        if partial.all():
+            order.remove(_PARTIAL_H2H_COLUMN)
+        elif partial[0]:
+            order.remove(_PARTIAL_H2H_COLUMN)
+            order.append(_PARTIAL_H2H_COLUMN)
+
+        return order
@@ -9,6 +9,8 @@ import pandas as pd
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 
+from .form_encoding import FORM_WEIGHTS, encode_forms, mean_points, weighted_points
+
 
 class CoreStatisticsEngine:
     """
@@ -60,15 +62,15 @@ class CoreStatisticsEngine:
         away_goals_history = match_data.get('away_goals_history', [])
         
         if len(home_goals_history) >= 5:
-            features['home_goals_last_5'] = np.mean(home_goals_history[-5:])
-            features['home_goals_last_10'] = np.mean(home_goals_history[-10:]) if len(home_goals_history) >= 10 else features['home_goals_last_5']
+            features['home_goals_last_5'] = sum(home_goals_history[-5:]) / 5
+            features['home_goals_last_10'] = sum(home_goals_history[-10:]) / 10 if len(home_goals_history) >= 10 else features['home_goals_last_5']
         else:
             features['home_goals_last_5'] = match_data.get('home_goals_avg', 0)
             features['home_goals_last_10'] = match_data.get('home_goals_avg', 0)
         
         if len(away_goals_history) >= 5:
-            features['away_goals_last_5'] = np.mean(away_goals_history[-5:])
-            features['away_goals_last_10'] = np.mean(away_goals_history[-10:]) if len(away_goals_history) >= 10 else features['away_goals_last_5']
+            features['away_goals_last_5'] = sum(away_goals_history[-5:]) / 5
+            features['away_goals_last_10'] = sum(away_goals_history[-10:]) / 10 if len(away_goals_history) >= 10 else features['away_goals_last_5']
         else:
             features['away_goals_last_5'] = match_data.get('away_goals_avg', 0)
             features['away_goals_last_10'] = match_data.get('away_goals_avg', 0)
@@ -77,43 +79,37 @@ class CoreStatisticsEngine:
         home_corners_history = match_data.get('home_corners_history', [])
         away_corners_history = match_data.get('away_corners_history', [])
         
-        features['home_corners_last_5'] = np.mean(home_corners_history[-5:]) if len(home_corners_history) >= 5 else match_data.get('home_corners_avg', 0)
-        features['away_corners_last_5'] = np.mean(away_corners_history[-5:]) if len(away_corners_history) >= 5 else match_data.get('away_corners_avg', 0)
+        features['home_corners_last_5'] = sum(home_corners_history[-5:]) / 5 if len(home_corners_history) >= 5 else match_data.get('home_corners_avg', 0)
+        features['away_corners_last_5'] = sum(away_corners_history[-5:]) / 5 if len(away_corners_history) >= 5 else match_data.get('away_corners_avg', 0)
         
         # Cards rolling averages
         home_cards_history = match_data.get('home_cards_history', [])
         away_cards_history = match_data.get('away_cards_history', [])
         
-        features['home_cards_last_5'] = np.mean(home_cards_history[-5:]) if len(home_cards_history) >= 5 else match_data.get('home_cards_avg', 0)
-        features['away_cards_last_5'] = np.mean(away_cards_history[-5:]) if len(away_cards_history) >= 5 else match_data.get('away_cards_avg', 0)
+        features['home_cards_last_5'] = sum(home_cards_history[-5:]) / 5 if len(home_cards_history) >= 5 else match_data.get('home_cards_avg', 0)
+        features['away_cards_last_5'] = sum(away_cards_history[-5:]) / 5 if len(away_cards_history) >= 5 else match_data.get('away_cards_avg', 0)
         
         return features
     
     def _weighted_form(self, match_data: Dict[str, Any]) -> Dict[str, float]:
         """Calculate exponentially weighted form (recent games matter more)"""
-        features = {}
-        
-        # Exponential decay weights (most recent = highest weight)
-        weights = np.array([0.4, 0.3, 0.2, 0.1])
-        
-        # Home team weighted form
-        home_results = match_data.get('home_results_last_4', [])
-        if len(home_results) >= 4:
-            # Convert W/D/L to points (3/1/0)
-            points = [3 if r == 'W' else 1 if r == 'D' else 0 for r in home_results[-4:]]
-            features['home_weighted_form'] = np.average(points, weights=weights)
-        else:
-            features['home_weighted_form'] = self._form_to_points(match_data.get('home_form', ''))
-        
-        # Away team weighted form
-        away_results = match_data.get('away_results_last_4', [])
-        if len(away_results) >= 4:
-            points = [3 if r == 'W' else 1 if r == 'D' else 0 for r in away_results[-4:]]
-            features['away_weighted_form'] = np.average(points, weights=weights)
-        else:
-            features['away_weighted_form'] = self._form_to_points(match_data.get('away_form', ''))
-        
-        return features
+        # Last four results of both teams, W/D/L converted to points (3/1/0)
+        codes, lengths = encode_forms([
+            match_data.get('home_results_last_4', []),
+            match_data.get('away_results_last_4', [])
+        ], width=4)
+        weighted = weighted_points(codes, FORM_WEIGHTS)
+        
+        # Teams without four results fall back to their form string
+        form_points = self._forms_to_points([
+            match_data.get('home_form', ''),
+            match_data.get('away_form', '')
+        ])
+        
+        return {
+            'home_weighted_form': weighted[0] if lengths[0] >= 4 else form_points[0],
+            'away_weighted_form': weighted[1] if lengths[1] >= 4 else form_points[1]
+        }
     
     def _variance_metrics(self, match_data: Dict[str, Any]) -> Dict[str, float]:
         """Calculate variance and consistency metrics"""
@@ -122,7 +118,7 @@ class CoreStatisticsEngine:
         # Goals variance (consistency indicator)
         home_goals_history = match_data.get('home_goals_history', [])
         if len(home_goals_history) >= 5:
-            features['home_goals_variance'] = np.var(home_goals_history[-10:])
+            features['home_goals_variance'] = _variance(home_goals_history[-10:])
             features['home_consistency_score'] = 1 / (1 + features['home_goals_variance'])
         else:
             features['home_goals_variance'] = 0.5
@@ -130,7 +126,7 @@ class CoreStatisticsEngine:
         
         away_goals_history = match_data.get('away_goals_history', [])
         if len(away_goals_history) >= 5:
-            features['away_goals_variance'] = np.var(away_goals_history[-10:])
+            features['away_goals_variance'] = _variance(away_goals_history[-10:])
             features['away_consistency_score'] = 1 / (1 + features['away_goals_variance'])
         else:
             features['away_goals_variance'] = 0.5
@@ -198,10 +194,12 @@ class CoreStatisticsEngine:
     
     def _form_to_points(self, form_string: str) -> float:
         """Convert form string (WWDLW) to average points"""
-        if not form_string:
-            return 1.5
-        points = sum(3 if c == 'W' else 1 if c == 'D' else 0 for c in form_string)
-        return points / len(form_string) if form_string else 1.5
+        return float(self._forms_to_points([form_string])[0])
+    
+    def _forms_to_points(self, form_strings: List[str]) -> np.ndarray:
+        """Average points for several form strings (1.5 when empty)"""
+        codes, lengths = encode_forms(form_strings)
+        return mean_points(codes, lengths)
     
     def _calculate_streak(self, results: List[str], target: Any) -> int:
         """Calculate current streak of specific result(s)"""
@@ -248,3 +246,9 @@ class CoreStatisticsEngine:
             'home_second_half_goals_avg', 'away_second_half_goals_avg',
             'home_late_goals_rate', 'away_late_goals_rate'
         ]
+
+
+def _variance(values: List[float]) -> float:
+    """Population variance of a short list (np.var without the array overhead)"""
+    mean = sum(values) / len(values)
+    return sum((v - mean) ** 2 for v in values) / len(values)
@@ -3,8 +3,11 @@ Feature Pipeline Orchestrator
 Coordinates all feature engineering modules to generate 100+ intelligent features
 """
 
+import json
+import time
 import pandas as pd
 import numpy as np
+from pathlib import Path
 from typing import Dict, List, Any, Optional
 import logging
 
@@ -12,9 +15,21 @@ from .core_stats import CoreStatisticsEngine
 from .head_to_head import HeadToHeadAnalyzer
 from .momentum import MomentumAnalyzer
 from .market_specific import MarketSpecificFeatures
+from .columnar import ColumnarFeatureEngine
+from .team_snapshot import TeamSnapshotCache
 
 logger = logging.getLogger(__name__)
 
+# Basic features from the original system, kept for compatibility
+LEGACY_FEATURES = [
+    'home_goals_avg', 'away_goals_avg',
+    'home_goals_conceded_avg', 'away_goals_conceded_avg',
+    'home_corners_avg', 'away_corners_avg',
+    'home_cards_avg', 'away_cards_avg',
+    'home_btts_rate', 'away_btts_rate',
+    'combined_goals_avg', 'combined_corners_avg', 'combined_cards_avg'
+]
+
 
 class FeaturePipeline:
     """
@@ -22,7 +37,24 @@ class FeaturePipeline:
     Generates 100+ features from raw match data
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        use_columnar: bool = True,
+        required_features: Optional[List[str]] = None,
+        snapshot_cache: Optional[TeamSnapshotCache] = None,
+        h2h_index=None
+    ):
+        """
+        Args:
+            use_columnar: Compute batches with the vectorized columnar engine
+            required_features: Only compute what these features need
+                (e.g. the loaded models' feature columns); None computes all
+            snapshot_cache: Reuse per-team side blocks across batches
+                (columnar engine only); register it as a result observer
+            h2h_index: HeadToHeadIndex (features/h2h_index.py at the project
+                root) attaching ``h2h_history`` to matches that carry team
+                IDs but no history; register it as a result observer
+        """
         self.core_stats = CoreStatisticsEngine()
         self.h2h_analyzer = HeadToHeadAnalyzer()
         self.momentum_analyzer = MomentumAnalyzer()
@@ -30,6 +62,77 @@ class FeaturePipeline:
         
         self.feature_count = 0
         self.feature_names = []
+        
+        # Pruning state: None means every group and column is produced
+        self.use_columnar = use_columnar
+        self.required_features = None
+        self.active_groups = None
+        self.snapshot_cache = snapshot_cache
+        self.h2h_index = h2h_index
+        
+        self.columnar_engine = (
+            ColumnarFeatureEngine(self.get_feature_names(), snapshot_cache=snapshot_cache)
+            if use_columnar else None
+        )
+        
+        if required_features is not None:
+            self.prune(required_features)
+    
+    @classmethod
+    def for_models(cls, models_dir: str, use_columnar: bool = True) -> 'FeaturePipeline':
+        """
+        Pipeline pruned to the features the models in a directory use
+        
+        Args:
+            models_dir: Directory with model metadata JSON files
+            use_columnar: Compute batches with the vectorized columnar engine
+            
+        Returns:
+            FeaturePipeline
+        """
+        return cls(use_columnar, required_features=required_features_from_models(models_dir))
+    
+    def prune(self, required_features: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        Restrict the pipeline to the groups and columns some models need
+        
+        A feature's group is computed whole, so derived features always
+        have their inputs (e.g. ``combined_aggression_score`` pulls in the
+        cards group); only the required columns are returned.
+        
+        Args:
+            required_features: Feature columns to produce (None restores
+                the full pipeline)
+            
+        Returns:
+            Pruning report (see ``get_pruning_report``)
+        """
+        if required_features is None:
+            self.required_features = None
+            self.active_groups = None
+        else:
+            required = set(required_features)
+            unknown = sorted(required.difference(self.get_feature_names()))
+            if unknown:
+                logger.warning(f"{len(unknown)} required features are not generated by the pipeline: {unknown}")
+            
+            self.active_groups = {
+                group for group, names in self.get_feature_groups().items()
+                if required.intersection(names)
+            }
+            self.required_features = [name for name in self.get_feature_names() if name in required]
+        
+        if self.use_columnar:
+            self.columnar_engine = ColumnarFeatureEngine(
+                self.get_output_feature_names(), self.active_groups, self.snapshot_cache
+            )
+        
+        report = self.get_pruning_report()
+        logger.info(
+            f"Feature pruning: computing {report['computed_features']}/{report['total_features']} "
+            f"features ({report['skipped_features']} skipped, groups: {', '.join(report['active_groups'])})"
+        )
+        return report
     
     def transform(self, match_data: Dict[str, Any]) -> Dict[str, float]:
         """
@@ -42,26 +145,43 @@ class FeaturePipeline:
             Dictionary of 100+ engineered features
         """
         features = {}
+        wants = self._wants
+        match_data = self._with_h2h_history([match_data])[0]
         
         try:
             # Core statistical features (30+ features)
-            logger.debug("Generating core statistics features...")
-            features.update(self.core_stats.create_features(match_data))
+            if wants('core'):
+                logger.debug("Generating core statistics features...")
+                features.update(self.core_stats.create_features(match_data))
             
             # Head-to-head features (18+ features)
-            logger.debug("Generating head-to-head features...")
-            features.update(self.h2h_analyzer.analyze_h2h(match_data))
+            if wants('h2h'):
+                logger.debug("Generating head-to-head features...")
+                features.update(self.h2h_analyzer.analyze_h2h(match_data))
             
             # Momentum and psychological features (25+ features)
-            logger.debug("Generating momentum features...")
-            features.update(self.momentum_analyzer.analyze_momentum(match_data))
+            if wants('momentum'):
+                logger.debug("Generating momentum features...")
+                features.update(self.momentum_analyzer.analyze_momentum(match_data))
             
             # Market-specific features (60+ features)
             logger.debug("Generating market-specific features...")
-            features.update(self.market_features.create_all_market_features(match_data))
+            if wants('goals'):
+                features.update(self.market_features.create_goals_features(match_data))
+            if wants('corners'):
+                features.update(self.market_features.create_corners_features(match_data))
+            if wants('cards'):
+                features.update(self.market_features.create_cards_features(match_data))
+            if wants('btts'):
+                features.update(self.market_features.create_btts_features(match_data))
             
             # Add basic features from original system (for compatibility)
-            features.update(self._add_legacy_features(match_data))
+            if wants('legacy'):
+                features.update(self._add_legacy_features(match_data))
+            
+            # Drop columns of computed groups that no model uses
+            if self.required_features is not None:
+                features = {name: features[name] for name in self.required_features if name in features}
             
             self.feature_count = len(features)
             logger.info(f"Generated {self.feature_count} features successfully")
@@ -76,12 +196,29 @@ class FeaturePipeline:
         """
         Transform multiple matches into feature DataFrame
         
+        Uses the columnar engine when enabled. Batches it rejects (e.g.
+        matches with malformed inputs) go through the per-match path, which
+        skips the matches that fail.
+        
         Args:
             matches_data: List of match data dictionaries
             
         Returns:
             DataFrame with features for all matches
         """
+        matches_data = self._with_h2h_history(matches_data)
+        if self.columnar_engine is not None and matches_data:
+            try:
+                df = self.columnar_engine.transform(matches_data)
+                logger.info(f"Generated features for {len(df)} matches with {len(df.columns)} features each")
+                return df
+            except Exception as e:
+                logger.warning(f"Columnar feature generation failed, using per-match path: {str(e)}")
+        
+        return self._transform_batch_rowwise(matches_data)
+    
+    def _transform_batch_rowwise(self, matches_data: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Transform matches one at a time through ``transform``"""
         features_list = []
         
         for i, match_data in enumerate(matches_data):
@@ -106,6 +243,31 @@ class FeaturePipeline:
         
         return df
     
+    def _with_h2h_history(self, matches_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Matches with head-to-head histories attached from the index where missing"""
+        if self.h2h_index is None or not self._wants('h2h'):
+            return matches_data
+        
+        missing = [
+            i for i, match in enumerate(matches_data)
+            if 'h2h_history' not in match
+            and match.get('home_team_id') is not None and match.get('away_team_id') is not None
+        ]
+        if not missing:
+            return matches_data
+        
+        # Copies, so callers' match dicts are left unchanged
+        matches_data = list(matches_data)
+        fixtures = [dict(matches_data[i]) for i in missing]
+        self.h2h_index.attach_histories(fixtures)
+        for i, fixture in zip(missing, fixtures):
+            matches_data[i] = fixture
+        return matches_data
+    
+    def _wants(self, group: str) -> bool:
+        """Whether a feature group is computed"""
+        return self.active_groups is None or group in self.active_groups
+    
     def _add_legacy_features(self, match_data: Dict[str, Any]) -> Dict[str, float]:
         """
         Add basic features from original system for backward compatibility
@@ -150,15 +312,7 @@ class FeaturePipeline:
         feature_names.extend(self.market_features.get_feature_names())
         
         # Add legacy features
-        legacy_features = [
-            'home_goals_avg', 'away_goals_avg',
-            'home_goals_conceded_avg', 'away_goals_conceded_avg',
-            'home_corners_avg', 'away_corners_avg',
-            'home_cards_avg', 'away_cards_avg',
-            'home_btts_rate', 'away_btts_rate',
-            'combined_goals_avg', 'combined_corners_avg', 'combined_cards_avg'
-        ]
-        feature_names.extend(legacy_features)
+        feature_names.extend(LEGACY_FEATURES)
         
         # Remove duplicates while preserving order
         seen = set()
@@ -166,6 +320,80 @@ class FeaturePipeline:
         
         return self.feature_names
     
+    def get_output_feature_names(self) -> List[str]:
+        """
+        Feature columns the pipeline returns (all, or the required ones when pruned)
+        
+        Returns:
+            List of feature names
+        """
+        if self.required_features is not None:
+            return list(self.required_features)
+        return self.get_feature_names()
+    
+    def get_feature_groups(self) -> Dict[str, List[str]]:
+        """
+        Features of each computation group, the unit pruning works on
+        
+        Returns:
+            Dictionary mapping group names to their feature lists
+        """
+        groups = {
+            'core': self.core_stats.get_feature_names(),
+            'h2h': self.h2h_analyzer.get_feature_names(),
+            'momentum': self.momentum_analyzer.get_feature_names()
+        }
+        groups.update(self.market_features.get_market_feature_groups())
+        groups['legacy'] = list(LEGACY_FEATURES)
+        return groups
+    
+    def get_pruning_report(
+        self,
+        sample_matches: Optional[List[Dict[str, Any]]] = None,
+        repeats: int = 3
+    ) -> Dict[str, Any]:
+        """
+        Summarize what pruning skips, optionally timing the saving
+        
+        Args:
+            sample_matches: Matches to time single-match requests on, with
+                and without pruning (optional)
+            repeats: Timing repeats (the fastest run is kept)
+            
+        Returns:
+            Dictionary with feature/group counts and, when sample matches
+            are given, per-request times in milliseconds
+        """
+        groups = self.get_feature_groups()
+        active = [group for group in groups if self._wants(group)]
+        total = len(self.get_feature_names())
+        computed = sum(len(groups[group]) for group in active)
+        
+        report = {
+            'total_features': total,
+            'required_features': len(self.get_output_feature_names()),
+            'computed_features': computed,
+            'skipped_features': total - computed,
+            'active_groups': active,
+            'skipped_groups': [group for group in groups if group not in active]
+        }
+        
+        if sample_matches:
+            full = FeaturePipeline(self.use_columnar)
+            full_ms = _time_per_request(full, sample_matches, repeats)
+            pruned_ms = _time_per_request(self, sample_matches, repeats)
+            report.update({
+                'full_ms_per_request': full_ms,
+                'pruned_ms_per_request': pruned_ms,
+                'saved_ms_per_request': full_ms - pruned_ms
+            })
+            logger.info(
+                f"Feature pruning saves {full_ms - pruned_ms:.3f} ms per request "
+                f"({full_ms:.3f} -> {pruned_ms:.3f} ms)"
+            )
+        
+        return report
+    
     def get_feature_importance_groups(self) -> Dict[str, List[str]]:
         """
         Group features by their source module for interpretability
@@ -178,14 +406,7 @@ class FeaturePipeline:
             'head_to_head': self.h2h_analyzer.get_feature_names(),
             'momentum': self.momentum_analyzer.get_feature_names(),
             'market_specific': self.market_features.get_feature_names(),
-            'legacy': [
-                'home_goals_avg', 'away_goals_avg',
-                'home_goals_conceded_avg', 'away_goals_conceded_avg',
-                'home_corners_avg', 'away_corners_avg',
-                'home_cards_avg', 'away_cards_avg',
-                'home_btts_rate', 'away_btts_rate',
-                'combined_goals_avg', 'combined_corners_avg', 'combined_cards_avg'
-            ]
+            'legacy': list(LEGACY_FEATURES)
         }
     
     def validate_features(self, features: Dict[str, float]) -> bool:
@@ -209,9 +430,10 @@ class FeaturePipeline:
             logger.warning(f"Found {inf_count} infinite values in features")
             return False
         
-        # Check minimum feature count
-        if len(features) < 50:
-            logger.error(f"Insufficient features generated: {len(features)} < 50")
+        # Check minimum feature count (h2h_corners_trend may be absent)
+        minimum = min(50, len(self.get_output_feature_names()) - 1)
+        if len(features) < minimum:
+            logger.error(f"Insufficient features generated: {len(features)} < {minimum}")
             return False
         
         return True
@@ -227,6 +449,7 @@ class FeaturePipeline:
         
         return {
             'total_features': len(self.get_feature_names()),
+            'output_features': len(self.get_output_feature_names()),
             'feature_groups': {
                 name: len(features) 
                 for name, features in feature_groups.items()
@@ -238,3 +461,34 @@ class FeaturePipeline:
                 'market_specific': 'Specialized features for each betting market'
             }
         }
+
+
+def required_features_from_models(models_dir: str) -> List[str]:
+    """
+    Union of the feature columns recorded for a set of trained models
+    
+    Args:
+        models_dir: Directory searched recursively for ``*metadata.json``
+            files (as written by ``save_model_with_metadata``)
+            
+    Returns:
+        Feature names in first-seen order
+    """
+    required = {}
+    for path in sorted(Path(models_dir).rglob('*metadata.json')):
+        with open(path, 'r') as f:
+            metadata = json.load(f)
+        required.update(dict.fromkeys(metadata.get('feature_columns', [])))
+    
+    return list(required)
+
+
+def _time_per_request(pipeline: FeaturePipeline, matches: List[Dict[str, Any]], repeats: int) -> float:
+    """Fastest mean time in ms to transform one match at a time"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for match in matches:
+            pipeline.transform_batch([match])
+        best = min(best, time.perf_counter() - start)
+    return best / len(matches) * 1000
@@ -0,0 +1,137 @@
+"""
+Form Encoding
+W/D/L form strings and result lists encoded once into a uint8 code matrix
+Shared by FeatureEngineer, CoreStatisticsEngine, MomentumAnalyzer and the columnar engine
+"""
+
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Result codes; PAD fills the left of rows shorter than the matrix width
+PAD = 0
+LOSS = 1     # 'L' and any character other than 'W'/'D'
+DRAW = 2
+WIN = 3
+
+# Points per code (3/1/0), indexed by code
+POINTS = np.array([0, 0, 1, 3], dtype=np.int64)
+
+# Weights for the last four results, applied oldest first as in the
+# weighted form and momentum features
+FORM_WEIGHTS = (0.4, 0.3, 0.2, 0.1)
+
+# Byte -> code lookup table
+_LUT = np.full(256, LOSS, dtype=np.uint8)
+_LUT[ord('W')] = WIN
+_LUT[ord('D')] = DRAW
+
+
+def encode_forms(
+    forms: Iterable[Any],
+    width: Optional[int] = None,
+    sequences: bool = True
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode form strings into a right-aligned uint8 code matrix
+
+    The most recent result stays last, so column -1 holds each row's latest
+    result and shorter rows are padded with PAD on the left.
+
+    Args:
+        forms: Form strings ('WWDLW'), or lists of result strings
+        width: Columns kept (defaults to the longest form); longer forms
+            keep their last ``width`` results
+        sequences: Also encode lists/tuples of results; when False,
+            anything that is not a string encodes as an empty form
+
+    Returns:
+        Tuple of (codes matrix, full form lengths)
+    """
+    strings = [_as_form_string(form, sequences) for form in forms]
+    n = len(strings)
+    lengths = np.fromiter(map(len, strings), np.int64, n)
+    if width is None:
+        width = int(lengths.max(initial=0))
+
+    codes = np.zeros((n, width), dtype=np.uint8)
+    total = int(lengths.sum())
+    if total == 0 or width == 0:
+        return codes, lengths
+
+    flat = _LUT[np.frombuffer(''.join(strings).encode('latin-1', 'replace'), dtype=np.uint8)]
+    rows = np.repeat(np.arange(n), lengths)
+    from_end = np.repeat(np.cumsum(lengths), lengths) - 1 - np.arange(total)
+    keep = from_end < width
+    codes[rows[keep], width - 1 - from_end[keep]] = flat[keep]
+    return codes, lengths
+
+
+def form_points(codes: np.ndarray) -> np.ndarray:
+    """Points (3/1/0) for each code; padding scores 0"""
+    return POINTS[codes]
+
+
+def total_points(codes: np.ndarray) -> np.ndarray:
+    """Total points per row"""
+    return form_points(codes).sum(axis=1)
+
+
+def mean_points(codes: np.ndarray, lengths: np.ndarray, empty: float = 1.5) -> np.ndarray:
+    """Average points per result, ``empty`` for rows without results"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(lengths > 0, total_points(codes) / lengths, empty)
+
+
+def weighted_points(codes: np.ndarray, weights: Sequence[float]) -> np.ndarray:
+    """
+    Weighted average points over the last ``len(weights)`` results
+
+    Matches ``np.average(points, weights=weights)`` with points ordered
+    oldest first. Rows with fewer results score their padding as 0, so
+    callers mask them.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    k = len(weights)
+    points = form_points(codes[:, -k:]) if codes.shape[1] >= k else np.zeros((len(codes), k))
+    return (points * weights).sum(axis=1) / weights.sum()
+
+
+def count_code(codes: np.ndarray, code: int) -> np.ndarray:
+    """Number of results with the given code per row"""
+    return (codes == code).sum(axis=1)
+
+
+def trailing_streak(codes: np.ndarray, targets: Sequence[int]) -> np.ndarray:
+    """
+    Length of the run of target codes ending at each row's latest result
+
+    Args:
+        codes: Code matrix from ``encode_forms``
+        targets: Codes that extend the streak, e.g. (WIN,) or (WIN, DRAW)
+
+    Returns:
+        Streak length per row
+    """
+    width = codes.shape[1]
+    if width == 0:
+        return np.zeros(len(codes), dtype=np.int64)
+    broken = ~np.isin(codes, targets)[:, ::-1]
+    return np.where(broken.any(axis=1), broken.argmax(axis=1), width)
+
+
+def _as_form_string(form: Any, sequences: bool) -> str:
+    """One character per result; non-form values become empty forms"""
+    if isinstance(form, str):
+        return form
+    if sequences and isinstance(form, (list, tuple, np.ndarray)):
+        try:
+            joined = ''.join(form)
+            if len(joined) == len(form):
+                return joined
+        except TypeError:
+            pass
+        # Multi-character or non-string entries: only exact 'W'/'D' count
+        return ''.join('W' if r == 'W' else 'D' if r == 'D' else 'L' for r in form)
+    return ''
@@ -0,0 +1,86 @@
+"""
+History Kernels
+Batch kernels over right-aligned padded history matrices (matches x last-N)
+Used by the columnar engine to vectorize CoreStatisticsEngine / MarketSpecificFeatures
+"""
+
+from itertools import chain
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def pad_histories(
+    lists: Sequence[Sequence[float]],
+    width: Optional[int] = None,
+    n: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack the last ``width`` items of each list into a right-aligned matrix
+
+    The most recent value stays last, so column -1 holds each row's latest
+    value and shorter rows are padded with zeros on the left.
+
+    Args:
+        lists: One sequence of numbers per match
+        width: Columns kept (defaults to the longest sequence)
+        n: Number of sequences, when ``lists`` has no len()
+
+    Returns:
+        Tuple of (float matrix, full sequence lengths)
+    """
+    n = len(lists) if n is None else n
+    lengths = np.fromiter(map(len, lists), np.int64, n)
+    if width is None:
+        width = int(lengths.max(initial=0))
+    kept = np.minimum(lengths, width)
+    total = int(kept.sum())
+
+    matrix = np.zeros((n, width), dtype=np.float64)
+    if total == 0:
+        return matrix, lengths
+
+    tails = lists if width >= lengths.max() else (seq[max(len(seq) - width, 0):] for seq in lists)
+    flat = np.fromiter(chain.from_iterable(tails), np.float64, total)
+
+    rows = np.repeat(np.arange(n), kept)
+    offsets = np.repeat(width - kept - (np.cumsum(kept) - kept), kept)
+    matrix[rows, np.arange(total) + offsets] = flat
+    return matrix, lengths
+
+
+def tail_mask(width: int, counts: np.ndarray) -> np.ndarray:
+    """Boolean matrix selecting the last ``counts`` columns of each row"""
+    return np.arange(width) >= (width - np.asarray(counts))[:, None]
+
+
+def tail_mean(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Mean of the right-aligned last ``counts`` items per row (NaN when 0)"""
+    valid = tail_mask(values.shape[1], counts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(valid, values, 0).sum(axis=1) / counts
+
+
+def tail_variance(values: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Population variance of the right-aligned last ``counts`` items per row"""
+    valid = tail_mask(values.shape[1], counts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, values, 0).sum(axis=1) / counts
+        return np.where(valid, (values - mean[:, None]) ** 2, 0).sum(axis=1) / counts
+
+
+def trailing_run(condition: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """Length of the run of True values ending at the last item of each row"""
+    width = condition.shape[1]
+    if width == 0:
+        return np.zeros(condition.shape[0])
+    broken = ~(condition & tail_mask(width, lengths))[:, ::-1]
+    run = np.where(broken.any(axis=1), broken.argmax(axis=1), width)
+    return run.astype(np.float64)
+
+
+def mean_difference(a, n_a, b, n_b) -> np.ndarray:
+    """mean(a) - mean(b) where both lists are non-empty, else 0"""
+    with np.errstate(invalid='ignore', divide='ignore'):
+        diff = a.sum(axis=1) / n_a - b.sum(axis=1) / n_b
+    return np.where((n_a > 0) & (n_b > 0), diff, 0)
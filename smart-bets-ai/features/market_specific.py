@@ -240,6 +240,10 @@ class MarketSpecificFeatures:
     
     def get_feature_names(self) -> List[str]:
         """Return list of all market-specific feature names"""
+        return [name for names in self.get_market_feature_groups().values() for name in names]
+    
+    def get_market_feature_groups(self) -> Dict[str, List[str]]:
+        """Return feature names per market, in generation order"""
         goals_features = [
             'home_xg_last_5', 'away_xg_last_5', 'combined_xg',
             'home_xg_diff', 'away_xg_diff',
@@ -283,4 +287,9 @@ class MarketSpecificFeatures:
             'btts_composite_score'
         ]
         
-        return goals_features + corners_features + cards_features + btts_features
+        return {
+            'goals': goals_features,
+            'corners': corners_features,
+            'cards': cards_features,
+            'btts': btts_features
+        }
@@ -8,6 +8,8 @@ import numpy as np
 from typing import Dict, List, Any
 from datetime import datetime, timedelta
 
+from .form_encoding import FORM_WEIGHTS, encode_forms, weighted_points
+
 
 class MomentumAnalyzer:
     """
@@ -54,24 +56,17 @@ class MomentumAnalyzer:
         """Calculate recent form momentum with weighted scoring"""
         features = {}
         
-        # Exponential weights (most recent = highest)
-        weights = np.array([0.4, 0.3, 0.2, 0.1])
-        
-        # Home team momentum
-        home_results = match_data.get('home_results_last_4', [])
-        if len(home_results) >= 4:
-            points = [3 if r == 'W' else 1 if r == 'D' else 0 for r in home_results]
-            features['home_momentum_score'] = np.average(points, weights=weights)
-        else:
-            features['home_momentum_score'] = 1.5
-        
-        # Away team momentum
-        away_results = match_data.get('away_results_last_4', [])
-        if len(away_results) >= 4:
-            points = [3 if r == 'W' else 1 if r == 'D' else 0 for r in away_results]
-            features['away_momentum_score'] = np.average(points, weights=weights)
-        else:
-            features['away_momentum_score'] = 1.5
+        # Last four results of both teams (most recent weighted by position)
+        codes, lengths = encode_forms([
+            match_data.get('home_results_last_4', []),
+            match_data.get('away_results_last_4', [])
+        ])
+        if codes.shape[1] > 4:
+            raise ValueError("results_last_4 must hold at most four results")
+        scores = np.where(lengths >= 4, weighted_points(codes, FORM_WEIGHTS), 1.5)
+        
+        features['home_momentum_score'] = scores[0]
+        features['away_momentum_score'] = scores[1]
         
         # Momentum differential
         features['momentum_differential'] = features['home_momentum_score'] - features['away_momentum_score']
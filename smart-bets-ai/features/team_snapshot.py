@@ -0,0 +1,165 @@
+"""
+Team Snapshot Cache
+Per-team, per-side feature blocks keyed by (team_id, side, as-of kickoff)
+Fixtures reuse a team's block across batches until a new result arrives
+"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+SnapshotKey = Tuple[Hashable, str, Hashable]
+
+
+class TeamSnapshotCache:
+    """
+    LRU cache of single-team feature blocks
+
+    A side block (rolling averages, form, momentum, venue splits, market
+    inputs) depends only on one team's data as of kickoff, so the same
+    block serves every fixture of that team at that time. Blocks are stored
+    as rows in the column order of the engine that computed them.
+
+    Register the cache as a DataIngestionService result observer so a new
+    or corrected result for a team drops its snapshots.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 50_000,
+        team_keys: Optional[Dict[str, str]] = None,
+        as_of_key: str = 'match_datetime'
+    ):
+        """
+        Args:
+            max_entries: Blocks kept before the least recently used are evicted
+            team_keys: Match data key holding each side's team ID
+            as_of_key: Match data key holding the kickoff time
+        """
+        self.max_entries = max_entries
+        self.team_keys = team_keys or {'home': 'home_team_id', 'away': 'away_team_id'}
+        self.as_of_key = as_of_key
+
+        self._blocks: 'OrderedDict[SnapshotKey, np.ndarray]' = OrderedDict()
+        self._by_team: Dict[Hashable, set] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, match_data: Dict[str, Any], side: str) -> Optional[SnapshotKey]:
+        """
+        Snapshot key of one side of a fixture
+
+        Returns:
+            (team_id, side, as_of), or None when the match data carries no
+            team ID or kickoff (such sides are never cached)
+        """
+        team_id = match_data.get(self.team_keys[side])
+        as_of = match_data.get(self.as_of_key)
+        if team_id is None or as_of is None:
+            return None
+        return (team_id, side, as_of)
+
+    def get(self, key: SnapshotKey) -> Optional[np.ndarray]:
+        """Cached block row, or None"""
+        block = self._blocks.get(key)
+        if block is None:
+            self.misses += 1
+            return None
+        self._blocks.move_to_end(key)
+        self.hits += 1
+        return block
+
+    def put(self, key: SnapshotKey, block: np.ndarray):
+        """Store a block row, evicting the least recently used beyond max_entries"""
+        self._blocks[key] = block
+        self._blocks.move_to_end(key)
+        self._by_team.setdefault(key[0], set()).add(key)
+
+        while len(self._blocks) > self.max_entries:
+            old_key, _ = self._blocks.popitem(last=False)
+            keys = self._by_team.get(old_key[0])
+            if keys is not None:
+                keys.discard(old_key)
+                if not keys:
+                    del self._by_team[old_key[0]]
+
+    def invalidate_team(self, team_id: Hashable) -> int:
+        """
+        Drop every snapshot of a team
+
+        Returns:
+            Number of blocks dropped
+        """
+        keys = self._by_team.pop(team_id, ())
+        for key in keys:
+            self._blocks.pop(key, None)
+        return len(keys)
+
+    def add_result(self, match, result):
+        """
+        Invalidate both teams of a completed match (result observer hook)
+
+        Args:
+            match: Match row (team IDs)
+            result: MatchResult row or MatchResultSchema (unused)
+        """
+        self.invalidate_team(match.home_team_id)
+        self.invalidate_team(match.away_team_id)
+
+    def correct_result(self, match, result):
+        """Invalidate both teams of a corrected result (result observer hook)"""
+        self.add_result(match, result)
+
+    def clear(self):
+        """Drop all snapshots (e.g. when the block layout changes)"""
+        self._blocks.clear()
+        self._by_team.clear()
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and hit rate"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._blocks),
+            'teams': len(self._by_team),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def lookup(self, matches_data: List[Dict[str, Any]], side: str) -> Tuple[List, List[int], Dict]:
+        """
+        Split one side of a batch into cached blocks and rows to compute
+
+        Fixtures sharing a key are computed once.
+
+        Args:
+            matches_data: List of match data dictionaries
+            side: 'home' or 'away'
+
+        Returns:
+            Tuple of (per-row key, row indices to compute, key -> cached block)
+        """
+        keys = [self.key(match, side) for match in matches_data]
+        cached = {}
+        pending = set()
+        compute_rows = []
+
+        for i, key in enumerate(keys):
+            if key is None:
+                compute_rows.append(i)
+            elif key in cached or key in pending:
+                continue
+            else:
+                block = self.get(key)
+                if block is None:
+                    pending.add(key)
+                    compute_rows.append(i)
+                else:
+                    cached[key] = block
+
+        return keys, compute_rows, cached
@@ -3,6 +3,7 @@ Prediction Service for Smart Bets AI
 Generates predictions for the 4 target markets and selects best bet per fixture
 """
 
+import sys
 import pickle
 import json
 from pathlib import Path
@@ -12,6 +13,14 @@ import numpy as np
 
 from features import FeatureEngineer
 
+# Appended (not inserted) so smart-bets-ai's own ``features`` package wins
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from predictor.model_io import has_model, load_model
+except ImportError:
+    has_model = load_model = None
+
 
 class SmartBetsPredictor:
     """
@@ -60,6 +69,11 @@ class SmartBetsPredictor:
         try:
             # Load models
             for market in ['goals', 'cards', 'corners', 'btts']:
+                if load_model is not None:
+                    if has_model(self.models_dir, market):
+                        self.models[market] = load_model(self.models_dir, market)
+                    continue
+                
                 model_path = self.models_dir / f"{market}_model.pkl"
                 if model_path.exists():
                     with open(model_path, 'rb') as f:
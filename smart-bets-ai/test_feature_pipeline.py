@@ -0,0 +1,260 @@
+"""
+Feature Pipeline Test Script
+Checks the columnar batch engine against the per-match dict path
+"""
+import importlib.util
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from features.core_stats import CoreStatisticsEngine
+from features.feature_pipeline import FeaturePipeline
+from features.team_snapshot import TeamSnapshotCache
+from features.kernels import pad_histories, tail_mean, tail_variance, trailing_run
+
+
+RESULTS = ['W', 'D', 'L']
+
+
+def _random_match(rng: random.Random, i: int) -> dict:
+    """Match data dict with a random subset of inputs and history lengths"""
+    match = {'match_id': f'M{i:04d}', 'home_team': f'Team {i % 7}', 'away_team': f'Team {(i + 3) % 7}'}
+
+    for side in ('home', 'away'):
+        optional = {
+            f'{side}_goals_avg': rng.uniform(0.5, 2.5),
+            f'{side}_goals_conceded_avg': rng.uniform(0.5, 2.0),
+            f'{side}_corners_avg': rng.uniform(3, 7),
+            f'{side}_cards_avg': rng.uniform(1, 3),
+            f'{side}_btts_rate': rng.random(),
+            f'{side}_form': ''.join(rng.choice(RESULTS) for _ in range(rng.randint(0, 6))),
+            f'{side}_goals_history': [rng.randint(0, 4) for _ in range(rng.randint(0, 15))],
+            f'{side}_corners_history': [rng.randint(0, 10) for _ in range(rng.randint(0, 12))],
+            f'{side}_cards_history': [rng.randint(0, 5) for _ in range(rng.randint(0, 8))],
+            f'{side}_results_last_4': [rng.choice(RESULTS) for _ in range(rng.choice([0, 2, 4]))],
+            f'{side}_results_last_5': [rng.choice(RESULTS) for _ in range(rng.randint(0, 5))],
+            f'{side}_results_last_10': [rng.choice(RESULTS) for _ in range(rng.randint(0, 10))],
+            f'{side}_goals_last_3': [rng.randint(0, 3) for _ in range(rng.randint(0, 3))],
+            f'{side}_goals_prev_3': [rng.randint(0, 3) for _ in range(rng.randint(0, 3))],
+            f'{side}_conceded_last_3': [rng.randint(0, 3) for _ in range(rng.randint(0, 3))],
+            f'{side}_conceded_prev_3': [rng.randint(0, 3) for _ in range(rng.randint(0, 3))],
+            f'{side}_recent_goal_diff': rng.randint(-6, 6),
+            f'{side}_winless_streak': rng.randint(0, 5),
+            f'{side}_days_since_last_match': rng.randint(2, 10),
+            f'{side}_shots_per_game': rng.choice([0.0, rng.uniform(6, 18)]),
+            f'{side}_possession_pct': rng.uniform(35, 65),
+            f'{side}_xg_last_5': rng.uniform(0.5, 2.5),
+            f'{side}_corners_1h_avg': rng.uniform(1, 4),
+            f'{side}_yellows_avg': rng.uniform(1, 3),
+            f'{side}_blanks_rate': rng.random(),
+        }
+        if side == 'home':
+            optional['home_home_goals_avg'] = rng.uniform(0.5, 3)
+        else:
+            optional['away_travel_distance'] = rng.uniform(0, 800)
+        for key, value in optional.items():
+            if rng.random() < 0.7:
+                match[key] = value
+
+    n_meetings = rng.choice([0, 1, 2, 3, 5, 8])
+    history = []
+    for _ in range(n_meetings):
+        home_goals, away_goals = rng.randint(0, 4), rng.randint(0, 4)
+        home_team, away_team = rng.sample([match['home_team'], match['away_team']], 2)
+        history.append({
+            'home_team': home_team,
+            'away_team': away_team,
+            'home_goals': home_goals,
+            'away_goals': away_goals,
+            'total_goals': home_goals + away_goals,
+            'total_corners': rng.randint(4, 15),
+            'total_cards': rng.randint(0, 8),
+            'result': 'H' if home_goals > away_goals else 'A' if home_goals < away_goals else 'D',
+            'winner': home_team if home_goals > away_goals else away_team if home_goals < away_goals else None
+        })
+    if history:
+        match['h2h_history'] = history
+
+    return match
+
+
+def _assert_same(columnar: pd.DataFrame, rowwise: pd.DataFrame):
+    assert list(columnar.columns) == list(rowwise.columns), "Column order differs"
+    assert list(columnar.index) == list(rowwise.index), "Match order differs"
+    pd.testing.assert_frame_equal(columnar, rowwise, check_dtype=False, rtol=1e-9, atol=1e-12)
+
+
+def test_columnar_parity():
+    """Columnar engine matches the per-match dict path"""
+    rng = random.Random(7)
+    pipeline = FeaturePipeline()
+    matches = [_random_match(rng, i) for i in range(500)]
+
+    columnar = pipeline.columnar_engine.transform(matches)
+    rowwise = pipeline._transform_batch_rowwise(matches)
+
+    _assert_same(columnar, rowwise)
+    print(f"✅ Columnar parity: {len(columnar)} matches x {len(columnar.columns)} features")
+
+
+def test_partial_h2h_column():
+    """h2h_corners_trend placement when pairs have only 1-2 meetings"""
+    rng = random.Random(11)
+    pipeline = FeaturePipeline()
+
+    matches = [_random_match(rng, i) for i in range(50)]
+    for match in matches:
+        match['h2h_history'] = match.get('h2h_history', [])[:2]
+    matches[0]['h2h_history'] = _random_match(random.Random(3), 0).get('h2h_history', [])[:1] or [{
+        'home_team': matches[0]['home_team'], 'away_team': matches[0]['away_team'],
+        'home_goals': 1, 'away_goals': 1, 'total_goals': 2, 'result': 'D'
+    }]
+    matches[1]['h2h_history'] = []
+
+    _assert_same(pipeline.columnar_engine.transform(matches), pipeline._transform_batch_rowwise(matches))
+    print("✅ Partial head-to-head column placement matches")
+
+
+def test_fallback_on_bad_input():
+    """Malformed matches fall back to the per-match path, which skips them"""
+    rng = random.Random(5)
+    pipeline = FeaturePipeline()
+    matches = [_random_match(rng, i) for i in range(20)]
+    matches[4]['home_shots_per_game'] = None
+    matches[9]['away_results_last_4'] = ['W', 'W', 'D', 'L', 'W']
+
+    batch = pipeline.transform_batch(matches)
+    rowwise = pipeline._transform_batch_rowwise(matches)
+
+    _assert_same(batch, rowwise)
+    assert len(batch) == 18
+    print("✅ Malformed matches handled like the per-match path")
+
+
+def test_pruned_features():
+    """Pruned pipeline returns the required columns with unchanged values"""
+    rng = random.Random(13)
+    matches = [_random_match(rng, i) for i in range(200)]
+    required = ['combined_aggression_score', 'home_xg_diff', 'h2h_btts_rate', 'combined_goals_avg']
+
+    full = FeaturePipeline().transform_batch(matches)
+    pipeline = FeaturePipeline(required_features=required)
+    report = pipeline.get_pruning_report()
+
+    assert report['active_groups'] == ['h2h', 'goals', 'cards', 'legacy']
+    assert report['skipped_features'] == report['total_features'] - report['computed_features'] > 0
+    _assert_same(pipeline.transform_batch(matches), full[pipeline.get_output_feature_names()])
+    _assert_same(pipeline._transform_batch_rowwise(matches), full[pipeline.get_output_feature_names()])
+    print(f"✅ Pruned pipeline: {report['skipped_features']} of {report['total_features']} features skipped")
+
+
+def test_team_snapshot_cache():
+    """Cached side blocks give the uncached features and follow result invalidation"""
+    rng = random.Random(17)
+    fixtures = [_random_match(rng, i) for i in range(40)]
+    for i, match in enumerate(fixtures):
+        match['home_team_id'], match['away_team_id'] = i, 40 + i
+        match['match_datetime'] = '2024-05-01 15:00'
+    # Same teams as of the same kickoff carry the same side inputs
+    matches = [dict(fixtures[i % 40], match_id=f'M{i:04d}') for i in range(100)]
+
+    expected = FeaturePipeline().transform_batch(matches)
+    cache = TeamSnapshotCache()
+    pipeline = FeaturePipeline(snapshot_cache=cache)
+
+    _assert_same(pipeline.transform_batch(matches), expected)
+    assert len(cache) == 80
+    _assert_same(pipeline.transform_batch(matches[::-1]), FeaturePipeline().transform_batch(matches[::-1]))
+    assert cache.stats()['hits'] == 80
+
+    class Match:
+        home_team_id, away_team_id = 3, 43
+    cache.add_result(Match(), None)
+    assert len(cache) == 78
+    _assert_same(pipeline.transform_batch(matches), expected)
+    print(f"✅ Team snapshot cache: {cache.stats()['hit_rate']:.0%} hit rate")
+
+
+def _load_root_module(name: str, module_name: str):
+    """Load a project-root ``features`` module by path (that package is shadowed here)"""
+    path = Path(__file__).parent.parent / 'features' / f'{name}.py'
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _load_h2h_index():
+    """Project-root HeadToHeadIndex, with the epoch helper it imports"""
+    _load_root_module('epoch', 'features.epoch')
+    return _load_root_module('h2h_index', 'h2h_index').HeadToHeadIndex
+
+
+def test_h2h_index_histories():
+    """Histories attached from the head-to-head index feed the h2h features"""
+    rng = random.Random(23)
+    index = _load_h2h_index()()
+    kickoff = datetime(2024, 1, 6, 15)
+    for day in range(300):
+        home, away = rng.sample(range(8), 2)
+        index.add_meeting(home, away, kickoff + timedelta(days=day), rng.randint(0, 4), rng.randint(0, 3),
+                          rng.randint(4, 14), rng.randint(0, 7))
+
+    fixtures = []
+    for i in range(60):
+        match = _random_match(rng, i)
+        match.pop('h2h_history', None)
+        home, away = rng.sample(range(8), 2)
+        match.update(home_team_id=home, away_team_id=away,
+                     match_datetime=kickoff + timedelta(days=rng.randint(0, 320)))
+        fixtures.append(match)
+
+    expected = FeaturePipeline().transform_batch(index.attach_histories([dict(m) for m in fixtures]))
+    assert all('h2h_history' not in match for match in fixtures)
+    for use_columnar in (True, False):
+        pipeline = FeaturePipeline(use_columnar=use_columnar, h2h_index=index)
+        _assert_same(pipeline.transform_batch(fixtures), expected)
+    assert all('h2h_history' not in match for match in fixtures), "Caller's matches were modified"
+    assert expected['h2h_avg_total_goals'].gt(0).sum() > len(fixtures) // 2
+    print(f"✅ H2H index histories: {index.n_meetings} meetings, {len(fixtures)} fixtures")
+
+
+def test_history_kernels():
+    """Padded history kernels match CoreStatisticsEngine's per-match streak, mean and variance"""
+    rng = random.Random(19)
+    histories = [[rng.randint(0, 3) * rng.random() for _ in range(rng.randint(0, 15))] for _ in range(300)]
+    engine = CoreStatisticsEngine()
+    rows = [{'home_goals_history': h} for h in histories]
+
+    values, lengths = pad_histories(histories)
+    expected_streak = [engine._calculate_scoring_streak(h) for h in histories]
+    assert list(trailing_run(values > 0, lengths)) == expected_streak
+
+    has_5 = lengths >= 5
+    last_5, _ = pad_histories(histories, 5)
+    expected_mean = [engine._rolling_averages(row)['home_goals_last_5'] for row in rows]
+    mean = np.where(has_5, tail_mean(last_5, np.minimum(lengths, 5)), 0)
+    np.testing.assert_allclose(mean, expected_mean, rtol=1e-12)
+
+    last_10, _ = pad_histories(histories, 10)
+    expected_var = [engine._variance_metrics(row)['home_goals_variance'] for row in rows]
+    variance = np.where(has_5, tail_variance(last_10, np.minimum(lengths, 10)), 0.5)
+    np.testing.assert_allclose(variance, expected_var, rtol=1e-9, atol=1e-12)
+    print(f"✅ History kernels: {len(histories)} histories")
+
+
+if __name__ == "__main__":
+    test_columnar_parity()
+    test_partial_h2h_column()
+    test_fallback_on_bad_input()
+    test_pruned_features()
+    test_team_snapshot_cache()
+    test_h2h_index_histories()
+    test_history_kernels()
@@ -28,6 +28,8 @@ try:
 except ImportError:
     from features import FeatureEngineer
 
+from predictor.model_io import save_model_artifacts, has_model, load_model
+
 
 class ModelTrainer:
     """
@@ -289,9 +291,7 @@ class ModelTrainer:
         
         # Save each model
         for market, model in self.models.items():
-            model_path = self.models_dir / f"{market}_model.pkl"
-            with open(model_path, 'wb') as f:
-                pickle.dump(model, f)
+            model_path = save_model_artifacts(model, self.models_dir, market)
             print(f"💾 Saved {market} model to {model_path}")
         
         # Save feature engineer
@@ -320,10 +320,8 @@ class ModelTrainer:
         markets = ['goals', 'cards', 'corners', 'btts']
         
         for market in markets:
-            model_path = self.models_dir / f"{market}_model.pkl"
-            if model_path.exists():
-                with open(model_path, 'rb') as f:
-                    self.models[market] = pickle.load(f)
+            if has_model(self.models_dir, market):
+                self.models[market] = load_model(self.models_dir, market)
                 print(f"✅ Loaded {market} model")
         
         # Load feature engineer
@@ -9,25 +9,34 @@ This module provides comprehensive training infrastructure for all betting marke
 - Retraining workflows
 """
 
-from .build_datasets import (
-    build_training_table_for_goals,
-    build_training_table_for_btts,
-    build_training_table_for_cards,
-    build_training_table_for_corners,
-    build_all_training_datasets
-)
+from importlib import import_module
 
-from .train_goals import train_goals_model
-from .train_btts import train_btts_model
-from .train_cards import train_cards_model
-from .train_corners import train_corners_model
+# Exports resolve on first use, so importing one submodule (e.g.
+# training.count_models) does not pull in the ingestion stack
+_EXPORTS = {
+    'build_training_table_for_goals': 'build_datasets',
+    'build_training_table_for_btts': 'build_datasets',
+    'build_training_table_for_cards': 'build_datasets',
+    'build_training_table_for_corners': 'build_datasets',
+    'build_all_training_datasets': 'build_datasets',
+    'train_goals_model': 'train_goals',
+    'train_btts_model': 'train_btts',
+    'train_cards_model': 'train_cards',
+    'train_corners_model': 'train_corners',
+    'fit_calibration_model': 'utils',
+    'apply_calibration': 'utils',
+    'save_model_with_metadata': 'utils',
+    'load_model_with_metadata': 'utils'
+}
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
 
-from .utils import (
-    fit_calibration_model,
-    apply_calibration,
-    save_model_with_metadata,
-    load_model_with_metadata
-)
 
 __all__ = [
     'build_training_table_for_goals',
@@ -18,6 +18,8 @@ sys.path.insert(0, str(project_root))
 
 from data_ingestion.database import get_db
 from data_ingestion.models import Match, MatchResult, MatchOdds, Team, TeamStatistic
+from features.rolling_store import RollingWindowStore
+from features.feature_builder import FEATURE_NAMES
 from training.config import (
     TRAINING_DATA_PATHS, LOOKBACK_WINDOWS, MIN_MATCHES_FOR_STATS,
     MARKETS, DATA_PROCESSED_DIR
@@ -27,9 +29,65 @@ from training.config import (
 class DatasetBuilder:
     """Builds training datasets from database or raw files"""
     
-    def __init__(self, session: Optional[Session] = None):
+    def __init__(
+        self,
+        session: Optional[Session] = None,
+        use_rolling_store: bool = True,
+        feature_store=None
+    ):
+        """
+        Args:
+            session: Database session
+            use_rolling_store: Answer rolling stats from an in-order replay
+            feature_store: FeatureStore with precomputed features (optional);
+                matches found there are read as of kickoff, not recomputed
+        """
         self.session = session
         self.lookback = LOOKBACK_WINDOWS
+        self.use_rolling_store = use_rolling_store
+        self.feature_store = feature_store
+        
+        # Chronological replay state (see _start_replay)
+        self._rolling_store = None
+        self._replay_results = []
+        self._replay_pos = 0
+        
+        # Point-in-time features from the feature store, by match ID
+        self._stored_features = None
+    
+    def _start_replay(self):
+        """
+        Prepare an in-order replay of completed results
+        
+        Matches are processed in kickoff order, so instead of querying each
+        team's history per fixture, results are pushed into a rolling-window
+        store as kickoff times pass and every lookup is answered from memory.
+        """
+        if self.feature_store is not None and self._stored_features is None:
+            stored = self.feature_store.get_point_in_time(features=FEATURE_NAMES)
+            self._stored_features = stored.drop(columns='kickoff').to_dict('index')
+            print(f"📦 Read {len(self._stored_features):,} matches from feature store "
+                  f"{self.feature_store.version}")
+        
+        if not self.session or not self.use_rolling_store:
+            return
+        
+        self._replay_results = self.session.query(Match, MatchResult).join(
+            MatchResult, Match.match_id == MatchResult.match_id
+        ).filter(
+            Match.status == 'completed'
+        ).order_by(Match.match_datetime).all()
+        self._replay_pos = 0
+        self._rolling_store = RollingWindowStore(capacity=self.lookback['long'])
+    
+    def _advance_replay(self, match_date: datetime):
+        """Push every replayed result that kicked off before match_date"""
+        while self._replay_pos < len(self._replay_results):
+            match, result = self._replay_results[self._replay_pos]
+            if match.match_datetime >= match_date:
+                break
+            self._rolling_store.add_result(match, result)
+            self._replay_pos += 1
     
     def _calculate_rolling_stats(
         self, 
@@ -53,6 +111,12 @@ class DatasetBuilder:
         if not self.session:
             return {}
         
+        if self._rolling_store is not None:
+            self._advance_replay(match_date)
+            return self._rolling_store.rolling_stats(
+                team_id, match_date, is_home, window, MIN_MATCHES_FOR_STATS
+            )
+        
         # Query recent matches before this date
         if is_home:
             matches = self.session.query(Match, MatchResult).join(
@@ -120,6 +184,17 @@ class DatasetBuilder:
         Returns:
             Dictionary with match features
         """
+        # Precomputed features as of kickoff
+        if self._stored_features is not None and match.match_id in self._stored_features:
+            return {
+                'match_id': match.match_id,
+                'date': match.match_datetime,
+                'league': match.league,
+                'home_team_id': match.home_team_id,
+                'away_team_id': match.away_team_id,
+                **self._stored_features[match.match_id]
+            }
+        
         # Get rolling stats for both teams
         home_stats_5 = self._calculate_rolling_stats(
             match.home_team_id, match.match_datetime, is_home=True, window=5
@@ -178,6 +253,41 @@ class DatasetBuilder:
         
         return features
     
+    def match_features(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> List[Dict]:
+        """
+        Features of completed matches in a kickoff range (feature store backfill)
+        
+        Args:
+            start: First kickoff (inclusive, optional)
+            end: Last kickoff (exclusive, optional)
+            
+        Returns:
+            List of feature dictionaries, in kickoff order
+        """
+        if not self.session:
+            raise ValueError("Database session required")
+        
+        query = self.session.query(Match, MatchResult).join(
+            MatchResult, Match.match_id == MatchResult.match_id
+        ).filter(Match.status == 'completed')
+        if start is not None:
+            query = query.filter(Match.match_datetime >= start)
+        if end is not None:
+            query = query.filter(Match.match_datetime < end)
+        
+        self._start_replay()
+        rows = []
+        for match, result in query.order_by(Match.match_datetime).all():
+            features = self._get_match_features(match, result)
+            if features:
+                rows.append(features)
+        
+        return rows
+    
     def build_training_table_for_goals(
         self, 
         out_path: Optional[str] = None
@@ -208,6 +318,7 @@ class DatasetBuilder:
             Match.status == 'completed'
         ).order_by(Match.match_datetime).all()
         
+        self._start_replay()
         rows = []
         for match, result, odds in matches:
             features = self._get_match_features(match, result)
@@ -251,6 +362,7 @@ class DatasetBuilder:
             Match.status == 'completed'
         ).order_by(Match.match_datetime).all()
         
+        self._start_replay()
         rows = []
         for match, result, odds in matches:
             features = self._get_match_features(match, result)
@@ -292,6 +404,7 @@ class DatasetBuilder:
             Match.status == 'completed'
         ).order_by(Match.match_datetime).all()
         
+        self._start_replay()
         rows = []
         for match, result, odds in matches:
             features = self._get_match_features(match, result)
@@ -333,6 +446,7 @@ class DatasetBuilder:
             Match.status == 'completed'
         ).order_by(Match.match_datetime).all()
         
+        self._start_replay()
         rows = []
         for match, result, odds in matches:
             features = self._get_match_features(match, result)
@@ -353,15 +467,72 @@ class DatasetBuilder:
         print(f"✅ Built Corners dataset: {len(df)} matches")
         return df
 
+    def build_training_table_for_counts(
+        self, 
+        out_path: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Build training dataset of per-team goal, corner and card counts
+        
+        Used by the count distribution models, which price every
+        over/under line, BTTS, 1X2 and double chance from one fit.
+        """
+        if not self.session:
+            raise ValueError("Database session required")
+        
+        print("🔄 Building per-team counts training dataset...")
+        
+        matches = self.session.query(Match, MatchResult).join(
+            MatchResult, Match.match_id == MatchResult.match_id
+        ).filter(
+            Match.status == 'completed'
+        ).order_by(Match.match_datetime).all()
+        
+        self._start_replay()
+        rows = []
+        for match, result in matches:
+            features = self._get_match_features(match, result)
+            if not features:
+                continue
+            
+            features['home_goals'] = result.home_goals
+            features['away_goals'] = result.away_goals
+            features['home_corners'] = result.home_corners
+            features['away_corners'] = result.away_corners
+            features['home_cards'] = result.home_cards
+            features['away_cards'] = result.away_cards
+            
+            rows.append(features)
+        
+        df = pd.DataFrame(rows)
+        
+        if out_path:
+            df.to_csv(out_path, index=False)
+            print(f"✅ Saved {len(df)} matches to {out_path}")
+        
+        print(f"✅ Built counts dataset: {len(df)} matches")
+        return df
 
-def build_all_training_datasets():
-    """Build all training datasets from database"""
+
+def build_all_training_datasets(feature_version: Optional[str] = None):
+    """
+    Build all training datasets from database
+    
+    Args:
+        feature_version: Read precomputed features from this feature store
+            version (optional)
+    """
     print("=" * 60)
     print("BUILDING ALL TRAINING DATASETS")
     print("=" * 60)
     
+    feature_store = None
+    if feature_version:
+        from features.feature_store import FeatureStore
+        feature_store = FeatureStore(feature_version)
+    
     with get_db() as session:
-        builder = DatasetBuilder(session)
+        builder = DatasetBuilder(session, feature_store=feature_store)
         
         # Build each market dataset
         builder.build_training_table_for_goals(
@@ -376,6 +547,9 @@ def build_all_training_datasets():
         builder.build_training_table_for_corners(
             str(TRAINING_DATA_PATHS['corners'])
         )
+        builder.build_training_table_for_counts(
+            str(TRAINING_DATA_PATHS['counts'])
+        )
     
     print("\n" + "=" * 60)
     print("✅ ALL DATASETS BUILT SUCCESSFULLY")
@@ -428,4 +602,10 @@ def build_training_table_for_corners(session_or_data_source, out_path: str) -> N
 
 
 if __name__ == "__main__":
-    build_all_training_datasets()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Build training datasets')
+    parser.add_argument('--feature-version', help='Feature store version to read features from')
+    args = parser.parse_args()
+    
+    build_all_training_datasets(args.feature_version)
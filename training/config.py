@@ -43,33 +43,39 @@ TRAINING_DATA_PATHS = {
     'goals': DATA_PROCESSED_DIR / "training_goals_over25.csv",
     'btts': DATA_PROCESSED_DIR / "training_btts.csv",
     'cards': DATA_PROCESSED_DIR / "training_cards.csv",
-    'corners': DATA_PROCESSED_DIR / "training_corners.csv"
+    'corners': DATA_PROCESSED_DIR / "training_corners.csv",
+    'counts': DATA_PROCESSED_DIR / "training_counts.csv"
 }
 
-# Market Definitions
+# Market Definitions (targets derive from the counts table: home + away
+# 'count' above 'threshold', or both teams above zero when it is None)
 MARKETS = {
     'goals': {
         'name': 'Total Goals Over 2.5',
         'target_column': 'over_2_5',
         'odds_column': 'odds_over25',
+        'count': 'goals',
         'threshold': 2.5
     },
     'btts': {
         'name': 'Both Teams To Score',
         'target_column': 'btts_yes',
         'odds_column': 'odds_btts_yes',
+        'count': 'goals',
         'threshold': None
     },
     'cards': {
         'name': 'Total Cards Over 3.5',
         'target_column': 'cards_over_3_5',
         'odds_column': 'odds_cards_over35',
+        'count': 'cards',
         'threshold': 3.5
     },
     'corners': {
         'name': 'Total Corners Over 9.5',
         'target_column': 'corners_over_9_5',
         'odds_column': 'odds_corners_over95',
+        'count': 'corners',
         'threshold': 9.5
     }
 }
@@ -126,6 +132,65 @@ MODEL_CONFIGS = {
 # Default models to train for each market
 DEFAULT_MODELS = ['logistic', 'xgboost', 'lightgbm']
 
+# Parallel retraining: every (market, model type) fit is one job
+PARALLEL_TRAINING_CONFIG = {
+    'max_workers': None,      # Worker processes (None: one per core, at most one per job)
+    'threads_per_job': None,  # Threads per fit (None: cores // workers, at least 1)
+    'job_order': ['xgboost', 'lightgbm', 'random_forest', 'logistic']  # Longest fits start first
+}
+
+# Incremental retraining: boosted models continue from the active version
+INCREMENTAL_TRAINING_CONFIG = {
+    'extra_rounds': 50,              # Boosting rounds added per update
+    'early_stopping_rounds': 20,
+    'holdout_fraction': 0.4,         # Newest share of the new matches kept out of boosting
+    'calibration_fraction': 0.5,     # Older share of that holdout, joining the calibration window
+    'calibration_window': 3000,      # Newest matches not boosted on by the update that refit the calibrator
+    'max_log_loss_increase': 0.005,  # Gate: allowed test log loss above the active ensemble's
+    'max_warm_starts': 8             # Chained updates before a from-scratch retrain is forced
+}
+
+# Hyperparameter Tuning (successive halving over time-based folds)
+TUNED_PARAMS_PATH = MODELS_DIR / "tuned_params.json"  # Per-market overrides of MODEL_CONFIGS
+TUNING_CACHE_DIR = DATA_PROCESSED_DIR / "tuning_cache"
+TUNING_CONFIG = {
+    'n_trials': 27,          # Configurations sampled per model type
+    'eta': 3,                # Keep the best 1/eta of the trials at each rung
+    'min_resource': 1 / 9,   # Share of each fold's (newest) training rows at the first rung
+    'n_folds': 3,            # Expanding-window folds over the train + validation splits
+    'max_workers': None,     # Worker processes (None: one per core)
+    'seed': 42,
+    'spaces': {
+        # (kind, low, high): 'int' / 'float' uniform, 'log' log-uniform
+        'xgboost': {
+            'max_depth': ('int', 3, 8),
+            'learning_rate': ('log', 0.01, 0.2),
+            'subsample': ('float', 0.6, 1.0),
+            'colsample_bytree': ('float', 0.5, 1.0),
+            'min_child_weight': ('log', 1.0, 20.0),
+            'reg_lambda': ('log', 0.1, 10.0)
+        },
+        'lightgbm': {
+            'num_leaves': ('int', 8, 64),
+            'max_depth': ('int', 3, 8),
+            'learning_rate': ('log', 0.01, 0.2),
+            'colsample_bytree': ('float', 0.5, 1.0),
+            'min_child_samples': ('int', 10, 100),
+            'reg_lambda': ('log', 0.1, 10.0)
+        },
+        'logistic': {
+            'C': ('log', 0.01, 100.0)
+        }
+    }
+}
+
+# Training Matrix Cache (XGBoost DMatrix / LightGBM Dataset binaries)
+MATRIX_CACHE_DIR = DATA_PROCESSED_DIR / "matrix_cache"
+MATRIX_CACHE_CONFIG = {
+    'enabled': True,
+    'max_bytes': 2 * 1024 ** 3  # Least recently used binaries are evicted beyond this
+}
+
 # Ensemble Configuration
 ENSEMBLE_WEIGHTS = {
     'logistic': 0.2,
@@ -136,6 +201,31 @@ ENSEMBLE_WEIGHTS = {
 # Calibration Configuration
 CALIBRATION_METHOD = 'isotonic'  # 'isotonic' or 'sigmoid' (Platt scaling)
 
+# Count Distribution Models (one fit prices every line in MatchOdds)
+COUNT_MODEL_CONFIG = {
+    'lines': {
+        'goals': [0.5, 1.5, 2.5, 3.5, 4.5],
+        'corners': [8.5, 9.5, 10.5],
+        'cards': [3.5, 4.5]
+    },
+    'max_goals': 10,      # Per-team goals in the Dixon-Coles score matrix
+    'alpha': 1e-4,        # L2 penalty of the Poisson regressions
+    'max_iter': 1000
+}
+
+# Distilled Student Models (served by default, ensemble near Golden Bets)
+DISTILLATION_CONFIG = {
+    'student': 'logistic',     # 'logistic' or 'trees'
+    'trees': {
+        'n_estimators': 40,
+        'max_depth': 3,
+        'learning_rate': 0.15,
+        'random_state': 42
+    },
+    'golden_threshold': 0.85,  # golden-bets-ai CONFIDENCE_THRESHOLD
+    'fallback_margin': 0.05    # Minimum band below the threshold re-scored by the ensemble
+}
+
 # Train/Validation/Test Split Configuration
 TRAIN_SPLIT = 0.7  # 70% for training
 VAL_SPLIT = 0.15   # 15% for validation
@@ -0,0 +1,477 @@
+"""
+Count Distribution Models
+Expected goals, corners and cards per team, priced into every over/under
+line, BTTS, 1X2 and double chance from a single fit
+"""
+
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from training.config import COUNT_MODEL_CONFIG, MODELS_DIR, INITIAL_VERSION
+
+
+# Per-team count columns of the counts training table
+COUNT_TARGETS = {
+    'goals': ('home_goals', 'away_goals'),
+    'corners': ('home_corners', 'away_corners'),
+    'cards': ('home_cards', 'away_cards')
+}
+
+NON_FEATURE_COLUMNS = ['match_id', 'date', 'league', 'home_team_id', 'away_team_id'] + [
+    column for pair in COUNT_TARGETS.values() for column in pair
+]
+
+# Dixon-Coles low-score correlation searched over this grid
+RHO_GRID = np.linspace(-0.3, 0.3, 601)
+
+
+def line_key(line: float) -> str:
+    """2.5 -> '2_5', as in the MatchOdds / MatchResult column names"""
+    return f"{line:.1f}".replace('.', '_')
+
+
+def count_pmf(mu: np.ndarray, max_count: int, dispersion: Optional[float] = None) -> np.ndarray:
+    """
+    Poisson or negative binomial probabilities of 0..max_count per row
+
+    Args:
+        mu: Expected counts, shape (n,)
+        max_count: Largest count evaluated
+        dispersion: Negative binomial size ``r`` (variance mu + mu^2 / r);
+            None for Poisson
+
+    Returns:
+        Array of shape (n, max_count + 1)
+    """
+    mu = np.asarray(mu, dtype=np.float64)[:, None]
+    k = np.arange(1, max_count + 1, dtype=np.float64)
+    if dispersion is None:
+        p0 = np.exp(-mu)
+        ratios = mu / k
+    else:
+        r = dispersion
+        p0 = (r / (r + mu)) ** r
+        ratios = (k - 1 + r) / k * (mu / (r + mu))
+    return np.concatenate([p0, p0 * np.cumprod(ratios, axis=1)], axis=1)
+
+
+def dixon_coles_tau(home_mu: np.ndarray, away_mu: np.ndarray, rho: float) -> np.ndarray:
+    """Dixon-Coles adjustment of the (0,0), (0,1), (1,0), (1,1) cells, shape (n, 2, 2)"""
+    tau = np.empty((len(home_mu), 2, 2))
+    tau[:, 0, 0] = 1 - home_mu * away_mu * rho
+    tau[:, 0, 1] = 1 + home_mu * rho
+    tau[:, 1, 0] = 1 + away_mu * rho
+    tau[:, 1, 1] = 1 - rho
+    return tau
+
+
+class CountDistributionModel:
+    """
+    Log-linear expected counts per team and side
+
+    Goals use a Dixon-Coles adjusted double Poisson score matrix; total
+    corners and cards use a negative binomial around the summed team
+    means. Every market is read off those distributions with vectorized
+    sums, so new lines cost nothing to train.
+    """
+
+    def __init__(
+        self,
+        feature_columns: List[str],
+        coefficients: Dict[str, Dict],
+        rho: float = 0.0,
+        dispersion: Optional[Dict[str, Optional[float]]] = None,
+        lines: Optional[Dict[str, List[float]]] = None,
+        max_goals: int = COUNT_MODEL_CONFIG['max_goals']
+    ):
+        """
+        Args:
+            feature_columns: Feature order of ``X``
+            coefficients: Per count column ``{'coef': [...], 'intercept': float}``
+            rho: Dixon-Coles low-score correlation
+            dispersion: Negative binomial size per stat ('corners', 'cards');
+                None entries are Poisson
+            lines: Over/under lines per stat
+            max_goals: Per-team goals in the score matrix
+        """
+        self.feature_columns = list(feature_columns)
+        self.coefficients = {
+            target: {'coef': np.asarray(c['coef'], dtype=np.float64), 'intercept': float(c['intercept'])}
+            for target, c in coefficients.items()
+        }
+        self.rho = float(rho)
+        self.dispersion = dispersion or {}
+        self.lines = lines or COUNT_MODEL_CONFIG['lines']
+        self.max_goals = max_goals
+
+        # Sum-of-goals index of each score matrix cell
+        n = max_goals + 1
+        totals = np.add.outer(np.arange(n), np.arange(n)).ravel()
+        self._total_onehot = (totals[:, None] == np.arange(2 * n - 1)).astype(np.float64)
+        self._home_win = np.tril(np.ones((n, n)), -1)
+
+    @classmethod
+    def fit(
+        cls,
+        X: pd.DataFrame,
+        counts: pd.DataFrame,
+        lines: Optional[Dict[str, List[float]]] = None,
+        alpha: float = COUNT_MODEL_CONFIG['alpha'],
+        max_iter: int = COUNT_MODEL_CONFIG['max_iter']
+    ) -> 'CountDistributionModel':
+        """
+        Fit one Poisson regression per count column, then rho and the
+        corners / cards dispersions on the fitted means
+
+        Args:
+            X: Feature matrix
+            counts: Per-team count columns (see COUNT_TARGETS); rows with a
+                missing count are skipped for that column
+            lines: Over/under lines per stat (default: COUNT_MODEL_CONFIG)
+            alpha: L2 penalty
+            max_iter: Solver iterations
+
+        Returns:
+            Fitted model
+        """
+        from sklearn.linear_model import PoissonRegressor
+
+        values = X.to_numpy(dtype=np.float64)
+        mean = values.mean(axis=0)
+        scale = values.std(axis=0)
+        scale[scale == 0] = 1.0
+        standardized = (values - mean) / scale
+
+        coefficients = {}
+        for pair in COUNT_TARGETS.values():
+            for target in pair:
+                if target not in counts:
+                    continue
+                y = counts[target].to_numpy(dtype=np.float64)
+                rows = ~np.isnan(y)
+                if not rows.any():
+                    continue
+                glm = PoissonRegressor(alpha=alpha, max_iter=max_iter).fit(standardized[rows], y[rows])
+                # Fold the standardization into the coefficients
+                coef = glm.coef_ / scale
+                coefficients[target] = {
+                    'coef': coef,
+                    'intercept': float(glm.intercept_ - coef @ mean)
+                }
+
+        model = cls(list(X.columns), coefficients, lines=lines)
+        means = model.predict_means(values)
+
+        if 'home_goals' in means and 'away_goals' in means:
+            model.rho = _fit_rho(
+                counts['home_goals'].to_numpy(), counts['away_goals'].to_numpy(),
+                means['home_goals'], means['away_goals']
+            )
+        for stat in ('corners', 'cards'):
+            home, away = COUNT_TARGETS[stat]
+            if home in means and away in means:
+                total = (counts[home] + counts[away]).to_numpy(dtype=np.float64)
+                rows = ~np.isnan(total)
+                model.dispersion[stat] = _fit_dispersion(total[rows], (means[home] + means[away])[rows])
+        return model
+
+    def predict_means(self, X) -> Dict[str, np.ndarray]:
+        """Expected count per count column, shape (n,) each"""
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X[None, :]
+        return {
+            target: np.exp(X @ c['coef'] + c['intercept'])
+            for target, c in self.coefficients.items()
+        }
+
+    def score_matrix(self, home_mu: np.ndarray, away_mu: np.ndarray) -> np.ndarray:
+        """
+        Dixon-Coles score probabilities, shape (n, max_goals + 1, max_goals + 1)
+        indexed [row, home goals, away goals] and normalized to sum to one
+        """
+        matrix = (count_pmf(home_mu, self.max_goals)[:, :, None]
+                  * count_pmf(away_mu, self.max_goals)[:, None, :])
+        matrix[:, :2, :2] *= np.maximum(dixon_coles_tau(home_mu, away_mu, self.rho), 0.0)
+        return matrix / matrix.sum(axis=(1, 2), keepdims=True)
+
+    def predict_markets(self, X) -> Dict[str, np.ndarray]:
+        """
+        Probabilities for every market derivable from the fitted counts
+
+        Keys follow the MatchOdds columns without ``_odds``: 'over_2_5',
+        'under_2_5', 'btts_yes', 'home_win', 'draw', 'home_or_draw',
+        'corners_over_9_5', 'cards_under_4_5', ...
+
+        Args:
+            X: Feature matrix in ``feature_columns`` order
+
+        Returns:
+            Dictionary mapping market keys to arrays, one value per row
+        """
+        means = self.predict_means(X)
+        markets = {}
+
+        if 'home_goals' in means and 'away_goals' in means:
+            home_mu, away_mu = means['home_goals'], means['away_goals']
+            matrix = self.score_matrix(home_mu, away_mu)
+            n = len(matrix)
+
+            # Total goals: cumulative sum of the score matrix anti-diagonals
+            total_cdf = np.cumsum(matrix.reshape(n, -1) @ self._total_onehot, axis=1)
+            for line in self.lines.get('goals', []):
+                under = total_cdf[:, int(line)]
+                markets[f"under_{line_key(line)}"] = under
+                markets[f"over_{line_key(line)}"] = 1.0 - under
+
+            no_home_goal = matrix[:, 0, :].sum(axis=1)
+            no_away_goal = matrix[:, :, 0].sum(axis=1)
+            markets['btts_yes'] = 1.0 - no_home_goal - no_away_goal + matrix[:, 0, 0]
+            markets['btts_no'] = 1.0 - markets['btts_yes']
+
+            markets['home_win'] = (matrix * self._home_win).sum(axis=(1, 2))
+            markets['away_win'] = (matrix * self._home_win.T).sum(axis=(1, 2))
+            markets['draw'] = np.trace(matrix, axis1=1, axis2=2)
+            markets['home_or_draw'] = markets['home_win'] + markets['draw']
+            markets['away_or_draw'] = markets['away_win'] + markets['draw']
+            markets['home_or_away'] = markets['home_win'] + markets['away_win']
+
+        for stat in ('corners', 'cards'):
+            home, away = COUNT_TARGETS[stat]
+            lines = self.lines.get(stat, [])
+            if home not in means or away not in means or not lines:
+                continue
+            cdf = np.cumsum(
+                count_pmf(means[home] + means[away], int(max(lines)), self.dispersion.get(stat)),
+                axis=1
+            )
+            for line in lines:
+                under = cdf[:, int(line)]
+                markets[f"{stat}_under_{line_key(line)}"] = under
+                markets[f"{stat}_over_{line_key(line)}"] = 1.0 - under
+
+        return markets
+
+    def save(self, directory) -> Path:
+        """
+        Save the model as ``count_model.json`` (coefficients and parameters)
+
+        Returns:
+            Path to the saved file
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / 'count_model.json'
+        with open(path, 'w') as f:
+            json.dump({
+                'feature_columns': self.feature_columns,
+                'coefficients': {
+                    target: {'coef': c['coef'].tolist(), 'intercept': c['intercept']}
+                    for target, c in self.coefficients.items()
+                },
+                'rho': self.rho,
+                'dispersion': self.dispersion,
+                'lines': self.lines,
+                'max_goals': self.max_goals
+            }, f, indent=2)
+        return path
+
+    @classmethod
+    def load(cls, directory) -> 'CountDistributionModel':
+        """Load a model saved by ``save``"""
+        with open(Path(directory) / 'count_model.json', 'r') as f:
+            data = json.load(f)
+        return cls(
+            data['feature_columns'], data['coefficients'], data['rho'],
+            data['dispersion'], data['lines'], data['max_goals']
+        )
+
+
+def market_outcomes(counts: pd.DataFrame, lines: Optional[Dict[str, List[float]]] = None) -> Dict[str, np.ndarray]:
+    """
+    Realized outcomes (1.0 / 0.0, NaN where a count is missing) with the
+    same keys as ``CountDistributionModel.predict_markets``
+    """
+    lines = lines or COUNT_MODEL_CONFIG['lines']
+    outcomes = {}
+
+    def _flag(condition: np.ndarray, valid: np.ndarray) -> np.ndarray:
+        return np.where(valid, condition.astype(np.float64), np.nan)
+
+    if all(column in counts for column in COUNT_TARGETS['goals']):
+        home = counts['home_goals'].to_numpy(dtype=np.float64)
+        away = counts['away_goals'].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(home + away)
+        for line in lines.get('goals', []):
+            outcomes[f"over_{line_key(line)}"] = _flag(home + away > line, valid)
+            outcomes[f"under_{line_key(line)}"] = _flag(home + away < line, valid)
+        outcomes['btts_yes'] = _flag((home > 0) & (away > 0), valid)
+        outcomes['btts_no'] = _flag(~((home > 0) & (away > 0)), valid)
+        outcomes['home_win'] = _flag(home > away, valid)
+        outcomes['draw'] = _flag(home == away, valid)
+        outcomes['away_win'] = _flag(home < away, valid)
+        outcomes['home_or_draw'] = _flag(home >= away, valid)
+        outcomes['away_or_draw'] = _flag(home <= away, valid)
+        outcomes['home_or_away'] = _flag(home != away, valid)
+
+    for stat in ('corners', 'cards'):
+        if not all(column in counts for column in COUNT_TARGETS[stat]):
+            continue
+        total = sum(counts[column].to_numpy(dtype=np.float64) for column in COUNT_TARGETS[stat])
+        valid = ~np.isnan(total)
+        for line in lines.get(stat, []):
+            outcomes[f"{stat}_over_{line_key(line)}"] = _flag(total > line, valid)
+            outcomes[f"{stat}_under_{line_key(line)}"] = _flag(total < line, valid)
+
+    return outcomes
+
+
+def evaluate_count_model(model: CountDistributionModel, X: pd.DataFrame, counts: pd.DataFrame) -> Dict[str, Dict[str, float]]:
+    """
+    Log loss and Brier score of every priced market
+
+    Returns:
+        Dictionary mapping market keys to {'log_loss', 'brier_score', 'n'}
+    """
+    predicted = model.predict_markets(X[model.feature_columns].to_numpy(dtype=np.float64))
+    outcomes = market_outcomes(counts, model.lines)
+    metrics = {}
+    for market, p in predicted.items():
+        y = outcomes.get(market)
+        if y is None:
+            continue
+        rows = ~np.isnan(y)
+        if not rows.any():
+            continue
+        p = np.clip(p[rows], 1e-15, 1 - 1e-15)
+        y = y[rows]
+        metrics[market] = {
+            'log_loss': float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))),
+            'brier_score': float(np.mean((p - y) ** 2)),
+            'n': int(rows.sum())
+        }
+    return metrics
+
+
+def _fit_rho(home_goals: np.ndarray, away_goals: np.ndarray, home_mu: np.ndarray, away_mu: np.ndarray) -> float:
+    """Maximum-likelihood Dixon-Coles rho over RHO_GRID (low-score terms only)"""
+    home_goals = np.asarray(home_goals, dtype=np.float64)
+    away_goals = np.asarray(away_goals, dtype=np.float64)
+    rows = (home_goals <= 1) & (away_goals <= 1)
+    if not rows.any():
+        return 0.0
+    h = home_goals[rows].astype(int)
+    a = away_goals[rows].astype(int)
+    lam, mu = home_mu[rows][:, None], away_mu[rows][:, None]
+    rho = RHO_GRID[None, :]
+
+    # tau per (training row, grid rho)
+    tau = np.select(
+        [((h == 0) & (a == 0))[:, None], ((h == 0) & (a == 1))[:, None], ((h == 1) & (a == 0))[:, None]],
+        [1 - lam * mu * rho, 1 + lam * rho, 1 + mu * rho],
+        1 - rho
+    )
+    # Rho must keep every adjusted cell positive for every training row
+    valid = (tau > 0).all(axis=0)
+    loglik = np.where(valid, np.log(np.maximum(tau, 1e-300)).sum(axis=0), -np.inf)
+    return float(RHO_GRID[np.argmax(loglik)])
+
+
+def _fit_dispersion(total: np.ndarray, mu: np.ndarray, max_size: float = 1e4) -> Optional[float]:
+    """
+    Maximum-likelihood negative binomial size for totals around ``mu``
+
+    Returns None (Poisson) when the counts show no overdispersion.
+    """
+    from scipy.optimize import minimize_scalar
+    from scipy.special import gammaln
+
+    if len(total) == 0:
+        return None
+
+    def negative_loglik(log_r: float) -> float:
+        r = np.exp(log_r)
+        return -np.sum(
+            gammaln(total + r) - gammaln(r) - gammaln(total + 1)
+            + r * np.log(r / (r + mu)) + total * np.log(mu / (r + mu))
+        )
+
+    result = minimize_scalar(negative_loglik, bounds=(np.log(0.1), np.log(max_size)), method='bounded')
+    size = float(np.exp(result.x))
+    return None if size >= 0.99 * max_size else size
+
+
+def train_count_models(data_path: Optional[str] = None, lines: Optional[Dict[str, List[float]]] = None) -> Dict:
+    """
+    Train the count distribution model on the per-team counts table
+
+    Args:
+        data_path: Path to the counts CSV (default: TRAINING_DATA_PATHS['counts'])
+        lines: Over/under lines per stat (default: COUNT_MODEL_CONFIG)
+
+    Returns:
+        Dictionary with the model, test metrics and feature columns
+    """
+    from training.config import TRAINING_DATA_PATHS, TRAIN_SPLIT, VAL_SPLIT
+    from training.utils import time_based_split
+
+    print("=" * 60)
+    print("TRAINING COUNT DISTRIBUTION MODEL")
+    print("=" * 60)
+
+    data_path = data_path or str(TRAINING_DATA_PATHS['counts'])
+    print(f"📂 Loading data from {data_path}")
+    df = pd.read_csv(data_path).dropna(subset=['home_goals', 'away_goals'])
+
+    feature_cols = [col for col in df.columns
+                    if col not in NON_FEATURE_COLUMNS and not col.startswith('odds_')]
+    train_df, val_df, test_df = time_based_split(df, TRAIN_SPLIT, VAL_SPLIT, 'date')
+    # No early stopping or calibration: fit on train + validation
+    fit_df = pd.concat([train_df, val_df])
+
+    print(f"🔄 Fitting Poisson regressions on {len(fit_df):,} matches, {len(feature_cols)} features...")
+    model = CountDistributionModel.fit(fit_df[feature_cols].fillna(0), fit_df, lines=lines)
+    print(f"   Dixon-Coles rho: {model.rho:+.3f}")
+    for stat in ('corners', 'cards'):
+        size = model.dispersion.get(stat)
+        print(f"   {stat} dispersion: {'Poisson' if size is None else f'{size:.1f}'}")
+
+    metrics = evaluate_count_model(model, test_df[feature_cols].fillna(0), test_df)
+    print(f"\n📊 Test set ({len(test_df):,} matches):")
+    for market, m in metrics.items():
+        print(f"   {market:22s} log_loss {m['log_loss']:.4f}  brier {m['brier_score']:.4f}")
+
+    model_dir = MODELS_DIR / 'counts'
+    model_path = model.save(model_dir)
+    with open(model_dir / 'count_metadata.json', 'w') as f:
+        json.dump({
+            'model_type': 'count_distribution',
+            'version': INITIAL_VERSION,
+            'trained_at': datetime.now().isoformat(),
+            'markets': list(metrics.keys()),
+            'metrics': {'test': metrics},
+            'feature_columns': feature_cols
+        }, f, indent=2)
+    print(f"\n💾 Saved count model to {model_path}")
+
+    print("\n✅ COUNT MODEL TRAINING COMPLETE")
+    return {'model': model, 'test_metrics': metrics, 'feature_columns': feature_cols}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Train the count distribution model')
+    parser.add_argument('--data', help='Path to the counts training CSV')
+    args = parser.parse_args()
+
+    train_count_models(args.data)
@@ -0,0 +1,293 @@
+"""
+Model Distillation
+Fits a compact student per market on the calibrated ensemble's outputs and
+records how closely it tracks the ensemble
+"""
+
+import hashlib
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from predictor.model_io import has_model, load_calibration, load_model, save_model_artifacts
+from training.config import DISTILLATION_CONFIG, ENSEMBLE_WEIGHTS, MODELS_DIR
+from training.utils import apply_calibration, calculate_metrics, ensemble_predictions, time_per_call
+
+
+DISTILLED_MARKETS = ['goals', 'btts', 'cards', 'corners']
+
+
+def teacher_fingerprint(ensemble_metadata: Dict) -> str:
+    """
+    Identifier of a trained ensemble, so a student is only served with the
+    ensemble it was distilled from
+
+    Args:
+        ensemble_metadata: Contents of ``ensemble_metadata.json``
+
+    Returns:
+        Hex digest of the version, weights and recorded metrics
+    """
+    key = {name: ensemble_metadata.get(name) for name in ('version', 'weights', 'metrics')}
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def load_teacher(market_dir: Path) -> Callable[[np.ndarray], np.ndarray]:
+    """
+    Calibrated ensemble of a market as served by IntegratedPredictor
+
+    Args:
+        market_dir: Directory with the market's base models and calibration
+
+    Returns:
+        Function mapping a feature matrix (``feature_columns`` order) to
+        calibrated probabilities
+    """
+    with open(market_dir / 'ensemble_metadata.json', 'r') as f:
+        metadata = json.load(f)
+
+    models = {
+        model_type: load_model(market_dir, model_type)
+        for model_type in metadata.get('base_models', ['xgboost', 'lightgbm', 'logistic'])
+        if has_model(market_dir, model_type)
+    }
+    if not models:
+        raise FileNotFoundError(f"No base models found in {market_dir}")
+
+    method = metadata.get('calibration_method', 'isotonic')
+    calibrator = load_calibration(market_dir, 'ensemble', method)
+    weights = metadata.get('weights', ENSEMBLE_WEIGHTS)
+
+    def predict(X: np.ndarray) -> np.ndarray:
+        proba = ensemble_predictions(
+            {model_type: model.predict_proba(X)[:, 1] for model_type, model in models.items()},
+            weights
+        )
+        if calibrator is None:
+            return proba
+        return np.asarray(apply_calibration(calibrator, proba, method), dtype=np.float64)
+
+    return predict
+
+
+def fit_student(
+    X: np.ndarray,
+    teacher_proba: np.ndarray,
+    student_type: str = 'logistic',
+    params: Optional[Dict] = None
+):
+    """
+    Fit a student to the teacher's probabilities (soft-label log loss)
+
+    Each row is used twice, as a positive weighted by the teacher's
+    probability and as a negative weighted by its complement, so the
+    student's cross-entropy minimum is the teacher's output.
+
+    Args:
+        X: Feature matrix
+        teacher_proba: Calibrated teacher probabilities
+        student_type: 'logistic' (binary logistic regression, served from
+            its coefficients) or 'trees' (small-depth XGBoost, served from
+            flat node arrays)
+        params: XGBoost parameters for 'trees' (default: DISTILLATION_CONFIG)
+
+    Returns:
+        Fitted classifier with ``predict_proba``
+    """
+    X = np.asarray(X, dtype=np.float64)
+    p = np.clip(np.asarray(teacher_proba, dtype=np.float64), 1e-6, 1 - 1e-6)
+    X_soft = np.vstack([X, X])
+    y_soft = np.concatenate([np.ones(len(X), dtype=int), np.zeros(len(X), dtype=int)])
+    weights = np.concatenate([p, 1.0 - p])
+
+    if student_type == 'logistic':
+        # Fit on standardized features, then fold the scaling into the
+        # coefficients so the saved model takes raw features
+        mean, scale = X.mean(axis=0), X.std(axis=0)
+        scale[scale == 0] = 1.0
+        student = LogisticRegression(C=10.0, max_iter=2000)
+        student.fit((X_soft - mean) / scale, y_soft, sample_weight=weights)
+        student.coef_ = student.coef_ / scale
+        student.intercept_ = student.intercept_ - student.coef_ @ mean
+        return student
+
+    if student_type == 'trees':
+        from xgboost import XGBClassifier
+        student = XGBClassifier(**(params or DISTILLATION_CONFIG['trees']), eval_metric='logloss')
+        student.fit(X_soft, y_soft, sample_weight=weights)
+        return student
+
+    raise ValueError(f"Unknown student type: {student_type}")
+
+
+def fidelity_report(
+    student_proba: np.ndarray,
+    teacher_proba: np.ndarray,
+    y_true: np.ndarray,
+    golden_threshold: float
+) -> Dict:
+    """
+    How closely the student tracks the teacher on held-out matches
+
+    Args:
+        student_proba: Student probabilities
+        teacher_proba: Calibrated teacher probabilities
+        y_true: Outcomes
+        golden_threshold: Golden Bets confidence threshold
+
+    Returns:
+        Dictionary with absolute probability gaps, agreement on the 0.5
+        decision and on Golden Bet candidacy, and test metrics of both
+    """
+    gap = np.abs(student_proba - teacher_proba)
+    student_golden = np.maximum(student_proba, 1 - student_proba) >= golden_threshold
+    teacher_golden = np.maximum(teacher_proba, 1 - teacher_proba) >= golden_threshold
+    student_metrics = calculate_metrics(y_true, student_proba)
+    teacher_metrics = calculate_metrics(y_true, teacher_proba)
+    return {
+        'mean_abs_gap': float(gap.mean()),
+        'p99_abs_gap': float(np.quantile(gap, 0.99)),
+        'max_abs_gap': float(gap.max()),
+        'decision_agreement': float(np.mean((student_proba >= 0.5) == (teacher_proba >= 0.5))),
+        'golden_agreement': float(np.mean(student_golden == teacher_golden)),
+        'log_loss_delta': student_metrics['log_loss'] - teacher_metrics['log_loss'],
+        'student_metrics': student_metrics,
+        'teacher_metrics': teacher_metrics
+    }
+
+
+def distill_market(
+    market: str,
+    data_path: Optional[str] = None,
+    student_type: Optional[str] = None,
+    models_dir: Optional[Path] = None,
+    trainer: Optional['MarketTrainer'] = None
+) -> Dict:
+    """
+    Distill one market's trained ensemble into a student
+
+    The student is fitted on the teacher's probabilities over the training
+    and validation splits and compared on the test split. Saved as
+    ``student_model.json`` (plus artifacts) and ``student_metadata.json``
+    next to the ensemble.
+
+    Args:
+        market: Market name
+        data_path: Training table (default: TRAINING_DATA_PATHS['counts'])
+        student_type: 'logistic' or 'trees' (default: DISTILLATION_CONFIG)
+        models_dir: Models directory (default: MODELS_DIR)
+        trainer: Loaded MarketTrainer to reuse (default: one over ``data_path``)
+
+    Returns:
+        Student metadata, including the fidelity report
+    """
+    from training.market_trainer import MarketTrainer
+
+    student_type = student_type or DISTILLATION_CONFIG['student']
+    market_dir = Path(models_dir or MODELS_DIR) / market
+
+    print("\n" + "=" * 60)
+    print(f"DISTILLING {market.upper()} ENSEMBLE ({student_type} student)")
+    print("=" * 60)
+
+    with open(market_dir / 'ensemble_metadata.json', 'r') as f:
+        ensemble_metadata = json.load(f)
+    teacher = load_teacher(market_dir)
+
+    trainer = trainer or MarketTrainer(data_path)
+    X_train, _, X_val, _, X_test, y_test, feature_cols = trainer.market_data(market)
+    feature_cols = ensemble_metadata.get('feature_columns', feature_cols)
+    X_fit = pd.concat([X_train, X_val]).reindex(columns=feature_cols, fill_value=0).to_numpy(dtype=np.float64)
+    X_test = X_test.reindex(columns=feature_cols, fill_value=0).to_numpy(dtype=np.float64)
+
+    print(f"\n🔄 Fitting student on {len(X_fit):,} teacher-labelled matches...")
+    student = fit_student(X_fit, teacher(X_fit), student_type)
+    save_model_artifacts(student, market_dir, 'student')
+    served_student = load_model(market_dir, 'student')
+
+    golden_threshold = DISTILLATION_CONFIG['golden_threshold']
+    teacher_test = teacher(X_test)
+    student_test = served_student.predict_proba(X_test)[:, 1]
+    fidelity = fidelity_report(student_test, teacher_test, y_test.to_numpy(), golden_threshold)
+    fidelity['latency_us'] = {
+        'student': time_per_call(served_student.predict_proba, X_test[:1]) * 1e6,
+        'teacher': time_per_call(teacher, X_test[:1]) * 1e6
+    }
+
+    # Scores within the margin of the threshold are re-scored by the
+    # ensemble; the margin is at least the student's p99 gap
+    metadata = {
+        'market': market,
+        'model_type': 'student',
+        'student_type': student_type,
+        'teacher_version': ensemble_metadata.get('version'),
+        'teacher_fingerprint': teacher_fingerprint(ensemble_metadata),
+        'distilled_at': datetime.now().isoformat(),
+        'golden_threshold': golden_threshold,
+        'fallback_margin': max(DISTILLATION_CONFIG['fallback_margin'], fidelity['p99_abs_gap']),
+        'feature_columns': list(feature_cols),
+        'fidelity': fidelity
+    }
+    with open(market_dir / 'student_metadata.json', 'w') as f:
+        json.dump(metadata, f, indent=2)
+
+    _print_fidelity(metadata)
+    return metadata
+
+
+def distill_all_markets(markets: Optional[List[str]] = None, student_type: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Distill every trained market ensemble, loading the training table once
+
+    Args:
+        markets: Markets to distill (default: DISTILLED_MARKETS)
+        student_type: 'logistic' or 'trees' (default: DISTILLATION_CONFIG)
+
+    Returns:
+        Student metadata per distilled market
+    """
+    from training.market_trainer import MarketTrainer
+
+    trainer = MarketTrainer()
+    results = {}
+    for market in markets or DISTILLED_MARKETS:
+        try:
+            results[market] = distill_market(market, student_type=student_type, trainer=trainer)
+        except Exception as e:
+            print(f"❌ Error distilling {market}: {e}")
+    return results
+
+
+def _print_fidelity(metadata: Dict):
+    fidelity = metadata['fidelity']
+    print(f"\n📊 Student vs ensemble (test split):")
+    print(f"   Mean |gap|:          {fidelity['mean_abs_gap']:.4f}")
+    print(f"   p99 / max |gap|:     {fidelity['p99_abs_gap']:.4f} / {fidelity['max_abs_gap']:.4f}")
+    print(f"   Decision agreement:  {fidelity['decision_agreement']:.1%}")
+    print(f"   Golden agreement:    {fidelity['golden_agreement']:.1%}")
+    print(f"   Log loss:            {fidelity['student_metrics']['log_loss']:.4f} "
+          f"(ensemble {fidelity['teacher_metrics']['log_loss']:.4f})")
+    print(f"   Latency (1 row):     {fidelity['latency_us']['student']:.0f} µs "
+          f"(ensemble {fidelity['latency_us']['teacher']:.0f} µs)")
+    print(f"   Ensemble fallback:   max(p, 1 - p) >= "
+          f"{metadata['golden_threshold'] - metadata['fallback_margin']:.3f}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Distill market ensembles into compact students')
+    parser.add_argument('--market', choices=DISTILLED_MARKETS, help='Single market (default: all)')
+    parser.add_argument('--student', choices=['logistic', 'trees'], help='Student model type')
+    args = parser.parse_args()
+
+    distill_all_markets([args.market] if args.market else None, args.student)
@@ -0,0 +1,326 @@
+"""
+Incremental Training
+Continues boosting the active ensemble's models on matches added since it
+was trained, refits only the calibrator, and gates the update on the
+active ensemble's performance over the newest matches
+"""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import lightgbm
+from lightgbm import LGBMClassifier
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from training.config import INCREMENTAL_TRAINING_CONFIG, MODELS_DIR, RETRAIN_CONFIG
+from training.market_trainer import MarketTrainer, evaluate_market, save_market
+from training.utils import calculate_metrics, model_params
+
+
+INCREMENTAL_MARKETS = ['goals', 'btts', 'cards', 'corners']
+
+
+def data_end_date(data_path: str) -> Optional[str]:
+    """
+    Date of the newest match in a training CSV
+
+    Args:
+        data_path: Training CSV
+
+    Returns:
+        ISO date string, or None if the CSV has no 'date' column
+    """
+    columns = pd.read_csv(data_path, nrows=0).columns
+    if 'date' not in columns:
+        return None
+    return pd.to_datetime(pd.read_csv(data_path, usecols=['date'])['date']).max().isoformat()
+
+
+def _artifact_path(market_dir: Path, model_type: str, key: str) -> Path:
+    """File of a saved model's artifact ('native' booster or linear 'weights')"""
+    manifest_path = market_dir / f"{model_type}_model.json"
+    manifest = {}
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    if key not in manifest:
+        raise ValueError(f"No {model_type} {key} artifact saved in {market_dir}")
+    return market_dir / manifest[key]
+
+
+def _update_logistic(
+    weights: np.ndarray,
+    X_new: pd.DataFrame,
+    y_new: pd.Series,
+    n_history: int,
+    C: float,
+    max_iter: int = 25
+) -> np.ndarray:
+    """
+    Newton update of saved logistic weights with new matches only
+
+    The history's loss enters as a quadratic around the saved weights
+    (its optimum), with curvature estimated on the new matches and scaled
+    to the history's size, so the history is not reread.
+
+    Args:
+        weights: Saved [intercept, coefficients]
+        X_new, y_new: Matches added since the weights were fitted
+        n_history: Matches the weights were fitted on
+        C: Inverse L2 strength, as LogisticRegression (intercept unpenalized)
+        max_iter: Newton steps at most
+
+    Returns:
+        Updated [intercept, coefficients]
+    """
+    X = np.column_stack([np.ones(len(X_new)), X_new.to_numpy(dtype=np.float64)])
+    y = y_new.to_numpy(dtype=np.float64)
+    start = weights.astype(np.float64)
+
+    p = 1.0 / (1.0 + np.exp(-X @ start))
+    prior = (C * n_history / len(X)) * (X.T * (p * (1 - p))) @ X
+    prior[1:, 1:] += np.eye(len(start) - 1)
+
+    w = start.copy()
+    for _ in range(max_iter):
+        p = 1.0 / (1.0 + np.exp(-X @ w))
+        gradient = C * X.T @ (p - y) + prior @ (w - start)
+        hessian = C * (X.T * (p * (1 - p))) @ X + prior
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.abs(step).max() < 1e-8:
+            break
+    return w
+
+
+def continue_training(
+    model_type: str,
+    market_dir: Path,
+    X_new: pd.DataFrame,
+    y_new: pd.Series,
+    X_val: pd.DataFrame,
+    y_val: pd.Series,
+    n_history: int,
+    extra_rounds: int,
+    market: Optional[str] = None
+) -> tuple:
+    """
+    Update one saved base model with new matches
+
+    XGBoost and LightGBM add at most ``extra_rounds`` trees fitted on the
+    new matches to the saved booster. Logistic regression takes a few
+    Newton steps from the saved coefficients on the new matches (see
+    ``_update_logistic``). Neither rereads the history.
+
+    Args:
+        model_type: 'xgboost', 'lightgbm' or 'logistic'
+        market_dir: Directory with the active model's artifacts
+        X_new, y_new: Matches added since the active model was trained
+        X_val, y_val: Early stopping / evaluation data
+        n_history: Matches the active model was trained on
+        extra_rounds: Maximum boosting rounds to add
+        market: Market whose tuned parameters apply (optional)
+
+    Returns:
+        Tuple of (model, val_predictions, metrics), as ``train_single_model``
+
+    Raises:
+        ValueError: If the model type or its saved format cannot be warm-started
+    """
+    params = model_params(model_type, market)
+
+    if model_type in ('xgboost', 'lightgbm'):
+        native_path = _artifact_path(market_dir, model_type, 'native')
+        params['n_estimators'] = extra_rounds
+        stopping_rounds = INCREMENTAL_TRAINING_CONFIG['early_stopping_rounds']
+        if model_type == 'xgboost':
+            params['early_stopping_rounds'] = stopping_rounds
+            model = XGBClassifier(**params)
+            model.fit(X_new, y_new, eval_set=[(X_val, y_val)], xgb_model=str(native_path), verbose=False)
+        else:
+            model = LGBMClassifier(**params)
+            model.fit(
+                X_new, y_new, eval_set=[(X_val, y_val)], init_model=str(native_path),
+                callbacks=[lightgbm.early_stopping(stopping_rounds, verbose=False)]
+            )
+    elif model_type == 'logistic':
+        weights = _update_logistic(
+            np.load(_artifact_path(market_dir, model_type, 'weights')),
+            X_new, y_new, n_history, params.get('C', 1.0)
+        )
+        model = LogisticRegression(**params)
+        model.coef_, model.intercept_ = weights[None, 1:], weights[:1]
+        model.classes_ = np.array([0, 1])
+        model.n_features_in_ = X_new.shape[1]
+        model.feature_names_in_ = np.asarray(X_new.columns, dtype=object)
+    else:
+        raise ValueError(f"{model_type} models cannot be warm-started")
+
+    val_proba = model.predict_proba(X_val)[:, 1]
+    return model, val_proba, calculate_metrics(y_val, val_proba, (val_proba >= 0.5).astype(int))
+
+
+def train_market_incremental(
+    market: str,
+    data_path: Optional[str] = None,
+    redistill: bool = True,
+    trainer: Optional[MarketTrainer] = None
+) -> Optional[Dict]:
+    """
+    Warm-start a market's ensemble from its active version
+
+    Matches dated after the active version's ``data_end_date`` are split
+    in time order: the oldest ``1 - holdout_fraction`` are boosted on and
+    the newest ``1 - calibration_fraction`` of the rest are the test
+    window. The calibrator is refitted on the ``calibration_window``
+    newest matches before the test window that were not boosted on. The
+    update is saved only if its test log loss is within
+    ``max_log_loss_increase`` of the active ensemble on the same window.
+
+    A saved update changes the ensemble's fingerprint, so a distilled
+    student stops being served until it is distilled again.
+
+    Args:
+        market: Market name
+        data_path: Training table (default: TRAINING_DATA_PATHS['counts'])
+        redistill: Distill the updated ensemble into a new student, if the
+            market had one (callers that distill after promotion pass False)
+        trainer: Loaded MarketTrainer to reuse (default: one over ``data_path``)
+
+    Returns:
+        Training results (as ``train_*_model``) plus 'gate' and 'timing',
+        or None if the market needs a from-scratch retrain (no active
+        version, too few new matches, or too many chained updates)
+    """
+    from training.distill import distill_market, load_teacher
+
+    config = INCREMENTAL_TRAINING_CONFIG
+    market_dir = MODELS_DIR / market
+
+    print("\n" + "=" * 60)
+    print(f"INCREMENTAL TRAINING: {market.upper()}")
+    print("=" * 60)
+
+    metadata_path = market_dir / 'ensemble_metadata.json'
+    if not metadata_path.exists():
+        print(f"⚠️  No active {market} ensemble - full retrain needed")
+        return None
+    with open(metadata_path, 'r') as f:
+        metadata = json.load(f)
+    if not metadata.get('data_end_date'):
+        print(f"⚠️  Active {market} ensemble has no data_end_date - full retrain needed")
+        return None
+    warm_starts = metadata.get('warm_starts', 0)
+    if warm_starts >= config['max_warm_starts']:
+        print(f"⚠️  {market} has had {warm_starts} incremental updates - full retrain due")
+        return None
+
+    trainer = (trainer or MarketTrainer(data_path)).load()
+    df = trainer.df.assign(y=trainer.target(market)).dropna(subset=['y'])
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.sort_values('date', kind='mergesort').reset_index(drop=True)
+    is_new = df['date'] > pd.Timestamp(metadata['data_end_date'])
+    n_new = int(is_new.sum())
+    if n_new < RETRAIN_CONFIG['min_new_matches']:
+        print(f"⚠️  Only {n_new} new matches (minimum {RETRAIN_CONFIG['min_new_matches']}) - full retrain needed")
+        return None
+
+    feature_cols = metadata['feature_columns']
+    X = df.reindex(columns=feature_cols).fillna(0)
+    y = df['y'].astype(int)
+    history, new = np.flatnonzero(~is_new), np.flatnonzero(is_new)
+    n_fit = int(n_new * (1 - config['holdout_fraction']))
+    n_cal = int((n_new - n_fit) * config['calibration_fraction'])
+    fit_rows, test_rows = new[:n_fit], new[n_fit + n_cal:]
+    # The active version held its newest matches out of boosting (its
+    # validation/test split, or a previous update's holdout), so the tail
+    # of the history extends the calibration window
+    cal_rows = np.concatenate([history, new[n_fit:n_fit + n_cal]])[-config['calibration_window']:]
+    print(f"📅 {n_new:,} new matches since {metadata['data_end_date'][:10]} "
+          f"({len(history):,} seen): {len(fit_rows):,} boosting, "
+          f"{len(cal_rows):,} calibration, {len(test_rows):,} test")
+
+    data = (
+        X.iloc[fit_rows], y.iloc[fit_rows], X.iloc[cal_rows], y.iloc[cal_rows],
+        X.iloc[test_rows], y.iloc[test_rows], feature_cols
+    )
+    started = time.perf_counter()
+    fits = {}
+    for model_type in metadata.get('base_models', []):
+        t0 = time.perf_counter()
+        try:
+            model, val_proba, metrics = continue_training(
+                model_type, market_dir, data[0], data[1], data[2], data[3],
+                len(history), config['extra_rounds'], market
+            )
+        except (ValueError, FileNotFoundError) as e:
+            print(f"⚠️  {e} - full retrain needed")
+            return None
+        fits[model_type] = {
+            'model': model, 'val_proba': val_proba, 'metrics': metrics,
+            'test_proba': model.predict_proba(data[4])[:, 1]
+        }
+        print(f"✅ {model_type}: updated in {time.perf_counter() - t0:.2f} s "
+              f"(calibration log loss {metrics['log_loss']:.4f})")
+
+    results = evaluate_market(data, fits)
+
+    # Gate against the active ensemble, calibrator included, on the newest matches
+    active_metrics = calculate_metrics(data[5], load_teacher(market_dir)(data[4]))
+    gate = {
+        'log_loss': results['test_metrics']['log_loss'],
+        'active_log_loss': active_metrics['log_loss'],
+        'max_increase': config['max_log_loss_increase'],
+    }
+    gate['passed'] = gate['log_loss'] <= gate['active_log_loss'] + gate['max_increase']
+    results.update({'gate': gate, 'timing': {'wall_time': time.perf_counter() - started, 'new_matches': n_new}})
+
+    print(f"\n📊 Test log loss: {gate['log_loss']:.4f} (active ensemble {gate['active_log_loss']:.4f})")
+    if not gate['passed']:
+        print(f"❌ Incremental {market} update rejected - active models left in place")
+        return results
+
+    save_market(market, data, fits, results, reference_data=X.iloc[np.concatenate([history, fit_rows])])
+    with open(metadata_path, 'r') as f:
+        updated = json.load(f)
+    updated.update({
+        'version': metadata.get('version', updated['version']),
+        'training_mode': 'incremental',
+        'warm_starts': warm_starts + 1,
+        'data_end_date': df['date'].max().isoformat()
+    })
+    with open(metadata_path, 'w') as f:
+        json.dump(updated, f, indent=2)
+
+    print(f"💾 Incremental {market} update saved in {results['timing']['wall_time']:.1f} s "
+          f"(update {warm_starts + 1} of {config['max_warm_starts']})")
+
+    if (market_dir / 'student_metadata.json').exists():
+        if not redistill:
+            print(f"⚠️  {market} student no longer matches the updated ensemble - not served until redistilled")
+        else:
+            try:
+                distill_market(market, trainer=trainer)
+            except Exception as e:
+                print(f"⚠️  Could not redistill {market} student ({e}) - the ensemble is served until it is distilled")
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Warm-start market models from their active version')
+    parser.add_argument('--market', choices=INCREMENTAL_MARKETS, help='Single market (default: all)')
+    args = parser.parse_args()
+
+    for market in [args.market] if args.market else INCREMENTAL_MARKETS:
+        train_market_incremental(market)
@@ -0,0 +1,482 @@
+"""
+Market Trainer
+Market-agnostic training engine: loads the shared feature block once,
+derives each market's target from the MARKETS config, and fits, ensembles,
+calibrates and saves every market on the same split
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.ensemble import RandomForestClassifier
+from xgboost import XGBClassifier
+from lightgbm import LGBMClassifier
+import warnings
+warnings.filterwarnings('ignore')
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from training.config import (
+    CALIBRATION_METHOD, DEFAULT_MODELS, ENSEMBLE_WEIGHTS, MARKETS, MODELS_DIR,
+    TRAIN_SPLIT, TRAINING_DATA_PATHS, USE_TIME_BASED_SPLIT, VAL_SPLIT
+)
+from training.count_models import COUNT_TARGETS
+from training.matrix_cache import MatrixCache, default_cache
+from training.utils import (
+    apply_calibration, calculate_metrics, ensemble_predictions, fit_calibration_model,
+    get_feature_importance, model_params, save_calibration, save_model_with_metadata,
+    time_based_split
+)
+
+
+# Training CSV columns that are not model features (nor are ``odds_*``)
+METADATA_COLUMNS = ['match_id', 'date', 'league', 'home_team_id', 'away_team_id', 'y']
+
+# Per-team counts of the training table, from which targets are derived
+COUNT_COLUMNS = [column for pair in COUNT_TARGETS.values() for column in pair]
+
+
+def feature_columns(columns) -> List[str]:
+    """Model feature columns of a training table (metadata, targets and odds excluded)"""
+    return [
+        col for col in columns
+        if col not in METADATA_COLUMNS and col not in COUNT_COLUMNS and not col.startswith('odds_')
+    ]
+
+
+def prepare_data(data_path: str, market: Optional[str] = None) -> tuple:
+    """
+    Load and split one training table for a single market
+
+    Args:
+        data_path: Path to training CSV
+        market: Market whose target is derived from the counts (default:
+            the CSV's 'y' column)
+
+    Returns:
+        Tuple of (X_train, y_train, X_val, y_val, X_test, y_test, feature_columns)
+    """
+    return MarketTrainer(data_path).market_data(market)
+
+
+def train_single_model(
+    model_type: str,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_val: pd.DataFrame,
+    y_val: pd.Series,
+    params: Optional[Dict] = None,
+    market: Optional[str] = None,
+    matrix_cache: Optional[MatrixCache] = None
+) -> tuple:
+    """
+    Train a single model
+    
+    Args:
+        model_type: Type of model to train
+        X_train, y_train: Training data
+        X_val, y_val: Validation data
+        params: Overrides of the model parameters (optional)
+        market: Market whose tuned parameters apply (optional)
+        matrix_cache: Cache of XGBoost / LightGBM training matrices
+            (default: the shared cache, unless disabled in MATRIX_CACHE_CONFIG)
+        
+    Returns:
+        Tuple of (model, val_predictions, metrics)
+    """
+    print(f"\n🔄 Training {model_type.upper()} model...")
+    
+    params = {**model_params(model_type, market), **(params or {})}
+    matrix_cache = matrix_cache or default_cache()
+    
+    # Initialize model
+    if model_type == 'logistic':
+        model = LogisticRegression(**params)
+    elif model_type == 'xgboost':
+        model = XGBClassifier(**params)
+    elif model_type == 'lightgbm':
+        model = LGBMClassifier(**params)
+    elif model_type == 'random_forest':
+        model = RandomForestClassifier(**params)
+    else:
+        raise ValueError(f"Unknown model type: {model_type}")
+    
+    # Train
+    if model_type in ('xgboost', 'lightgbm') and matrix_cache is not None:
+        # Boosters train from cached native matrices (same model as the wrapper's fit)
+        model = matrix_cache.fit(model_type, params, X_train, y_train, X_val, y_val)
+    elif model_type == 'xgboost':
+        # Use early stopping for gradient boosting
+        model.fit(
+            X_train, y_train,
+            eval_set=[(X_val, y_val)],
+            verbose=False
+        )
+    elif model_type == 'lightgbm':
+        # LightGBM 4 takes no ``verbose`` in fit (set in the params)
+        model.fit(X_train, y_train, eval_set=[(X_val, y_val)])
+    else:
+        model.fit(X_train, y_train)
+    
+    # Predict on validation set
+    val_proba = model.predict_proba(X_val)[:, 1]
+    val_pred = (val_proba >= 0.5).astype(int)
+    
+    # Calculate metrics
+    metrics = calculate_metrics(y_val, val_proba, val_pred)
+    
+    print(f"✅ {model_type.upper()} trained:")
+    print(f"   Log Loss:    {metrics['log_loss']:.4f}")
+    print(f"   Brier Score: {metrics['brier_score']:.4f}")
+    print(f"   Accuracy:    {metrics['accuracy']:.4f}")
+    print(f"   AUC-ROC:     {metrics['auc_roc']:.4f}")
+    
+    return model, val_proba, metrics
+
+
+def market_target(df: pd.DataFrame, market: str) -> pd.Series:
+    """
+    Binary target of a market from the per-team counts
+
+    The market's MARKETS entry names the counted stat and the line: the
+    target is home + away above ``threshold``, or both teams above zero
+    when ``threshold`` is None (BTTS).
+
+    Args:
+        df: Table with the COUNT_TARGETS columns of the market's stat
+        market: Market name
+
+    Returns:
+        Float series of 0/1, NaN where either count is missing
+    """
+    spec = MARKETS[market]
+    home, away = COUNT_TARGETS[spec['count']]
+    if spec['threshold'] is None:
+        y = (df[home] > 0) & (df[away] > 0)
+    else:
+        y = df[home] + df[away] > spec['threshold']
+    return y.astype(float).where(df[home].notna() & df[away].notna())
+
+
+class MarketTrainer:
+    """
+    Trains any MARKETS entry from one load of the shared feature block
+
+    The table is read, its features built and its train / validation /
+    test split computed once; each market then only derives its target and
+    drops the rows where it is missing. Seconds per stage are collected in
+    ``timings``.
+    """
+
+    def __init__(self, data_path: Optional[str] = None, model_types: Optional[List[str]] = None):
+        """
+        Args:
+            data_path: Training table (default: TRAINING_DATA_PATHS['counts'])
+            model_types: Base models per market (default: DEFAULT_MODELS)
+        """
+        self.data_path = str(data_path or TRAINING_DATA_PATHS['counts'])
+        self.model_types = list(model_types or DEFAULT_MODELS)
+        self.timings: Dict[str, float] = {}
+        self.df: Optional[pd.DataFrame] = None
+        self.feature_cols: List[str] = []
+        self.splits: Dict[str, np.ndarray] = {}
+        self.X: Dict[str, pd.DataFrame] = {}
+
+    @contextmanager
+    def _stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    def load(self) -> 'MarketTrainer':
+        """Read the table, build the feature matrices and the shared split (once)"""
+        if self.df is not None:
+            return self
+
+        with self._stage('load'):
+            print(f"📂 Loading data from {self.data_path}")
+            df = pd.read_csv(self.data_path)
+            self.feature_cols = feature_columns(df.columns)
+
+            if USE_TIME_BASED_SPLIT and 'date' in df.columns:
+                print("📅 Using time-based split")
+                df['date'] = pd.to_datetime(df['date'])
+                # The split frames are slices of the sorted table, indexed by position
+                parts = time_based_split(df, TRAIN_SPLIT, VAL_SPLIT, 'date')
+                df = pd.concat(parts)
+                self.splits = {split: part.index.to_numpy() for split, part in zip(('train', 'val', 'test'), parts)}
+            else:
+                print("🔀 Using random split")
+                from sklearn.model_selection import train_test_split
+                train_rows, temp_rows = train_test_split(np.arange(len(df)), train_size=TRAIN_SPLIT, random_state=42)
+                val_rows, test_rows = train_test_split(
+                    temp_rows, train_size=VAL_SPLIT/(VAL_SPLIT + (1-TRAIN_SPLIT-VAL_SPLIT)),
+                    random_state=42
+                )
+                self.splits = {'train': train_rows, 'val': val_rows, 'test': test_rows}
+
+            features = df[self.feature_cols].fillna(0)
+            self.X = {split: features.iloc[rows] for split, rows in self.splits.items()}
+            self.df = df
+
+        print(f"✅ Loaded {len(self.df):,} matches, {len(self.feature_cols)} features "
+              f"({len(self.splits['train']):,} / {len(self.splits['val']):,} / {len(self.splits['test']):,} "
+              f"train / validation / test) in {self.timings['load']:.1f} s")
+        return self
+
+    def target(self, market: Optional[str]) -> pd.Series:
+        """Market target over the loaded table (its 'y' column for a single-market CSV)"""
+        if market is None or (
+            COUNT_TARGETS[MARKETS[market]['count']][0] not in self.df.columns and 'y' in self.df.columns
+        ):
+            return self.df['y'].astype(float)
+        return market_target(self.df, market)
+
+    def market_data(self, market: Optional[str]) -> tuple:
+        """
+        One market's splits, rows with a missing target dropped
+
+        Args:
+            market: Market name (None: the table's 'y' column)
+
+        Returns:
+            Tuple of (X_train, y_train, X_val, y_val, X_test, y_test, feature_columns)
+        """
+        self.load()
+        with self._stage(f"{market}/data"):
+            y = self.target(market)
+            data = []
+            for split, rows in self.splits.items():
+                y_split = y.iloc[rows]
+                known = y_split.notna().to_numpy()
+                X_split = self.X[split] if known.all() else self.X[split][known]
+                data += [X_split, y_split[known].astype(int)]
+
+        y_train = data[1]
+        name = MARKETS[market]['name'] if market else 'Target'
+        print(f"📊 {name}: {len(data[0]):,} / {len(data[2]):,} / {len(data[4]):,} "
+              f"samples, {y_train.mean():.1%} positive (training)")
+        return (*data, self.feature_cols)
+
+    def train_market(self, market: str) -> Dict:
+        """
+        Fit, ensemble, calibrate, evaluate and save one market
+
+        Args:
+            market: Market name
+
+        Returns:
+            Training results, as returned by ``evaluate_market``, plus the
+            market's stage 'timing' in seconds
+        """
+        print("\n" + "=" * 60)
+        print(f"TRAINING {MARKETS[market]['name'].upper()} MODEL")
+        print("=" * 60)
+
+        data = self.market_data(market)
+        X_train, y_train, X_val, y_val, X_test, _, feature_cols = data
+
+        fits = {}
+        for model_type in self.model_types:
+            try:
+                with self._stage(f"{market}/{model_type}"):
+                    model, val_proba, metrics = train_single_model(
+                        model_type, X_train, y_train, X_val, y_val, market=market
+                    )
+                    fits[model_type] = {
+                        'model': model, 'val_proba': val_proba, 'metrics': metrics,
+                        'test_proba': model.predict_proba(X_test)[:, 1]
+                    }
+            except Exception as e:
+                print(f"❌ Error training {model_type}: {e}")
+
+        if not fits:
+            print("❌ No models were successfully trained!")
+            return {}
+
+        with self._stage(f"{market}/calibrate"):
+            results = evaluate_market(data, fits)
+        for label, key in (('Ensemble', 'ensemble_metrics'), ('Calibrated ensemble', 'calibrated_metrics'),
+                           ('Test set (calibrated ensemble)', 'test_metrics')):
+            metrics = results[key]
+            print(f"✅ {label}: log loss {metrics['log_loss']:.4f}, brier {metrics['brier_score']:.4f}, "
+                  f"accuracy {metrics['accuracy']:.4f}, AUC {metrics['auc_roc']:.4f}")
+
+        with self._stage(f"{market}/save"):
+            save_market(market, data, fits, results)
+        print(f"💾 Saved {market} models to {MODELS_DIR / market}")
+
+        tree_type = next((mt for mt in ('xgboost', 'lightgbm', 'random_forest') if mt in fits), None)
+        if tree_type:
+            print(f"\n📊 Top 10 features ({tree_type}):")
+            importance_df = get_feature_importance(fits[tree_type]['model'], feature_cols, top_n=10)
+            for _, row in importance_df.iterrows():
+                print(f"   {row['feature']:30s}: {row['importance']:.4f}")
+
+        results['timing'] = {
+            stage.split('/', 1)[1]: seconds for stage, seconds in self.timings.items()
+            if stage.startswith(f"{market}/")
+        }
+        return results
+
+    def train_all(self, markets: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Train several markets on the shared load
+
+        Args:
+            markets: Markets to train (default: every MARKETS entry)
+
+        Returns:
+            Training results per market
+        """
+        results = {}
+        for market in markets or list(MARKETS):
+            try:
+                results[market] = self.train_market(market)
+            except Exception as e:
+                print(f"❌ Error training {market} model: {e}")
+        self.print_timings()
+        return results
+
+    def print_timings(self):
+        """Seconds per stage, the shared load first"""
+        print("\n" + "=" * 60)
+        print("TRAINING STAGE TIMES")
+        print("=" * 60)
+        for stage, seconds in self.timings.items():
+            print(f"   {stage:30s}{seconds:>8.2f} s")
+        print(f"   {'total':30s}{sum(self.timings.values()):>8.2f} s")
+
+
+def evaluate_market(data: Tuple, fits: Dict[str, Dict]) -> Dict:
+    """
+    Ensemble one market's base models, calibrate on the validation split
+    and evaluate on the test split
+
+    Args:
+        data: ``prepare_data`` output for the market
+        fits: Per model type, a dictionary with the fitted 'model' and its
+            'val_proba' / 'test_proba' predictions
+
+    Returns:
+        Training results: models, ensemble / calibrated validation metrics,
+        test metrics, calibration model and feature columns
+    """
+    _, _, _, y_val, _, y_test, feature_cols = data
+
+    ensemble_proba = ensemble_predictions(
+        {model_type: fit['val_proba'] for model_type, fit in fits.items()}, ENSEMBLE_WEIGHTS
+    )
+    calibration_model = fit_calibration_model(ensemble_proba, y_val.values, CALIBRATION_METHOD)
+    calibrated_metrics = calculate_metrics(
+        y_val, apply_calibration(calibration_model, ensemble_proba, CALIBRATION_METHOD)
+    )
+
+    test_ensemble = ensemble_predictions(
+        {model_type: fit['test_proba'] for model_type, fit in fits.items()}, ENSEMBLE_WEIGHTS
+    )
+    test_metrics = calculate_metrics(
+        y_test, apply_calibration(calibration_model, test_ensemble, CALIBRATION_METHOD)
+    )
+
+    return {
+        'models': {model_type: fit['model'] for model_type, fit in fits.items()},
+        'ensemble_metrics': calculate_metrics(y_val, ensemble_proba),
+        'calibrated_metrics': calibrated_metrics,
+        'test_metrics': test_metrics,
+        'calibration_model': calibration_model,
+        'feature_columns': feature_cols
+    }
+
+
+def save_market(
+    market: str,
+    data: Tuple,
+    fits: Dict[str, Dict],
+    results: Dict,
+    reference_data: Optional[pd.DataFrame] = None
+):
+    """
+    Save a market's base models, ensemble metadata and calibration
+
+    Args:
+        market: Market name
+        data: ``prepare_data`` output for the market
+        fits: Per model type, a dictionary with the fitted 'model' and its 'metrics'
+        results: ``evaluate_market`` output
+        reference_data: Drift reference features (default: training split)
+    """
+    X_train, _, X_val, _, X_test, _, feature_cols = data
+
+    for model_type, fit in fits.items():
+        save_model_with_metadata(
+            model=fit['model'], market=market, metrics=fit['metrics'],
+            feature_columns=feature_cols, model_type=model_type,
+            additional_info={
+                'training_samples': len(X_train),
+                'validation_samples': len(X_val),
+                'test_samples': len(X_test)
+            },
+            reference_data=X_train if reference_data is None else reference_data
+        )
+
+    market_dir = MODELS_DIR / market
+    market_dir.mkdir(parents=True, exist_ok=True)
+    with open(market_dir / 'ensemble_metadata.json', 'w') as f:
+        json.dump({
+            'market': market, 'model_type': 'ensemble', 'version': 'v1.0.0',
+            'base_models': list(fits.keys()), 'weights': ENSEMBLE_WEIGHTS,
+            'calibration_method': CALIBRATION_METHOD,
+            'metrics': {'validation': results['calibrated_metrics'], 'test': results['test_metrics']},
+            'feature_columns': feature_cols
+        }, f, indent=2)
+    save_calibration(results['calibration_model'], market_dir, 'ensemble')
+
+
+def train_market(market: str, data_path: Optional[str] = None) -> Dict:
+    """
+    Train one market on its own load of the training table
+
+    Args:
+        market: Market name
+        data_path: Training table (default: TRAINING_DATA_PATHS['counts'])
+
+    Returns:
+        Training results (see ``MarketTrainer.train_market``)
+    """
+    return MarketTrainer(data_path).train_market(market)
+
+
+def train_all_markets(markets: Optional[List[str]] = None, data_path: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    Train several markets from one load of the training table
+
+    Args:
+        markets: Markets to train (default: every MARKETS entry)
+        data_path: Training table (default: TRAINING_DATA_PATHS['counts'])
+
+    Returns:
+        Training results per market
+    """
+    return MarketTrainer(data_path).train_all(markets)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Train market models from the shared training table')
+    parser.add_argument('--markets', nargs='+', choices=list(MARKETS), help='Markets (default: all)')
+    parser.add_argument('--data', help='Training table (default: the counts CSV)')
+    args = parser.parse_args()
+
+    train_all_markets(args.markets, args.data)
@@ -0,0 +1,276 @@
+"""
+Training Matrix Cache
+Saves constructed XGBoost DMatrix and LightGBM Dataset binaries keyed by
+content, so repeated fits on the same data skip matrix construction
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from training.config import MATRIX_CACHE_CONFIG, MATRIX_CACHE_DIR
+
+
+# LightGBM parameters that change how a Dataset is binned (part of the key)
+LIGHTGBM_DATASET_PARAMS = (
+    'max_bin', 'max_bin_by_feature', 'min_data_in_bin', 'subsample_for_bin',
+    'bin_construct_sample_cnt', 'random_state', 'seed', 'data_random_seed',
+    'use_missing', 'zero_as_missing', 'linear_tree'
+)
+
+# LGBMClassifier arguments that are not LightGBM parameters
+_LIGHTGBM_SKLEARN_ONLY = ('n_estimators', 'class_weight', 'importance_type')
+
+_default_cache: Optional['MatrixCache'] = None
+
+
+class LightGBMBoosterClassifier:
+    """
+    Classifier over a lightgbm.Booster trained from a cached Dataset
+
+    Exposes what the training code uses of LGBMClassifier: ``booster_``,
+    ``predict_proba`` and ``feature_importances_``.
+    """
+
+    def __init__(self, booster):
+        self.booster_ = booster
+        self.classes_ = np.array([0, 1])
+        self.n_features_in_ = booster.num_feature()
+        self.feature_name_ = booster.feature_name()
+        self.best_iteration_ = booster.best_iteration
+
+    @property
+    def feature_importances_(self) -> np.ndarray:
+        return self.booster_.feature_importance()
+
+    def predict_proba(self, X) -> np.ndarray:
+        p = self.booster_.predict(X)
+        return np.column_stack([1.0 - p, p])
+
+
+class MatrixCache:
+    """
+    Library-native training matrices on disk, keyed by data content
+
+    Keys hash the feature values, labels, feature names, split label,
+    library version and (LightGBM) binning parameters. Least recently used
+    files are evicted once the cache exceeds ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """
+        Args:
+            cache_dir: Cache directory (default: MATRIX_CACHE_DIR)
+            max_bytes: Size bound (default: MATRIX_CACHE_CONFIG['max_bytes'])
+        """
+        self.cache_dir = Path(cache_dir or MATRIX_CACHE_DIR)
+        self.max_bytes = max_bytes or MATRIX_CACHE_CONFIG['max_bytes']
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, X, y, split: str, library: str, params: Optional[Dict] = None) -> str:
+        """
+        Cache key of a training matrix
+
+        Args:
+            X: Features (DataFrame or array)
+            y: Labels
+            split: Split label ('train', 'val', ...)
+            library: 'xgboost' or 'lightgbm'
+            params: Construction parameters that change the binary
+
+        Returns:
+            Hex digest
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        values = X.to_numpy() if isinstance(X, pd.DataFrame) else np.asarray(X)
+        digest.update(json.dumps({
+            'features': _feature_names(X),
+            'split': split,
+            'library': library,
+            'version': _library_version(library),
+            'dtype': values.dtype.str,
+            'shape': values.shape,
+            'params': params or {}
+        }, sort_keys=True, default=str).encode())
+        digest.update(np.ascontiguousarray(values).data)
+        digest.update(np.ascontiguousarray(np.asarray(y, dtype=np.float64)).data)
+        return digest.hexdigest()
+
+    def xgboost_dmatrix(self, X, y, split: str = 'train'):
+        """
+        DMatrix of (X, y), loaded from the cache when present
+
+        Args:
+            X: Features
+            y: Labels
+            split: Split label
+
+        Returns:
+            xgboost.DMatrix
+        """
+        import xgboost
+
+        path = self.cache_dir / 'xgboost' / f"{self.key(X, y, split, 'xgboost')}.buffer"
+        if self._hit(path):
+            try:
+                return xgboost.DMatrix(str(path))
+            except xgboost.core.XGBoostError:
+                pass
+        dmatrix = xgboost.DMatrix(X, label=np.asarray(y), feature_names=_feature_names(X))
+        self._store(path, dmatrix.save_binary)
+        return dmatrix
+
+    def lightgbm_dataset(self, X, y, split: str = 'train', params: Optional[Dict] = None, reference=None):
+        """
+        Constructed LightGBM Dataset of (X, y), loaded from the cache when present
+
+        Args:
+            X: Features
+            y: Labels
+            split: Split label
+            params: LightGBM parameters (binning ones are part of the key)
+            reference: Training Dataset whose bins a validation set uses
+
+        Returns:
+            lightgbm.Dataset
+        """
+        import lightgbm
+
+        dataset_params = {
+            name: value for name, value in (params or {}).items()
+            if name in LIGHTGBM_DATASET_PARAMS and value is not None
+        }
+        # Without pre-filtering, min_data_in_leaf does not change the binary
+        dataset_params.update({'verbose': -1, 'feature_pre_filter': False})
+        key_params = dict(dataset_params, reference=None if reference is None else reference.cache_key)
+        key = self.key(X, y, split, 'lightgbm', key_params)
+        path = self.cache_dir / 'lightgbm' / f"{key}.bin"
+
+        if self._hit(path):
+            dataset = lightgbm.Dataset(str(path), params=dataset_params, reference=reference)
+        else:
+            dataset = lightgbm.Dataset(
+                X, label=np.asarray(y), params=dataset_params, reference=reference,
+                feature_name=_feature_names(X) or 'auto', free_raw_data=False
+            ).construct()
+            self._store(path, dataset.save_binary)
+        dataset.cache_key = key
+        return dataset
+
+    def fit(self, model_type: str, params: Dict, X_train, y_train, X_val, y_val) -> Any:
+        """
+        Fit a boosted model from cached matrices
+
+        Same result as the scikit-learn wrapper's ``fit`` with
+        ``eval_set=[(X_val, y_val)]``.
+
+        Args:
+            model_type: 'xgboost' or 'lightgbm'
+            params: Model constructor parameters
+            X_train, y_train: Training data
+            X_val, y_val: Evaluation (early stopping) data
+
+        Returns:
+            Fitted XGBClassifier, or LightGBMBoosterClassifier
+        """
+        if model_type == 'xgboost':
+            import xgboost
+            model = xgboost.XGBClassifier(**params)
+            booster = xgboost.train(
+                model.get_xgb_params(),
+                self.xgboost_dmatrix(X_train, y_train, 'train'),
+                model.get_num_boosting_rounds(),
+                evals=[(self.xgboost_dmatrix(X_val, y_val, 'val'), 'validation_0')],
+                early_stopping_rounds=model.early_stopping_rounds,
+                verbose_eval=False
+            )
+            model.load_model(bytearray(booster.save_raw()))
+            return model
+
+        if model_type == 'lightgbm':
+            import lightgbm
+            lgb_params = {
+                name: value for name, value in lightgbm.LGBMClassifier(**params).get_params().items()
+                if name not in _LIGHTGBM_SKLEARN_ONLY and value is not None
+            }
+            lgb_params['objective'] = 'binary'
+            rounds = params.get('n_estimators', 100)
+            booster = lightgbm.train(lgb_params, self.lightgbm_dataset(X_train, y_train, 'train', lgb_params), rounds)
+            return LightGBMBoosterClassifier(booster)
+
+        raise ValueError(f"No cached matrices for model type: {model_type}")
+
+    def size(self) -> int:
+        """Total bytes of cached files"""
+        return sum(path.stat().st_size for path in self._files())
+
+    def _files(self) -> List[Path]:
+        return [path for path in self.cache_dir.glob('*/*') if path.is_file() and not path.name.endswith('.tmp')]
+
+    def _hit(self, path: Path) -> bool:
+        """Whether ``path`` is cached; a hit refreshes its eviction order"""
+        if path.exists():
+            try:
+                os.utime(path)
+                self.hits += 1
+                return True
+            except FileNotFoundError:
+                pass
+        self.misses += 1
+        return False
+
+    def _store(self, path: Path, save_fn):
+        """Write via a temporary file so concurrent workers never read a partial binary"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        save_fn(str(tmp_path))
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        """Delete least recently used files until the cache fits ``max_bytes``"""
+        files = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda f: f[0]):
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+
+def default_cache() -> Optional[MatrixCache]:
+    """Process-wide cache, or None when MATRIX_CACHE_CONFIG disables it"""
+    global _default_cache
+    if not MATRIX_CACHE_CONFIG['enabled']:
+        return None
+    if _default_cache is None:
+        _default_cache = MatrixCache()
+    return _default_cache
+
+
+def _feature_names(X) -> Optional[List[str]]:
+    return [str(col) for col in X.columns] if isinstance(X, pd.DataFrame) else None
+
+
+def _library_version(library: str) -> str:
+    module = __import__(library)
+    return module.__version__
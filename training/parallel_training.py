@@ -0,0 +1,240 @@
+"""
+Parallel Market Training
+Trains every (market, model type) pair over a process pool with bounded
+threads per fit, and ensembles and calibrates each market as soon as its
+base models are done
+"""
+
+import contextlib
+import io
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from training.config import DEFAULT_MODELS, PARALLEL_TRAINING_CONFIG
+from training.market_trainer import MarketTrainer, evaluate_market, save_market
+
+
+PARALLEL_MARKETS = ['goals', 'btts', 'cards', 'corners']
+
+# Model parameter carrying the thread count of each library
+_THREAD_PARAMS = {'xgboost': 'n_jobs', 'lightgbm': 'n_jobs', 'random_forest': 'n_jobs'}
+
+
+def plan_workers(
+    n_jobs: int,
+    max_workers: Optional[int] = None,
+    threads_per_job: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Worker processes and threads per fit, keeping their product within
+    the cores
+
+    Args:
+        n_jobs: Number of fits to run
+        max_workers: Worker processes (default: one per core, at most n_jobs)
+        threads_per_job: Threads per fit (default: cores // workers)
+
+    Returns:
+        Tuple of (workers, threads per job)
+    """
+    cores = os.cpu_count() or 1
+    workers = max(1, min(max_workers or cores, n_jobs))
+    threads = threads_per_job or max(1, cores // workers)
+    return workers, threads
+
+
+def fit_base_model(job: Dict) -> Dict:
+    """
+    Fit one base model (runs in a worker process)
+
+    Args:
+        job: Dictionary with 'market', 'model_type', 'threads' and the
+            'X_train', 'y_train', 'X_val', 'y_val', 'X_test' splits
+
+    Returns:
+        Dictionary with the fitted model, validation and test predictions,
+        validation metrics, captured output, and wall / CPU seconds
+    """
+    from threadpoolctl import threadpool_limits
+    from training.market_trainer import train_single_model
+
+    model_type, threads = job['model_type'], job['threads']
+    params = {_THREAD_PARAMS[model_type]: threads} if model_type in _THREAD_PARAMS else None
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    log = io.StringIO()
+    # BLAS / OpenMP pools are capped as well as the libraries' own threads
+    with threadpool_limits(limits=threads), contextlib.redirect_stdout(log):
+        model, val_proba, metrics = train_single_model(
+            model_type, job['X_train'], job['y_train'], job['X_val'], job['y_val'], params, job['market']
+        )
+        test_proba = model.predict_proba(job['X_test'])[:, 1]
+
+    return {
+        'market': job['market'],
+        'model_type': model_type,
+        'model': model,
+        'val_proba': val_proba,
+        'test_proba': test_proba,
+        'metrics': metrics,
+        'log': log.getvalue(),
+        'threads': threads,
+        'wall_time': time.perf_counter() - wall,
+        'cpu_time': time.process_time() - cpu
+    }
+
+
+def finalize_market(market: str, data: Tuple, fits: Dict[str, Dict]) -> Dict:
+    """
+    Ensemble, calibrate, evaluate and save one market's base models
+
+    Args:
+        market: Market name
+        data: ``prepare_data`` output for the market
+        fits: ``fit_base_model`` results per model type
+
+    Returns:
+        Training results, as returned by ``train_*_model``
+    """
+    results = evaluate_market(data, fits)
+    save_market(market, data, fits, results)
+    return results
+
+
+def train_markets_parallel(
+    markets: Optional[List[str]] = None,
+    model_types: Optional[List[str]] = None,
+    data_path: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    threads_per_job: Optional[int] = None
+) -> Dict[str, Dict]:
+    """
+    Train all markets' base models in parallel
+
+    Every (market, model type) pair is one job in a process pool; longer
+    fits are submitted first. The training table is loaded and split once
+    for all markets. A market is ensembled, calibrated and saved as soon
+    as its last base model finishes, while other jobs keep running.
+
+    Args:
+        markets: Markets to train (default: PARALLEL_MARKETS)
+        model_types: Base models per market (default: DEFAULT_MODELS)
+        data_path: Training table (default: TRAINING_DATA_PATHS['counts'])
+        max_workers: Worker processes (default: PARALLEL_TRAINING_CONFIG)
+        threads_per_job: Threads per fit (default: PARALLEL_TRAINING_CONFIG)
+
+    Returns:
+        Training results per market (as ``train_*_model``), plus a
+        'timing' entry with the load and per-job wall and CPU seconds
+    """
+    markets = markets or PARALLEL_MARKETS
+    model_types = model_types or DEFAULT_MODELS
+
+    trainer = MarketTrainer(data_path, model_types).load()
+    data = {market: trainer.market_data(market) for market in markets}
+
+    order = PARALLEL_TRAINING_CONFIG['job_order']
+    pairs = sorted(
+        ((market, model_type) for market in markets for model_type in model_types),
+        key=lambda pair: order.index(pair[1]) if pair[1] in order else len(order)
+    )
+    workers, threads = plan_workers(
+        len(pairs),
+        max_workers or PARALLEL_TRAINING_CONFIG['max_workers'],
+        threads_per_job or PARALLEL_TRAINING_CONFIG['threads_per_job']
+    )
+    print(f"\n🚀 Training {len(pairs)} models on {workers} workers x {threads} threads "
+          f"({os.cpu_count()} cores)")
+
+    results, fits, timing = {}, {market: {} for market in markets}, []
+    started = time.perf_counter()
+    # Fresh interpreters: forking after OpenMP has started can deadlock
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        pending = {}
+        for market, model_type in pairs:
+            X_train, y_train, X_val, y_val, X_test, _, _ = data[market]
+            job = {
+                'market': market, 'model_type': model_type, 'threads': threads,
+                'X_train': X_train, 'y_train': y_train, 'X_val': X_val, 'y_val': y_val, 'X_test': X_test
+            }
+            pending[pool.submit(fit_base_model, job)] = (market, model_type)
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                market, model_type = pending.pop(future)
+                try:
+                    fit = future.result()
+                except Exception as e:
+                    print(f"❌ Error training {market}/{model_type}: {e}")
+                    fits[market][model_type] = None
+                else:
+                    fits[market][model_type] = fit
+                    timing.append({key: fit[key] for key in ('market', 'model_type', 'threads', 'wall_time', 'cpu_time')})
+                    print(f"✅ {market}/{model_type}: {fit['wall_time']:.1f} s wall, {fit['cpu_time']:.1f} s CPU")
+
+                # Ensemble the market once all its jobs have reported
+                if len(fits[market]) == len(model_types):
+                    # Model order as in serial training (the ensemble sums in the first one's dtype)
+                    trained = {mt: fits[market][mt] for mt in model_types if fits[market][mt] is not None}
+                    if not trained:
+                        print(f"❌ No {market} models were successfully trained!")
+                        results[market] = {}
+                        continue
+                    wall = time.perf_counter()
+                    results[market] = finalize_market(market, data[market], trained)
+                    metrics = results[market]['test_metrics']
+                    print(f"💾 {market} ensemble saved ({time.perf_counter() - wall:.1f} s): "
+                          f"log loss {metrics['log_loss']:.4f}, brier {metrics['brier_score']:.4f}")
+
+    results['timing'] = {
+        'load_time': trainer.timings['load'],
+        'jobs': timing,
+        'workers': workers,
+        'threads_per_job': threads,
+        'wall_time': time.perf_counter() - started,
+        'cpu_time': float(sum(job['cpu_time'] for job in timing))
+    }
+    print_timing_report(results['timing'])
+    return results
+
+
+def print_timing_report(timing: Dict):
+    """Per-job wall and CPU seconds, and the run's parallel speedup"""
+    print("\n" + "=" * 60)
+    print("PARALLEL TRAINING TIMES")
+    print("=" * 60)
+    print(f"{'Job':<22}{'Threads':>8}{'Wall (s)':>10}{'CPU (s)':>10}{'CPU/Wall':>10}")
+    for job in sorted(timing['jobs'], key=lambda j: -j['wall_time']):
+        name = f"{job['market']}/{job['model_type']}"
+        ratio = job['cpu_time'] / job['wall_time'] if job['wall_time'] else 0.0
+        print(f"{name:<22}{job['threads']:>8}{job['wall_time']:>10.1f}{job['cpu_time']:>10.1f}{ratio:>10.2f}")
+
+    serial = sum(job['wall_time'] for job in timing['jobs'])
+    if 'load_time' in timing:
+        print(f"\n📂 Data load (shared by all markets): {timing['load_time']:.1f} s")
+    print(f"\n⏱️  Wall clock: {timing['wall_time']:.1f} s  (sum of job wall times {serial:.1f} s, "
+          f"{serial / max(timing['wall_time'], 1e-9):.1f}x)")
+    print(f"⏱️  CPU time:   {timing['cpu_time']:.1f} s over {timing['workers']} workers "
+          f"x {timing['threads_per_job']} threads")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Train all market models in parallel')
+    parser.add_argument('--markets', nargs='+', choices=PARALLEL_MARKETS)
+    parser.add_argument('--workers', type=int, help='Worker processes')
+    parser.add_argument('--threads', type=int, help='Threads per fit')
+    args = parser.parse_args()
+
+    train_markets_parallel(args.markets, max_workers=args.workers, threads_per_job=args.threads)
@@ -0,0 +1,331 @@
+"""
+Multi-Output Market Model
+One shared-trunk XGBoost model (multi-output trees) scoring goals, BTTS,
+cards and corners in a single evaluation, with a comparison report against
+the per-market ensembles
+"""
+
+import json
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from predictor.model_io import load_calibration, load_model, save_calibration, save_model_artifacts
+from training.config import (
+    DEFAULT_MODELS, ENSEMBLE_WEIGHTS, CALIBRATION_METHOD, INITIAL_VERSION, MODEL_CONFIGS,
+    MODELS_DIR, TRAINING_DATA_PATHS, TRAIN_SPLIT, VAL_SPLIT
+)
+from training.utils import (
+    apply_calibration, calculate_metrics, ensemble_predictions, fit_calibration_model, time_based_split,
+    time_per_call
+)
+
+
+MULTI_OUTPUT_MARKETS = ['goals', 'btts', 'cards', 'corners']
+
+MULTI_OUTPUT_DIR = MODELS_DIR / 'multi_output'
+
+_ID_COLUMNS = ['match_id', 'date', 'league', 'home_team_id', 'away_team_id']
+
+
+class MultiMarketModel:
+    """Shared-trunk model plus one calibration table per market"""
+
+    def __init__(self, model, calibrators: Dict, feature_columns: List[str], markets: List[str] = None):
+        """
+        Args:
+            model: Fitted multi-label classifier, ``predict_proba`` -> (n, n_markets)
+            calibrators: CalibrationTable per market
+            feature_columns: Feature order of ``X``
+            markets: Market order of the model outputs
+        """
+        self.model = model
+        self.calibrators = calibrators
+        self.feature_columns = list(feature_columns)
+        self.markets = list(markets or MULTI_OUTPUT_MARKETS)
+
+    def predict_markets(self, X) -> Dict[str, np.ndarray]:
+        """
+        Calibrated probabilities for every market from one model evaluation
+
+        Args:
+            X: Feature matrix in ``feature_columns`` order
+
+        Returns:
+            Dictionary mapping market names to probabilities, one per row
+        """
+        proba = np.asarray(self.model.predict_proba(X)).reshape(len(X), -1)
+        return {
+            market: apply_calibration(self.calibrators[market], proba[:, i], CALIBRATION_METHOD)
+            if market in self.calibrators else proba[:, i]
+            for i, market in enumerate(self.markets)
+        }
+
+    def save(self, directory=MULTI_OUTPUT_DIR, metadata: Optional[Dict] = None) -> Path:
+        """Save the model natively, the calibration tables and metadata"""
+        directory = Path(directory)
+        save_model_artifacts(self.model, directory, 'multi_output')
+        for market, calibrator in self.calibrators.items():
+            save_calibration(calibrator, directory, market)
+        metadata_path = directory / 'multi_output_metadata.json'
+        with open(metadata_path, 'w') as f:
+            json.dump({
+                **(metadata or {}),
+                'markets': self.markets,
+                'feature_columns': self.feature_columns
+            }, f, indent=2)
+        return metadata_path
+
+    @classmethod
+    def load(cls, directory=MULTI_OUTPUT_DIR) -> 'MultiMarketModel':
+        """Load a model saved by ``save``"""
+        directory = Path(directory)
+        with open(directory / 'multi_output_metadata.json', 'r') as f:
+            metadata = json.load(f)
+        calibrators = {}
+        for market in metadata['markets']:
+            calibrator = load_calibration(directory, market, CALIBRATION_METHOD)
+            if calibrator is not None:
+                calibrators[market] = calibrator
+        return cls(load_model(directory, 'multi_output'), calibrators,
+                   metadata['feature_columns'], metadata['markets'])
+
+
+def load_multi_market_data(data_paths: Optional[Dict[str, str]] = None) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Join the four market training tables on match_id
+
+    Args:
+        data_paths: CSV path per market (default: TRAINING_DATA_PATHS)
+
+    Returns:
+        Tuple of (DataFrame with features and one ``y_<market>`` column per
+        market, feature columns)
+    """
+    data_paths = data_paths or {market: str(TRAINING_DATA_PATHS[market]) for market in MULTI_OUTPUT_MARKETS}
+
+    df = None
+    for market in MULTI_OUTPUT_MARKETS:
+        table = pd.read_csv(data_paths[market]).dropna(subset=['y'])
+        table = table.rename(columns={'y': f'y_{market}'})
+        table = table[[col for col in table.columns if not col.startswith('odds_')]]
+        if df is None:
+            df = table
+        else:
+            df = df.merge(table[['match_id', f'y_{market}']], on='match_id', how='inner')
+
+    targets = [f'y_{market}' for market in MULTI_OUTPUT_MARKETS]
+    feature_cols = [col for col in df.columns if col not in _ID_COLUMNS and col not in targets]
+    return df, feature_cols
+
+
+def fit_multi_output_model(
+    X_train: pd.DataFrame,
+    Y_train: np.ndarray,
+    X_val: pd.DataFrame,
+    Y_val: np.ndarray
+):
+    """
+    Fit one XGBoost model whose trees carry a leaf value per market
+
+    Uses the per-market XGBoost parameters, with early stopping on the
+    mean validation log loss across markets.
+    """
+    from xgboost import XGBClassifier
+
+    params = MODEL_CONFIGS['xgboost']['params'].copy()
+    params.update({'tree_method': 'hist', 'multi_strategy': 'multi_output_tree'})
+    model = XGBClassifier(**params)
+    model.fit(X_train, Y_train, eval_set=[(X_val, Y_val)], verbose=False)
+    return model
+
+
+def train_multi_output_model(
+    data_paths: Optional[Dict[str, str]] = None,
+    compare: bool = True
+) -> Dict:
+    """
+    Train, calibrate and save the multi-output model
+
+    Args:
+        data_paths: CSV path per market (default: TRAINING_DATA_PATHS)
+        compare: Also train the per-market ensembles on the same split and
+            report accuracy, calibration, latency and artifact size
+
+    Returns:
+        Dictionary with the model, test metrics and comparison report
+    """
+    print("\n" + "=" * 60)
+    print("TRAINING MULTI-OUTPUT MARKET MODEL")
+    print("=" * 60)
+
+    df, feature_cols = load_multi_market_data(data_paths)
+    train_df, val_df, test_df = time_based_split(df, TRAIN_SPLIT, VAL_SPLIT, 'date')
+    targets = [f'y_{market}' for market in MULTI_OUTPUT_MARKETS]
+    splits = {
+        name: (part[feature_cols].fillna(0), part[targets].to_numpy(dtype=int))
+        for name, part in (('train', train_df), ('val', val_df), ('test', test_df))
+    }
+    print(f"✅ {len(df):,} matches with all four markets, {len(feature_cols)} features")
+
+    print("\n🔄 Training shared-trunk XGBoost (multi-output trees)...")
+    X_val, Y_val = splits['val']
+    model = fit_multi_output_model(*splits['train'], X_val, Y_val)
+    val_proba = model.predict_proba(X_val)
+    calibrators = {
+        market: fit_calibration_model(val_proba[:, i], Y_val[:, i], CALIBRATION_METHOD)
+        for i, market in enumerate(MULTI_OUTPUT_MARKETS)
+    }
+    multi = MultiMarketModel(model, calibrators, feature_cols)
+
+    X_test, Y_test = splits['test']
+    predictions = multi.predict_markets(X_test)
+    metrics = {
+        market: _market_metrics(Y_test[:, i], predictions[market])
+        for i, market in enumerate(MULTI_OUTPUT_MARKETS)
+    }
+
+    report = None
+    if compare:
+        report = compare_with_ensembles(multi, splits)
+
+    metadata_path = multi.save(MULTI_OUTPUT_DIR, {
+        'model_type': 'multi_output',
+        'version': INITIAL_VERSION,
+        'trained_at': datetime.now().isoformat(),
+        'calibration_method': CALIBRATION_METHOD,
+        'metrics': {'test': metrics},
+        'comparison': report
+    })
+    print(f"\n💾 Saved multi-output model to {metadata_path.parent}")
+
+    print("\n✅ MULTI-OUTPUT MODEL TRAINING COMPLETE")
+    return {'model': multi, 'test_metrics': metrics, 'comparison': report, 'feature_columns': feature_cols}
+
+
+def compare_with_ensembles(multi: MultiMarketModel, splits: Dict[str, Tuple[pd.DataFrame, np.ndarray]]) -> Dict:
+    """
+    Per-market ensembles vs the multi-output model on the same split
+
+    Ensembles are trained here (DEFAULT_MODELS per market, ENSEMBLE_WEIGHTS,
+    same calibration) and both sides are timed after a save/load round trip
+    through the serving artifact formats.
+
+    Returns:
+        Report with per-market test metrics, latency (µs per call at 1 and
+        1000 rows) and artifact bytes for each approach
+    """
+    from training.market_trainer import train_single_model
+
+    X_train, Y_train = splits['train']
+    X_val, Y_val = splits['val']
+    X_test, Y_test = splits['test']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ensemble_dir, multi_dir = Path(tmp) / 'ensembles', Path(tmp) / 'multi_output'
+        for i, market in enumerate(MULTI_OUTPUT_MARKETS):
+            print(f"\n🔄 Training {market} ensemble for comparison...")
+            val_predictions = {}
+            for model_type in DEFAULT_MODELS:
+                model, val_proba, _ = train_single_model(
+                    model_type, X_train, pd.Series(Y_train[:, i]), X_val, pd.Series(Y_val[:, i]),
+                    market=market
+                )
+                save_model_artifacts(model, ensemble_dir / market, model_type)
+                val_predictions[model_type] = val_proba
+            calibrator = fit_calibration_model(
+                ensemble_predictions(val_predictions, ENSEMBLE_WEIGHTS), Y_val[:, i], CALIBRATION_METHOD
+            )
+            save_calibration(calibrator, ensemble_dir / market, 'ensemble')
+
+        multi.save(multi_dir)
+        served_multi = MultiMarketModel.load(multi_dir)
+        served_ensembles = {
+            market: (
+                {model_type: load_model(ensemble_dir / market, model_type) for model_type in DEFAULT_MODELS},
+                load_calibration(ensemble_dir / market, 'ensemble')
+            )
+            for market in MULTI_OUTPUT_MARKETS
+        }
+
+        def predict_ensembles(X) -> Dict[str, np.ndarray]:
+            return {
+                market: apply_calibration(calibrator, ensemble_predictions(
+                    {model_type: model.predict_proba(X)[:, 1] for model_type, model in models.items()},
+                    ENSEMBLE_WEIGHTS
+                ), CALIBRATION_METHOD)
+                for market, (models, calibrator) in served_ensembles.items()
+            }
+
+        X = X_test.to_numpy(dtype=np.float32)
+        approaches = {'ensembles': (predict_ensembles, ensemble_dir), 'multi_output': (served_multi.predict_markets, multi_dir)}
+        report = {}
+        for name, (predict, directory) in approaches.items():
+            predictions = predict(X)
+            report[name] = {
+                'metrics': {
+                    market: _market_metrics(Y_test[:, i], predictions[market])
+                    for i, market in enumerate(MULTI_OUTPUT_MARKETS)
+                },
+                'latency_us': {
+                    str(rows): time_per_call(predict, X[:rows]) * 1e6
+                    for rows in (1, min(1000, len(X)))
+                },
+                'artifact_bytes': sum(p.stat().st_size for p in directory.rglob('*') if p.is_file())
+            }
+
+    _print_report(report)
+    return report
+
+
+def _market_metrics(y_true: np.ndarray, proba: np.ndarray) -> Dict[str, float]:
+    """calculate_metrics plus expected calibration error"""
+    metrics = calculate_metrics(y_true, proba)
+    metrics['ece'] = _expected_calibration_error(y_true, proba)
+    return {key: float(value) for key, value in metrics.items()}
+
+
+def _expected_calibration_error(y_true: np.ndarray, proba: np.ndarray, n_bins: int = 10) -> float:
+    """Sample-weighted mean |observed rate - mean prediction| over probability bins"""
+    bins = np.clip((np.asarray(proba) * n_bins).astype(int), 0, n_bins - 1)
+    counts = np.bincount(bins, minlength=n_bins)
+    predicted = np.bincount(bins, weights=proba, minlength=n_bins)
+    observed = np.bincount(bins, weights=y_true, minlength=n_bins)
+    return float(np.abs(observed - predicted).sum() / max(len(proba), 1))
+
+
+def _print_report(report: Dict):
+    print("\n" + "=" * 60)
+    print("MULTI-OUTPUT VS PER-MARKET ENSEMBLES (test set)")
+    print("=" * 60)
+    for market in MULTI_OUTPUT_MARKETS:
+        print(f"\n📊 {market}:")
+        for name, result in report.items():
+            m = result['metrics'][market]
+            print(f"   {name:12s} log_loss {m['log_loss']:.4f}  brier {m['brier_score']:.4f}  "
+                  f"acc {m['accuracy']:.3f}  auc {m['auc_roc']:.3f}  ece {m['ece']:.4f}")
+    print("\n⏱️  Latency (all four markets, calibrated):")
+    for name, result in report.items():
+        latency = '  '.join(f"{rows} rows {us:9.1f} µs" for rows, us in result['latency_us'].items())
+        print(f"   {name:12s} {latency}")
+    print("\n📦 Artifact size:")
+    for name, result in report.items():
+        print(f"   {name:12s} {result['artifact_bytes'] / 1024:,.0f} KiB")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Train the multi-output market model')
+    parser.add_argument('--no-compare', action='store_true', help='Skip the per-market ensemble comparison')
+    args = parser.parse_args()
+
+    train_multi_output_model(compare=not args.no_compare)
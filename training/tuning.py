@@ -0,0 +1,337 @@
+"""
+Hyperparameter Tuning
+Successive-halving search over each model type's parameter space on cached
+time-based folds, writing the winners to TUNED_PARAMS_PATH
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from training.config import (
+    DEFAULT_MODELS, TRAINING_DATA_PATHS, TUNED_PARAMS_PATH, TUNING_CACHE_DIR, TUNING_CONFIG
+)
+from training.parallel_training import plan_workers
+
+
+TUNED_MARKETS = ['goals', 'btts', 'cards', 'corners']
+
+# Smallest training slice a trial is fitted on
+_MIN_TRIAL_ROWS = 200
+
+# Folds of the current worker process, memory-mapped once by _load_folds
+_FOLDS: List[Dict[str, np.ndarray]] = []
+
+
+def build_folds(
+    market: str,
+    data_path: Optional[str] = None,
+    n_folds: Optional[int] = None,
+    cache_dir: Optional[Path] = None
+) -> Path:
+    """
+    Build a market's expanding-window folds once and cache them as arrays
+
+    The market's test split (as MarketTrainer splits the table) is left
+    out. The train and validation splits are cut into ``n_folds + 1`` chronological blocks;
+    fold k trains on blocks 0..k and validates on block k + 1. The cache is
+    reused while the source CSV is unchanged.
+
+    Args:
+        market: Market name
+        data_path: Training table (default: TRAINING_DATA_PATHS['counts'])
+        n_folds: Number of folds (default: TUNING_CONFIG)
+        cache_dir: Cache root (default: TUNING_CACHE_DIR)
+
+    Returns:
+        Directory holding ``folds.json`` and the fold ``.npy`` files
+
+    Raises:
+        ValueError: If the CSV has no 'date' column
+    """
+    from training.market_trainer import MarketTrainer
+
+    data_path = Path(data_path or TRAINING_DATA_PATHS['counts'])
+    n_folds = n_folds or TUNING_CONFIG['n_folds']
+    cache_dir = Path(cache_dir or TUNING_CACHE_DIR) / market
+
+    stat = data_path.stat()
+    source = {'path': str(data_path.resolve()), 'size': stat.st_size, 'mtime': stat.st_mtime, 'n_folds': n_folds}
+    manifest_path = cache_dir / 'folds.json'
+    if manifest_path.exists():
+        with open(manifest_path, 'r') as f:
+            if json.load(f).get('source') == source:
+                print(f"📦 Using cached {market} folds in {cache_dir}")
+                return cache_dir
+
+    print(f"📂 Building {n_folds} time-based folds from {data_path}")
+    trainer = MarketTrainer(data_path).load()
+    if 'date' not in trainer.df.columns:
+        raise ValueError(f"Time-based folds need a 'date' column in {data_path}")
+    X_train, y_train, X_val, y_val, _, _, feature_cols = trainer.market_data(market)
+    X, y = pd.concat([X_train, X_val]), pd.concat([y_train, y_val])
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    n, block = len(X), len(X) // (n_folds + 1)
+    sizes = []
+    for k in range(n_folds):
+        end = n - (n_folds - 1 - k) * block
+        for split, rows in (('train', slice(0, end - block)), ('val', slice(end - block, end))):
+            np.save(cache_dir / f"fold{k}_X_{split}.npy", X.iloc[rows].to_numpy(dtype=np.float32))
+            np.save(cache_dir / f"fold{k}_y_{split}.npy", y.iloc[rows].to_numpy(dtype=np.int8))
+        sizes.append({'train': end - block, 'val': block})
+
+    with open(manifest_path, 'w') as f:
+        json.dump({'source': source, 'feature_columns': feature_cols, 'folds': sizes}, f, indent=2)
+    return cache_dir
+
+
+def _load_folds(cache_dir: str):
+    """Worker initializer: memory-map the cached folds (pages shared between workers)"""
+    with open(Path(cache_dir) / 'folds.json', 'r') as f:
+        n_folds = len(json.load(f)['folds'])
+    _FOLDS[:] = [
+        {
+            name: np.load(Path(cache_dir) / f"fold{k}_{name}.npy", mmap_mode='r')
+            for name in ('X_train', 'y_train', 'X_val', 'y_val')
+        }
+        for k in range(n_folds)
+    ]
+
+
+def sample_params(space: Dict, rng: np.random.Generator) -> Dict:
+    """
+    Draw one configuration from a search space
+
+    Args:
+        space: Parameter name -> (kind, low, high), kind 'int', 'float' or 'log'
+        rng: Random generator
+
+    Returns:
+        Parameter values (plain Python numbers)
+    """
+    params = {}
+    for name, (kind, low, high) in space.items():
+        if kind == 'int':
+            params[name] = int(rng.integers(low, high + 1))
+        elif kind == 'log':
+            params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            params[name] = float(rng.uniform(low, high))
+    return params
+
+
+def run_trial(trial: Dict) -> Dict:
+    """
+    Mean validation log loss of one configuration over the cached folds
+    (runs in a worker process)
+
+    Each fold's model is fitted on the newest ``resource`` share of its
+    training rows.
+
+    Args:
+        trial: Dictionary with 'model_type', 'params' (overrides of
+            MODEL_CONFIGS), 'resource' and 'threads'
+
+    Returns:
+        The trial with 'log_loss' and 'wall_time' added
+    """
+    from threadpoolctl import threadpool_limits
+    from training.market_trainer import train_single_model
+
+    model_type = trial['model_type']
+    params = dict(trial['params'])
+    if model_type in ('xgboost', 'lightgbm', 'random_forest'):
+        params['n_jobs'] = trial['threads']
+
+    started = time.perf_counter()
+    losses = []
+    try:
+        with threadpool_limits(limits=trial['threads']), contextlib.redirect_stdout(io.StringIO()):
+            for fold in _FOLDS:
+                n_rows = max(int(len(fold['y_train']) * trial['resource']), _MIN_TRIAL_ROWS)
+                _, _, metrics = train_single_model(
+                    model_type, fold['X_train'][-n_rows:], fold['y_train'][-n_rows:],
+                    fold['X_val'], fold['y_val'], params
+                )
+                losses.append(metrics['log_loss'])
+        log_loss = float(np.mean(losses))
+    except Exception as e:
+        print(f"⚠️  {model_type} trial {trial['trial_id']} failed: {e}")
+        log_loss = float('inf')
+    return {**trial, 'log_loss': log_loss, 'wall_time': time.perf_counter() - started}
+
+
+def tune_market(
+    market: str,
+    model_types: Optional[List[str]] = None,
+    n_trials: Optional[int] = None,
+    data_path: Optional[str] = None,
+    max_workers: Optional[int] = None
+) -> Dict[str, Dict]:
+    """
+    Successive-halving search for one market
+
+    Every model type starts with ``n_trials`` configurations (the current
+    MODEL_CONFIGS parameters are trial 0) on ``min_resource`` of the
+    training rows. After each rung the best 1/eta are kept and their
+    resource multiplied by eta, up to the full folds. The current
+    parameters are always scored at the last rung as the baseline. Rungs of
+    all model types share one process pool.
+
+    Args:
+        market: Market name
+        model_types: Model types to tune (default: DEFAULT_MODELS)
+        n_trials: Configurations per model type (default: TUNING_CONFIG)
+        data_path: Training table (default: TRAINING_DATA_PATHS['counts'])
+        max_workers: Worker processes (default: TUNING_CONFIG)
+
+    Returns:
+        Per model type: best 'params', its 'log_loss', the baseline's
+        'default_log_loss' and every trial in 'history'
+    """
+    model_types = model_types or DEFAULT_MODELS
+    n_trials = n_trials or TUNING_CONFIG['n_trials']
+    eta = TUNING_CONFIG['eta']
+
+    print("\n" + "=" * 60)
+    print(f"TUNING {market.upper()} MODELS")
+    print("=" * 60)
+
+    cache_dir = build_folds(market, data_path)
+    rng = np.random.default_rng(TUNING_CONFIG['seed'])
+    active = {
+        model_type: [
+            {'trial_id': i, 'model_type': model_type,
+             'params': {} if i == 0 else sample_params(TUNING_CONFIG['spaces'][model_type], rng)}
+            for i in range(n_trials)
+        ]
+        for model_type in model_types
+    }
+    history = {model_type: [] for model_type in model_types}
+
+    workers, threads = plan_workers(n_trials * len(model_types), max_workers or TUNING_CONFIG['max_workers'])
+    print(f"🚀 {n_trials} trials x {len(model_types)} model types on {workers} workers x {threads} threads")
+
+    resource, rung = TUNING_CONFIG['min_resource'], 0
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=_load_folds, initargs=(str(cache_dir),)) as pool:
+        while True:
+            last_rung = resource >= 1.0 - 1e-9
+            if last_rung:
+                # Score the current parameters at full resource as the baseline
+                for model_type, trials in active.items():
+                    if all(trial['trial_id'] != 0 for trial in trials):
+                        default = next(t for t in history[model_type] if t['trial_id'] == 0)
+                        trials.append({key: default[key] for key in ('trial_id', 'model_type', 'params')})
+
+            jobs = [
+                {**trial, 'resource': min(resource, 1.0), 'threads': threads}
+                for trials in active.values() for trial in trials
+            ]
+            started = time.perf_counter()
+            for result in pool.map(run_trial, jobs):
+                history[result['model_type']].append({**result, 'rung': rung})
+            print(f"\n📊 Rung {rung}: {len(jobs)} trials on {min(resource, 1.0):.0%} of the training rows "
+                  f"({time.perf_counter() - started:.1f} s)")
+
+            for model_type in model_types:
+                scored = sorted(
+                    (t for t in history[model_type] if t['rung'] == rung), key=lambda t: t['log_loss']
+                )
+                print(f"   {model_type:<10} best log loss {scored[0]['log_loss']:.4f} (trial {scored[0]['trial_id']})")
+                active[model_type] = [
+                    {key: t[key] for key in ('trial_id', 'model_type', 'params')}
+                    for t in scored[:max(1, len(scored) // eta)]
+                ]
+
+            if last_rung:
+                break
+            resource *= eta
+            rung += 1
+
+    results = {}
+    for model_type in model_types:
+        final = sorted((t for t in history[model_type] if t['rung'] == rung), key=lambda t: t['log_loss'])
+        baseline = next(t for t in final if t['trial_id'] == 0)
+        results[model_type] = {
+            'params': final[0]['params'],
+            'log_loss': final[0]['log_loss'],
+            'default_log_loss': baseline['log_loss'],
+            'history': history[model_type]
+        }
+    _print_tuning(market, results)
+    return results
+
+
+def save_tuned_params(market: str, results: Dict[str, Dict], path: Path = TUNED_PARAMS_PATH) -> Path:
+    """
+    Write a market's winning parameters where ``model_params`` reads them
+
+    Args:
+        market: Market name
+        results: ``tune_market`` output
+        path: Tuned parameters file (default: TUNED_PARAMS_PATH)
+
+    Returns:
+        Path to the tuned parameters file
+    """
+    tuned = {}
+    if path.exists():
+        with open(path, 'r') as f:
+            tuned = json.load(f)
+
+    tuned.setdefault(market, {})
+    for model_type, result in results.items():
+        tuned[market][model_type] = {
+            'params': result['params'],
+            'log_loss': result['log_loss'],
+            'default_log_loss': result['default_log_loss'],
+            'n_trials': len({t['trial_id'] for t in result['history']}),
+            'tuned_at': datetime.now().isoformat()
+        }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(tuned, f, indent=2)
+    print(f"💾 Saved tuned {market} parameters to {path}")
+    return path
+
+
+def _print_tuning(market: str, results: Dict[str, Dict]):
+    print(f"\n🏆 Best {market} configurations (mean fold log loss):")
+    for model_type, result in results.items():
+        gain = result['default_log_loss'] - result['log_loss']
+        params = ', '.join(
+            f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in result['params'].items()
+        ) or 'current MODEL_CONFIGS'
+        print(f"   {model_type:<10} {result['log_loss']:.4f} (current {result['default_log_loss']:.4f}, "
+              f"{-gain:+.4f}): {params}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Tune model hyperparameters by successive halving')
+    parser.add_argument('--market', choices=TUNED_MARKETS, help='Single market (default: all)')
+    parser.add_argument('--models', nargs='+', choices=list(TUNING_CONFIG['spaces']), help='Model types')
+    parser.add_argument('--trials', type=int, help='Configurations per model type')
+    parser.add_argument('--workers', type=int, help='Worker processes')
+    args = parser.parse_args()
+
+    for market in [args.market] if args.market else TUNED_MARKETS:
+        results = tune_market(market, args.models, args.trials, max_workers=args.workers)
+        save_tuned_params(market, results)
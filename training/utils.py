@@ -5,6 +5,7 @@ Shared helper functions for model training, calibration, and evaluation
 
 import json
 import pickle
+import time
 import numpy as np
 import pandas as pd
 from pathlib import Path
@@ -17,7 +18,12 @@ from sklearn.metrics import log_loss, brier_score_loss, roc_auc_score, accuracy_
 import warnings
 warnings.filterwarnings('ignore')
 
-from training.config import MODELS_DIR, MODEL_VERSION_FORMAT, INITIAL_VERSION
+from training.config import (
+    MODELS_DIR, MODEL_VERSION_FORMAT, INITIAL_VERSION, MODEL_CONFIGS, TUNED_PARAMS_PATH
+)
+from predictor.model_io import (
+    CalibrationTable, save_model_artifacts, load_model, save_calibration, load_calibration
+)
 
 
 def fit_calibration_model(
@@ -34,7 +40,7 @@ def fit_calibration_model(
         method: 'isotonic' for isotonic regression or 'sigmoid' for Platt scaling
         
     Returns:
-        Trained calibration model
+        Calibration lookup table (isotonic breakpoints or Platt coefficients)
     """
     if method == 'isotonic':
         calibrator = IsotonicRegression(out_of_bounds='clip')
@@ -46,7 +52,8 @@ def fit_calibration_model(
     else:
         raise ValueError(f"Unknown calibration method: {method}")
     
-    return calibrator
+    # Exported to arrays so serving skips sklearn's per-call validation
+    return CalibrationTable.from_model(calibrator, method)
 
 
 def apply_calibration(
@@ -58,13 +65,16 @@ def apply_calibration(
     Apply trained calibration model to raw probabilities
     
     Args:
-        calibration_model: Trained calibration model
+        calibration_model: CalibrationTable, or a legacy sklearn calibrator
         raw_probs: Raw probability predictions
-        method: Calibration method used ('isotonic' or 'sigmoid')
+        method: Calibration method used ('isotonic' or 'sigmoid'); tables
+            carry their own
         
     Returns:
         Calibrated probabilities
     """
+    if isinstance(calibration_model, CalibrationTable):
+        return calibration_model.predict(raw_probs)
     if method == 'isotonic':
         return calibration_model.predict(raw_probs)
     elif method == 'sigmoid':
@@ -190,8 +200,8 @@ def time_based_split(
     Returns:
         Tuple of (train_df, val_df, test_df)
     """
-    # Sort by date
-    df = df.sort_values(date_column).reset_index(drop=True)
+    # Sort by date (stable, so same-day matches keep their table order)
+    df = df.sort_values(date_column, kind='mergesort').reset_index(drop=True)
     
     n = len(df)
     train_end = int(n * train_ratio)
@@ -204,6 +214,38 @@ def time_based_split(
     return train_df, val_df, test_df
 
 
+def feature_reference_profile(X: pd.DataFrame, n_bins: int = 10) -> Dict:
+    """
+    Summarise training feature distributions for drift monitoring
+    
+    Each column is cut at its training quantiles into at most ``n_bins``
+    bins (repeated cut points are merged); the profile stores the cut
+    points and the share of training rows in each bin.
+    
+    Args:
+        X: Training feature matrix
+        n_bins: Bins per feature
+        
+    Returns:
+        JSON-serialisable reference profile
+    """
+    values = X.to_numpy(dtype=np.float64, na_value=0.0)
+    quantiles = np.linspace(0, 1, n_bins + 1)[1:-1]
+    
+    features = {}
+    for j, name in enumerate(X.columns):
+        column = values[:, j]
+        edges = np.unique(np.quantile(column, quantiles)) if len(column) else np.empty(0)
+        # A value equal to a cut point falls in the bin above it
+        counts = np.bincount(np.searchsorted(edges, column, side='right'), minlength=len(edges) + 1)
+        features[str(name)] = {
+            'edges': edges.tolist(),
+            'proportions': (counts / max(len(column), 1)).tolist()
+        }
+    
+    return {'n_bins': n_bins, 'n_samples': len(values), 'features': features}
+
+
 def save_model_with_metadata(
     model: Any,
     market: str,
@@ -215,7 +257,8 @@ def save_model_with_metadata(
     version: Optional[str] = None,
     train_start_date: Optional[str] = None,
     train_end_date: Optional[str] = None,
-    additional_info: Optional[Dict] = None
+    additional_info: Optional[Dict] = None,
+    reference_data: Optional[pd.DataFrame] = None
 ) -> str:
     """
     Save model with comprehensive metadata
@@ -232,9 +275,11 @@ def save_model_with_metadata(
         train_start_date: Training data start date
         train_end_date: Training data end date
         additional_info: Additional metadata to store
+        reference_data: Training features whose distributions are stored
+            as the drift monitoring reference (optional)
         
     Returns:
-        Path to saved model
+        Path to the saved model manifest
     """
     # Generate version if not provided
     if version is None:
@@ -244,13 +289,13 @@ def save_model_with_metadata(
     model_dir = MODELS_DIR / market
     model_dir.mkdir(parents=True, exist_ok=True)
     
-    # Save model
-    model_path = model_dir / f"{model_type}_model.pkl"
-    with open(model_path, 'wb') as f:
-        pickle.dump(model, f)
+    # Save model (native format + flat tree arrays; pickle only as fallback)
+    model_path = save_model_artifacts(model, model_dir, model_type)
     
     # Save calibration model if provided
-    if calibration_model is not None:
+    if isinstance(calibration_model, CalibrationTable):
+        save_calibration(calibration_model, model_dir, model_type)
+    elif calibration_model is not None:
         calib_path = model_dir / f"{model_type}_calibration.pkl"
         with open(calib_path, 'wb') as f:
             pickle.dump(calibration_model, f)
@@ -272,6 +317,9 @@ def save_model_with_metadata(
     if additional_info:
         metadata.update(additional_info)
     
+    if reference_data is not None:
+        metadata['feature_reference'] = feature_reference_profile(reference_data[feature_columns])
+    
     # Save metadata
     metadata_path = model_dir / f"{model_type}_metadata.json"
     with open(metadata_path, 'w') as f:
@@ -299,13 +347,8 @@ def load_model_with_metadata(
     """
     model_dir = MODELS_DIR / market
     
-    # Load model
-    model_path = model_dir / f"{model_type}_model.pkl"
-    if not model_path.exists():
-        raise FileNotFoundError(f"Model not found: {model_path}")
-    
-    with open(model_path, 'rb') as f:
-        model = pickle.load(f)
+    # Load model (native artifacts, or a legacy pickle)
+    model = load_model(model_dir, model_type)
     
     # Load metadata
     metadata_path = model_dir / f"{model_type}_metadata.json"
@@ -316,11 +359,9 @@ def load_model_with_metadata(
         metadata = {}
     
     # Load calibration model if exists
-    calib_path = model_dir / f"{model_type}_calibration.pkl"
-    calibration_model = None
-    if calib_path.exists():
-        with open(calib_path, 'rb') as f:
-            calibration_model = pickle.load(f)
+    calibration_model = load_calibration(
+        model_dir, model_type, metadata.get('calibration_method') or 'isotonic'
+    )
     
     return model, metadata, calibration_model
 
@@ -357,6 +398,54 @@ def increment_version(current_version: str, increment_type: str = 'minor') -> st
     return f"v{major}.{minor}.{patch}"
 
 
+def model_params(model_type: str, market: Optional[str] = None) -> Dict:
+    """
+    Parameters for a model type, with the market's tuned values applied
+    
+    Args:
+        model_type: Type of model (key of MODEL_CONFIGS)
+        market: Market whose entry in TUNED_PARAMS_PATH overrides the
+            defaults (optional)
+        
+    Returns:
+        Model constructor parameters
+        
+    Raises:
+        ValueError: If the model type is unknown
+    """
+    if model_type not in MODEL_CONFIGS:
+        raise ValueError(f"Unknown model type: {model_type}")
+    params = dict(MODEL_CONFIGS[model_type]['params'])
+    
+    if market is not None and TUNED_PARAMS_PATH.exists():
+        with open(TUNED_PARAMS_PATH, 'r') as f:
+            tuned = json.load(f)
+        params.update(tuned.get(market, {}).get(model_type, {}).get('params', {}))
+    return params
+
+
+def time_per_call(fn, X, min_time: float = 0.3) -> float:
+    """
+    Mean seconds per call of ``fn(X)``, repeating for at least ``min_time``
+    
+    Args:
+        fn: Prediction function
+        X: Input batch
+        min_time: Minimum measured seconds (after one warm-up call)
+        
+    Returns:
+        Seconds per call
+    """
+    fn(X)
+    calls, start = 0, time.perf_counter()
+    while True:
+        fn(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return elapsed / calls
+
+
 def get_feature_importance(
     model: Any,
     feature_names: List[str],
@@ -4,7 +4,7 @@ FastAPI application serving predictions and handling data ingestion
 """
 
 import os
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
@@ -15,9 +15,11 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from data_ingestion.database import get_db_session, init_db
+from data_ingestion.database import get_db, get_db_session, init_db
 from data_ingestion.schemas import BatchIngestRequest, IngestResponse
 from data_ingestion.ingestion import DataIngestionService
+from features.h2h_index import HeadToHeadIndex
+from features.rolling_store import RollingWindowStore
 
 # Import Smart Bets predictor
 try:
@@ -43,6 +45,14 @@ except ImportError:
     VALUE_BETS_AVAILABLE = False
     print("⚠️  Value Bets AI not available.")
 
+# Import integrated market predictor (trained ensembles with drift monitoring)
+try:
+    from predictor.integrated_predictor import IntegratedPredictor
+    INTEGRATED_PREDICTOR_AVAILABLE = True
+except ImportError:
+    INTEGRATED_PREDICTOR_AVAILABLE = False
+    print("⚠️  Integrated predictor not available.")
+
 # Import Custom Analysis
 try:
     from custom_analysis import CustomBetAnalyzer
@@ -71,13 +81,20 @@ app.add_middleware(
 predictor = None
 golden_predictor = None
 value_predictor = None
+market_predictor = None
 custom_analyzer = None
 
+# In-memory feature state, kept current by result ingestion
+rolling_store = None
+h2h_index = None
+result_observers: List = []
+
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize database and models on startup"""
-    global predictor, golden_predictor, value_predictor, custom_analyzer
+    global predictor, golden_predictor, value_predictor, market_predictor, custom_analyzer
+    global rolling_store, h2h_index
     
     try:
         init_db()
@@ -85,6 +102,23 @@ async def startup_event():
     except Exception as e:
         print(f"❌ Database initialization failed: {e}")
     
+    # Build the live feature state from stored results
+    try:
+        with get_db() as db:
+            rolling_store = RollingWindowStore.from_session(db)
+        result_observers.append(rolling_store)
+        print(f"✅ Rolling-window store built ({rolling_store.n_teams} teams)")
+    except Exception as e:
+        print(f"⚠️  Could not build rolling-window store: {e}")
+    
+    try:
+        with get_db() as db:
+            h2h_index = HeadToHeadIndex.from_session(db)
+        result_observers.append(h2h_index)
+        print(f"✅ Head-to-head index built ({h2h_index.n_pairs} team pairs)")
+    except Exception as e:
+        print(f"⚠️  Could not build head-to-head index: {e}")
+    
     # Load Smart Bets models
     if SMART_BETS_AVAILABLE:
         try:
@@ -109,6 +143,14 @@ async def startup_event():
         except Exception as e:
             print(f"⚠️  Could not load Value Bets models: {e}")
     
+    # Load integrated market models
+    if INTEGRATED_PREDICTOR_AVAILABLE:
+        try:
+            market_predictor = IntegratedPredictor(rolling_store=rolling_store)
+            print("✅ Market models loaded")
+        except Exception as e:
+            print(f"⚠️  Could not load market models: {e}")
+    
     # Load Custom Analysis
     if CUSTOM_ANALYSIS_AVAILABLE:
         try:
@@ -132,6 +174,8 @@ async def root():
             "golden_bets": "/api/v1/predictions/golden-bets",
             "value_bets": "/api/v1/predictions/value-bets",
             "custom_analysis": "/api/v1/predictions/custom-analysis",
+            "market_probabilities": "/api/v1/predictions/markets",
+            "feature_drift": "/api/v1/monitoring/drift",
             "docs": "/docs"
         }
     }
@@ -147,6 +191,7 @@ async def health_check():
         "smart_bets_available": predictor is not None,
         "golden_bets_available": golden_predictor is not None,
         "value_bets_available": value_predictor is not None,
+        "market_models_available": market_predictor is not None,
         "custom_analysis_available": custom_analyzer is not None
     }
 
@@ -175,7 +220,7 @@ async def ingest_data(
     - Any errors encountered
     """
     try:
-        service = DataIngestionService(db)
+        service = DataIngestionService(db, result_observers=result_observers)
         response = service.ingest_batch(request)
         
         if not response.success:
@@ -233,6 +278,13 @@ class ValueBetsRequest(BaseModel):
     matches: List[MatchWithOdds]
 
 
+class MarketPredictionRequest(BaseModel):
+    """Request for calibrated market probabilities"""
+    matches: List[Dict[str, Any]]
+    markets: Optional[List[str]] = None
+    full_ensemble: bool = False
+
+
 class CustomAnalysisRequest(BaseModel):
     """Request for Custom Bet Analysis"""
     match_data: MatchInput
@@ -387,6 +439,89 @@ async def predict_value_bets(request: ValueBetsRequest):
         )
 
 
+@app.post(
+    "/api/v1/predictions/markets",
+    tags=["Predictions"],
+    status_code=status.HTTP_200_OK
+)
+async def predict_markets(request: MarketPredictionRequest):
+    """
+    Calibrated ensemble probabilities for each market
+    
+    Scores every match with the trained goals, BTTS, cards and corners
+    models. Markets with a distilled student are served by it, with the
+    full ensemble used for Golden Bet candidates near the threshold (or
+    for every match with ``full_ensemble``). Served features are recorded
+    by the drift monitor.
+    
+    Returns:
+    - Probability per market for each match
+    """
+    if market_predictor is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Market models not loaded. Please train models first."
+        )
+    
+    try:
+        probabilities = market_predictor.predict_batch(
+            request.matches, request.markets, use_student=not request.full_ensemble
+        )
+        
+        predictions = [
+            {
+                "match_id": match.get("match_id"),
+                "probabilities": {market: float(probs[i]) for market, probs in probabilities.items()}
+            }
+            for i, match in enumerate(request.matches)
+        ]
+        
+        return {
+            "success": True,
+            "total_matches": len(predictions),
+            "predictions": predictions
+        }
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Market prediction error: {str(e)}"
+        )
+
+
+@app.get("/api/v1/monitoring/drift", tags=["Monitoring"])
+async def get_feature_drift(top: Optional[int] = None, reset: bool = False):
+    """
+    Feature drift of served traffic against the training distributions
+    
+    Scores every model input column with the Population Stability Index
+    (PSI; >= 0.1 moderate, >= 0.25 drift) and the binned Kolmogorov-Smirnov
+    distance between live and training histograms.
+    
+    Args:
+        top: Only return the ``top`` most drifted features
+        reset: Start a new observation window after reading
+    """
+    if market_predictor is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Market models not loaded. Please train models first."
+        )
+    
+    report = market_predictor.get_drift_report(top)
+    if reset and market_predictor.drift_monitor is not None:
+        market_predictor.drift_monitor.reset()
+    
+    return {
+        "success": True,
+        "drift": report
+    }
+
+
 @app.post(
     "/api/v1/predictions/custom-analysis",
     tags=["Predictions"],
@@ -514,6 +649,79 @@ async def get_teams(
     }
 
 
+@app.get("/api/v1/teams/{team_id}/statistics", tags=["Teams"])
+async def get_team_statistics(
+    team_id: int,
+    season: Optional[str] = None,
+    db: Session = Depends(get_db_session)
+):
+    """
+    Get pre-aggregated season statistics for a team
+
+    Rows are maintained on result ingestion, so no match history is scanned.
+
+    Query parameters:
+    - season: Season filter, e.g. 2024-25 (default: all seasons)
+    """
+    from data_ingestion.models import TeamStatistic
+
+    query = db.query(TeamStatistic).filter(TeamStatistic.team_id == team_id)
+    if season is not None:
+        query = query.filter(TeamStatistic.season == season)
+
+    rows = query.order_by(TeamStatistic.season).all()
+
+    if not rows:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No statistics found for team {team_id}"
+        )
+
+    def _num(value):
+        return float(value) if value is not None else None
+
+    return {
+        "team_id": team_id,
+        "seasons": [
+            {
+                "season": s.season,
+                "matches_played": s.matches_played,
+                "wins": s.wins,
+                "draws": s.draws,
+                "losses": s.losses,
+                "goals_scored": s.goals_scored,
+                "goals_conceded": s.goals_conceded,
+                "home": {
+                    "matches": s.home_matches,
+                    "wins": s.home_wins,
+                    "draws": s.home_draws,
+                    "losses": s.home_losses,
+                    "goals_scored": s.home_goals_scored,
+                    "goals_conceded": s.home_goals_conceded
+                },
+                "away": {
+                    "matches": s.away_matches,
+                    "wins": s.away_wins,
+                    "draws": s.away_draws,
+                    "losses": s.away_losses,
+                    "goals_scored": s.away_goals_scored,
+                    "goals_conceded": s.away_goals_conceded
+                },
+                "goals_avg": _num(s.goals_avg),
+                "goals_conceded_avg": _num(s.goals_conceded_avg),
+                "home_goals_avg": _num(s.home_goals_avg),
+                "away_goals_avg": _num(s.away_goals_avg),
+                "corners_avg": _num(s.corners_avg),
+                "cards_avg": _num(s.cards_avg),
+                "btts_rate": _num(s.btts_rate),
+                "clean_sheet_rate": _num(s.clean_sheet_rate),
+                "current_form": s.current_form
+            }
+            for s in rows
+        ]
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -49,14 +49,17 @@ class ValueBetsCalculator:
         """
         value_bets = []
         
-        for pred in predictions_with_odds:
+        # Get AI probabilities in one batch, building features once per row
+        matches = [pred.get('match_data', {}) for pred in predictions_with_odds]
+        row_markets = [pred.get('market', 'goals') for pred in predictions_with_odds]
+        market_probs = self.predictor.predict_batch(matches, list(dict.fromkeys(row_markets)))
+        ai_probs = [float(market_probs[market][i]) for i, market in enumerate(row_markets)]
+        
+        for pred, ai_prob in zip(predictions_with_odds, ai_probs):
             match_data = pred.get('match_data', {})
             market = pred.get('market', 'goals')
             odds = pred.get('odds', 2.0)
             
-            # Get AI probability
-            ai_prob = self.predictor.predict_for_match(market, match_data)
-            
             # Skip if below minimum probability
             if ai_prob < self.min_prob:
                 continue